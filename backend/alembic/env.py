@@ -17,6 +17,7 @@ from app.models.demographics import Demographics
 from app.models.ai_chat import ChatMessage, ChatConversation, ChatAnalytics
 from app.models.execution import WorkflowExecution, ExecutionCheckpoint, ExecutionLog
 from app.models.reviews import ReviewBase, ShoesReview, WirelessReview
+from app.models.product_summary import ProductSummary
 from app.models.survey import SurveyResponse
 from app.models.summary import ExecutionSummary
 from app.models.source_data import SourceReview
@@ -0,0 +1,38 @@
+"""chat_conversations.next_message_index sequence
+
+- Per-conversation message index counter (replaces COUNT(*) per message)
+- Backfilled from existing chat_messages
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# --- Alembic identifiers ---
+revision = "chat_message_sequence_20261018"
+down_revision = "v1_baseline_20251112"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "chat_conversations",
+        sa.Column("next_message_index", sa.Integer, nullable=False, server_default=sa.text("0")),
+        schema="public",
+    )
+    op.execute(
+        """
+        UPDATE public.chat_conversations AS c
+        SET next_message_index = m.cnt
+        FROM (
+            SELECT session_id, COUNT(*) AS cnt
+            FROM public.chat_messages
+            GROUP BY session_id
+        ) AS m
+        WHERE m.session_id = c.session_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("chat_conversations", "next_message_index", schema="public")
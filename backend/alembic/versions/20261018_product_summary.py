@@ -0,0 +1,47 @@
+"""product_summary materialized table
+
+- One row per (category, product_id): review counts, rating histogram,
+  verified count, text length sums, date range
+- Populated by: python -m app.models.product_summary
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# --- Alembic identifiers ---
+revision = "product_summary_20261018"
+down_revision = "chat_message_sequence_20261018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "product_summary",
+        sa.Column("id", sa.Integer, sa.Identity(), primary_key=True),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("product_id", sa.String(50), nullable=False),
+        sa.Column("product_title", sa.String(500), nullable=False),
+        sa.Column("review_count", sa.Integer, nullable=False),
+        sa.Column("malformed_count", sa.Integer, nullable=False),
+        sa.Column("verified_count", sa.Integer, nullable=False),
+        sa.Column("rating_1", sa.Integer, nullable=False),
+        sa.Column("rating_2", sa.Integer, nullable=False),
+        sa.Column("rating_3", sa.Integer, nullable=False),
+        sa.Column("rating_4", sa.Integer, nullable=False),
+        sa.Column("rating_5", sa.Integer, nullable=False),
+        sa.Column("rating_sum", sa.Integer, nullable=False),
+        sa.Column("body_length_sum", sa.Integer, nullable=False),
+        sa.Column("headline_length_sum", sa.Integer, nullable=False),
+        sa.Column("first_review_date", sa.Date),
+        sa.Column("last_review_date", sa.Date),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.UniqueConstraint("category", "product_id", name="uq_product_summary_category_product"),
+        schema="public",
+    )
+    op.create_index("ix_product_summary_category", "product_summary", ["category"], unique=False, schema="public")
+
+
+def downgrade():
+    op.drop_index("ix_product_summary_category", table_name="product_summary", schema="public")
+    op.drop_table("product_summary", schema="public")
@@ -0,0 +1,35 @@
+"""Trigram text search indexes on review tables
+
+- pg_trgm extension
+- GIN trigram indexes on review_headline, review_body, product_title of
+  every review table, so ILIKE '%term%' text filters use an index
+"""
+
+from alembic import op
+
+# --- Alembic identifiers ---
+revision = "review_text_search_20261018"
+down_revision = "product_summary_20261018"
+branch_labels = None
+depends_on = None
+
+REVIEW_TABLES = ("shoes_reviews", "wireless_reviews")
+TEXT_COLUMNS = ("review_headline", "review_body", "product_title")
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in REVIEW_TABLES:
+        suffix = table.replace("_reviews", "")
+        for column in TEXT_COLUMNS:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{suffix}_{column}_trgm "
+                f"ON public.{table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    for table in REVIEW_TABLES:
+        suffix = table.replace("_reviews", "")
+        for column in TEXT_COLUMNS:
+            op.execute(f"DROP INDEX IF EXISTS public.idx_{suffix}_{column}_trgm")
@@ -86,6 +86,26 @@ class Settings(BaseSettings):
         default="low",
         description="GPT-5: Control reasoning depth (minimal=fast/simple, medium=default, high=complex)"
     )    
+    prompt_context_budget: int = Field(
+        default=3000,
+        description="Token budget for data context in tool prompts (models not listed in prompt_context_budgets)"
+    )
+
+    prompt_context_budgets: dict[str, int] = Field(
+        default_factory=lambda: {
+            "gpt-3.5-turbo": 2000,
+            "gpt-4o-mini": 4000,
+            "gpt-5-mini": 6000,
+            "gpt-5": 8000,
+        },
+        description="Per-model token budget for data context in tool prompts"
+    )
+
+    tiktoken_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Bundled tiktoken encodings for prompt budgets (default: backend/tiktoken_cache); missing encodings fall back to the estimator, never a download"
+    )
+
     # Usage recommendations:
     # - verbosity="low" → for chat UI (concise responses)
     # - verbosity="high" → for research/analysis tasks (detailed responses)
@@ -128,6 +148,16 @@ class Settings(BaseSettings):
         pattern=r"^\d+/(second|minute|hour|day)$",
         description="Overall API rate limit"
     )
+
+    rate_limit_backend: Literal["memory", "redis"] = Field(
+        default="redis",
+        description="HTTP rate limit state: shared across workers in Redis (falls back to in-process while Redis is down) or per worker"
+    )
+
+    rate_limit_trusted_proxies: list[str] = Field(
+        default=["127.0.0.1/32", "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"],
+        description="Networks of reverse proxies (traefik) whose X-Forwarded-For is trusted for the rate limit client IP"
+    )
     
     # API
     api_host: str = Field(
@@ -162,6 +192,51 @@ class Settings(BaseSettings):
         default=10,
         description="Max number of overflow pool connections"
     )
+
+    db_pool_timeout: int = Field(
+        default=30,
+        description="Seconds to wait for a pooled connection before failing"
+    )
+
+    db_pool_split: bool = Field(
+        default=False,
+        description="Separate connection pools for bulk writes and analytics queries (otherwise all share the interactive pool)"
+    )
+
+    db_bulk_pool_size: int = Field(
+        default=3,
+        description="Pool size for bulk writes (checkpoints, execution logs, tracking)"
+    )
+
+    db_bulk_max_overflow: int = Field(
+        default=5,
+        description="Max overflow connections of the bulk write pool"
+    )
+
+    db_analytics_pool_size: int = Field(
+        default=2,
+        description="Pool size for long analytics/export queries"
+    )
+
+    db_analytics_max_overflow: int = Field(
+        default=2,
+        description="Max overflow connections of the analytics pool"
+    )
+
+    db_analytics_statement_timeout_ms: int = Field(
+        default=120000,
+        description="PostgreSQL statement_timeout for the analytics pool"
+    )
+
+    db_long_held_threshold_seconds: float = Field(
+        default=5.0,
+        description="Connections checked out longer than this are reported as long-held"
+    )
+
+    db_capture_checkout_stacks: Optional[bool] = Field(
+        default=None,
+        description="Capture the call stack on every connection checkout, shown for long-held connections (default: on in debug mode)"
+    )
     
     # Optional individual DB components (for building DATABASE_URL)
     db_host: Optional[str] = Field(
@@ -278,6 +353,70 @@ class Settings(BaseSettings):
         description="Redis cache time to live"
     )
 
+    # Metrics
+    metrics_enabled: bool = Field(
+        default=True,
+        description="Record request/DB/Redis/LLM/WebSocket metrics and expose them at /metrics (Prometheus text format)"
+    )
+
+    # Workflow node tracing
+    node_tracing_enabled: bool = Field(
+        default=True,
+        description="Record per-phase timing spans of workflow nodes (in-process, no collector needed)"
+    )
+
+    # Graceful shutdown (app.core.shutdown)
+    shutdown_drain_timeout_seconds: float = Field(
+        default=25.0,
+        description="On SIGTERM, how long running executions may finish before they are checkpointed and interrupted (keep below the container stop grace period)"
+    )
+    shutdown_interrupt_timeout_seconds: float = Field(
+        default=5.0,
+        description="Time interrupted executions get to write their checkpoint and status"
+    )
+    shutdown_reconnect_delay_ms: int = Field(
+        default=1000,
+        description="Reconnect hint sent to WebSocket clients when the server restarts"
+    )
+
+    # Event loop monitoring (app.core.loop_monitor)
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        description="Measure event loop lag with a heartbeat task (event_loop_lag_seconds)"
+    )
+    loop_monitor_interval_seconds: float = Field(
+        default=0.1,
+        description="Heartbeat interval of the event loop monitor"
+    )
+    loop_block_threshold_seconds: float = Field(
+        default=0.1,
+        description="Heartbeat lag from which the loop counts as blocked (logged and ranked by call site)"
+    )
+    loop_capture_blocking_stacks: Optional[bool] = Field(
+        default=None,
+        description="Capture the loop thread's stack while it is blocked (default: on in debug mode)"
+    )
+
+    # CPU offload (app.core.cpu_executor)
+    cpu_pool_workers: Optional[int] = Field(
+        default=None,
+        description="Worker processes for CPU-heavy aggregation/sampling (default: min(4, cores - 1); 0 = always inline)"
+    )
+    cpu_offload_min_items: int = Field(
+        default=20000,
+        description="Rows (records / extracted themes) from which sampling and theme aggregation run in the process pool instead of on the event loop"
+    )
+    cpu_offload_min_themes: int = Field(
+        default=300,
+        description="Theme list length from which the (quadratic) ShowResults theme merge runs in the process pool"
+    )
+
+    # Serialization
+    json_backend: Literal["auto", "orjson", "json"] = Field(
+        default="auto",
+        description="JSON library for state, checkpoints, WebSocket frames and API responses (auto = fastest installed)"
+    )
+
 
     # WebSocket
     heartbeat_timeout: int = Field(
@@ -288,6 +427,46 @@ class Settings(BaseSettings):
         default=300, # 5 minuted
         description="Seconds after which session is marked inactive by backend"
     )
+    websocket_send_timeout: float = Field(
+        default=5.0,
+        description="Seconds a single WebSocket send may take during broadcasts/health checks before the consumer is treated as stuck"
+    )
+    websocket_outbound_queue_size: int = Field(
+        default=256,
+        description="Pending frames per connection before the overflow policy applies"
+    )
+    websocket_overflow_policy: Literal["coalesce", "drop_stream", "disconnect"] = Field(
+        default="coalesce",
+        description="Slow consumers: coalesce progress + stream frames, only drop superseded stream frames, or disconnect on overflow"
+    )
+    websocket_binary_enabled: bool = Field(
+        default=True,
+        description="Allow clients to negotiate the binary MessagePack encoding (JSON stays the default)"
+    )
+    websocket_compress_threshold_bytes: int = Field(
+        default=1024,
+        description="Binary frames at least this large are deflated (result previews, batches)"
+    )
+    websocket_batch_max_concurrency: int = Field(
+        default=4,
+        description="Sub-requests of a WebSocket batch executed concurrently"
+    )
+    websocket_batch_share_read_session: bool = Field(
+        default=True,
+        description="Run the read-only sub-requests of a batch stage on one shared DB session"
+    )
+    websocket_fanout_backend: Literal["none", "memory", "redis"] = Field(
+        default="redis",
+        description="Cross-worker WebSocket delivery: redis pub/sub (required for more than one worker), memory (single process) or none"
+    )
+    websocket_offline_queue_size: int = Field(
+        default=100,
+        description="Messages kept per offline session until it reconnects (on any worker)"
+    )
+    websocket_offline_ttl_s: int = Field(
+        default=300,
+        description="Seconds an offline session's message queue is kept"
+    )
 
     # Session
     session_timeout_minutes: int = Field(
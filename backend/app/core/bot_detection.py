@@ -1,4 +1,6 @@
 """Bot detection utilities for filtering automated requests."""
+import re
+from functools import lru_cache
 from typing import Optional, Tuple
 
 # Known bot user agent patterns
@@ -17,10 +19,24 @@ BOT_USER_AGENT_PATTERNS = [
 ]
 
 # Suspicious screen resolutions (too old/common for automation)
-SUSPICIOUS_RESOLUTIONS = [
+SUSPICIOUS_RESOLUTIONS = frozenset({
     "800x600",
     "640x480",
-]
+})
+
+# All patterns in one precompiled automaton: a single pass over the user
+# agent instead of one substring scan per pattern
+_BOT_USER_AGENT_RE = re.compile(
+    "|".join(re.escape(pattern) for pattern in BOT_USER_AGENT_PATTERNS),
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=2048)
+def _match_bot_pattern(user_agent: str) -> Optional[str]:
+    """First bot pattern in the user agent (cached: user agents repeat a lot)"""
+    match = _BOT_USER_AGENT_RE.search(user_agent)
+    return match.group(0).lower() if match else None
 
 
 def is_bot_request(
@@ -41,13 +57,12 @@ def is_bot_request(
         return True, "Missing user agent"
     
     # Check user agent for bot patterns
-    user_agent_lower = user_agent.lower()
-    for pattern in BOT_USER_AGENT_PATTERNS:
-        if pattern in user_agent_lower:
-            return True, f"Bot pattern detected: {pattern}"
+    pattern = _match_bot_pattern(user_agent)
+    if pattern:
+        return True, f"Bot pattern detected: {pattern}"
     
     # Check for suspicious screen resolution
     if screen_resolution and screen_resolution in SUSPICIOUS_RESOLUTIONS:
         return True, f"Suspicious resolution: {screen_resolution}"
     
-    return False, None
\ No newline at end of file
+    return False, None
@@ -0,0 +1,173 @@
+"""Process pool for CPU-bound helpers (theme aggregation, sampling).
+
+Pure-Python aggregation over large inputs holds the event loop, and with
+it every other session's WebSocket traffic. ``cpu_executor.run()`` moves a
+kernel from ``app.core.cpu_tasks`` into a worker process once its input
+reaches ``cpu_offload_min_items`` rows (quadratic kernels pass their own
+``offload_from``); smaller inputs run inline (a pool round trip costs
+more than the work).
+
+Input is columnar: callers extract the few fields a kernel needs into
+columns (one sequence per field). Offloaded calls copy the int / float /
+str columns into one shared-memory segment, so workers read them without
+unpickling record dicts; other params are pickled as usual.
+
+Workers are started via ``forkserver`` (clean processes, no copy of the
+server's threads / sockets) and created lazily on first use.
+
+Usage:
+    indices = await cpu_executor.run(
+        stratified_sample_indices,
+        columns={'ratings': ratings, 'body_lengths': lengths},
+        target_count=100
+    )
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.configs.config import settings
+from app.core.cpu_tasks import ColumnLayout, encode_column, run_with_params, run_with_shared_columns
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CPU_TASK_DURATION = metrics.histogram(
+    'cpu_task_duration_seconds',
+    'CPU kernel duration (offloaded: including the pool round trip)',
+    ['task', 'mode']
+)
+
+_ALIGNMENT = 8
+
+
+class CpuExecutor:
+    """
+    Runs CPU kernels inline or in a process pool depending on input size
+
+    Args:
+        max_workers: Pool size (0 = never offload)
+        min_items: Rows from which a call is offloaded
+    """
+
+    def __init__(self, max_workers: int, min_items: int):
+        self.max_workers = max_workers
+        self.min_items = min_items
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {'inline': 0, 'offloaded': 0, 'fallbacks': 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['app.core.cpu_tasks'])
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            logger.info(f"CPU process pool started ({self.max_workers} workers)")
+        return self._pool
+
+    def should_offload(self, items: int, offload_from: Optional[int] = None) -> bool:
+        threshold = self.min_items if offload_from is None else offload_from
+        return self.max_workers > 0 and items >= threshold
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        columns: Optional[Dict[str, Sequence[Any]]] = None,
+        offload_from: Optional[int] = None,
+        **params: Any
+    ) -> Any:
+        """
+        fn(**columns, **params), offloaded when the largest column has at
+        least min_items rows (offload_from overrides it for kernels whose
+        cost is not linear in the rows). fn must be a module-level function
+        (picklable).
+        """
+        columns = columns or {}
+        items = max((len(values) for values in columns.values()), default=0)
+        task = fn.__name__
+
+        if self.should_offload(items, offload_from):
+            start = time.perf_counter()
+            try:
+                result = await self._run_in_pool(fn, columns, params)
+                self.stats['offloaded'] += 1
+                CPU_TASK_DURATION.labels(task, 'process').observe(time.perf_counter() - start)
+                return result
+            except BrokenProcessPool as e:
+                # A worker died (OOM kill etc.): recreate the pool next time, run inline now
+                logger.error(f"CPU process pool broken ({e}), running {task} inline")
+                self._pool = None
+                self.stats['fallbacks'] += 1
+
+        start = time.perf_counter()
+        result = fn(**columns, **params)
+        self.stats['inline'] += 1
+        CPU_TASK_DURATION.labels(task, 'inline').observe(time.perf_counter() - start)
+        return result
+
+    async def _run_in_pool(
+        self,
+        fn: Callable[..., Any],
+        columns: Dict[str, Sequence[Any]],
+        params: Dict[str, Any]
+    ) -> Any:
+        layout: List[ColumnLayout] = []
+        chunks: List[bytes] = []
+        offset = 0
+        pickled: Dict[str, Any] = {}
+
+        for name, values in columns.items():
+            encoded = encode_column(values)
+            if encoded is None:
+                pickled[name] = list(values)
+                continue
+            kind, data = encoded
+            layout.append((name, kind, offset, len(data), len(values)))
+            padding = -len(data) % _ALIGNMENT
+            chunks.append(data + b'\0' * padding)
+            offset += len(data) + padding
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if not layout:
+            return await loop.run_in_executor(pool, run_with_params, fn, {**pickled, **params})
+
+        shm = SharedMemory(create=True, size=max(offset, 1))
+        try:
+            shm.buf[:offset] = b''.join(chunks)
+            return await loop.run_in_executor(
+                pool, run_with_shared_columns, fn, shm.name, layout, {**pickled, **params}
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_workers': self.max_workers,
+            'min_items': self.min_items,
+            'pool_started': self._pool is not None,
+            **self.stats
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _default_workers() -> int:
+    if settings.cpu_pool_workers is not None:
+        return settings.cpu_pool_workers
+    return min(4, max(1, (os.cpu_count() or 2) - 1))
+
+
+cpu_executor = CpuExecutor(
+    max_workers=_default_workers(),
+    min_items=settings.cpu_offload_min_items
+)
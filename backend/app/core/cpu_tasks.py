@@ -0,0 +1,365 @@
+# backend/app/core/cpu_tasks.py
+"""
+CPU-bound kernels and the worker-side entry point of the CPU executor
+
+Everything here runs inside the process pool (see app.core.cpu_executor),
+so this module must only import the standard library: worker processes
+import it on first use and should not pull in the app (settings, DB,
+LangChain).
+
+Kernels take columns (plain sequences, one value per row) instead of
+lists of record dicts, so large inputs can be passed through shared
+memory without pickling every record. They return plain Python objects.
+
+Column encodings in shared memory:
+    'q'  int64 array
+    'd'  float64 array
+    's'  utf-8 strings: int64 end offsets (one per row) followed by the
+         concatenated bytes
+"""
+import math
+import random
+from array import array
+from collections import Counter
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# (name, kind, offset, nbytes, rows)
+ColumnLayout = Tuple[str, str, int, int, int]
+
+
+# ============================================================
+# SHARED MEMORY COLUMNS
+# ============================================================
+
+def encode_column(values: Sequence[Any]) -> Optional[Tuple[str, bytes]]:
+    """Column -> (kind, bytes), or None if it has no fixed encoding (then it is pickled)"""
+    if not values:
+        return None
+    first = values[0]
+    try:
+        if isinstance(first, bool):
+            return None
+        if isinstance(first, int):
+            return 'q', array('q', values).tobytes()
+        if isinstance(first, float):
+            return 'd', array('d', values).tobytes()
+        if isinstance(first, str):
+            encoded = [value.encode('utf-8') for value in values]
+            ends = array('q')
+            position = 0
+            for item in encoded:
+                position += len(item)
+                ends.append(position)
+            return 's', ends.tobytes() + b''.join(encoded)
+    except (TypeError, AttributeError, OverflowError):
+        return None
+    return None
+
+
+def decode_column(buffer: memoryview, kind: str, offset: int, nbytes: int, rows: int) -> List[Any]:
+    view = buffer[offset:offset + nbytes]
+    try:
+        if kind in ('q', 'd'):
+            return view.cast(kind).tolist()
+        ends_size = rows * 8
+        ends = view[:ends_size].cast('q').tolist()
+        blob = bytes(view[ends_size:])
+        values = []
+        start = 0
+        for end in ends:
+            values.append(blob[start:end].decode('utf-8'))
+            start = end
+        return values
+    finally:
+        view.release()
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    Attach without taking ownership: the executor unlinks the segment.
+    Pool workers share the server's resource tracker (forkserver passes it
+    on), so on Python < 3.13 the re-registration is a no-op there.
+    """
+    try:
+        return SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def run_with_params(fn: Callable[..., Any], params: Dict[str, Any]) -> Any:
+    """Worker entry point for calls without shared columns"""
+    return fn(**params)
+
+
+def run_with_shared_columns(
+    fn: Callable[..., Any],
+    shm_name: str,
+    layout: List[ColumnLayout],
+    params: Dict[str, Any]
+) -> Any:
+    """Worker entry point: decode the shared columns and call fn(**columns, **params)"""
+    shm = _attach(shm_name)
+    try:
+        columns = {
+            name: decode_column(shm.buf, kind, offset, nbytes, rows)
+            for name, kind, offset, nbytes, rows in layout
+        }
+    finally:
+        shm.close()
+    return fn(**columns, **params)
+
+
+# ============================================================
+# KERNELS
+# ============================================================
+
+def stratified_sample_indices(
+    ratings: Sequence[int],
+    body_lengths: Sequence[int],
+    target_count: int,
+    seed: Optional[int] = None
+) -> List[int]:
+    """
+    Sample row indices maintaining rating and length distributions.
+    Stratification: Rating x Length; prioritizes rows with above-average
+    body length (avoids "Works." type reviews)
+    """
+    rng = random.Random(seed)
+    total = len(ratings)
+    if not total:
+        return []
+
+    avg_length = sum(body_lengths) / total
+
+    # Group by: rating and length (prioritize long reviews)
+    long_groups: Dict[Any, List[int]] = {}
+    short_groups: Dict[Any, List[int]] = {}
+    for index, (rating, length) in enumerate(zip(ratings, body_lengths)):
+        groups = long_groups if length >= avg_length else short_groups
+        group = groups.get(rating)
+        if group is None:
+            group = groups[rating] = []
+        group.append(index)
+
+    # Calculate allocation per rating
+    allocations = []
+    total_allocated = 0
+    for rating in set(long_groups) | set(short_groups):
+        long_rows = long_groups.get(rating, [])
+        short_rows = short_groups.get(rating, [])
+        proportion = (len(long_rows) + len(short_rows)) / total
+        ideal_size = target_count * proportion
+        allocated = math.floor(ideal_size)
+        allocations.append({
+            'long': long_rows,
+            'short': short_rows,
+            'allocated': allocated,
+            'remainder': ideal_size - allocated
+        })
+        total_allocated += allocated
+
+    # Distribute remaining slots
+    remaining = target_count - total_allocated
+    allocations.sort(key=lambda x: x['remainder'], reverse=True)
+    for i in range(remaining):
+        if i < len(allocations):
+            allocation = allocations[i]
+            if allocation['allocated'] < len(allocation['long']) + len(allocation['short']):
+                allocation['allocated'] += 1
+
+    # Sample from each rating group (long rows first)
+    sampled: List[int] = []
+    for allocation in allocations:
+        long_rows, short_rows, needed = allocation['long'], allocation['short'], allocation['allocated']
+        if needed == 0:
+            continue
+        if len(long_rows) >= needed:
+            sampled.extend(rng.sample(long_rows, needed))
+        else:
+            sampled.extend(long_rows)
+            remaining_needed = needed - len(long_rows)
+            if remaining_needed > 0 and short_rows:
+                sampled.extend(rng.sample(short_rows, min(remaining_needed, len(short_rows))))
+
+    rng.shuffle(sampled)
+    return sampled[:target_count]
+
+
+def _format_themes_weighted(
+    weighted_theme_scores: Counter,
+    review_ids: Dict[str, set],
+    max_count: int,
+    total_reviews: int
+) -> List[Dict[str, Any]]:
+    formatted = []
+    for theme, weighted_score in weighted_theme_scores.most_common(max_count):
+        review_count = len(review_ids[theme])
+        percentage = (review_count / total_reviews * 100) if total_reviews > 0 else 0
+        formatted.append({
+            'theme': theme,
+            'weighted_score': weighted_score,
+            'review_count': review_count,
+            'percentage': round(percentage, 2),
+        })
+    return formatted
+
+
+def aggregate_review_themes(
+    review_ids: Sequence[Any],
+    theme_rows: Sequence[int],
+    theme_topics: Sequence[str],
+    theme_importance: Sequence[float],
+    theme_sentiment: Sequence[float],
+    theme_separation: str,
+    max_themes_per_category: int,
+    weight_alpha: float,
+    weight_scaling: float
+) -> Dict[str, Any]:
+    """
+    Aggregate extracted themes across reviews (weighted by importance)
+
+    Columns: one entry per review (review_ids) and one entry per extracted
+    theme (theme_*), theme_rows pointing at the review. Weight per theme
+    mention: weight_alpha + importance / weight_scaling; a theme counts
+    once per review.
+    """
+    total_reviews = len(review_ids)
+    by_sentiment = theme_separation == 'by_sentiment'
+
+    buckets = ('positive', 'neutral', 'negative') if by_sentiment else ('all',)
+    scores: Dict[str, Dict[str, float]] = {bucket: {} for bucket in buckets}
+    ids: Dict[str, Dict[str, set]] = {bucket: {} for bucket in buckets}
+    # Reviews with at least one theme of that sentiment (percentage base)
+    reviews_with: Dict[str, set] = {bucket: set() for bucket in buckets}
+
+    current_row = -1
+    seen_in_review: set = set()
+    for row, topic, importance, sentiment in zip(theme_rows, theme_topics, theme_importance, theme_sentiment):
+        if row != current_row:
+            current_row = row
+            seen_in_review = set()
+
+        if by_sentiment:
+            if sentiment >= 5:
+                bucket = 'positive'
+            elif sentiment <= 2:
+                bucket = 'negative'
+            else:
+                bucket = 'neutral'
+            if sentiment >= 5 or sentiment <= 2 or sentiment in (3, 4):
+                reviews_with[bucket].add(row)
+        else:
+            bucket = 'all'
+
+        theme_lower = topic.lower()
+        if theme_lower in seen_in_review:
+            continue
+        seen_in_review.add(theme_lower)
+
+        weight = weight_alpha + (importance / weight_scaling)
+        bucket_scores = scores[bucket]
+        if theme_lower not in bucket_scores:
+            bucket_scores[theme_lower] = 0
+            ids[bucket][theme_lower] = set()
+        bucket_scores[theme_lower] += weight
+        ids[bucket][theme_lower].add(review_ids[row])
+
+    if not by_sentiment:
+        return {
+            'type': 'combined',
+            'themes': _format_themes_weighted(
+                Counter(scores['all']), ids['all'], max_themes_per_category, total_reviews
+            )
+        }
+
+    result: Dict[str, Any] = {'type': 'by_sentiment'}
+    for bucket in buckets:
+        base = len(reviews_with[bucket]) or total_reviews
+        result[f'{bucket}_themes'] = _format_themes_weighted(
+            Counter(scores[bucket]), ids[bucket], max_themes_per_category, base
+        )
+    return result
+
+
+def merge_theme_list(
+    theme_names: Sequence[str],
+    weighted_scores: Sequence[float],
+    review_counts: Sequence[int],
+    total_records: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge themes whose normalized names match (same parts in any order, or
+    one a subset of the other), keeping the more specific name; adds
+    percentages within the list and projected counts for total_records.
+    """
+    parts_cache: Dict[str, frozenset] = {}
+
+    def get_theme_parts(theme: str) -> frozenset:
+        parts = parts_cache.get(theme)
+        if parts is None:
+            parts = parts_cache[theme] = frozenset(
+                part.strip().lower() for part in theme.split('/') if part.strip()
+            )
+        return parts
+
+    def normalize_theme_name(theme: str) -> str:
+        normalized = theme.replace('|', '/').replace(',', '/').replace(';', '/').replace('\\', '/')
+        return '/'.join(part.strip() for part in normalized.split('/')).lower()
+
+    aggregated: Dict[str, Dict[str, Any]] = {}
+    for name, weighted_score, review_count in zip(theme_names, weighted_scores, review_counts):
+        if not name:
+            continue
+        normalized = normalize_theme_name(name)
+        parts = get_theme_parts(normalized)
+
+        matching_key = None
+        for key in aggregated:
+            key_parts = get_theme_parts(key)
+            if parts == key_parts or parts <= key_parts or key_parts <= parts:
+                matching_key = key
+                break
+
+        if matching_key is None:
+            aggregated[normalized] = {
+                'theme': normalized,
+                'weighted_score': weighted_score,
+                'review_count': review_count,
+            }
+            continue
+
+        key_parts = get_theme_parts(matching_key)
+        if parts == key_parts:
+            merged_name = '/'.join(sorted(parts))
+        elif len(parts) >= len(key_parts):
+            merged_name = normalized
+        else:
+            merged_name = matching_key
+
+        if merged_name != matching_key:
+            old = aggregated.pop(matching_key)
+            aggregated[merged_name] = {
+                'theme': merged_name,
+                'weighted_score': old['weighted_score'] + weighted_score,
+                'review_count': old['review_count'] + review_count,
+            }
+        else:
+            aggregated[matching_key]['weighted_score'] += weighted_score
+            aggregated[matching_key]['review_count'] += review_count
+
+    result = list(aggregated.values())
+    if result:
+        total_in_group = sum(theme['review_count'] for theme in result)
+        for theme in result:
+            if total_in_group > 0:
+                theme['percentage'] = round((theme['review_count'] / total_in_group) * 100, 2)
+                if total_records and total_records > 0:
+                    theme['estimated_total_count'] = round((theme['percentage'] / 100) * total_records)
+            else:
+                theme['percentage'] = 0.0
+                if total_records:
+                    theme['estimated_total_count'] = 0
+
+    result.sort(key=lambda x: x['weighted_score'], reverse=True)
+    return result
@@ -0,0 +1,181 @@
+"""Connection pool instrumentation via SQLAlchemy pool events.
+
+Attached to every engine created in ``app.database``. Tracks, per pool:
+
+- checkout wait time      (``db_pool_checkout_wait_seconds``, recorded by
+                           ``InstrumentedQueuePool`` in app.database)
+- in-use / overflow       (``db_pool_checked_out``, ``db_pool_overflow``)
+- connection hold time    (``db_connection_hold_seconds``)
+- long-held connections   (``db_long_held_connections_total``), logged with
+                          the stack that checked the connection out (stack
+                          capture walks the stack on every checkout, so it
+                          is on in debug mode only by default)
+
+Sync SQLAlchemy calls from async code borrow a pool connection for the
+whole ``with get_db_context()`` block; a handler that holds one across a
+slow await starves the pool and shows up here as a long hold.
+
+Usage:
+    pool_monitor.attach(engine, 'interactive')
+    pool_monitor.get_pool_stats()     # GET /api/monitoring/db-pools
+"""
+import logging
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, event
+
+from app.configs.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_CONNECTION_HOLD = metrics.histogram(
+    'db_connection_hold_seconds',
+    'Time a database connection stayed checked out',
+    ['pool']
+)
+
+DB_LONG_HELD_CONNECTIONS = metrics.counter(
+    'db_long_held_connections_total',
+    'Connections returned after exceeding the long-hold threshold',
+    ['pool']
+)
+
+_CHECKOUT_INFO_KEY = 'pool_monitor_checkout'
+
+# Captured stacks keep the innermost application frames (SQLAlchemy frames dropped)
+_STACK_LIMIT = 15
+
+
+def _capture_stack() -> traceback.StackSummary:
+    frames = [
+        frame for frame in traceback.extract_stack(limit=_STACK_LIMIT * 4)[:-2]
+        if '/sqlalchemy/' not in frame.filename.replace('\\', '/') and frame.filename != '<string>'
+    ]
+    return traceback.StackSummary.from_list(frames[-_STACK_LIMIT:])
+
+
+class PoolMonitor:
+    """
+    Per-pool checkout tracking
+
+    Args:
+        long_held_threshold_s: Hold time after which a connection counts as long-held
+        capture_stacks: Capture the checkout stack (reported for long holds)
+    """
+
+    def __init__(self, long_held_threshold_s: float = 5.0, capture_stacks: bool = False):
+        self.long_held_threshold_s = long_held_threshold_s
+        self.capture_stacks = capture_stacks
+
+        self._engines: Dict[str, Engine] = {}
+        # id(connection_record) -> checkout info of currently checked-out connections
+        self._live: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine, pool_name: str) -> None:
+        """Register pool events and gauges for an engine (once per pool name)"""
+        if pool_name in self._engines:
+            return
+        self._engines[pool_name] = engine
+
+        event.listen(engine, 'checkout', self._make_checkout_listener(pool_name))
+        event.listen(engine, 'checkin', self._on_checkin)
+
+        metrics.gauge(
+            'db_pool_checked_out', 'Database connections currently in use', ['pool']
+        ).labels(pool_name).set_function(lambda: engine.pool.checkedout())
+        metrics.gauge(
+            'db_pool_overflow', 'Database connections opened beyond pool_size', ['pool']
+        ).labels(pool_name).set_function(lambda: max(engine.pool.overflow(), 0))
+        metrics.gauge(
+            'db_pool_size', 'Configured pool_size', ['pool']
+        ).labels(pool_name).set_function(lambda: engine.pool.size())
+
+    def _make_checkout_listener(self, pool_name: str):
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            info = {
+                'pool': pool_name,
+                'since': time.perf_counter(),
+                'checked_out_at': time.time(),
+                'thread': threading.current_thread().name,
+                'stack': _capture_stack() if self.capture_stacks else None,
+            }
+            connection_record.info[_CHECKOUT_INFO_KEY] = info
+            with self._lock:
+                self._live[id(connection_record)] = info
+        return on_checkout
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        info = connection_record.info.pop(_CHECKOUT_INFO_KEY, None)
+        with self._lock:
+            self._live.pop(id(connection_record), None)
+        if info is None:
+            return
+
+        held_s = time.perf_counter() - info['since']
+        DB_CONNECTION_HOLD.labels(info['pool']).observe(held_s)
+
+        if held_s >= self.long_held_threshold_s:
+            DB_LONG_HELD_CONNECTIONS.labels(info['pool']).inc()
+            logger.warning(
+                f"Long-held DB connection: pool={info['pool']} held={held_s:.2f}s "
+                f"thread={info['thread']}\n{self._format_stack(info)}"
+            )
+
+    @staticmethod
+    def _format_stack(info: Dict[str, Any]) -> str:
+        if not info.get('stack'):
+            return '(stack capture disabled)'
+        return ''.join(traceback.format_list(info['stack']))
+
+    def get_long_held(self, threshold_s: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Connections checked out longer than threshold_s right now"""
+        threshold_s = self.long_held_threshold_s if threshold_s is None else threshold_s
+        now = time.perf_counter()
+        with self._lock:
+            live = list(self._live.values())
+
+        held = [
+            {
+                'pool': info['pool'],
+                'held_s': round(now - info['since'], 3),
+                'checked_out_at': info['checked_out_at'],
+                'thread': info['thread'],
+                'stack': self._format_stack(info),
+            }
+            for info in live if now - info['since'] >= threshold_s
+        ]
+        return sorted(held, key=lambda entry: -entry['held_s'])
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Usage of every attached pool plus currently long-held connections"""
+        pools = {}
+        for pool_name, engine in self._engines.items():
+            pool = engine.pool
+            pools[pool_name] = {
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'max_overflow': getattr(pool, '_max_overflow', None),
+                'timeout_s': getattr(pool, '_timeout', None),
+            }
+        return {
+            'pools': pools,
+            'long_held_threshold_s': self.long_held_threshold_s,
+            'long_held': self.get_long_held(),
+        }
+
+
+# Global monitor (attached to the engines in app.database)
+pool_monitor = PoolMonitor(
+    long_held_threshold_s=settings.db_long_held_threshold_seconds,
+    capture_stacks=(
+        settings.debug if settings.db_capture_checkout_stacks is None
+        else settings.db_capture_checkout_stacks
+    )
+)
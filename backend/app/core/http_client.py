@@ -0,0 +1,84 @@
+"""Application-scoped HTTP client pool for upstream (OpenAI) requests.
+
+One ``httpx.AsyncClient`` is created in the FastAPI lifespan and shared by
+all requests, so TLS handshakes and TCP connections are reused via
+keep-alive. HTTP/2 is enabled when the optional ``h2`` package is installed.
+"""
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Pool limits (per worker process)
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# Per-request timeouts are still passed explicitly by callers
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support requires the optional 'h2' package"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called once from the app lifespan)"""
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        return _http_client
+
+    http2 = _http2_available()
+    _http_client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=DEFAULT_TIMEOUT,
+    )
+    logger.info(f"Shared HTTP client initialized (http2={http2})")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Shared HTTP client closed")
+
+
+def get_http_client() -> Optional[httpx.AsyncClient]:
+    """Get the shared client, or None if the lifespan has not created it"""
+    if _http_client is None or _http_client.is_closed:
+        return None
+    return _http_client
+
+
+@asynccontextmanager
+async def http_client_session() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Borrow the shared client for a block of requests.
+
+    Falls back to a short-lived client (closed on exit) when no shared
+    client exists, e.g. in scripts that do not run the app lifespan.
+    """
+    client = get_http_client()
+    if client is not None:
+        yield client
+        return
+
+    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as temp_client:
+        yield temp_client
@@ -0,0 +1,309 @@
+"""Event loop lag measurement and blocking-call detection.
+
+A heartbeat task sleeps ``interval_s`` and measures how late it wakes up:
+that lateness is the time the loop spent in callbacks that did not yield
+(sync SQLAlchemy / redis-py calls, file logging, CPU work). Recorded as
+
+- ``event_loop_lag_seconds``          (histogram, every heartbeat)
+- ``event_loop_blocked_total``        (heartbeats later than threshold_s)
+- ``event_loop_blocked_seconds_total``
+
+With stack capture (on in debug mode) a watchdog thread checks whether the
+current heartbeat is overdue by threshold_s; if so the loop is blocked
+*right now*, and the stack of the loop thread is the code holding it. The
+block is attributed to the innermost application frame of that stack
+(the blocking call site) and ranked by total blocked time.
+
+Usage:
+    loop_monitor.start()               # in the lifespan (running loop)
+    loop_monitor.get_stats()           # GET /api/monitoring/event-loop
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.configs.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = metrics.histogram(
+    'event_loop_lag_seconds',
+    'Heartbeat lateness of the asyncio event loop',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+LOOP_BLOCKED = metrics.counter(
+    'event_loop_blocked_total',
+    'Heartbeats delayed beyond the blocking threshold'
+)
+
+LOOP_BLOCKED_SECONDS = metrics.counter(
+    'event_loop_blocked_seconds_total',
+    'Event loop time lost to blocks beyond the threshold'
+)
+
+_STACK_LIMIT = 15
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _relative(filename: str) -> str:
+    if filename.startswith(_APP_DIR):
+        return 'app' + filename[len(_APP_DIR):].replace('\\', '/')
+    return filename
+
+
+def _blocking_site(stack: traceback.StackSummary) -> str:
+    """Innermost application frame (the call site that blocked), else the innermost frame"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_APP_DIR) and frame.filename != _THIS_FILE:
+            return f"{_relative(frame.filename)}:{frame.lineno} {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} {frame.name}"
+    return 'unknown'
+
+
+class LoopMonitor:
+    """
+    Heartbeat lag measurement plus (optional) blocking stack capture
+
+    Args:
+        interval_s: Heartbeat interval
+        threshold_s: Lag from which a heartbeat counts as a block
+        capture_stacks: Capture the loop thread's stack while it is blocked
+        max_offenders: Blocking sites kept for ranking (least blocking evicted)
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 0.1,
+        threshold_s: float = 0.1,
+        capture_stacks: bool = False,
+        max_offenders: int = 100
+    ):
+        self.interval_s = interval_s
+        self.threshold_s = threshold_s
+        self.capture_stacks = capture_stacks
+        self.max_offenders = max_offenders
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        # (sequence, perf_counter) of the current heartbeat; one tuple so the
+        # watchdog reads both atomically
+        self._beat = (0, time.perf_counter())
+        self._captured_seq = 0
+        self._pending: Optional[Dict[str, Any]] = None
+
+        self._recent = deque(maxlen=600)
+        self._offenders: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'blocks': 0, 'blocked_s': 0.0, 'max_lag_s': 0.0}
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    def start(self):
+        """Start the heartbeat (and watchdog); must be called from the running loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._task = self._loop.create_task(self._heartbeat(), name='loop-monitor')
+
+        if self.capture_stacks:
+            self._watchdog = threading.Thread(target=self._watch, name='loop-monitor-watchdog', daemon=True)
+            self._watchdog.start()
+
+        logger.info(
+            f"Event loop monitor started (interval {self.interval_s * 1000:.0f}ms, "
+            f"threshold {self.threshold_s * 1000:.0f}ms, stacks {'on' if self.capture_stacks else 'off'})"
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    # ============================================================
+    # MEASUREMENT
+    # ============================================================
+
+    async def _heartbeat(self):
+        sequence = 0
+        while True:
+            sequence += 1
+            started = time.perf_counter()
+            self._beat = (sequence, started)
+            await asyncio.sleep(self.interval_s)
+
+            lag = max(0.0, time.perf_counter() - started - self.interval_s)
+            LOOP_LAG.observe(lag)
+            self._recent.append(lag)
+            if lag > self.stats['max_lag_s']:
+                self.stats['max_lag_s'] = lag
+            if lag >= self.threshold_s:
+                self._record_block(sequence, lag)
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack while a heartbeat is overdue"""
+        poll_s = min(self.interval_s, self.threshold_s) / 2
+        while not self._stopping.wait(poll_s):
+            sequence, started = self._beat
+            overdue = time.perf_counter() - started - self.interval_s
+            if overdue < self.threshold_s or sequence == self._captured_seq:
+                continue
+            self._captured_seq = sequence
+            capture = self._capture()
+            if capture is not None:
+                with self._lock:
+                    self._pending = {'seq': sequence, **capture}
+
+    def _capture(self) -> Optional[Dict[str, Any]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.StackSummary.from_list(
+            traceback.extract_stack(frame, limit=_STACK_LIMIT * 4)[-_STACK_LIMIT:]
+        )
+        del frame
+
+        task_name = coroutine = None
+        try:
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                task_name = task.get_name()
+                coroutine = getattr(task.get_coro(), '__qualname__', None)
+        except RuntimeError:
+            pass
+
+        return {
+            'site': _blocking_site(stack),
+            'call': f"{_relative(stack[-1].filename)}:{stack[-1].lineno} {stack[-1].name}" if stack else None,
+            'task': task_name,
+            'coroutine': coroutine,
+            'stack': ''.join(traceback.format_list(stack)),
+        }
+
+    def _record_block(self, sequence: int, lag: float):
+        LOOP_BLOCKED.inc()
+        LOOP_BLOCKED_SECONDS.inc(lag)
+        self.stats['blocks'] += 1
+        self.stats['blocked_s'] += lag
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+        capture = pending if pending is not None and pending['seq'] == sequence else None
+
+        if capture is None:
+            site = 'unattributed' if self.capture_stacks else '(stack capture disabled)'
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms ({site})")
+            self._add_offender(site, lag, None)
+            return
+
+        logger.warning(
+            f"Event loop blocked for {lag * 1000:.0f}ms at {capture['site']} "
+            f"(task={capture['task']} coroutine={capture['coroutine']})\n{capture['stack']}"
+        )
+        self._add_offender(capture['site'], lag, capture)
+
+    def _add_offender(self, site: str, lag: float, capture: Optional[Dict[str, Any]]):
+        with self._lock:
+            offender = self._offenders.get(site)
+            if offender is None:
+                if len(self._offenders) >= self.max_offenders:
+                    least = min(self._offenders, key=lambda key: self._offenders[key]['total_blocked_s'])
+                    del self._offenders[least]
+                offender = self._offenders[site] = {
+                    'site': site,
+                    'count': 0,
+                    'total_blocked_s': 0.0,
+                    'max_blocked_s': 0.0,
+                    'call': None,
+                    'task': None,
+                    'coroutine': None,
+                    'stack': None,
+                }
+            offender['count'] += 1
+            offender['total_blocked_s'] += lag
+            offender['last_seen'] = time.time()
+            if capture is not None and lag >= offender['max_blocked_s']:
+                # Keep the stack of the longest block
+                for key in ('call', 'task', 'coroutine', 'stack'):
+                    offender[key] = capture[key]
+            offender['max_blocked_s'] = max(offender['max_blocked_s'], lag)
+
+    # ============================================================
+    # REPORTING
+    # ============================================================
+
+    def get_offenders(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Blocking sites ranked by total blocked time"""
+        with self._lock:
+            offenders = [dict(offender) for offender in self._offenders.values()]
+        offenders.sort(key=lambda offender: -offender['total_blocked_s'])
+        for offender in offenders:
+            offender['total_blocked_s'] = round(offender['total_blocked_s'], 4)
+            offender['max_blocked_s'] = round(offender['max_blocked_s'], 4)
+        return offenders[:limit]
+
+    def get_stats(self, limit: int = 20) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+        lag_ms = {}
+        if recent:
+            lag_ms = {
+                'last': round(self._recent[-1] * 1000, 2),
+                'p50': round(statistics.median(recent) * 1000, 2),
+                'p99': round(recent[min(len(recent) - 1, int(len(recent) * 0.99))] * 1000, 2),
+                'max_recent': round(recent[-1] * 1000, 2),
+            }
+        return {
+            'running': self._task is not None,
+            'interval_ms': self.interval_s * 1000,
+            'threshold_ms': self.threshold_s * 1000,
+            'capture_stacks': self.capture_stacks,
+            'lag_ms': lag_ms,
+            'max_lag_ms': round(self.stats['max_lag_s'] * 1000, 2),
+            'blocks': self.stats['blocks'],
+            'blocked_s': round(self.stats['blocked_s'], 3),
+            'offenders': self.get_offenders(limit),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._offenders.clear()
+        self._recent.clear()
+        self.stats = {'blocks': 0, 'blocked_s': 0.0, 'max_lag_s': 0.0}
+
+
+# Global monitor (started in the application lifespan)
+loop_monitor = LoopMonitor(
+    interval_s=settings.loop_monitor_interval_seconds,
+    threshold_s=settings.loop_block_threshold_seconds,
+    capture_stacks=(
+        settings.debug if settings.loop_capture_blocking_stacks is None
+        else settings.loop_capture_blocking_stacks
+    )
+)
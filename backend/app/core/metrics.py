@@ -0,0 +1,401 @@
+"""Process-wide metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms are registered once at import time and
+updated from hot paths (HTTP middleware, DB pool, Redis client, LLM proxy,
+WebSocket batching). ``GET /metrics`` renders them in the Prometheus text
+format (version 0.0.4), so any Prometheus-compatible scraper can collect
+them without an extra dependency.
+
+Instruments are lock-free: every thread writes its own shard (created once
+per thread via an atomic ``dict.setdefault``) and shards are summed at
+scrape time. Writers never contend; a scrape may be a few increments
+behind, which is fine for monitoring.
+
+Usage:
+    REQUESTS = metrics.counter('app_requests_total', 'Requests', ['route'])
+    REQUESTS.labels('/api/reviews').inc()
+
+    LATENCY = metrics.histogram('app_latency_seconds', 'Latency')
+    LATENCY.observe(0.012)
+
+    metrics.gauge('app_queue_depth', 'Queued items').set_function(lambda: len(queue))
+"""
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond Redis calls up to slow LLM responses
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+# ============================================================
+# INSTRUMENT CHILDREN (one per label combination)
+# ============================================================
+
+class _CounterChild:
+    __slots__ = ('_shards',)
+
+    def __init__(self):
+        self._shards: Dict[int, List[float]] = {}
+
+    def inc(self, amount: float = 1.0) -> None:
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(threading.get_ident(), [0.0])
+        shard[0] += amount
+
+    def value(self) -> float:
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+
+class _GaugeChild:
+    __slots__ = ('_value', '_function')
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value at scrape time (queue depths, pool usage, ...)"""
+        self._function = function
+
+    def value(self) -> float:
+        if self._function is None:
+            return self._value
+        try:
+            return float(self._function())
+        except Exception as e:
+            logger.debug(f"Gauge callback failed: {e}")
+            return math.nan
+
+
+class _HistogramChild:
+    __slots__ = ('_buckets', '_shards')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._shards: Dict[int, List[float]] = {}
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            # [bucket counts..., +Inf count, sum]
+            shard = self._shards.setdefault(threading.get_ident(), [0] * (len(self._buckets) + 1) + [0.0])
+        shard[bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> '_Timer':
+        """Context manager observing the elapsed seconds"""
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        counts = [0] * (len(self._buckets) + 1)
+        total = 0.0
+        for shard in list(self._shards.values()):
+            for index in range(len(counts)):
+                counts[index] += shard[index]
+            total += shard[-1]
+        return counts, total
+
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+# ============================================================
+# INSTRUMENTS
+# ============================================================
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._children.setdefault((), self._new_child())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **kwargs: str):
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value())}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value())}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.buckets: Tuple[float, ...] = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ============================================================
+# REGISTRY
+# ============================================================
+
+class MetricsRegistry:
+    """Named instruments; registering a name twice returns the existing one"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()  # registration only, never on updates
+
+    def _register(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_class):
+                    raise ValueError(f"Metric {name} already registered as {existing.type_name}")
+                return existing
+            metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Global registry
+metrics = MetricsRegistry()
+
+
+# ============================================================
+# SHARED INSTRUMENTS
+# ============================================================
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ['method', 'route', 'status']
+)
+
+DB_POOL_CHECKOUT_WAIT = metrics.histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for a database connection from the pool',
+    ['pool']
+)
+
+REDIS_COMMAND_DURATION = metrics.histogram(
+    'redis_command_duration_seconds',
+    'Redis round-trip latency by command',
+    ['command']
+)
+
+LLM_REQUEST_DURATION = metrics.histogram(
+    'llm_request_duration_seconds',
+    'LLM call latency by tool',
+    ['tool', 'outcome']
+)
+
+LLM_TOKENS = metrics.counter(
+    'llm_tokens_total',
+    'LLM tokens used by tool',
+    ['tool', 'kind']
+)
+
+WEBSOCKET_BATCH_SIZE = metrics.histogram(
+    'websocket_batch_size_messages',
+    'Messages per flushed WebSocket batch',
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+
+
+# ============================================================
+# INSTRUMENTED CLIENTS / MIDDLEWARE
+# ============================================================
+
+class InstrumentedRedis(redis.Redis):
+    """redis.Redis that records every command round trip"""
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            command = str(args[0]).upper() if args else 'UNKNOWN'
+            REDIS_COMMAND_DURATION.labels(command).observe(time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording HTTP request latency
+
+    Labels use the matched route template (e.g. /api/reviews/{category}),
+    not the raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            HTTP_REQUEST_DURATION.labels(
+                scope.get('method', ''),
+                getattr(route, 'path', None) or 'unmatched',
+                str(status['code'])
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,367 @@
+"""Rate limiting (GCRA) for HTTP routes and WebSocket messages.
+
+One algorithm, two backends:
+
+- ``memory`` - in-process dict, per worker; used by the WebSocket message
+  gate (a connection is pinned to one worker, no round trip per frame)
+- ``redis``  - shared across workers via one Lua script (``EVALSHA`` on the
+  asyncio client, so a slow Redis never blocks the event loop), the clock
+  is Redis ``TIME`` so workers never disagree; falls back to the
+  in-process backend while Redis is unreachable (fail open, not closed)
+
+GCRA (generic cell rate algorithm) stores a single "theoretical arrival
+time" per key: ``limit`` requests per ``period`` with a burst of ``limit``,
+i.e. the same budget as a fixed window but without the double burst at
+window boundaries.
+
+HTTP clients are keyed by IP, taken from ``X-Forwarded-For`` when the peer
+is a trusted proxy (traefik). Client-supplied identifiers (session_id
+parameters or headers) are never used as keys: a fresh value per request
+would bypass the limit.
+
+Usage:
+    rate = Rate.parse('20/minute')
+    result = await rate_limiter.hit_async(f'chat:{session_id}', rate)
+    if not result.allowed:
+        retry_after = result.retry_after_s
+
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, rules=default_http_rules())
+"""
+import ipaddress
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.configs.config import settings
+from app.core import serialization
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_REJECTIONS = metrics.counter(
+    'rate_limit_rejections_total',
+    'Requests / messages rejected by the rate limiter',
+    ['scope']
+)
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+class Rate:
+    """``limit`` requests per ``period_s`` (burst = limit)"""
+
+    __slots__ = ('limit', 'period_s', 'interval_s', 'tolerance_s')
+
+    def __init__(self, limit: int, period_s: float):
+        if limit <= 0 or period_s <= 0:
+            raise ValueError(f"Invalid rate: {limit}/{period_s}s")
+        self.limit = limit
+        self.period_s = period_s
+        self.interval_s = period_s / limit       # emission interval
+        self.tolerance_s = self.interval_s * limit  # burst allowance
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Rate':
+        """'20/minute' (same format as the *_rate_limit settings)"""
+        count, _, unit = spec.partition('/')
+        if unit not in _PERIODS:
+            raise ValueError(f"Invalid rate spec: {spec}")
+        return cls(int(count), _PERIODS[unit])
+
+    def __repr__(self):
+        return f"Rate({self.limit}/{self.period_s:g}s)"
+
+
+class RateLimitResult:
+    __slots__ = ('allowed', 'remaining', 'retry_after_s')
+
+    def __init__(self, allowed: bool, remaining: int, retry_after_s: float = 0.0):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after_s = retry_after_s
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+class MemoryBackend:
+    """Per-process GCRA state (key -> theoretical arrival time)"""
+
+    name = 'memory'
+
+    def __init__(self, prune_every: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._prune_every = prune_every
+        self._clock = clock
+        self._hits = 0
+
+    def hit(self, key: str, rate: Rate, cost: int = 1) -> RateLimitResult:
+        now = self._clock()
+        with self._lock:
+            self._hits += 1
+            if self._hits % self._prune_every == 0:
+                self._prune(now)
+
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + cost * rate.interval_s
+            allow_at = new_tat - rate.tolerance_s
+            if now < allow_at:
+                return RateLimitResult(False, 0, allow_at - now)
+
+            self._tat[key] = new_tat
+            return RateLimitResult(True, int((now - allow_at) / rate.interval_s))
+
+    async def hit_async(self, key: str, rate: Rate, cost: int = 1) -> RateLimitResult:
+        return self.hit(key, rate, cost)
+
+    def _prune(self, now: float):
+        """Drop keys whose budget is fully restored"""
+        expired = [key for key, tat in self._tat.items() if tat <= now]
+        for key in expired:
+            del self._tat[key]
+
+    def reset(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._tat.clear()
+            else:
+                self._tat.pop(key, None)
+
+    def key_count(self) -> int:
+        return len(self._tat)
+
+
+# KEYS[1] = key; ARGV = interval_ms, tolerance_ms, cost
+# Returns {allowed (0/1), remaining, retry_after_ms}
+_GCRA_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + cost * interval
+local allow_at = new_tat - tolerance
+if now < allow_at then
+    return {0, 0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.max(1, math.ceil(new_tat - now)))
+return {1, math.floor((now - allow_at) / interval), '0'}
+"""
+
+
+class RedisBackend:
+    """
+    GCRA state shared by all workers (one Lua round trip per hit)
+
+    Uses the asyncio client; there is no sync ``hit``. While Redis errors,
+    hits go to a local MemoryBackend; the backend retries Redis after
+    retry_after_s.
+    """
+
+    name = 'redis'
+
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        key_prefix: str = 'ratelimit:',
+        fallback: Optional[MemoryBackend] = None,
+        retry_after_s: float = 5.0
+    ):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.fallback = fallback or MemoryBackend()
+        self.retry_after_s = retry_after_s
+        self._script = client.register_script(_GCRA_LUA)
+        self._down_until = 0.0
+
+    async def hit_async(self, key: str, rate: Rate, cost: int = 1) -> RateLimitResult:
+        if time.monotonic() < self._down_until:
+            return self.fallback.hit(key, rate, cost)
+        try:
+            allowed, remaining, retry_after_ms = await self._script(
+                keys=[self.key_prefix + key],
+                args=[rate.interval_s * 1000, rate.tolerance_s * 1000, cost]
+            )
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Rate limiter Redis unavailable ({e}), using in-process limits for {self.retry_after_s}s")
+            self._down_until = time.monotonic() + self.retry_after_s
+            return self.fallback.hit(key, rate, cost)
+        return RateLimitResult(bool(allowed), int(remaining), float(retry_after_ms) / 1000)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class RateLimiter:
+    """Front for a backend; counts rejections per scope"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def hit(self, key: str, rate: Rate, cost: int = 1, scope: str = 'default') -> RateLimitResult:
+        """Synchronous hit, in-process backends only (WebSocket message gate)"""
+        return self._count(self.backend.hit(key, rate, cost), scope)
+
+    async def hit_async(self, key: str, rate: Rate, cost: int = 1, scope: str = 'default') -> RateLimitResult:
+        return self._count(await self.backend.hit_async(key, rate, cost), scope)
+
+    def _count(self, result: RateLimitResult, scope: str) -> RateLimitResult:
+        if not result.allowed:
+            RATE_LIMIT_REJECTIONS.labels(scope).inc()
+        return result
+
+    async def close(self):
+        if hasattr(self.backend, 'close'):
+            await self.backend.close()
+
+
+def create_rate_limiter(backend: str = 'memory') -> RateLimiter:
+    """'redis' (shared, when Redis is enabled) or 'memory'"""
+    if backend == 'redis' and settings.redis_enabled:
+        client = aioredis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=0.25,
+            socket_connect_timeout=0.25
+        )
+        return RateLimiter(RedisBackend(client))
+    return RateLimiter(MemoryBackend())
+
+
+# ============================================================
+# HTTP MIDDLEWARE
+# ============================================================
+
+# (method or None for any, path prefix, rate spec); first match wins
+RateRule = Tuple[Optional[str], str, str]
+
+EXEMPT_PATH_PREFIXES = ('/metrics', '/health', '/api/monitoring', '/docs', '/openapi.json')
+
+
+def default_http_rules() -> List[RateRule]:
+    return [
+        ('POST', '/api/ai-chat/chat', settings.chat_rate_limit),
+        ('POST', '/api/ai-chat/save-message', settings.save_chat_rate_limit),
+        (None, '/api/', settings.api_rate_limit),
+    ]
+
+
+def _parse_networks(specs: Sequence[str]) -> List[ipaddress.IPv4Network | ipaddress.IPv6Network]:
+    return [ipaddress.ip_network(spec, strict=False) for spec in specs]
+
+
+def _is_trusted(host: str, networks) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def _client_ip(scope, trusted_proxies) -> str:
+    """
+    Peer address, or the client behind trusted proxies
+
+    X-Forwarded-For is read right to left (each proxy appends the address
+    it received from), the first hop outside the trusted networks is the
+    client. Entries further left are client-controlled and ignored.
+    """
+    client = scope.get('client')
+    peer = client[0] if client else 'unknown'
+    if not _is_trusted(peer, trusted_proxies):
+        return peer
+
+    forwarded = real_ip = None
+    for name, value in scope.get('headers', ()):
+        if name == b'x-forwarded-for':
+            forwarded = value.decode('latin-1') if forwarded is None else f"{forwarded},{value.decode('latin-1')}"
+        elif name == b'x-real-ip':
+            real_ip = value.decode('latin-1').strip()
+
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, trusted_proxies):
+                return hop
+        return hops[0]
+    return real_ip or peer
+
+
+def _client_key(scope, trusted_proxies) -> str:
+    return f"ip:{_client_ip(scope, trusted_proxies)}"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying the first matching rule per request
+
+    Rejections get 429 with Retry-After; CORS preflights and monitoring
+    endpoints are never limited.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        rules: Sequence[RateRule],
+        trusted_proxies: Optional[Sequence[str]] = None
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.rules = [(method, prefix, Rate.parse(spec)) for method, prefix, spec in rules]
+        self.trusted_proxies = _parse_networks(
+            settings.rate_limit_trusted_proxies if trusted_proxies is None else trusted_proxies
+        )
+
+    def _match(self, method: str, path: str) -> Optional[Tuple[str, Rate]]:
+        for rule_method, prefix, rate in self.rules:
+            if (rule_method is None or rule_method == method) and path.startswith(prefix):
+                return prefix, rate
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] == 'OPTIONS':
+            return await self.app(scope, receive, send)
+
+        path = scope['path']
+        if path.startswith(EXEMPT_PATH_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        match = self._match(scope['method'], path)
+        if match is None:
+            return await self.app(scope, receive, send)
+
+        prefix, rate = match
+        key = _client_key(scope, self.trusted_proxies)
+        result = await self.limiter.hit_async(f"http:{prefix}:{key}", rate, scope='http')
+        if result.allowed:
+            return await self.app(scope, receive, send)
+
+        retry_after = max(1, math.ceil(result.retry_after_s))
+        body = serialization.dumps_bytes({'detail': 'Rate limit exceeded', 'retry_after': retry_after})
+        await send({
+            'type': 'http.response.start',
+            'status': 429,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(retry_after).encode()),
+                (b'x-ratelimit-limit', str(rate.limit).encode()),
+                (b'x-ratelimit-remaining', b'0'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+# Shared (Redis) limiter for HTTP routes
+rate_limiter = create_rate_limiter(settings.rate_limit_backend)
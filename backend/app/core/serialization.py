@@ -0,0 +1,167 @@
+"""Pluggable JSON serialization for hot paths.
+
+State fields in Redis, checkpoint snapshots, debug logs, WebSocket frames
+and API responses all go through this module, so the JSON library is
+chosen in one place (``settings.json_backend``):
+
+- ``orjson``  - fastest; native datetime/UUID/dataclass support
+- ``json``    - stdlib fallback, always available
+
+All backends produce the same JSON for the same input: datetimes as ISO
+8601, UUIDs as strings, Decimals as numbers, Pydantic models via
+``model_dump()``, non-string dict keys as strings. Decode errors are raised
+as ``json.JSONDecodeError`` so existing ``except`` clauses keep working.
+"""
+import dataclasses
+import importlib.util
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+from app.configs.config import settings
+
+logger = logging.getLogger(__name__)
+
+JSONDecodeError = json.JSONDecodeError
+
+_BACKEND_PREFERENCE = ("orjson", "json")
+
+
+def json_default(value: Any) -> Any:
+    """
+    Fallback encoder for types the JSON library does not handle natively
+
+    Shared by every backend so output does not depend on which one is active.
+    """
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def _resolve_backend(requested: str) -> str:
+    """Requested backend if installed, otherwise the fastest available"""
+    candidates = _BACKEND_PREFERENCE if requested == "auto" else (requested,) + _BACKEND_PREFERENCE
+    for name in candidates:
+        if name == "json" or importlib.util.find_spec(name) is not None:
+            if requested not in ("auto", name):
+                logger.warning(f"JSON backend '{requested}' not installed, using '{name}'")
+            return name
+    return "json"
+
+
+class _StdlibBackend:
+    name = "json"
+
+    def dumps(self, value: Any, indent: bool = False) -> bytes:
+        return self.dumps_str(value, indent).encode('utf-8')
+
+    def dumps_str(self, value: Any, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(value, default=json_default, ensure_ascii=False, indent=2)
+        return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS
+        self._indent_option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+
+    def dumps(self, value: Any, indent: bool = False) -> bytes:
+        return self._orjson.dumps(
+            value,
+            default=json_default,
+            option=self._indent_option if indent else self._option
+        )
+
+    def dumps_str(self, value: Any, indent: bool = False) -> str:
+        return self.dumps(value, indent).decode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return self._orjson.loads(data)
+
+
+_BACKEND_CLASSES = {
+    "orjson": _OrjsonBackend,
+    "json": _StdlibBackend,
+}
+
+_backend = None
+
+
+def get_backend(name: Optional[str] = None):
+    """Active serializer (or a specific one, e.g. for comparisons)"""
+    global _backend
+
+    if name is not None:
+        return _BACKEND_CLASSES[_resolve_backend(name)]()
+
+    if _backend is None:
+        _backend = _BACKEND_CLASSES[_resolve_backend(settings.json_backend)]()
+        logger.info(f"JSON serialization backend: {_backend.name}")
+    return _backend
+
+
+def dumps(value: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string"""
+    return get_backend().dumps_str(value, indent)
+
+
+def dumps_bytes(value: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    return get_backend().dumps(value, indent)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or bytes"""
+    return get_backend().loads(data)
+
+
+def to_jsonable(value: Any) -> Any:
+    """Plain JSON-compatible copy of value (e.g. for JSON database columns)"""
+    backend = get_backend()
+    return backend.loads(backend.dumps(value))
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the active backend
+
+    Equivalent to FastAPI's ORJSONResponse when orjson is installed, but
+    keeps working (stdlib) when it is not.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+def dump_to_file(value: Any, path, indent: bool = True) -> None:
+    """Write value as JSON to path (debug logs)"""
+    with open(path, 'wb') as f:
+        f.write(dumps_bytes(value, indent))
+
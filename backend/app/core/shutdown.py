@@ -0,0 +1,251 @@
+"""Coordinated graceful shutdown.
+
+uvicorn's own shutdown closes the listening socket and every WebSocket
+before the lifespan shutdown runs, and does not know about executions
+started with ``asyncio.create_task``. Those were simply destroyed with the
+loop, leaving 'running' executions and unflushed checkpoints behind.
+
+``shutdown_manager`` chains a SIGTERM handler in front of uvicorn's, so the
+drain runs while the server still serves:
+
+1. stop admissions     new executions and WebSocket connections are
+                       refused with a retry hint, /health reports
+                       'draining' (load balancer stops routing here)
+2. drain executions    running executions get shutdown_drain_timeout_seconds
+                       to finish; the rest are cancelled, which makes the
+                       orchestrator checkpoint their state and mark them
+                       interrupted
+3. flush               checkpoint buffer, WebSocket batch and outbound
+                       queues
+4. close WebSockets    'server_shutdown' notice with reconnect_after_ms,
+                       close code 1012 (service restart)
+
+then hands the signal to uvicorn. The lifespan shutdown (``shutdown()``)
+runs the drain too if no signal came first, and disposes the process and
+connection pools.
+
+Usage:
+    task = shutdown_manager.spawn_execution(run(), execution_id, session_id)
+    if shutdown_manager.draining: ...   # refuse new work
+"""
+import asyncio
+import logging
+import signal
+import time
+from datetime import datetime, timezone
+from typing import Any, Coroutine, Dict, Optional
+
+from app.configs.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SERVICE_RESTART_CLOSE_CODE = 1012
+
+SHUTDOWN_INTERRUPTED_EXECUTIONS = metrics.counter(
+    'shutdown_interrupted_executions_total',
+    'Executions cancelled (and checkpointed) because the drain deadline passed'
+)
+
+
+class ShutdownManager:
+    """
+    Tracks running executions and runs the shutdown sequence once
+
+    Args:
+        drain_timeout_s: Time running executions may finish
+        interrupt_timeout_s: Time cancelled executions get for their checkpoint
+        reconnect_delay_ms: Reconnect hint for WebSocket clients
+    """
+
+    def __init__(self, drain_timeout_s: float, interrupt_timeout_s: float, reconnect_delay_ms: int):
+        self.drain_timeout_s = drain_timeout_s
+        self.interrupt_timeout_s = interrupt_timeout_s
+        self.reconnect_delay_ms = reconnect_delay_ms
+
+        self.draining = False
+        self._executions: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._drain_task: Optional[asyncio.Task] = None
+        self._previous_handler = None
+        self.report: Dict[str, Any] = {}
+
+    # ============================================================
+    # ADMISSION
+    # ============================================================
+
+    def spawn_execution(self, coro: Coroutine, execution_id: int, session_id: str) -> asyncio.Task:
+        """Start an execution task the shutdown drain waits for"""
+        task = asyncio.create_task(coro, name=f'execution-{execution_id}')
+        self._executions[task] = {
+            'execution_id': execution_id,
+            'session_id': session_id,
+            'started': time.monotonic(),
+        }
+        task.add_done_callback(lambda done: self._executions.pop(done, None))
+        return task
+
+    def rejection(self) -> Dict[str, Any]:
+        """Error payload for work refused while draining"""
+        return {
+            'error': 'Server is restarting, please retry',
+            'error_type': 'ServerShutdown',
+            'retry_after_ms': self.reconnect_delay_ms,
+        }
+
+    def shutdown_notice(self) -> Dict[str, Any]:
+        """Last message WebSocket clients get before the close"""
+        return {
+            'type': 'server_shutdown',
+            'reason': 'restart',
+            'reconnect_after_ms': self.reconnect_delay_ms,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        }
+
+    # ============================================================
+    # SIGNALS
+    # ============================================================
+
+    def install_signal_handler(self):
+        """
+        Run the drain on SIGTERM before uvicorn's handler sees the signal.
+        Must be called from the running loop after uvicorn installed its
+        handlers (lifespan startup); no-op if SIGTERM is not handled in
+        Python (e.g. under a test client).
+        """
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous) or self._previous_handler is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._previous_handler = previous
+
+        def on_sigterm(signum, frame):
+            if self._drain_task is not None:
+                # Second SIGTERM: stop waiting
+                previous(signum, frame)
+                return
+            loop.call_soon_threadsafe(self._drain_then_exit, signum, frame)
+
+        signal.signal(signal.SIGTERM, on_sigterm)
+
+    def _drain_then_exit(self, signum, frame):
+        logger.info("SIGTERM received, draining before shutdown")
+        task = self._start_drain()
+        task.add_done_callback(lambda _: self._previous_handler(signum, frame))
+
+    # ============================================================
+    # SHUTDOWN SEQUENCE
+    # ============================================================
+
+    def _start_drain(self) -> asyncio.Task:
+        if self._drain_task is None:
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain(), name='shutdown-drain')
+        return self._drain_task
+
+    async def drain(self) -> Dict[str, Any]:
+        """Stop admissions, drain executions, flush buffers, close WebSockets (once)"""
+        return await asyncio.shield(self._start_drain())
+
+    async def _drain(self) -> Dict[str, Any]:
+        from app.orchestrator.state_manager import state_manager
+        from app.websocket.manager import get_ws_manager
+
+        started = time.monotonic()
+        ws_manager = get_ws_manager()
+
+        # 1. Stop admissions
+        self.draining = True
+        ws_manager.stop_accepting(self.shutdown_notice())
+        logger.info(f"Draining: {len(self._executions)} running execution(s), deadline {self.drain_timeout_s:.0f}s")
+
+        # 2. Let executions finish, interrupt the rest
+        running = list(self._executions)
+        interrupted = []
+        if running:
+            _, pending = await asyncio.wait(running, timeout=self.drain_timeout_s)
+            for task in pending:
+                info = self._executions.get(task, {})
+                interrupted.append(info.get('execution_id'))
+                task.cancel(msg='server shutdown')
+            if pending:
+                SHUTDOWN_INTERRUPTED_EXECUTIONS.inc(len(pending))
+                logger.warning(f"Interrupting {len(pending)} execution(s) past the drain deadline: {interrupted}")
+                _, stuck = await asyncio.wait(pending, timeout=self.interrupt_timeout_s)
+                if stuck:
+                    logger.error(f"{len(stuck)} execution(s) did not finish their interruption checkpoint")
+
+        # 3. Flush buffered checkpoints
+        flushed = 0
+        try:
+            flushed = state_manager.buffer.get_buffer_size() if state_manager.buffer else 0
+            await state_manager.shutdown()
+        except Exception as e:
+            logger.error(f"Failed to flush checkpoints on shutdown: {e}")
+
+        # 4. Flush WebSocket queues, notify and close clients
+        try:
+            await ws_manager.shutdown(close_code=SERVICE_RESTART_CLOSE_CODE, notice=self.shutdown_notice())
+        except Exception as e:
+            logger.error(f"WebSocket shutdown failed: {e}")
+
+        self.report = {
+            'executions_completed': len(running) - len(interrupted),
+            'executions_interrupted': interrupted,
+            'checkpoints_flushed': flushed,
+            'drain_seconds': round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Drain complete: {self.report}")
+        return self.report
+
+    async def shutdown(self):
+        """Lifespan shutdown: drain (if no SIGTERM did already), then dispose pools"""
+        from app.core.cpu_executor import cpu_executor
+        from app.core.http_client import close_http_client
+        from app.core.loop_monitor import loop_monitor
+        from app.core.rate_limiter import rate_limiter
+        from app.database import engines
+        from app.orchestrator.state_manager import state_manager
+
+        await self.drain()
+
+        cpu_executor.shutdown()
+        await loop_monitor.stop()
+        await close_http_client()
+        await rate_limiter.close()
+
+        try:
+            state_manager.redis_client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Redis pool: {e}")
+
+        # engines maps several pool names to one engine unless db_pool_split
+        for engine in {id(engine): engine for engine in engines.values()}.values():
+            engine.dispose()
+        logger.info("Connection pools disposed")
+
+    def running_count(self) -> int:
+        return len(self._executions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            'draining': self.draining,
+            'drain_timeout_s': self.drain_timeout_s,
+            'signal_handler_installed': self._previous_handler is not None,
+            'running_executions': [
+                {**{k: v for k, v in info.items() if k != 'started'}, 'running_s': round(now - info['started'], 1)}
+                for info in self._executions.values()
+            ],
+            'last_drain': self.report,
+        }
+
+
+# Global manager (signal handler installed in the application lifespan)
+shutdown_manager = ShutdownManager(
+    drain_timeout_s=settings.shutdown_drain_timeout_seconds,
+    interrupt_timeout_s=settings.shutdown_interrupt_timeout_seconds,
+    reconnect_delay_ms=settings.shutdown_reconnect_delay_ms
+)
+
+metrics.gauge(
+    'executions_running', 'Executions running in this worker'
+).set_function(shutdown_manager.running_count)
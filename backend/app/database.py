@@ -1,44 +1,104 @@
 # backend/app/database.py
-from sqlalchemy import create_engine, text
+from sqlalchemy import Engine, create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
+from contextvars import ContextVar
 import logging
+import time
+from typing import Dict, Literal, Optional, Tuple
 
 from app.configs.config import settings
 from app.configs.logging_config import setup_slow_query_logging 
+from app.core import serialization
+from app.core.db_pool_monitor import pool_monitor
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Create engine with optimized settings for user study scale
-engine = create_engine(
-    settings.database_url,
-
-    # echo=settings.debug, # Enable SQL echo for debugging
-    echo=False,  # Disable SQL echo to reduce log noise
-    # echo_pool=settings.debug,  # Log pool checkouts/checkins in debug mode
-    # pool_logging_name="agentic_study_db_pool",
-    echo_pool=False,  # Disable pool echo to reduce log noise
-
-    poolclass=QueuePool,
-    pool_size=settings.db_pool_size,        # Default: 5 connections
-    max_overflow=settings.db_max_overflow,  # Default: 10 overflow (15 total)
-    pool_pre_ping=True,                     # Health check before using connection
-    pool_recycle=3600,                      # Recycle connections after 1 hour
-    pool_timeout=30,                        # Wait 30s for connection
-    connect_args={
-        "connect_timeout": 10,
-        "options": "-c statement_timeout=30000"  # 30s query timeout
-    } if "postgresql" in settings.database_url else {}
-)
-
-# Setup slow query logging (logs queries > 1 second to slow_queries.log)
-setup_slow_query_logging(engine, threshold_ms=1000)
-
-# Session factory
+DatabasePool = Literal['interactive', 'bulk', 'analytics']
+
+# (pool, session) shared by read-only work of the current task, see shared_read_session()
+_shared_read_session: ContextVar[Optional[Tuple[str, object]]] = ContextVar('shared_read_session', default=None)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long callers wait for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self._orig_logging_name or 'default').observe(time.perf_counter() - start)
+
+
+def _create_engine(pool_name: str, pool_size: int, max_overflow: int, statement_timeout_ms: int) -> Engine:
+    """Engine with its own instrumented connection pool"""
+    pool_engine = create_engine(
+        settings.database_url,
+
+        # echo=settings.debug, # Enable SQL echo for debugging
+        echo=False,  # Disable SQL echo to reduce log noise
+        # echo_pool=settings.debug,  # Log pool checkouts/checkins in debug mode
+        echo_pool=False,  # Disable pool echo to reduce log noise
+        pool_logging_name=pool_name,            # Also labels the pool metrics
+
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,                     # Health check before using connection
+        pool_recycle=3600,                      # Recycle connections after 1 hour
+        pool_timeout=settings.db_pool_timeout,  # Wait for a connection before failing
+        json_serializer=serialization.dumps,    # JSON columns (checkpoint snapshots, logs)
+        json_deserializer=serialization.loads,
+        connect_args={
+            "connect_timeout": 10,
+            "options": f"-c statement_timeout={statement_timeout_ms}"
+        } if "postgresql" in settings.database_url else {}
+    )
+
+    # Setup slow query logging (logs queries > 1 second to slow_queries.log)
+    setup_slow_query_logging(pool_engine, threshold_ms=1000)
+    pool_monitor.attach(pool_engine, pool_name)
+    return pool_engine
+
+
+# Interactive pool: participant-facing requests, WebSocket handlers, tools
+# Default: 5 connections + 10 overflow, 30s query timeout
+engine = _create_engine('interactive', settings.db_pool_size, settings.db_max_overflow, 30000)
+
+if settings.db_pool_split:
+    # Bulk writes (checkpoints, tracking) and long analytics queries get their
+    # own pools, so neither can exhaust the interactive pool
+    bulk_engine = _create_engine(
+        'bulk', settings.db_bulk_pool_size, settings.db_bulk_max_overflow, 30000
+    )
+    analytics_engine = _create_engine(
+        'analytics', settings.db_analytics_pool_size, settings.db_analytics_max_overflow,
+        settings.db_analytics_statement_timeout_ms
+    )
+else:
+    bulk_engine = analytics_engine = engine
+
+engines: Dict[str, Engine] = {
+    'interactive': engine,
+    'bulk': bulk_engine,
+    'analytics': analytics_engine,
+}
+
+# Session factories (one per pool)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+BulkSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=bulk_engine)
+AnalyticsSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=analytics_engine)
+
+session_factories: Dict[str, sessionmaker] = {
+    'interactive': SessionLocal,
+    'bulk': BulkSessionLocal,
+    'analytics': AnalyticsSessionLocal,
+}
 
 # Base class for models
 Base = declarative_base()
@@ -47,6 +107,24 @@ Base = declarative_base()
 # DATABASE DEPENDENCIES
 # ============================================================
 
+def _session_dependency(pool: DatabasePool):
+    factory = session_factories[pool]
+
+    def dependency():
+        db = factory()
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    dependency.__name__ = f"get_{pool}_db"
+    return dependency
+
+
 def get_db():
     """
     Dependency for FastAPI endpoints
@@ -67,16 +145,41 @@ def get_db():
         db.close()
 
 
+# Tracking writes (interactions, sync) and analytics/export endpoints
+get_bulk_db = _session_dependency('bulk')
+get_analytics_db = _session_dependency('analytics')
+
+
 @contextmanager
-def get_db_context():
+def get_db_context(pool: DatabasePool = 'interactive'):
     """
     Context manager for database sessions outside of FastAPI
     
+    Args:
+        pool: 'interactive' (default), 'bulk' (checkpoints, logs, tracking)
+              or 'analytics' (long aggregate queries)
+    
     Usage:
         with get_db_context() as db:
             db.query(Model).all()
+        
+        with get_db_context('bulk') as db:
+            db.add_all(checkpoints)
+    
+    Inside shared_read_session() the shared session of that pool is
+    yielded instead (no commit, closed by the owner).
     """
-    db = SessionLocal()
+    shared = _shared_read_session.get()
+    if shared is not None and shared[0] == pool:
+        try:
+            yield shared[1]
+        except Exception:
+            # Keep the shared session usable for the other readers
+            shared[1].rollback()
+            raise
+        return
+    
+    db = session_factories[pool]()
     try:
         yield db
         # Auto-commit on successful completion
@@ -89,6 +192,30 @@ def get_db_context():
     finally:
         db.close()
 
+
+@contextmanager
+def shared_read_session(pool: DatabasePool = 'interactive'):
+    """
+    One session (one pool checkout) for a group of read-only operations
+    
+    get_db_context(pool) calls in this task - and in tasks started from it,
+    which copy the context - reuse the session instead of checking out a
+    connection each. Nothing is committed: the session is rolled back and
+    closed on exit, so only wrap code that does not write.
+    
+    Usage:
+        with shared_read_session():
+            await asyncio.gather(handle_session_get(...), handle_chat_history_request(...))
+    """
+    db = session_factories[pool]()
+    token = _shared_read_session.set((pool, db))
+    try:
+        yield db
+    finally:
+        _shared_read_session.reset(token)
+        db.rollback()
+        db.close()
+
 # ============================================================
 # DATABASE INITIALIZATION
 # ============================================================
@@ -147,6 +274,7 @@ def get_database_info() -> dict:
                 "pool_size": pool.size(),
                 "checked_out": pool.checkedout(),
                 "overflow": pool.overflow(),
+                "pools": pool_monitor.get_pool_stats()['pools'],
             }
     except Exception as e:
         logger.error(f"Failed to get database info: {e}")
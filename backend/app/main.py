@@ -1,17 +1,21 @@
 # backend/app/main.py
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 import logging
 import traceback
 
 from app.routers import sessions, demographics, ai_chat, sentry, orchestrator, websocket, reviews, monitoring, survey, summary
-from app.database import check_database_connection, get_database_info
+from app.database import check_database_connection, get_database_info, engine
+from app.models.review_search import ensure_search_indexes
+from app.core.http_client import init_http_client
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, metrics
+from app.core.rate_limiter import RateLimitMiddleware, default_http_rules, rate_limiter
+from app.core.shutdown import shutdown_manager
 from app.websocket.handlers import register_handlers
+from app.websocket.manager import get_ws_manager
 
 from app.configs.config import settings
 from app.configs.logging_config import setup_logging
@@ -35,9 +39,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address) if settings.rate_limit_enabled else None
-
 # Initialize Sentry
 sentry_enabled = init_sentry(settings)
 
@@ -58,9 +59,22 @@ async def lifespan(app: FastAPI):
     # Run migrations on container startup before this
     logger.info("Database ready - tables managed by Alembic")
 
+    # SQLite (local runs): FTS5 review search tables; PostgreSQL uses Alembic indexes
+    ensure_search_indexes(engine)
+
+    # Event loop lag / blocking call detection
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+
     # Register WebSocket handlers ONCE at startup
     register_handlers()
 
+    # Cross-worker WebSocket delivery (Redis pub/sub when several workers run)
+    await get_ws_manager().start_fanout()
+
+    # Shared upstream HTTP client (keep-alive / HTTP/2 connection reuse)
+    init_http_client()
+
     # Initialize LangSmith tracing
     langsmith_enabled = init_langsmith(settings)
     if langsmith_enabled:
@@ -68,11 +82,15 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Running without LangSmith tracing")
     
+    # SIGTERM: drain executions / buffers / WebSockets before uvicorn shuts down
+    shutdown_manager.install_signal_handler()
+    
     logger.info("Agentic Study API started successfully")
     yield
     
-    # Shutdown
+    # Shutdown (drain if no SIGTERM did already, then dispose pools)
     logger.info("Shutting down Agentic Study API")
+    await shutdown_manager.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -83,15 +101,18 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Add rate limiter to app state
-if limiter:
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Rate limiting (GCRA per session/IP and route, shared via Redis)
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, rules=default_http_rules())
 
 # Add Sentry middleware (if enabled)
 if sentry_enabled:
     app.middleware("http")(sentry_context_middleware)
 
+# Request latency metrics (/metrics)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # CORS Configuration - MUST be added before routes
 app.add_middleware(
     CORSMiddleware,
@@ -160,7 +181,10 @@ async def root():
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    """Comprehensive health check"""
+    """Comprehensive health check (503 while draining for a restart)"""
+    if shutdown_manager.draining:
+        return JSONResponse(status_code=503, content={"status": "draining", "version": "1.2.0"})
+    
     db_info = get_database_info()
     
     return {
@@ -174,6 +198,14 @@ async def health_check():
         "debug_mode": settings.debug
     }
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """All backend metrics in Prometheus text exposition format"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/api/version")
 async def get_version():
     """API version and feature flags"""
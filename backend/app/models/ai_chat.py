@@ -1,5 +1,6 @@
 # backend/app/models/ai_chat.py
-from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, ForeignKey, Float, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, ForeignKey, Float, Boolean, update
+from sqlalchemy.orm import Session as DBSession
 from datetime import datetime
 from app.models.session import Base
 
@@ -45,6 +46,9 @@ class ChatConversation(Base):
     last_message_at = Column(DateTime, default=datetime.utcnow)
     message_count = Column(Integer, default=0)
     
+    # Next ChatMessage.message_index (advanced atomically, see reserve_message_index)
+    next_message_index = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Usage statistics
     total_tokens_used = Column(Integer, default=0)
     total_user_messages = Column(Integer, default=0)
@@ -68,6 +72,24 @@ class ChatConversation(Base):
         {'mysql_engine': 'InnoDB'},
     )
 
+    @staticmethod
+    def reserve_message_index(db: DBSession, session_id: str) -> int:
+        """
+        Atomically reserve the next message index of a conversation
+        
+        Single UPDATE ... RETURNING; the row lock serialises concurrent
+        writers until the caller's transaction commits. The conversation
+        row must exist.
+        """
+        result = db.execute(
+            update(ChatConversation)
+            .where(ChatConversation.session_id == session_id)
+            .values(next_message_index=ChatConversation.next_message_index + 1)
+            .returning(ChatConversation.next_message_index)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one() - 1
+
 class ChatAnalytics(Base):
     """Aggregate analytics for chat usage"""
     __tablename__ = "chat_analytics"
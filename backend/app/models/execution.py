@@ -63,7 +63,7 @@ class ExecutionCheckpoint(Base):
     
     # Checkpoint identification
     step_number = Column(Integer, index=True)
-    checkpoint_type = Column(String(50))  # 'node_start', 'node_end', 'agent_decision', 'user_intervention', 'error'
+    checkpoint_type = Column(String(50))  # 'node_start', 'node_end', 'agent_decision', 'user_intervention', 'error', 'interrupted'
     node_id = Column(String(100), nullable=True)  # For Workflow Builder nodes
     
     # State snapshot
@@ -0,0 +1,323 @@
+# backend/app/models/product_summary.py
+"""
+Materialized per-product review summaries
+
+One row per (category, product_id) with the aggregates dataset overviews
+need: review counts, rating histogram, verified count, text lengths and
+date range. Overview requests read these rows instead of scanning the
+category's review table, so their cost depends on the number of products,
+not reviews.
+
+Kept up to date by:
+- Offline build:   python -m app.models.product_summary [--category shoes]
+- ORM imports:     review rows added/changed/deleted through any pool's session are
+                   re-aggregated for their products on commit
+- Bulk SQL loads:  call refresh_product_summaries(db, category, product_ids)
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime, UniqueConstraint, case, delete, event, func, insert, select
+)
+from sqlalchemy.orm import Session
+
+from app.database import Base, SessionLocal, session_factories
+from app.models.review_categories import REVIEW_CATEGORIES, get_review_category
+from app.models.reviews import ReviewBase, get_review_model
+import logging
+
+logger = logging.getLogger(__name__)
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+class ProductSummary(Base):
+    """
+    Aggregated review statistics per category/product
+
+    Counts (except malformed_count) cover non-malformed reviews only, matching
+    what study participants and tools see.
+    """
+    __tablename__ = "product_summary"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    category = Column(String(50), nullable=False, index=True)
+    product_id = Column(String(50), nullable=False)
+    product_title = Column(String(500), nullable=False, default="")
+
+    review_count = Column(Integer, nullable=False, default=0)
+    malformed_count = Column(Integer, nullable=False, default=0)
+    verified_count = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    body_length_sum = Column(Integer, nullable=False, default=0)
+    headline_length_sum = Column(Integer, nullable=False, default=0)
+
+    first_review_date = Column(Date, nullable=True)
+    last_review_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('category', 'product_id', name='uq_product_summary_category_product'),
+    )
+
+    def __repr__(self):
+        return f"<ProductSummary({self.category}/{self.product_id}, reviews={self.review_count})>"
+
+    @property
+    def rating_distribution(self) -> Dict[int, int]:
+        return {rating: getattr(self, f"rating_{rating}") or 0 for rating in RATING_VALUES}
+
+    @property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.review_count if self.review_count else 0.0
+
+    @property
+    def verified_ratio(self) -> float:
+        return self.verified_count / self.review_count if self.review_count else 0.0
+
+    @property
+    def avg_body_length(self) -> float:
+        return self.body_length_sum / self.review_count if self.review_count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'category': self.category,
+            'product_id': self.product_id,
+            'product_title': self.product_title,
+            'review_count': self.review_count,
+            'malformed_count': self.malformed_count,
+            'average_rating': round(self.average_rating, 2),
+            'rating_distribution': self.rating_distribution,
+            'verified_count': self.verified_count,
+            'verified_ratio': round(self.verified_ratio, 3),
+            'avg_body_length': round(self.avg_body_length, 1),
+            'avg_headline_length': round(self.headline_length_sum / self.review_count, 1) if self.review_count else 0.0,
+            'first_review_date': self.first_review_date.isoformat() if self.first_review_date else None,
+            'last_review_date': self.last_review_date.isoformat() if self.last_review_date else None,
+        }
+
+
+# ============================================================
+# BUILD / REFRESH
+# ============================================================
+
+def _aggregate_query(model, product_ids: Optional[Iterable[str]] = None):
+    """Per-product aggregates over one category table"""
+    valid = model.is_malformed == False  # noqa: E712
+
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    def sum_if_valid(expression):
+        return func.coalesce(func.sum(case((valid, expression), else_=0)), 0)
+
+    query = select(
+        model.product_id,
+        func.max(model.product_title).label('product_title'),
+        count_if(valid).label('review_count'),
+        count_if(model.is_malformed == True).label('malformed_count'),  # noqa: E712
+        count_if(valid & (model.verified_purchase == True)).label('verified_count'),  # noqa: E712
+        *[count_if(valid & (model.star_rating == rating)).label(f'rating_{rating}') for rating in RATING_VALUES],
+        sum_if_valid(model.star_rating).label('rating_sum'),
+        sum_if_valid(func.length(func.coalesce(model.review_body, ''))).label('body_length_sum'),
+        sum_if_valid(func.length(func.coalesce(model.review_headline, ''))).label('headline_length_sum'),
+        func.min(model.review_date).label('first_review_date'),
+        func.max(model.review_date).label('last_review_date'),
+    ).group_by(model.product_id)
+
+    if product_ids is not None:
+        query = query.where(model.product_id.in_(list(product_ids)))
+    return query
+
+
+def aggregate_product_summaries(
+    db: Session,
+    category: str,
+    product_ids: Optional[Iterable[str]] = None
+) -> List[ProductSummary]:
+    """Compute summaries live from the review table (transient, not stored)"""
+    spec = get_review_category(category)
+    rows = db.execute(_aggregate_query(get_review_model(spec.key), product_ids)).mappings().all()
+    return [
+        ProductSummary(**{**row, 'product_title': row['product_title'] or ""}, category=spec.key)
+        for row in rows
+    ]
+
+
+def refresh_product_summaries(
+    db: Session,
+    category: str,
+    product_ids: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Recompute summaries for a category (all products, or only product_ids)
+
+    Replaces the affected rows in the caller's transaction; products that
+    no longer have reviews lose their summary row. Does not commit.
+
+    Returns:
+        Number of summary rows written
+    """
+    spec = get_review_category(category)
+    model = get_review_model(spec.key)
+    product_ids = None if product_ids is None else sorted(set(product_ids))
+    if product_ids == []:
+        return 0
+
+    rows = db.execute(_aggregate_query(model, product_ids)).mappings().all()
+
+    stale = delete(ProductSummary).where(ProductSummary.category == spec.key)
+    if product_ids is not None:
+        stale = stale.where(ProductSummary.product_id.in_(product_ids))
+    db.execute(stale)
+
+    if rows:
+        now = datetime.utcnow()
+        db.execute(
+            insert(ProductSummary),
+            [{**row, 'product_title': row['product_title'] or "", 'category': spec.key, 'updated_at': now} for row in rows]
+        )
+
+    logger.info(
+        f"Product summaries refreshed: {spec.key} "
+        f"({'all products' if product_ids is None else f'{len(product_ids)} products'}, {len(rows)} rows)"
+    )
+    return len(rows)
+
+
+def rebuild_all_product_summaries(db: Session) -> Dict[str, int]:
+    """Full rebuild for every registered category (commits)"""
+    written = {spec.key: refresh_product_summaries(db, spec.key) for spec in REVIEW_CATEGORIES}
+    db.commit()
+    return written
+
+
+# ============================================================
+# READ
+# ============================================================
+
+def get_product_summary(db: Session, category: str, product_id: str) -> Optional[ProductSummary]:
+    return db.query(ProductSummary).filter(
+        ProductSummary.category == get_review_category(category).key,
+        ProductSummary.product_id == product_id
+    ).first()
+
+
+def get_category_overview(db: Session, category: str, top_products: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Category-level overview from the product summaries
+
+    Returns None if the category has no summaries yet (not built).
+    """
+    spec = get_review_category(category)
+    summaries: List[ProductSummary] = db.query(ProductSummary).filter(
+        ProductSummary.category == spec.key
+    ).all()
+    if not summaries:
+        return None
+
+    review_count = sum(s.review_count for s in summaries)
+    distribution = {rating: sum(s.rating_distribution[rating] for s in summaries) for rating in RATING_VALUES}
+    rating_sum = sum(s.rating_sum for s in summaries)
+    verified = sum(s.verified_count for s in summaries)
+    body_length = sum(s.body_length_sum for s in summaries)
+    first_dates = [s.first_review_date for s in summaries if s.first_review_date]
+    last_dates = [s.last_review_date for s in summaries if s.last_review_date]
+    ranked = sorted(summaries, key=lambda s: (-s.review_count, s.product_id))[:top_products]
+
+    return {
+        'category': spec.key,
+        'product_count': len(summaries),
+        'review_count': review_count,
+        'total_rows': review_count + sum(s.malformed_count for s in summaries),
+        'average_rating': round(rating_sum / review_count, 2) if review_count else 0.0,
+        'rating_distribution': distribution,
+        'verified_ratio': round(verified / review_count, 3) if review_count else 0.0,
+        'avg_body_length': round(body_length / review_count, 1) if review_count else 0.0,
+        'first_review_date': min(first_dates).isoformat() if first_dates else None,
+        'last_review_date': max(last_dates).isoformat() if last_dates else None,
+        'top_products': [s.to_dict() for s in ranked],
+    }
+
+
+def get_category_row_count(db: Session, category: str) -> Optional[int]:
+    """All rows (incl. malformed) of a category from summaries, None if not built"""
+    total = db.query(
+        func.sum(ProductSummary.review_count + ProductSummary.malformed_count)
+    ).filter(ProductSummary.category == get_review_category(category).key).scalar()
+    return int(total) if total is not None else None
+
+
+# ============================================================
+# INCREMENTAL REFRESH ON IMPORT (ORM writes)
+# ============================================================
+
+_PENDING_KEY = 'product_summary_pending'
+
+
+def _changed_reviews(session: Session) -> List[ReviewBase]:
+    return [
+        obj for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, ReviewBase) and obj.category_spec is not None
+    ]
+
+
+def _collect_changed_products(session: Session, flush_context):
+    """Remember (category, product_id) of review rows written in this flush"""
+    changed = _changed_reviews(session)
+    if changed:
+        pending = session.info.setdefault(_PENDING_KEY, set())
+        pending.update((obj.category_spec.key, obj.product_id) for obj in changed)
+
+
+def _refresh_changed_products(session: Session):
+    """Re-aggregate touched products inside the committing transaction"""
+    # commit() flushes after this hook; review rows still unflushed must be
+    # collected now. Sessions without review changes skip the extra flush.
+    if _changed_reviews(session):
+        session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    by_category: Dict[str, set] = {}
+    for category, product_id in pending:
+        by_category.setdefault(category, set()).add(product_id)
+
+    for category, product_ids in by_category.items():
+        refresh_product_summaries(session, category, product_ids)
+
+
+def _discard_pending_products(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Sessions of every pool (imports may run on the bulk pool)
+for _factory in session_factories.values():
+    event.listen(_factory, 'after_flush', _collect_changed_products)
+    event.listen(_factory, 'before_commit', _refresh_changed_products)
+    event.listen(_factory, 'after_rollback', _discard_pending_products)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build product_summary from the review tables")
+    parser.add_argument('--category', help="Only this category (default: all registered)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        if args.category:
+            written = {args.category: refresh_product_summaries(db, args.category)}
+            db.commit()
+        else:
+            written = rebuild_all_product_summaries(db)
+    for category, rows in written.items():
+        print(f"{category}: {rows} product summaries")
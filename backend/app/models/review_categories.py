@@ -0,0 +1,83 @@
+# backend/app/models/review_categories.py
+"""
+Review category registry - single declaration of all review datasets
+
+Everything category-specific is generated from REVIEW_CATEGORIES:
+- ORM model + table ({key}_reviews) with constraints/indexes (models/reviews.py)
+- Study list endpoint GET /api/reviews/{key} (routers/reviews.py)
+- Category validation for tools, tool schemas and the orchestrator
+
+Each category keeps its own table, so every query touches only that
+category's rows (one physical partition per category).
+
+Adding a dataset:
+    1. Add a ReviewCategorySpec below
+    2. alembic revision --autogenerate (creates the {key}_reviews table)
+    3. Load the data
+
+Kept free of SQLAlchemy imports so schemas and tool definitions can use it.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class ReviewCategorySpec:
+    """
+    Declaration of one review dataset
+
+    Attributes:
+        key: Lowercase identifier used in URLs, tools and table names
+        display_name: Value stored in product_category (e.g. 'Shoes')
+        description: Short human-readable description
+    """
+    key: str
+    display_name: str
+    description: str = ""
+
+    @property
+    def table_name(self) -> str:
+        return f"{self.key}_reviews"
+
+    @property
+    def model_name(self) -> str:
+        return f"{self.display_name.replace(' ', '')}Review"
+
+
+REVIEW_CATEGORIES: Tuple[ReviewCategorySpec, ...] = (
+    ReviewCategorySpec(key='shoes', display_name='Shoes', description='Shoe product reviews'),
+    ReviewCategorySpec(key='wireless', display_name='Wireless', description='Wireless headphone reviews'),
+)
+
+REVIEW_CATEGORY_MAP: Dict[str, ReviewCategorySpec] = {spec.key: spec for spec in REVIEW_CATEGORIES}
+
+REVIEW_CATEGORY_KEYS: Tuple[str, ...] = tuple(REVIEW_CATEGORY_MAP)
+
+
+def get_review_category(category: str) -> ReviewCategorySpec:
+    """
+    Look up a category declaration (case-insensitive)
+
+    Raises:
+        ValueError: If category is not registered
+    """
+    spec = REVIEW_CATEGORY_MAP.get((category or '').lower())
+    if spec is None:
+        raise ValueError(
+            f"Unsupported review category: {category}. "
+            f"Supported categories: {', '.join(REVIEW_CATEGORY_KEYS)}"
+        )
+    return spec
+
+
+def is_review_category(category: str) -> bool:
+    """True if category (case-insensitive) is registered"""
+    return (category or '').lower() in REVIEW_CATEGORY_MAP
+
+
+def format_review_categories(quote: str = "'") -> str:
+    """Human-readable list for messages, e.g. "'shoes' or 'wireless'" """
+    quoted = [f"{quote}{key}{quote}" for key in REVIEW_CATEGORY_KEYS]
+    if len(quoted) <= 1:
+        return "".join(quoted)
+    return f"{', '.join(quoted[:-1])} or {quoted[-1]}"
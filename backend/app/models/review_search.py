@@ -0,0 +1,174 @@
+# backend/app/models/review_search.py
+"""
+Indexed text search over review tables
+
+Text filters ('contains', 'starts_with', 'ends_with' on review text and
+titles) are case-insensitive substring matches. Without an index every one
+of them is a sequential scan. This module translates such filter
+conditions into predicates that use a text index:
+
+- PostgreSQL: pg_trgm GIN indexes per text column (Alembic migration
+  review_text_search_20261018). ILIKE '%term%' is served by the trigram
+  index, so the predicate stays an escaped ILIKE with identical semantics.
+- SQLite (local runs): FTS5 table {table}_fts with the trigram tokenizer,
+  kept in sync by triggers (ensure_search_indexes). Terms of 3+ characters
+  are resolved through MATCH; shorter terms fall back to LIKE.
+
+Usage:
+    predicate = text_predicate(db, model, 'review_body', 'contains', 'zu klein')
+    query = query.filter(predicate)
+"""
+import logging
+from typing import Any
+
+from sqlalchemy import Engine, and_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.review_categories import REVIEW_CATEGORIES
+from app.models.reviews import get_review_model
+
+logger = logging.getLogger(__name__)
+
+# Indexed text columns (all review tables)
+TEXT_SEARCH_FIELDS = ('review_headline', 'review_body', 'product_title')
+
+TEXT_OPERATORS = ('contains', 'starts_with', 'ends_with')
+
+# FTS5 trigram tokenizer needs at least 3 characters per term
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+LIKE_ESCAPE = "\\"
+
+
+def is_indexed_text_filter(field: str, operator: str) -> bool:
+    """True if the condition can be served by the text index"""
+    return field in TEXT_SEARCH_FIELDS and operator in TEXT_OPERATORS
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally"""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace('%', f'{LIKE_ESCAPE}%')
+        .replace('_', f'{LIKE_ESCAPE}_')
+    )
+
+
+def like_pattern(operator: str, term: str) -> str:
+    escaped = escape_like(term)
+    if operator == 'starts_with':
+        return f"{escaped}%"
+    if operator == 'ends_with':
+        return f"%{escaped}"
+    return f"%{escaped}%"
+
+
+def fts_table_name(model) -> str:
+    return f"{model.__tablename__}_fts"
+
+
+def _fts_phrase(field: str, term: str) -> str:
+    """FTS5 query restricted to one column, term matched as a literal phrase"""
+    return f'{field} : "{term.replace(chr(34), chr(34) * 2)}"'
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+# ============================================================
+# QUERY TRANSLATION
+# ============================================================
+
+def text_predicate(db: Session, model, field: str, operator: str, value: Any):
+    """
+    WHERE clause for a text filter condition on model
+
+    Raises:
+        ValueError: If field/operator is not an indexed text filter
+    """
+    if not is_indexed_text_filter(field, operator):
+        raise ValueError(f"'{operator}' on '{field}' is not an indexed text filter")
+
+    column = getattr(model, field)
+    term = str(value)
+    like = column.ilike(like_pattern(operator, term), escape=LIKE_ESCAPE)
+
+    if _dialect(db) == 'sqlite' and len(term) >= MIN_TRIGRAM_TERM_LENGTH and _has_fts_table(db, model):
+        fts = fts_table_name(model)
+        matches = model.id.in_(
+            select(text('rowid')).select_from(text(fts)).where(
+                text(f"{fts} MATCH :fts_query").bindparams(fts_query=_fts_phrase(field, term))
+            )
+        )
+        # MATCH finds the substring anywhere; anchor starts/ends with LIKE
+        return matches if operator == 'contains' else and_(matches, like)
+
+    # PostgreSQL: served by the pg_trgm GIN index
+    return like
+
+
+# ============================================================
+# SQLITE FTS5 SETUP (PostgreSQL indexes come from Alembic)
+# ============================================================
+
+_fts_tables: dict = {}
+
+
+def _has_fts_table(db: Session, model) -> bool:
+    bind = db.get_bind()
+    key = (id(bind), model.__tablename__)
+    if key not in _fts_tables:
+        found = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': fts_table_name(model)}
+        ).first()
+        _fts_tables[key] = found is not None
+    return _fts_tables[key]
+
+
+def _create_sqlite_fts(connection, model) -> None:
+    table = model.__tablename__
+    fts = fts_table_name(model)
+    columns = ', '.join(TEXT_SEARCH_FIELDS)
+    new_values = ', '.join(f"new.{c}" for c in TEXT_SEARCH_FIELDS)
+    old_values = ', '.join(f"old.{c}" for c in TEXT_SEARCH_FIELDS)
+
+    statements = [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def ensure_search_indexes(engine: Engine) -> None:
+    """
+    Create SQLite FTS5 search tables for all review tables (idempotent)
+
+    No-op for other databases; PostgreSQL trigram indexes are created by
+    the Alembic migration.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    with engine.begin() as connection:
+        existing = {
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        for spec in REVIEW_CATEGORIES:
+            model = get_review_model(spec.key)
+            if model.__tablename__ in existing and fts_table_name(model) not in existing:
+                _create_sqlite_fts(connection, model)
+                logger.info(f"Created FTS5 search index {fts_table_name(model)}")
+
+    _fts_tables.clear()
@@ -4,7 +4,10 @@ SQLAlchemy models for product reviews - OPTIMIZED VERSION
 """
 from sqlalchemy import Column, Integer, String, Text, Boolean, Date, Numeric, CheckConstraint, Index
 from sqlalchemy.ext.declarative import declared_attr
+from typing import Dict
+
 from app.database import Base
+from app.models.review_categories import REVIEW_CATEGORIES, ReviewCategorySpec, get_review_category
 
 
 class ReviewBase:
@@ -13,6 +16,9 @@ class ReviewBase:
     Eliminates code duplication between review types.
     """
     
+    # Registry declaration (set on generated category models)
+    category_spec: ReviewCategorySpec = None
+    
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
     
@@ -28,8 +34,9 @@ class ReviewBase:
     
     @declared_attr
     def product_category(cls):
-        """Set default category based on class name"""
-        category = cls.__name__.replace('Review', '')
+        """Set default category from the registry declaration (or class name)"""
+        spec = cls.category_spec
+        category = spec.display_name if spec else cls.__name__.replace('Review', '')
         return Column(String(50), nullable=False, default=category)
     
     # Rating Information
@@ -155,32 +162,39 @@ class ReviewBase:
         return result
 
 
-class ShoesReview(ReviewBase, Base):
+# ============================================================
+# GENERATED CATEGORY MODELS
+# ============================================================
+
+def _build_review_model(spec: ReviewCategorySpec):
     """
-    Model for shoes product reviews
+    Generate the ORM model for a registered category
     
-    Table: shoes_reviews
-    
-    Example queries optimized by indexes:
-    - Get all 5-star verified reviews for a product
-    - Find most helpful reviews for a product
-    - Get reviews in a date range for a product
+    Table, constraint and index names derive from the table name, so the
+    generated models match the hand-written ones they replace.
     """
-    __tablename__ = "shoes_reviews"
+    return type(
+        spec.model_name,
+        (ReviewBase, Base),
+        {
+            '__tablename__': spec.table_name,
+            'category_spec': spec,
+            '__doc__': (
+                f"Model for {spec.key} product reviews\n\n"
+                f"    Table: {spec.table_name}\n"
+            ),
+            '__module__': __name__,
+        }
+    )
 
 
-class WirelessReview(ReviewBase, Base):
-    """
-    Model for wireless product reviews
-    
-    Table: wireless_reviews
-    
-    Example queries optimized by indexes:
-    - Get all 5-star verified reviews for a product
-    - Find most helpful reviews for a product
-    - Get reviews in a date range for a product
-    """
-    __tablename__ = "wireless_reviews"
+REVIEW_MODELS: Dict[str, type] = {
+    spec.key: _build_review_model(spec) for spec in REVIEW_CATEGORIES
+}
+
+# Explicit names for existing imports
+ShoesReview = REVIEW_MODELS['shoes']
+WirelessReview = REVIEW_MODELS['wireless']
 
 
 # ============================================================
@@ -200,17 +214,4 @@ def get_review_model(category: str):
     Raises:
         ValueError: If category is not supported
     """
-    category_lower = category.lower()
-    
-    model_map = {
-        'shoes': ShoesReview,
-        'wireless': WirelessReview,
-    }
-    
-    if category_lower not in model_map:
-        raise ValueError(
-            f"Unsupported review category: {category}. "
-            f"Supported categories: {', '.join(model_map.keys())}"
-        )
-    
-    return model_map[category_lower]
\ No newline at end of file
+    return REVIEW_MODELS[get_review_category(category).key]
@@ -14,7 +14,9 @@ import logging
 from sqlalchemy.orm import Session
 
 from app.models.execution import ExecutionCheckpoint
+from app.core.metrics import metrics
 from app.database import get_db_context
+from app.orchestrator.graphs.shared_state import serialize_state
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +62,7 @@ class CheckpointBuffer:
             'execution_end', 
             'error',
             'cancelled',
+            'interrupted',
             'user_interaction'
         }
         
@@ -131,7 +134,7 @@ class CheckpointBuffer:
             execution_id=execution_id,
             step_number=step_number,
             checkpoint_type=checkpoint_type,
-            state_snapshot=state,
+            state_snapshot=serialize_state(state),
             timestamp=datetime.utcnow(),
             node_id=kwargs.get('node_id'),
             time_since_last_step_ms=kwargs.get('time_since_last_ms'),
@@ -168,7 +171,7 @@ class CheckpointBuffer:
         
         try:
             # Use bulk insert for performance
-            with get_db_context() as db:
+            with get_db_context('bulk') as db:
                 db.bulk_save_objects(checkpoints_to_flush)
                 # Commit happens via context manager
             
@@ -229,7 +232,7 @@ class CheckpointBuffer:
             
             # Flush execution checkpoints
             try:
-                with get_db_context() as db:
+                with get_db_context('bulk') as db:
                     db.bulk_save_objects(to_flush)
                 
                 count = len(to_flush)
@@ -275,4 +278,8 @@ checkpoint_buffer = CheckpointBuffer(
     max_size=10,
     max_age_seconds=5.0,
     auto_flush_critical=True
-)
\ No newline at end of file
+)
+
+metrics.gauge(
+    'checkpoint_buffer_depth', 'Checkpoints waiting in the write buffer'
+).set_function(checkpoint_buffer.get_buffer_size)
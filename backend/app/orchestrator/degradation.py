@@ -18,6 +18,8 @@ from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+from app.core.metrics import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -437,4 +439,10 @@ class GracefulDegradation:
 
 
 # Global degradation manager instance
-graceful_degradation = GracefulDegradation()
\ No newline at end of file
+graceful_degradation = GracefulDegradation()
+
+_LEVEL_ORDER = list(DegradationLevel)
+
+metrics.gauge(
+    'degradation_level', 'Current degradation level (0=full, 1=reduced, 2=minimal, 3=emergency)'
+).set_function(lambda: _LEVEL_ORDER.index(graceful_degradation.current_level))
@@ -1,7 +1,9 @@
 # backend/app/orchestrator/graphs/ai_assistant_agent.py
 from typing import Dict, Any, Optional, List, Literal, Annotated
 from pydantic import BaseModel, Field, model_validator
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dataclass_field
+from cachetools import TTLCache
+from redis.exceptions import WatchError
 import logging
 import json
 import re
@@ -19,7 +21,9 @@ from langchain.tools import ToolRuntime, tool
 from app.websocket.manager import get_ws_manager
 
 from app.database import get_db_context
-from app.schemas.reviews import to_study_format
+from app.schemas.reviews import STUDY_PROJECTION
+from app.models.product_summary import get_category_row_count
+from app.models.review_search import is_indexed_text_filter, like_pattern, text_predicate
 from app.models.reviews import get_review_model
 from sqlalchemy import asc, desc, func
 
@@ -461,7 +465,7 @@ Return the complete tool output as a Markdown table:
         redis_key = f"inputData_{session_id}_{execution_id}"
 
         data_mng = InputDataManager(key=redis_key)
-        data_mng._save(serialize_for_logging(initial_state))
+        data_mng._save(initial_state)
 
         # Create context if not provided
         agent_context = AIAssistantContext(
@@ -576,7 +580,7 @@ Return the complete tool output as a Markdown table:
         redis_key = f"inputData_{session_id}_{execution_id}"
 
         data_mng = InputDataManager(key=redis_key)
-        data_mng._save(serialize_for_logging(initial_state))
+        data_mng._save(initial_state)
         
         # Create context if not provided
         context = AIAssistantContext(
@@ -783,7 +787,7 @@ async def execute_tool_workflow(
     from app.orchestrator.graphs.workflow_builder import WorkflowBuilderGraph
     from app.orchestrator.state_manager import state_manager
     from app.websocket.manager import get_ws_manager
-    from app.orchestrator.graphs.shared_state import SharedWorkflowState
+    from app.orchestrator.graphs.shared_state import SharedWorkflowState, get_record_store
     
     state: AIAssistantState = runtime.state
     context: AIAssistantContext = runtime.context
@@ -805,7 +809,9 @@ async def execute_tool_workflow(
     # Prepare initial state
     redis_key = context.redis_key or f"inputData_{state['session_id']}_{state['execution_id']}"
     data_mng = InputDataManager()
-    redis_state = json.loads(data_mng.get(redis_key))
+    redis_state = data_mng.get(redis_key)
+    if redis_state is None:
+        raise ValueError(f"Input state not found or expired: {redis_key}")
     initial_state = SharedWorkflowState(**redis_state)
     
     # Build and execute graph
@@ -826,7 +832,8 @@ async def execute_tool_workflow(
     result = result or {}
 
     # Return summary
-    total = result.get("record_store", {}).get("total", 0)
+    record_store = get_record_store(result)
+    total = record_store.total if record_store else 0
 
     return f"Successfully processed all records! Returned {min(limit, total)} of {total} records! Limit was set at {limit} records!"
 
@@ -1187,13 +1194,11 @@ def build_query(
         elif operator in {"contains", "starts_with", "ends_with"}:
             if not is_text(col):
                 raise ValueError(f"'{operator}' requires a text column ({field})")
-            s = str(value)
-            pattern = (
-                f"%{s}%" if operator == "contains"
-                else f"{s}%" if operator == "starts_with"
-                else f"%{s}"
-            )
-            expr = ilike(col, pattern)
+            if is_indexed_text_filter(field, operator):
+                # Served by the text search index (pg_trgm / SQLite FTS5)
+                expr = text_predicate(db, model, field, operator, value)
+            else:
+                expr = ilike(col, like_pattern(operator, str(value)))
 
         else:
             # Unsupported operator: skip
@@ -1284,8 +1289,10 @@ async def get_data_overview_snippet(
         with get_db_context() as db:
             model = get_review_model(category)
 
-            # total (entire table)
-            total_available = db.query(model).count()
+            # total (entire table) from product summaries; count if not built
+            total_available = get_category_row_count(db, category)
+            if total_available is None:
+                total_available = db.query(model).count()
 
             # build query with multi-filter AND logic
             query = build_query(
@@ -1301,10 +1308,10 @@ async def get_data_overview_snippet(
             filtered_available = query.order_by(None).count()
 
             # fetch only (limit + 1) filtered + sorted rows
-            rows = query.limit(limit + 1).all()
+            rows = STUDY_PROJECTION.select(query, model).limit(limit + 1).all()
 
-            # Convert ORM → dicts
-            study_dicts = [to_study_format(r).model_dump() for r in rows]
+            # Projected rows → dicts
+            study_dicts = STUDY_PROJECTION.to_dicts(rows)
 
         # first = detailed row
         full_row = study_dicts[0] if study_dicts else None
@@ -1347,37 +1354,203 @@ LANGCHAIN_TOOLS = [get_data, filtered_data, theme_extraction, analyze_data, get_
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
+# Shared Redis connection pool for InputDataManager instances (lazy)
+_input_data_pool = None
+
+# In-process working sets, keyed by Redis key (one per session execution)
+INPUT_DATA_TTL = 600  # 10 minutes (buffer for safety)
+_input_data_cache: TTLCache = TTLCache(maxsize=64, ttl=INPUT_DATA_TTL)
+
+
+def _get_input_data_pool():
+    global _input_data_pool
+    if _input_data_pool is None:
+        import redis
+        _input_data_pool = redis.ConnectionPool.from_url(settings.redis_url, decode_responses=True)
+    return _input_data_pool
+
+
+def _clone_json(value: Any) -> Any:
+    """Copy a JSON-shaped value (dicts/lists) without re-parsing it"""
+    if isinstance(value, dict):
+        return {k: _clone_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone_json(v) for v in value]
+    return value
+
+
+@dataclass
+class _InputDataWorkingSet:
+    """Decoded copy of a Redis input state, stamped with its versions"""
+    version: int = -1
+    field_versions: Dict[str, int] = dataclass_field(default_factory=dict)
+    values: Dict[str, Any] = dataclass_field(default_factory=dict)
+    digests: Dict[str, int] = dataclass_field(default_factory=dict)
+
+
 class InputDataManager:
+    """
+    Input state store for agent tool calls
+    
+    Redis layout (both keys share the TTL):
+        {key}           hash: state field -> JSON
+        {key}:versions  hash: state field -> version of last change,
+                        '__version__' -> latest version
+    
+    Readers keep a decoded working set per key in-process. A read costs one
+    round trip when nothing changed; otherwise only fields whose version
+    moved are fetched and decoded. Writes only send changed fields and
+    commit under WATCH on the versions hash, so concurrent writers never
+    reuse a version (a conflicting write retries against the new state).
+    """
+    VERSION_FIELD = '__version__'
+    
     def __init__(self, key: Optional[str] = None):
-        import redis
-        from app.configs.config import settings
-        self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
-        self.ttl = 600  # 10 minutes (buffer for safety)
+        from app.core.metrics import InstrumentedRedis
+        self.redis_client = InstrumentedRedis(connection_pool=_get_input_data_pool())
+        self.ttl = INPUT_DATA_TTL
         self.key = key
     
     def save(self, key: str, data: dict):
         """Save and reset TTL"""
-        self.redis_client.setex(key, self.ttl, json.dumps(data))
+        self._save_fields(key, data)
 
     def _save(self, data: dict):
         """Save and reset TTL"""
-        self.redis_client.setex(self.key, self.ttl, json.dumps(data))
+        self._save_fields(self.key, data)
     
     def get(self, key: str) -> dict | None:
         """Get and extend TTL (keep alive during active use)"""
-        data = self.redis_client.get(key)
-        if data:
-            self.redis_client.expire(key, self.ttl)  # Extend TTL
-            return json.loads(data)
-        return None
+        return self._get_fields(key)
     
     def _get(self) -> dict | None:
         """Get and extend TTL (keep alive during active use)"""
-        data = self.redis_client.get(self.key)
-        if data:
-            self.redis_client.expire(self.key, self.ttl)  # Extend TTL
-            return json.loads(data)
-        return None
+        return self._get_fields(self.key)
+    
+    def _save_fields(self, key: str, data: dict):
+        versions_key = f"{key}:versions"
+        encoded = {
+            field_name: json.dumps(value, cls=CustomJSONEncoder)
+            for field_name, value in data.items()
+        }
+        
+        with self.redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(versions_key)
+                    current = int(pipe.hget(versions_key, self.VERSION_FIELD) or 0)
+                    working_set = _input_data_cache.get(key)
+                    in_sync = working_set is not None and working_set.version == current
+                    
+                    if in_sync:
+                        changed = {
+                            f: raw for f, raw in encoded.items()
+                            if working_set.digests.get(f) != hash(raw)
+                        }
+                        removed = [f for f in working_set.values if f not in encoded]
+                    else:
+                        # Unknown server contents: rewrite everything
+                        working_set = _InputDataWorkingSet()
+                        changed = encoded
+                        removed = []
+                    
+                    pipe.multi()
+                    if changed or removed:
+                        new_version = current + 1
+                        if not in_sync:
+                            pipe.delete(key, versions_key)
+                        if changed:
+                            pipe.hset(key, mapping=changed)
+                        if removed:
+                            pipe.hdel(key, *removed)
+                            pipe.hdel(versions_key, *removed)
+                        pipe.hset(versions_key, mapping={
+                            **{f: new_version for f in changed},
+                            self.VERSION_FIELD: new_version
+                        })
+                    else:
+                        new_version = current
+                    pipe.expire(key, self.ttl)
+                    pipe.expire(versions_key, self.ttl)
+                    pipe.execute()
+                    break
+                except WatchError:
+                    # Another writer committed in between: diff against its state
+                    logger.debug(f"Input data write conflict on {key}, retrying")
+                    continue
+        
+        # Mirror the write into the local working set
+        for f, raw in changed.items():
+            working_set.values[f] = json.loads(raw)
+            working_set.digests[f] = hash(raw)
+            working_set.field_versions[f] = new_version
+        for f in removed:
+            working_set.values.pop(f, None)
+            working_set.digests.pop(f, None)
+            working_set.field_versions.pop(f, None)
+        working_set.version = new_version
+        _input_data_cache[key] = working_set
+        
+        logger.debug(
+            f"Input data saved: {key} v{new_version} "
+            f"({len(changed)} changed, {len(removed)} removed)"
+        )
+    
+    def _get_fields(self, key: str) -> dict | None:
+        versions_key = f"{key}:versions"
+        
+        # Version check + TTL extension in one round trip
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hget(versions_key, self.VERSION_FIELD)
+        pipe.expire(key, self.ttl)
+        pipe.expire(versions_key, self.ttl)
+        version, _, _ = pipe.execute()
+        
+        if version is None:
+            _input_data_cache.pop(key, None)
+            return None
+        version = int(version)
+        
+        working_set = _input_data_cache.get(key) or _InputDataWorkingSet()
+        
+        if working_set.version != version:
+            field_versions = {
+                f: int(v)
+                for f, v in self.redis_client.hgetall(versions_key).items()
+                if f != self.VERSION_FIELD
+            }
+            stale = [
+                f for f, v in field_versions.items()
+                if working_set.field_versions.get(f) != v
+            ]
+            
+            if stale:
+                for f, raw in zip(stale, self.redis_client.hmget(key, stale)):
+                    if raw is None:
+                        # Concurrent rewrite; keep the old version so the
+                        # next read fetches this field again
+                        version = -1
+                        if f in working_set.field_versions:
+                            field_versions[f] = working_set.field_versions[f]
+                        else:
+                            field_versions.pop(f)
+                        continue
+                    working_set.values[f] = json.loads(raw)
+                    working_set.digests[f] = hash(raw)
+            
+            for f in list(working_set.values):
+                if f not in field_versions:
+                    working_set.values.pop(f, None)
+                    working_set.digests.pop(f, None)
+            
+            working_set.field_versions = field_versions
+            working_set.version = version
+            _input_data_cache[key] = working_set
+            
+            logger.debug(f"Input data synced: {key} v{version} ({len(stale)} fields fetched)")
+        
+        # Callers (graph nodes) mutate state in place
+        return {f: _clone_json(v) for f, v in working_set.values.items()}
 
 def serialize_for_logging(obj: Any) -> str:
     """
@@ -1405,6 +1578,10 @@ class CustomJSONEncoder(json.JSONEncoder):
         if isinstance(obj, datetime):
             return obj.isoformat()
         
+        # Typed state containers (RecordStore, registries)
+        if isinstance(obj, BaseModel):
+            return obj.model_dump()
+        
         # Handle any object with __dict__
         if hasattr(obj, "__dict__"):
             return obj.__dict__
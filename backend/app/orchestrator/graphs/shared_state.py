@@ -7,9 +7,10 @@ Architecture:
 - Internal models: Pydantic BaseModel (for validation/structure)
 - Best of both worlds: LangGraph compatibility + validation
 """
-from typing import TypedDict, List, Dict, Any, Optional, Set, Literal
+from typing import TypedDict, List, Dict, Any, Optional, Set, Literal, Iterator
+from collections.abc import Mapping
 from datetime import datetime, timezone
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -74,6 +75,168 @@ class RowOperation(BaseModel):
         extra = "allow"
 
 
+class ProductStatistics(BaseModel):
+    """Per-product aggregates (internal model)"""
+    review_count: int = 0
+    rated_count: int = 0
+    rating_sum: float = 0.0
+    verified_count: int = 0
+    
+    class Config:
+        extra = "forbid"
+    
+    @property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.rated_count if self.rated_count else 0.0
+
+
+class RecordStatistics(BaseModel):
+    """
+    Precomputed aggregates over the current record set
+    
+    Built in a single pass when records enter the RecordStore and kept
+    in sync by apply_row_modification / apply_enrichment, so downstream
+    tools read counts instead of re-scanning every record.
+    """
+    total: int = 0
+    
+    # Ratings
+    rated_count: int = 0
+    rating_sum: float = 0.0
+    rating_counts: Dict[int, int] = Field(default_factory=dict)
+    
+    # Review metadata
+    verified_count: int = 0
+    body_length_sum: int = 0
+    headline_length_sum: int = 0
+    
+    # Sentiment (filled once a sentiment enrichment exists)
+    sentiment_counts: Dict[str, int] = Field(default_factory=dict)
+    sentiment_compared: int = 0
+    sentiment_aligned: int = 0
+    
+    products: Dict[str, ProductStatistics] = Field(default_factory=dict)
+    
+    class Config:
+        extra = "forbid"
+    
+    @staticmethod
+    def _is_aligned(rating: Any, sentiment: str) -> bool:
+        """Expected alignment between star rating and sentiment label"""
+        if rating >= 4:
+            return sentiment == 'positive'
+        if rating == 3:
+            return sentiment == 'neutral'
+        return sentiment == 'negative'
+    
+    @classmethod
+    def from_records(
+        cls,
+        records: List[Dict[str, Any]],
+        sentiment_lookup: Optional[Dict[str, str]] = None
+    ) -> "RecordStatistics":
+        """
+        Build statistics in one pass
+        
+        Args:
+            records: Base or enriched records
+            sentiment_lookup: review_id -> sentiment (from EnrichmentRegistry);
+                falls back to a 'sentiment' key on the record itself
+        """
+        stats = cls(total=len(records))
+        rating_counts = stats.rating_counts
+        sentiment_counts = stats.sentiment_counts
+        products = stats.products
+        
+        for record in records:
+            rating = record.get('star_rating')
+            verified = bool(record.get('verified_purchase'))
+            
+            if rating:
+                stats.rated_count += 1
+                stats.rating_sum += rating
+                rating_counts[rating] = rating_counts.get(rating, 0) + 1
+            if verified:
+                stats.verified_count += 1
+            stats.body_length_sum += len(record.get('review_body') or '')
+            stats.headline_length_sum += len(record.get('review_headline') or '')
+            
+            product_id = record.get('product_id')
+            if product_id is not None:
+                product = products.get(str(product_id))
+                if product is None:
+                    product = products[str(product_id)] = ProductStatistics()
+                product.review_count += 1
+                if rating:
+                    product.rated_count += 1
+                    product.rating_sum += rating
+                if verified:
+                    product.verified_count += 1
+            
+            sentiment = None
+            if sentiment_lookup:
+                sentiment = sentiment_lookup.get(record.get('review_id'))
+            if sentiment is None:
+                sentiment = record.get('sentiment')
+            if sentiment:
+                sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
+                if rating:
+                    stats.sentiment_compared += 1
+                    if cls._is_aligned(rating, sentiment):
+                        stats.sentiment_aligned += 1
+        
+        return stats
+    
+    def apply_sentiment(
+        self,
+        labels: Dict[str, str],
+        previous: Dict[str, str],
+        ratings: Dict[str, Any]
+    ):
+        """
+        Fold new sentiment labels into the counts
+        
+        Args:
+            labels: review_id -> new sentiment label
+            previous: review_id -> label that is being replaced (if any)
+            ratings: review_id -> star rating for records in the store
+        """
+        for review_id, sentiment in labels.items():
+            if review_id not in ratings:
+                continue
+            rating = ratings[review_id]
+            
+            old = previous.get(review_id)
+            if old:
+                self.sentiment_counts[old] = self.sentiment_counts.get(old, 0) - 1
+                if rating:
+                    self.sentiment_compared -= 1
+                    if self._is_aligned(rating, old):
+                        self.sentiment_aligned -= 1
+            
+            if sentiment:
+                self.sentiment_counts[sentiment] = self.sentiment_counts.get(sentiment, 0) + 1
+                if rating:
+                    self.sentiment_compared += 1
+                    if self._is_aligned(rating, sentiment):
+                        self.sentiment_aligned += 1
+    
+    @property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.rated_count if self.rated_count else 0.0
+    
+    @property
+    def has_sentiment(self) -> bool:
+        return any(count > 0 for count in self.sentiment_counts.values())
+    
+    def top_products(self, limit: int = 5) -> List[tuple[str, ProductStatistics]]:
+        """Products with the most reviews (ties broken by product id)"""
+        return sorted(
+            self.products.items(),
+            key=lambda item: (-item[1].review_count, item[0])
+        )[:limit]
+
+
 class RecordStore(BaseModel):
     """
     Internal storage model with product title deduplication
@@ -87,6 +250,15 @@ class RecordStore(BaseModel):
     total: int = 0
     category: str = ""
     
+    # Incremented whenever the record set changes (cache key for enriched views)
+    version: int = 0
+    
+    # Precomputed aggregates (see RecordStatistics)
+    statistics: RecordStatistics = Field(default_factory=RecordStatistics)
+    
+    # Materialised enriched records of this live store (see get_all_enriched_records)
+    _enriched: Optional[tuple] = PrivateAttr(default=None)
+    
     class Config:
         extra = "forbid"
     
@@ -111,9 +283,15 @@ class RecordStore(BaseModel):
         self.total = len(optimized_records)
         self.category = category
         self.record_index = {r['review_id']: idx for idx, r in enumerate(optimized_records)}
+        self.statistics = RecordStatistics.from_records(optimized_records)
+        self.version += 1
         
     
-    def update_records(self, new_records: List[Dict[str, Any]]) -> RowOperation:
+    def update_records(
+        self,
+        new_records: List[Dict[str, Any]],
+        sentiment_lookup: Optional[Dict[str, str]] = None
+    ) -> RowOperation:
         """
         Update records (for filter/clean operations)
         
@@ -128,6 +306,8 @@ class RecordStore(BaseModel):
         self.records = new_records
         self.total = len(new_records)
         self.record_index = {r['review_id']: idx for idx, r in enumerate(new_records)}
+        self.statistics = RecordStatistics.from_records(new_records, sentiment_lookup)
+        self.version += 1
         
         rows_after = self.total
         rows_removed = rows_before - rows_after
@@ -156,18 +336,108 @@ class RecordStore(BaseModel):
                 'product_title': self.product_titles[record['product_id']]
             }
         return record
+    
+    def get_ratings(self, review_ids) -> Dict[str, Any]:
+        """review_id -> star_rating for the given ids present in the store"""
+        ratings = {}
+        for review_id in review_ids:
+            idx = self.record_index.get(review_id)
+            if idx is not None:
+                ratings[review_id] = self.records[idx].get('star_rating')
+        return ratings
 
 
 class ColumnEnrichment(BaseModel):
-    """Column enrichment (internal model)"""
+    """
+    Column enrichment (internal model)
+    
+    Stored column-wise: columns[column][review_id] -> value. Tools still
+    produce row-wise `column_data` ({review_id: {column: value}}), which is
+    converted on construction (also for state written before this layout).
+    
+    Columns are keyed by review_id rather than held as arrays aligned to
+    RecordStore.records: filter/sample operations replace and reorder the
+    records after an enrichment was added, which would invalidate positions.
+    """
     tool_id: str
     tool_name: str
     columns_added: List[str]
-    column_data: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    columns: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
     timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     
     class Config:
         extra = "forbid"
+    
+    @model_validator(mode='before')
+    @classmethod
+    def _rows_to_columns(cls, data: Any) -> Any:
+        if isinstance(data, dict) and 'column_data' in data:
+            data = dict(data)
+            columns: Dict[str, Dict[str, Any]] = {}
+            for review_id, row in (data.pop('column_data') or {}).items():
+                for column, value in row.items():
+                    columns.setdefault(column, {})[review_id] = value
+            data.setdefault('columns', columns)
+        return data
+
+
+class EnrichedRecordView(Mapping):
+    """
+    Read-only enriched record resolved lazily (no copy)
+    
+    Chains lookups: enrichment columns (latest tool first) -> product
+    title -> base record. Use to_dict() to materialise.
+    """
+    __slots__ = ('_base', '_review_id', '_product_title', '_sources')
+    
+    def __init__(
+        self,
+        base: Dict[str, Any],
+        sources: Dict[str, List[Dict[str, Any]]],
+        product_title: Optional[str] = None
+    ):
+        self._base = base
+        self._review_id = base.get('review_id')
+        self._product_title = product_title
+        self._sources = sources
+    
+    def _lookup(self, key: str):
+        for values in self._sources.get(key, ()):
+            if self._review_id in values:
+                return True, values[self._review_id]
+        return False, None
+    
+    def __getitem__(self, key: str) -> Any:
+        found, value = self._lookup(key)
+        if found:
+            return value
+        if key == 'product_title' and self._product_title is not None:
+            return self._product_title
+        return self._base[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        if self._product_title is not None and 'product_title' not in self._base:
+            yield 'product_title'
+        for column in self._sources:
+            if column not in self._base and column != 'product_title' and self._lookup(column)[0]:
+                yield column
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialise as a plain dict (single pass over columns)"""
+        record = dict(self._base)
+        if self._product_title is not None:
+            record['product_title'] = self._product_title
+        review_id = self._review_id
+        for column, sources in self._sources.items():
+            for values in sources:
+                if review_id in values:
+                    record[column] = values[review_id]
+                    break
+        return record
 
 
 class EnrichmentRegistry(BaseModel):
@@ -175,6 +445,11 @@ class EnrichmentRegistry(BaseModel):
     enrichments: Dict[str, ColumnEnrichment] = Field(default_factory=dict)
     execution_order: List[str] = Field(default_factory=list)
     
+    # Incremented on every add (cache key for enriched views)
+    version: int = 0
+    
+    _sources: Optional[Dict[str, List[Dict[str, Any]]]] = PrivateAttr(default=None)
+    
     class Config:
         extra = "forbid"
     
@@ -182,18 +457,44 @@ class EnrichmentRegistry(BaseModel):
         self.enrichments[enrichment.tool_id] = enrichment
         if enrichment.tool_id not in self.execution_order:
             self.execution_order.append(enrichment.tool_id)
+        self.version += 1
+        self._sources = None
+    
+    def get_column_sources(self) -> Dict[str, List[Dict[str, Any]]]:
+        """column -> value maps, most recent enrichment first"""
+        if self._sources is None:
+            sources: Dict[str, List[Dict[str, Any]]] = {}
+            for tool_id in reversed(self.execution_order):
+                enrichment = self.enrichments.get(tool_id)
+                if not enrichment:
+                    continue
+                for column, values in enrichment.columns.items():
+                    sources.setdefault(column, []).append(values)
+            self._sources = sources
+        return self._sources
+    
+    def view(
+        self,
+        base_record: Dict[str, Any],
+        product_title: Optional[str] = None
+    ) -> EnrichedRecordView:
+        """Lazy enriched view over a base record"""
+        return EnrichedRecordView(base_record, self.get_column_sources(), product_title)
     
     def get_enriched_record(self, base_record: Dict[str, Any]) -> Dict[str, Any]:
         """Build enriched record on-demand"""
-        review_id = base_record['review_id']
-        enriched = base_record.copy()
-        
-        for tool_id in self.execution_order:
-            enrichment = self.enrichments.get(tool_id)
-            if enrichment and review_id in enrichment.column_data:
-                enriched.update(enrichment.column_data[review_id])
+        return self.view(base_record).to_dict()
+    
+    def get_column_values(self, column: str) -> Dict[str, Any]:
+        """review_id -> current value of one enriched column (later tools win)"""
+        sources = self.get_column_sources().get(column, [])
+        if len(sources) == 1:
+            return sources[0]
         
-        return enriched
+        values = {}
+        for source in reversed(sources):
+            values.update(source)
+        return values
 
 
 class ToolResult(BaseModel):
@@ -218,6 +519,9 @@ class ResultsRegistry(BaseModel):
     
     def add(self, result: ToolResult):
         self.results[result.tool_id] = result
+    
+    def get_result(self, tool_id: str) -> Optional[ToolResult]:
+        return self.results.get(tool_id)
 
 
 # ============================================================
@@ -277,17 +581,20 @@ class SharedWorkflowState(TypedDict, total=False):
     # Current working dataset with memory optimization
     # Uses product title deduplication (5% memory savings)
     # Mutable - gets replaced by filter/clean operations
-    record_store: Optional[Dict[str, Any]]          # RecordStore.model_dump()
+    # Typed containers: dict when loaded from Redis/checkpoint, validated into
+    # the model on first access (get_record_store etc.) and kept as the live
+    # object for the rest of the run; serialized only when persisted
+    record_store: Optional[Dict[str, Any] | RecordStore]
     
     # Registry of column enrichments (sentiment, insights, etc.)
     # Additive-only - enrichments don't modify existing rows
     # Stored separately for efficient updates and reconstruction
-    enrichment_registry: Dict[str, Any]             # EnrichmentRegistry.model_dump()
+    enrichment_registry: Dict[str, Any] | EnrichmentRegistry
     
     # Registry of tool execution results
     # Stores summary and detailed output from each tool
     # Used for final result extraction and analysis
-    results_registry: Dict[str, Any]                # ResultsRegistry.model_dump()
+    results_registry: Dict[str, Any] | ResultsRegistry
     
     # Analysis outputs (NEW)
     sentiment_statistics: Optional[Dict[str, Any]]  # Sentiment distribution stats
@@ -493,11 +800,13 @@ def initialize_records(
         state['data_source'] = data_source.model_dump()
     
     # Create Pydantic model for validation + deduplication
-    record_store = RecordStore()
+    # (version continues from any previous store so cached views never collide)
+    previous = get_record_store(state)
+    record_store = RecordStore(version=previous.version if previous else 0)
     record_store.initialize(records, category)
     
-    # Store as dict in state (LangGraph expects dicts)
-    state['record_store'] = record_store.model_dump()
+    # Live object in state; serialized only when persisted
+    state['record_store'] = record_store
     
     # Update metadata
     state['base_record_ids'] = list(r['review_id'] for r in records)
@@ -505,27 +814,86 @@ def initialize_records(
     state['base_columns'] = list(records[0].keys()) if records else list()
 
 
+def _get_state_model(state: Dict[str, Any], field: str, model_cls: type[BaseModel]):
+    """
+    Typed container for a state field, validated at most once
+    
+    Values loaded from Redis/checkpoints are dicts; the first access
+    validates them and replaces the dict with the model, later accesses
+    return the same object without re-validation.
+    """
+    value = state.get(field)
+    if value is None or isinstance(value, model_cls):
+        return value
+    
+    model = model_cls.model_validate(value)
+    state[field] = model
+    return model
+
+
 def get_record_store(state: SharedWorkflowState) -> Optional[RecordStore]:
     """
-    Reconstruct RecordStore from state dict
+    Get the live RecordStore from state
     
-    Pattern: State stores dicts, but we work with Pydantic models for validation
+    Pattern: Validated once at the boundary, then used as a typed object
     """
     if not state.get('record_store'):
         return None
     
-    # Reconstruct from dict
-    return RecordStore(**state['record_store'])
+    return _get_state_model(state, 'record_store', RecordStore)
+
+
+def get_record_statistics(
+    record_store: Optional[Dict[str, Any] | RecordStore],
+    records: List[Dict[str, Any]]
+) -> RecordStatistics:
+    """
+    Precomputed statistics for tool input
+    
+    Uses the aggregates stored with the record store; rebuilds them from
+    `records` only when they are missing or do not match the record count
+    (e.g. state written before statistics existed).
+    """
+    if isinstance(record_store, RecordStore):
+        stats = record_store.statistics
+    else:
+        stats_dict = (record_store or {}).get('statistics')
+        stats = RecordStatistics(**stats_dict) if stats_dict else None
+    
+    if stats is not None and stats.total == len(records):
+        return stats
+    
+    return RecordStatistics.from_records(records)
 
 
 def get_enrichment_registry(state: SharedWorkflowState) -> EnrichmentRegistry:
-    """Reconstruct EnrichmentRegistry from state dict"""
-    return EnrichmentRegistry(**state['enrichment_registry'])
+    """Get the live EnrichmentRegistry from state (created if missing)"""
+    if state.get('enrichment_registry') is None:
+        state['enrichment_registry'] = EnrichmentRegistry()
+    return _get_state_model(state, 'enrichment_registry', EnrichmentRegistry)
 
 
 def get_results_registry(state: SharedWorkflowState) -> ResultsRegistry:
-    """Reconstruct ResultsRegistry from state dict"""
-    return ResultsRegistry(**state['results_registry'])
+    """Get the live ResultsRegistry from state (created if missing)"""
+    if state.get('results_registry') is None:
+        state['results_registry'] = ResultsRegistry()
+    return _get_state_model(state, 'results_registry', ResultsRegistry)
+
+
+def serialize_state_value(value: Any) -> Any:
+    """Plain JSON-compatible form of a state value (models are dumped)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return value
+
+
+def serialize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Snapshot state for persistence (checkpoints, Redis)
+    
+    Typed containers are dumped here - the only place they are serialized.
+    """
+    return {key: serialize_state_value(value) for key, value in state.items()}
 
 
 def apply_enrichment(
@@ -539,11 +907,9 @@ def apply_enrichment(
     Apply column enrichment
     
     Pattern:
-    1. Reconstruct Pydantic model from state dict
-    2. Apply changes to model
-    3. Store back as dict
+    1. Get live typed containers from state
+    2. Apply changes in place
     """
-    # Reconstruct
     enrichment_registry = get_enrichment_registry(state)
     
     # Apply change
@@ -553,10 +919,23 @@ def apply_enrichment(
         columns_added=columns_added,
         column_data=column_data
     )
-    enrichment_registry.add(enrichment)
     
-    # Store back as dict
-    state['enrichment_registry'] = enrichment_registry.model_dump()
+    # Keep precomputed sentiment aggregates in sync
+    record_store = get_record_store(state) if 'sentiment' in columns_added else None
+    if record_store:
+        previous = enrichment_registry.get_column_values('sentiment')
+        labels = {
+            review_id: row['sentiment']
+            for review_id, row in column_data.items()
+            if 'sentiment' in row
+        }
+        record_store.statistics.apply_sentiment(
+            labels=labels,
+            previous=previous,
+            ratings=record_store.get_ratings(labels.keys())
+        )
+    
+    enrichment_registry.add(enrichment)
 
 
 def apply_row_modification(
@@ -593,14 +972,16 @@ def apply_row_modification(
             filtered, 'filter', {'min_rating': 4}
         )
     """
-    # Reconstruct record store
+    # Live record store (modified in place)
     record_store = get_record_store(state)
     if not record_store:
         logger.error("No record store to modify!")
         return
     
     # Apply row update (returns operation for audit)
-    operation = record_store.update_records(filtered_records)
+    # Statistics are rebuilt in the same pass, keeping existing sentiment labels
+    sentiment_lookup = get_enrichment_registry(state).get_column_values('sentiment')
+    operation = record_store.update_records(filtered_records, sentiment_lookup)
     
     # Update operation metadata
     operation.tool_id = tool_id
@@ -609,9 +990,6 @@ def apply_row_modification(
     operation.criteria = criteria
     operation.execution_time_ms = execution_time_ms
     
-    # Store back to state
-    state['record_store'] = record_store.model_dump()
-    
     # Track operation in history
     state['row_operation_history'].append(operation.model_dump())
     
@@ -621,37 +999,58 @@ def get_input_data(state: SharedWorkflowState) -> Dict[str, Any]:
     return state.get('input_data', {})
 
 
-def get_all_enriched_records(state: SharedWorkflowState, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+def get_enriched_views(state: SharedWorkflowState, limit: Optional[int] = None) -> List[EnrichedRecordView]:
     """
-    Get all enriched records with product titles reconstructed
+    Get lazy enriched views over the current records (no copies)
     
-    Pattern: Reconstruct models, build records, return
+    Use for read-only access; see get_all_enriched_records for dicts.
     """
     record_store = get_record_store(state)
     if not record_store:
         return []
     
     enrichment_registry = get_enrichment_registry(state)
+    product_titles = record_store.product_titles
+    base_records = record_store.records[:limit] if limit else record_store.records
     
-    records = []
-    for idx, base_record in enumerate(record_store.records):
-        if limit and idx >= limit:
-            break
-        
-        # Reconstruct product title
-        if 'product_id' in base_record and base_record['product_id'] in record_store.product_titles:
-            base_with_title = {
-                **base_record,
-                'product_title': record_store.product_titles[base_record['product_id']]
-            }
-        else:
-            base_with_title = base_record
-        
-        # Add enrichments
-        enriched = enrichment_registry.get_enriched_record(base_with_title)
-        records.append(enriched)
+    return [
+        enrichment_registry.view(base_record, product_titles.get(base_record.get('product_id')))
+        for base_record in base_records
+    ]
+
+
+def get_all_enriched_records(state: SharedWorkflowState, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Get all enriched records with product titles reconstructed
     
-    return records
+    Materialises the enriched views in one pass. The result is cached on
+    the live RecordStore for (record version, enrichment registry and its
+    version, limit), so repeated tool inputs within one run skip the merge.
+    State reloaded from Redis is validated into new objects and starts
+    uncached: version counters alone repeat across runs that start from the
+    same stored state. Callers get their own shallow copies because tools
+    annotate records in place.
+    """
+    record_store = get_record_store(state)
+    if not record_store:
+        return []
+    
+    enrichment_registry = get_enrichment_registry(state)
+    cache_key = (record_store.version, enrichment_registry.version, limit)
+    
+    cached = record_store._enriched
+    if cached is not None and cached[0] is enrichment_registry and cached[1] == cache_key:
+        records = cached[2]
+    else:
+        product_titles = record_store.product_titles
+        base_records = record_store.records[:limit] if limit else record_store.records
+        records = [
+            enrichment_registry.view(base_record, product_titles.get(base_record.get('product_id'))).to_dict()
+            for base_record in base_records
+        ]
+        record_store._enriched = (enrichment_registry, cache_key, records)
+    
+    return [dict(record) for record in records]
 
 
 def get_working_data_dict(state: SharedWorkflowState) -> Dict[str, Any]:
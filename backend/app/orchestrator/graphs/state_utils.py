@@ -34,8 +34,10 @@ from .shared_state import (
     get_row_operation_summary,
     initialize_records,
     RowOperation,
-    ResultsRegistry,
-    ToolResult
+    ToolResult,
+    get_record_store,
+    get_results_registry,
+    EnrichmentRegistry
 )
 from datetime import datetime, timezone
 from app.schemas.reviews import (
@@ -43,6 +45,7 @@ from app.schemas.reviews import (
     batch_to_enhanced_study_format
 )
 
+from app.core import serialization
 from app.orchestrator.tools.registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
@@ -79,12 +82,11 @@ def _log_to_file(data: dict | str, filename: str = None):
         filepath = log_dir / filename
         
         # Write results to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            if isinstance(data, str):
+        if isinstance(data, str):
+            with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(data)
-            else:
-                import json
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            serialization.dump_to_file(data, filepath)
         
         return filepath
     
@@ -380,7 +382,8 @@ async def process_tool_result(
                 # DATA TOOL (filter/clean/sort) - Track row modification
                 if result.get('filtered_records') is not None:
                     # Calculate rows before/after for RowOperation
-                    rows_before = len(state.get('record_store',{}).get('records', []))
+                    record_store = get_record_store(state)
+                    rows_before = record_store.total if record_store else 0
                     rows_after = len(result.get('filtered_records'))
                     rows_removed = rows_before - rows_after
                     
@@ -482,7 +485,7 @@ async def process_tool_result(
                 })
                 
                 # Store result in results_registry
-                results_registry = ResultsRegistry(**state.get('results_registry'))
+                results_registry = get_results_registry(state)
                 tool_result = ToolResult(
                     tool_id=tool_id,
                     tool_name=tool_name,
@@ -491,7 +494,6 @@ async def process_tool_result(
                     execution_time_ms=result.get('execution_time_ms', 0)
                 )
                 results_registry.add(tool_result)
-                state['results_registry'] = results_registry.model_dump()
                 
                 # Update results_registry in Redis
                 state_manager.update_state_field(
@@ -733,7 +735,11 @@ def get_tool_input_summary(input_data: Dict[str, Any]) -> str:
     records = len(input_data.get('records', []))
     category = input_data.get('category', 'unknown')
     operations = len(input_data.get('row_operation_history', []))
-    enrichments = len(input_data.get('enrichment_registry', {}).get('enrichments', {}))
+    # Read-only: get_enrichment_registry would store a registry in input_data
+    registry = input_data.get('enrichment_registry')
+    if not isinstance(registry, EnrichmentRegistry):
+        registry = EnrichmentRegistry.model_validate(registry or {})
+    enrichments = len(registry.enrichments)
     
     return (
         f"Input: {records} records, "
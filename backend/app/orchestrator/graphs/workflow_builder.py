@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 
 from .shared_state import (
     SharedWorkflowState,
-    ResultsRegistry
+    get_results_registry
 )
 from app.database import get_db_context
 
@@ -20,6 +20,7 @@ from .state_utils import (
     cleanup_result_for_response
 )
 from app.orchestrator.llm.client_langchain import get_llm_client
+from app.orchestrator.node_tracing import node_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -170,19 +171,21 @@ class WorkflowBuilderGraph:
             step_start_time = time.time()
 
             condition = state.get("condition",condition)
+            trace = node_tracer.start_node(execution_id, node_id, template_id)
 
-            # Atomic increment
-            new_step = self.state_manager.increment_field(execution_id, 'step_number', 1)
-            state['step_number'] = new_step
-            
-            # Single field update
-            self.state_manager.update_state_field(execution_id, 'current_node', node_id)
+            with trace.span('redis.step_update'):
+                # Atomic increment
+                new_step = self.state_manager.increment_field(execution_id, 'step_number', 1)
+                state['step_number'] = new_step
+                
+                # Single field update
+                self.state_manager.update_state_field(execution_id, 'current_node', node_id)
             
             logger.info(f"Executing node: {node_id} ({node_label}) - Step {new_step}")
             
             # Checkpoint: node start (buffered)
             if self.state_manager.should_checkpoint(state['condition'], 'node_start'):
-                with get_db_context() as db:
+                with trace.span('checkpoint.node_start'), get_db_context('bulk') as db:
                     await self.state_manager.checkpoint_to_db(
                         db=db,
                         execution_id=execution_id,
@@ -195,31 +198,33 @@ class WorkflowBuilderGraph:
             
             # Send WebSocket update (batched)
             if self.websocket_manager:
-                await self.websocket_manager.send_node_progress(
-                    session_id=state['session_id'],
-                    execution_id=execution_id,
-                    condition=condition,
-                    progress_type='start',
-                    status='start',
-                    data={
-                        'node_id': node_id,
-                        'node_label': node_label,
-                        'step_number': new_step
-                    }
-                )
+                with trace.span('websocket.start'):
+                    await self.websocket_manager.send_node_progress(
+                        session_id=state['session_id'],
+                        execution_id=execution_id,
+                        condition=condition,
+                        progress_type='start',
+                        status='start',
+                        data={
+                            'node_id': node_id,
+                            'node_label': node_label,
+                            'step_number': new_step
+                        }
+                    )
             
             # Prepare input data with full state context
             try:
 
                 logger.info({'node':node, 'tool': tool})
                 # Get working data using helper
-                input_data = prepare_tool_input(
-                    state=state,
-                    config=node.get('data', {}).get('config'),
-                    condition=condition,
-                    session_id=state['session_id'],
-                    execution_id=execution_id
-                )
+                with trace.span('prepare_input'):
+                    input_data = prepare_tool_input(
+                        state=state,
+                        config=node.get('data', {}).get('config'),
+                        condition=condition,
+                        session_id=state['session_id'],
+                        execution_id=execution_id
+                    )
                 
                 logger.debug(
                     f"Tool input: {input_data['total']} records, "
@@ -241,34 +246,37 @@ class WorkflowBuilderGraph:
             
             # ==================== EXECUTE TOOL ====================
             try:
-                await self.websocket_manager.send_node_progress(
-                    session_id=state['session_id'],
-                    execution_id=execution_id,
-                    condition=condition,
-                    progress_type='progress',
-                    status='running',
-                    data={
-                        'node_id': node_id,
-                        'node_label': node_label,
-                        'step_number': new_step
-                    }
-                )
+                with trace.span('websocket.progress'):
+                    await self.websocket_manager.send_node_progress(
+                        session_id=state['session_id'],
+                        execution_id=execution_id,
+                        condition=condition,
+                        progress_type='progress',
+                        status='running',
+                        data={
+                            'node_id': node_id,
+                            'node_label': node_label,
+                            'step_number': new_step
+                        }
+                    )
 
                 # Execute tool with prepared input
-                result = await tool.run(input_data)
+                with trace.span('tool.run'):
+                    result = await tool.run(input_data)
 
                 # ==================== PROCESS RESULT ====================
-                result = await process_tool_result(
-                    state=state,
-                    result=result,
-                    tool_name=node_label,
-                    tool_id=template_id,
-                    tool_category=None,  # Will be inferred from registry
-                    condition=condition,
-                    registry=self.registry,
-                    websocket_manager= self.websocket_manager,
-                    state_manager=self.state_manager
-                )
+                with trace.span('process_result'):
+                    result = await process_tool_result(
+                        state=state,
+                        result=result,
+                        tool_name=node_label,
+                        tool_id=template_id,
+                        tool_category=None,  # Will be inferred from registry
+                        condition=condition,
+                        registry=self.registry,
+                        websocket_manager= self.websocket_manager,
+                        state_manager=self.state_manager
+                    )
                 
                 # Check for errors and raise immediately
                 if state['status'] == 'error' or state.get('errors'):
@@ -278,51 +286,55 @@ class WorkflowBuilderGraph:
                 
                 # Update Redis with modified state fields
                 # (process_tool_result already updated state dict)
-                self.state_manager.update_state_fields(execution_id, {
-                    'record_store': state.get('record_store'),
-                    'enrichment_registry': state.get('enrichment_registry'),
-                    'results_registry': state.get('results_registry'),
-                    'row_operation_history': state.get('row_operation_history'),
-                    'data_source': state.get('data_source'),
-                })
+                with trace.span('redis.state_sync'):
+                    self.state_manager.update_state_fields(execution_id, {
+                        'record_store': state.get('record_store'),
+                        'enrichment_registry': state.get('enrichment_registry'),
+                        'results_registry': state.get('results_registry'),
+                        'row_operation_history': state.get('row_operation_history'),
+                        'data_source': state.get('data_source'),
+                    })
                 
                 logger.info(f"Node {node_id} completed successfully")
                 step_time = int((time.time() - step_start_time) * 1000)
 
                 # Batch field updates
-                self.state_manager.update_state_fields(execution_id, {
-                    'last_step_at': datetime.now(timezone.utc).isoformat(),
-                    'total_time_ms': state.get('total_time_ms', 0) + step_time
-                })
+                with trace.span('redis.timing_update'):
+                    self.state_manager.update_state_fields(execution_id, {
+                        'last_step_at': datetime.now(timezone.utc).isoformat(),
+                        'total_time_ms': state.get('total_time_ms', 0) + step_time
+                    })
 
                 state['total_time_ms'] = state.get('total_time_ms', 0) + step_time
                 state['last_step_at'] = datetime.now(timezone.utc).isoformat()            
 
-                cleaned_result = cleanup_result_for_response(result)                    
+                with trace.span('cleanup_result'):
+                    cleaned_result = cleanup_result_for_response(result)
 
                 execution_time_ms = int((time.time() - start_time) * 1000)
 
                 # Send success event
                 if self.websocket_manager:
-                    await self.websocket_manager.send_node_progress(
-                        session_id = state['session_id'],
-                        execution_id = execution_id,
-                        condition = condition,
-                        progress_type='end',
-                        status='completed',
-                        data={
-                            'success': cleaned_result.pop('success', False),
-                            'node_id': node_id,
-                            'node_label': node_label,
-                            'step_number': state['step_number'],
-                            'results': cleaned_result,
-                            'execution_time_ms': execution_time_ms
-                        }
-                    )
+                    with trace.span('websocket.end'):
+                        await self.websocket_manager.send_node_progress(
+                            session_id = state['session_id'],
+                            execution_id = execution_id,
+                            condition = condition,
+                            progress_type='end',
+                            status='completed',
+                            data={
+                                'success': cleaned_result.pop('success', False),
+                                'node_id': node_id,
+                                'node_label': node_label,
+                                'step_number': state['step_number'],
+                                'results': cleaned_result,
+                                'execution_time_ms': execution_time_ms
+                            }
+                        )
 
                 # Checkpoint: node end
                 if self.state_manager.should_checkpoint(state['condition'], 'node_end'):
-                    with get_db_context() as db:
+                    with trace.span('checkpoint.node_end'), get_db_context('bulk') as db:
                         await self.state_manager.checkpoint_to_db(
                             db=db,
                             execution_id=execution_id,
@@ -376,9 +388,13 @@ class WorkflowBuilderGraph:
                 
                 # Mark execution as failed
                 state['status'] = 'error'
+                trace.status = 'error'
                 
                 # Re-raise to stop workflow execution
                 raise
+
+            finally:
+                trace.finish()
         
             return state
         
@@ -613,7 +629,7 @@ class WorkflowBuilderGraph:
         def condition_router(state: SharedWorkflowState) -> str:
             """Route based on condition evaluation"""
             # Get condition result from node execution
-            results_registry = ResultsRegistry(**state['results_registry'])
+            results_registry = get_results_registry(state)
             node_result = results_registry.get_result(node_id)
             
             if node_result and node_result.summary.get('condition_met'):
@@ -29,6 +29,7 @@ from langchain_core.callbacks.base import AsyncCallbackHandler
 from pydantic import BaseModel
 
 from app.configs.config import settings
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_TOKENS
 from .circuit_breaker_enhanced import circuit_breaker_manager, CircuitBreakerOpen, ToolType
 
 logger = logging.getLogger(__name__)
@@ -155,6 +156,7 @@ class CircuitBreakerProxy:
         """
         self.total_calls += 1
         start_time = time.time()
+        outcome = 'error'
         
         
         # Convert dict messages to BaseMessage if needed
@@ -176,6 +178,9 @@ class CircuitBreakerProxy:
             if hasattr(result, 'response_metadata'):
                 token_usage = result.response_metadata.get('token_usage', {})
                 self.total_tokens += token_usage.get('total_tokens', 0)
+                LLM_TOKENS.labels(self.tool_name, 'prompt').inc(token_usage.get('prompt_tokens') or 0)
+                LLM_TOKENS.labels(self.tool_name, 'completion').inc(token_usage.get('completion_tokens') or 0)
+            outcome = 'ok'
             
             elapsed_ms = int((time.time() - start_time) * 1000)
             logger.debug(
@@ -187,6 +192,7 @@ class CircuitBreakerProxy:
             
         except CircuitBreakerOpen as e:
             # Circuit breaker rejected call
+            outcome = 'rejected'
             self.circuit_breaker_rejections += 1
             logger.error(
                 f"Circuit breaker blocked {self.tool_name}: {e.message}"
@@ -201,6 +207,9 @@ class CircuitBreakerProxy:
                     'circuit_breaker_state': self.circuit_breaker.get_state()
                 }
             )
+        
+        finally:
+            LLM_REQUEST_DURATION.labels(self.tool_name, outcome).observe(time.time() - start_time)
     
     async def _do_invoke(
         self,
@@ -0,0 +1,268 @@
+# backend/app/orchestrator/llm/prompt_budget.py
+"""
+Token-Budgeted Prompt Context Builder
+
+Tool prompts embed statistics, theme lists and review snippets whose size
+grows with the dataset. This module keeps that context inside a per-model
+token budget:
+
+- Tokens are counted with tiktoken when its encoding is bundled in
+  TIKTOKEN_CACHE_DIR (fetched at image build), otherwise with a calibrated
+  estimator; encodings are never downloaded at runtime
+- Sections are ranked by priority; lower-value sections are truncated
+  item by item, then dropped, until the context fits
+- Output depends only on the inputs (no timestamps, no randomness), so
+  identical data produces identical prompts and LLM prompt caches can hit
+
+Usage:
+    budget = PromptBudget.for_model(settings.llm_model)
+    context = budget.build([
+        PromptSection('overview', 'Dataset Overview:', ['  Total: 120'], priority=0, required=True),
+        PromptSection('themes', 'Main Themes:', theme_lines, priority=2),
+    ])
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from app.configs.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fallback encoding for models tiktoken does not know (gpt-4o / gpt-5 family)
+DEFAULT_ENCODING = "o200k_base"
+
+# Bundled encodings: tiktoken cache layout (file name = sha1 of the blob path),
+# filled at image build (see Dockerfile)
+TIKTOKEN_CACHE_DIR = settings.tiktoken_cache_dir or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "tiktoken_cache"
+)
+
+# Blob path and sha256 of the encodings the configured models use
+ENCODING_FILES = {
+    "o200k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+        "446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+    ),
+    "cl100k_base": (
+        "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+        "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+    ),
+}
+
+# Estimator calibration (o200k_base on English/German review text)
+CHARS_PER_TOKEN_ASCII = 4.0
+CHARS_PER_TOKEN_NON_ASCII = 2.5
+DIGITS_PER_TOKEN = 3
+
+TRUNCATION_MARKER = "  … ({omitted} more omitted)"
+
+_PIECE_PATTERN = re.compile(r"\d+|[^\W\d_]+|[^\w\s]|_")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Calibrated token estimate without a tokenizer
+
+    Splits text into words, digit runs and symbols, roughly the way BPE
+    pre-tokenizes, and costs each piece by length. Errs slightly high so
+    budgets hold when the real tokenizer is unavailable.
+    """
+    if not text:
+        return 0
+
+    tokens = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        if piece.isdigit():
+            tokens += math.ceil(len(piece) / DIGITS_PER_TOKEN)
+        elif piece.isascii():
+            tokens += math.ceil(len(piece) / CHARS_PER_TOKEN_ASCII)
+        else:
+            tokens += math.ceil(len(piece) / CHARS_PER_TOKEN_NON_ASCII)
+
+    # Line breaks are tokens of their own in chat prompts
+    return tokens + text.count("\n")
+
+
+def _is_bundled(encoding_name: str) -> bool:
+    """Encoding file present and intact in TIKTOKEN_CACHE_DIR (tiktoken re-downloads otherwise)"""
+    if encoding_name not in ENCODING_FILES:
+        return False
+    blob_path, expected_sha256 = ENCODING_FILES[encoding_name]
+    path = os.path.join(TIKTOKEN_CACHE_DIR, hashlib.sha1(blob_path.encode()).hexdigest())
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest() == expected_sha256
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: Optional[str] = None) -> Callable[[str], int]:
+    """
+    Token counter for a model
+
+    Uses tiktoken only if the model's encoding is bundled in
+    TIKTOKEN_CACHE_DIR, so the lookup never blocks on a download. Falls
+    back to estimate_tokens otherwise; the result is cached so the lookup
+    happens once per model.
+    """
+    model = model or settings.llm_model
+    try:
+        import tiktoken
+        from tiktoken.model import encoding_name_for_model
+
+        try:
+            encoding_name = encoding_name_for_model(model)
+        except KeyError:
+            encoding_name = DEFAULT_ENCODING
+
+        if not _is_bundled(encoding_name):
+            logger.info(
+                f"Prompt budget: encoding '{encoding_name}' not bundled in {TIKTOKEN_CACHE_DIR}, "
+                f"using estimator for {model}"
+            )
+            return estimate_tokens
+
+        os.environ["TIKTOKEN_CACHE_DIR"] = TIKTOKEN_CACHE_DIR
+        encoding = tiktoken.get_encoding(encoding_name)
+        logger.info(f"Prompt budget: using tiktoken encoding '{encoding.name}' for {model}")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+    except Exception as e:
+        logger.info(f"Prompt budget: tiktoken unavailable for {model} ({type(e).__name__}), using estimator")
+        return estimate_tokens
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens in text for the given model"""
+    return get_token_counter(model)(text)
+
+
+def get_context_budget(model: Optional[str] = None) -> int:
+    """Configured context token budget for a model"""
+    model = model or settings.llm_model
+    return settings.prompt_context_budgets.get(model, settings.prompt_context_budget)
+
+
+@dataclass
+class PromptSection:
+    """
+    One block of prompt context
+
+    Attributes:
+        name: Identifier (for logging)
+        header: Line(s) always emitted with the section
+        items: Body lines, most important first; truncated from the end
+        priority: Lower value = kept first when the budget is tight
+        required: Never dropped (items may still be truncated)
+    """
+    name: str
+    header: str = ""
+    items: List[str] = field(default_factory=list)
+    priority: int = 0
+    required: bool = False
+
+    def render(self, item_count: Optional[int] = None) -> str:
+        items = self.items if item_count is None else self.items[:item_count]
+        lines = [self.header] if self.header else []
+        lines.extend(items)
+        if item_count is not None and item_count < len(self.items):
+            lines.append(TRUNCATION_MARKER.format(omitted=len(self.items) - item_count))
+        return "\n".join(lines)
+
+
+class PromptBudget:
+    """
+    Fits ranked prompt sections into a token budget
+
+    Sections are admitted in priority order (ties keep their input
+    order). A section that does not fully fit keeps as many leading items
+    as the remaining budget allows; optional sections that cannot fit
+    their header are dropped. Output keeps the original section order.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        model: Optional[str] = None,
+        separator: str = "\n\n"
+    ):
+        self.max_tokens = max_tokens
+        self.model = model
+        self.separator = separator
+        self._count = get_token_counter(model)
+
+    @classmethod
+    def for_model(cls, model: Optional[str] = None, **kwargs) -> "PromptBudget":
+        """Budget configured for a model (settings.prompt_context_budgets)"""
+        return cls(max_tokens=get_context_budget(model), model=model, **kwargs)
+
+    def count(self, text: str) -> int:
+        return self._count(text)
+
+    def build(self, sections: List[PromptSection]) -> str:
+        """Render sections within the budget"""
+        separator_cost = self.count(self.separator)
+        remaining = self.max_tokens
+        rendered: dict[int, str] = {}
+        dropped: List[str] = []
+        truncated: List[str] = []
+
+        ranked = sorted(
+            enumerate(sections),
+            key=lambda pair: (not pair[1].required, pair[1].priority, pair[0])
+        )
+
+        for position, section in ranked:
+            full = section.render()
+            if not full:
+                continue
+
+            available = remaining - (separator_cost if rendered else 0)
+            text = full
+            if self.count(full) > available:
+                text = self._truncate(section, available)
+                if text is None and section.required:
+                    # Required sections always keep their header
+                    text = section.render(item_count=0) if section.items else full
+                if text is None:
+                    dropped.append(section.name)
+                    continue
+                truncated.append(section.name)
+
+            remaining = available - self.count(text)
+            rendered[position] = text
+
+        if dropped or truncated:
+            logger.debug(
+                f"Prompt budget {self.max_tokens}: truncated={truncated}, dropped={dropped}"
+            )
+
+        return self.separator.join(rendered[position] for position in sorted(rendered))
+
+    def _truncate(self, section: PromptSection, available: int) -> Optional[str]:
+        """Largest item prefix that fits, or None if not even one item fits"""
+        if available <= 0 or not section.items:
+            return None
+
+        # Binary search on item count (token cost is monotonic in prefix length)
+        low, high = 0, len(section.items) - 1
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            if self.count(section.render(item_count=mid + 1)) <= available:
+                best = mid + 1
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        if best is None:
+            return None
+        return section.render(item_count=best)
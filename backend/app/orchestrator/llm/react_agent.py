@@ -280,6 +280,10 @@ class ReactAgent:
             # Other error - use fallback
             logger.error(f"Error in ReAct decision: {e}", exc_info=True)
             return self._get_fallback_decision(state, str(e))
+        
+        finally:
+            if callback is not None:
+                self.callback_factory.release_callback(callback)
     
     async def _invoke_llm_decision(
         self,
@@ -12,11 +12,13 @@ Architecture:
 - Callback factory creates new callbacks per execution
 - Callbacks know their session_id and execution_id
 - WebSocket manager handles actual message delivery
+- Factory registry is TTL/size bounded and released on task completion
 """
 import asyncio
 import time
 import logging
-from typing import Any, Dict, List, Optional, Union
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime, timezone 
 from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
@@ -53,6 +55,12 @@ STREAMING_CONFIG = {
 }
 
 
+# Registry bounds for CallbackFactory
+# Callbacks outliving these limits are dropped even if nobody released them
+CALLBACK_TTL_SECONDS = 15 * 60  # Longer than any tool timeout
+MAX_ACTIVE_CALLBACKS = 1000
+
+
 def get_stream_config(tool_name: str) -> Dict[str, Any]:
     """Get streaming configuration for a tool"""
     return STREAMING_CONFIG.get(tool_name, STREAMING_CONFIG['default'])
@@ -128,6 +136,10 @@ class WebSocketStreamingCallback(AsyncCallbackHandler):
         self.start_time = time.time()
         self.first_token_time = None
         
+        # Registry bookkeeping (set by CallbackFactory)
+        self.registry_key: Optional[str] = None
+        self.registered_at: float = time.monotonic()
+        
         logger.debug(
             f"WebSocketStreamingCallback initialized: "
             f"tool={tool_name}, stream_level={self.stream_level}, "
@@ -401,6 +413,10 @@ class WebSocketStreamingCallback(AsyncCallbackHandler):
         """Get accumulated content"""
         return self.full_content
     
+    def get_retained_bytes(self) -> int:
+        """Get size of accumulated content in bytes (UTF-8)"""
+        return len(self.full_content.encode('utf-8'))
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get streaming metrics"""
         elapsed_ms = int((time.time() - self.start_time) * 1000)
@@ -430,34 +446,63 @@ class CallbackFactory:
     - Automatic config selection
     - WebSocket manager injection
     - Metrics aggregation
+    - Bounded registry: callbacks are released when their owning task
+      finishes (including cancellation/timeouts), when they exceed the TTL,
+      or when the registry exceeds its size limit (oldest first)
     
     Usage:
         factory = CallbackFactory(ws_manager)
         
-        # Create callback for an execution
-        callback = factory.create_callback(
+        # Preferred: scoped callback, released on exit/error/cancellation
+        async with factory.managed_callback(
             session_id='sess_123',
             execution_id=456,
             condition='workflow_builder',
             tool_name='decision_maker',
             step_number=3
-        )
+        ) as callback:
+            llm = ChatOpenAI(callbacks=[callback])
         
-        # Use with LangChain
-        llm = ChatOpenAI(callbacks=[callback])
+        # Unscoped: released when the current task finishes or TTL expires
+        callback = factory.create_callback(...)
     """
     
-    def __init__(self, ws_manager):
+    def __init__(
+        self,
+        ws_manager,
+        ttl_seconds: float = CALLBACK_TTL_SECONDS,
+        max_callbacks: int = MAX_ACTIVE_CALLBACKS
+    ):
         """
         Initialize callback factory
         
         Args:
             ws_manager: WebSocket manager instance
+            ttl_seconds: Max lifetime of an unreleased callback
+            max_callbacks: Max number of tracked callbacks
         """
         self.ws_manager = ws_manager        
+        self.ttl_seconds = ttl_seconds
+        self.max_callbacks = max_callbacks
+        
+        # Insertion ordered: oldest callbacks come first
         self._active_callbacks: Dict[str, WebSocketStreamingCallback] = {}
         
-        logger.info("CallbackFactory initialized")
+        # Done-callbacks registered on owning tasks (key -> (task, fn))
+        self._task_hooks: Dict[str, tuple] = {}
+        
+        # Lifetime counters
+        self._stats = {
+            'created': 0,
+            'released': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+        
+        logger.info(
+            f"CallbackFactory initialized "
+            f"(ttl={ttl_seconds}s, max_callbacks={max_callbacks})"
+        )
     
     def create_callback(
         self,
@@ -470,6 +515,9 @@ class CallbackFactory:
         """
         Create a new streaming callback
         
+        The callback is tracked until it is released explicitly, its owning
+        asyncio task finishes, or it expires.
+        
         Args:
             session_id: Session identifier
             execution_id: Execution identifier
@@ -480,7 +528,7 @@ class CallbackFactory:
         Returns:
             WebSocketStreamingCallback instance
         """
-
+        self._prune(reserve=1)
 
         callback = WebSocketStreamingCallback(
             ws_manager=self.ws_manager,
@@ -491,9 +539,15 @@ class CallbackFactory:
             step_number=step_number
         )
         
-        # Track active callback
+        # Track active callback (replaces a previous one with the same key)
         callback_key = f"{session_id}_{execution_id}_{tool_name}_{step_number}"
+        if callback_key in self._active_callbacks:
+            self._remove(callback_key)
+        callback.registry_key = callback_key
         self._active_callbacks[callback_key] = callback
+        self._stats['created'] += 1
+        
+        self._bind_to_current_task(callback_key, callback)
         
         logger.debug(
             f"Created callback: session={session_id}, "
@@ -502,6 +556,48 @@ class CallbackFactory:
         
         return callback
     
+    @asynccontextmanager
+    async def managed_callback(
+        self,
+        session_id: str,
+        execution_id: int,
+        condition: str,
+        tool_name: str = 'default',
+        step_number: Optional[int] = None
+    ) -> AsyncIterator[WebSocketStreamingCallback]:
+        """
+        Create a streaming callback scoped to an ``async with`` block
+        
+        The callback is released when the block exits, whether normally,
+        through an exception, a timeout or task cancellation.
+        """
+        callback = self.create_callback(
+            session_id=session_id,
+            execution_id=execution_id,
+            condition=condition,
+            tool_name=tool_name,
+            step_number=step_number
+        )
+        try:
+            yield callback
+        finally:
+            self.release_callback(callback)
+    
+    def release_callback(self, callback: WebSocketStreamingCallback) -> bool:
+        """
+        Release a single callback
+        
+        Returns:
+            True if the callback was still tracked
+        """
+        key = callback.registry_key
+        if key is None or self._active_callbacks.get(key) is not callback:
+            return False
+        
+        self._remove(key)
+        self._stats['released'] += 1
+        return True
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get metrics across all active callbacks"""
         return {
@@ -512,6 +608,28 @@ class CallbackFactory:
             ]
         }
     
+    def get_registry_stats(self) -> Dict[str, Any]:
+        """Get registry size, retained content and lifetime counters"""
+        self._prune()
+        
+        now = time.monotonic()
+        oldest_age = None
+        if self._active_callbacks:
+            oldest = next(iter(self._active_callbacks.values()))
+            oldest_age = round(now - oldest.registered_at, 1)
+        
+        return {
+            'live_callbacks': len(self._active_callbacks),
+            'retained_bytes': sum(
+                cb.get_retained_bytes()
+                for cb in self._active_callbacks.values()
+            ),
+            'oldest_age_seconds': oldest_age,
+            'ttl_seconds': self.ttl_seconds,
+            'max_callbacks': self.max_callbacks,
+            'totals': dict(self._stats)
+        }
+    
     def cleanup_callback(self, session_id: str, execution_id: int):
         """Remove callbacks for a completed execution"""
         keys_to_remove = [
@@ -520,9 +638,75 @@ class CallbackFactory:
         ]
         
         for key in keys_to_remove:
-            del self._active_callbacks[key]
+            self._remove(key)
+        self._stats['released'] += len(keys_to_remove)
         
         logger.debug(f"Cleaned up {len(keys_to_remove)} callbacks")
+    
+    # ========================================
+    # REGISTRY HELPERS
+    # ========================================
+    
+    def _bind_to_current_task(
+        self,
+        key: str,
+        callback: WebSocketStreamingCallback
+    ):
+        """Release callback automatically when the creating task finishes"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None  # Not called from a running loop
+        
+        if task is None or task.done():
+            return
+        
+        def _on_task_done(_task, _key=key, _callback=callback):
+            if self.release_callback(_callback):
+                logger.debug(f"Released callback {_key} on task completion")
+        
+        task.add_done_callback(_on_task_done)
+        self._task_hooks[key] = (task, _on_task_done)
+    
+    def _remove(self, key: str):
+        """Drop callback and detach its task hook"""
+        self._active_callbacks.pop(key, None)
+        
+        hook = self._task_hooks.pop(key, None)
+        if hook is not None:
+            task, fn = hook
+            task.remove_done_callback(fn)
+    
+    def _prune(self, reserve: int = 0):
+        """
+        Drop expired callbacks and enforce the size limit
+        
+        Args:
+            reserve: Slots to keep free for callbacks about to be created
+        """
+        if not self._active_callbacks:
+            return
+        
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [
+            key for key, cb in self._active_callbacks.items()
+            if cb.registered_at < cutoff
+        ]
+        for key in expired:
+            self._remove(key)
+        self._stats['expired'] += len(expired)
+        
+        overflow = len(self._active_callbacks) - self.max_callbacks + reserve
+        if overflow > 0:
+            for key in list(self._active_callbacks.keys())[:overflow]:
+                self._remove(key)
+            self._stats['evicted'] += overflow
+        
+        if expired or overflow > 0:
+            logger.warning(
+                f"CallbackFactory pruned {len(expired)} expired and "
+                f"{max(overflow, 0)} overflow callbacks (not released by caller)"
+            )
 
 
 # ============================================================
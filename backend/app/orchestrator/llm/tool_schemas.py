@@ -9,9 +9,14 @@ from enum import Enum
 import logging
 
 from app.orchestrator.graphs.shared_state import DataSource
+from app.models.review_categories import REVIEW_CATEGORY_KEYS, format_review_categories
 
 logger = logging.getLogger(__name__)
 
+# Registered review categories (app/models/review_categories.py)
+ReviewCategoryKey = Literal[REVIEW_CATEGORY_KEYS]
+REVIEW_CATEGORY_PATTERN = f"^({'|'.join(REVIEW_CATEGORY_KEYS)})$"
+
 class ActionType(str, Enum):
     """Available action types"""
     LOAD = "load"
@@ -36,10 +41,10 @@ class LoadReviewsParams(BaseModel):
     
     Used to fetch product reviews with various filters
     """
-    category: Literal['shoes', 'wireless'] = Field(
+    category: ReviewCategoryKey = Field(
         ..., 
-        description="Product category: 'shoes' or 'wireless'",
-        pattern="^(shoes|wireless)$"
+        description=f"Product category: {format_review_categories()}",
+        pattern=REVIEW_CATEGORY_PATTERN
     )
     limit: Optional[int] = Field(
         None,
@@ -343,10 +348,10 @@ class ToolCallInputData(BaseModel):
         default=0,
         description="Number of records in current working set"
     )
-    category: Literal['shoes', 'wireless'] = Field(
+    category: ReviewCategoryKey = Field(
         ..., 
-        description="Product category: 'shoes' or 'wireless'",
-        pattern="^(shoes|wireless)$"
+        description=f"Product category: {format_review_categories()}",
+        pattern=REVIEW_CATEGORY_PATTERN
     )
     config: BaseModel
     product_titles: Dict[str, str] = Field(
@@ -0,0 +1,222 @@
+# backend/app/orchestrator/node_tracing.py
+"""
+Per-phase timing of workflow node execution
+
+Lightweight in-process tracer (no OpenTelemetry SDK / collector needed).
+Every workflow node records one span per phase around its work:
+
+    node.total            whole node handler
+    redis.step_update     step counter + current node
+    checkpoint.node_start buffered start checkpoint
+    websocket.start       node start event
+    prepare_input         prepare_tool_input
+    websocket.progress    node running event
+    tool.run              tool.run (the actual work)
+    process_result        process_tool_result
+    redis.state_sync      record store / registries to Redis
+    redis.timing_update   last_step_at / total_time_ms
+    cleanup_result        cleanup_result_for_response
+    websocket.end         node completed event
+    checkpoint.node_end   buffered end checkpoint
+    node.overhead         node.total - tool.run
+
+Spans feed two sinks:
+- Process-wide histograms per phase (and per tool), exposed at
+  GET /api/monitoring/node-timings
+- Per-execution span lists, stored in WorkflowExecution.execution_metadata
+  ['node_timings'] when the execution finishes (offline analysis)
+
+Usage:
+    trace = node_tracer.start_node(execution_id, node_id, template_id)
+    with trace.span('tool.run'):
+        result = await tool.run(input_data)
+    trace.finish()
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.configs import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of histogram buckets; last bucket is +Inf
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000
+)
+
+
+class PhaseHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.bucket_counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def observe(self, duration_ms: float) -> None:
+        self.bucket_counts[bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing quantile q (max for +Inf bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum_ms': round(self.sum_ms, 3),
+            'avg_ms': round(self.sum_ms / self.count, 3) if self.count else None,
+            'min_ms': round(self.min_ms, 3) if self.min_ms is not None else None,
+            'max_ms': round(self.max_ms, 3) if self.max_ms is not None else None,
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'p99_ms': self.quantile(0.99),
+            'buckets': {
+                **{str(bound): count for bound, count in zip(self.buckets_ms, self.bucket_counts)},
+                '+Inf': self.bucket_counts[-1],
+            },
+        }
+
+
+class NodeTrace:
+    """Spans of one node execution"""
+
+    def __init__(self, tracer: 'NodeTracer', execution_id: int, node_id: str, tool_id: str):
+        self.tracer = tracer
+        self.execution_id = execution_id
+        self.node_id = node_id
+        self.tool_id = tool_id
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.status = 'ok'
+
+    @contextmanager
+    def span(self, phase: str):
+        """Time a phase; repeated phases within a node accumulate"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.status = 'error'
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.phases[phase] = self.phases.get(phase, 0.0) + duration_ms
+
+    def finish(self) -> Dict[str, float]:
+        """Close the node span and hand all phases to the tracer"""
+        total_ms = (time.perf_counter() - self.started) * 1000
+        self.phases['node.total'] = total_ms
+        self.phases['node.overhead'] = max(total_ms - self.phases.get('tool.run', 0.0), 0.0)
+        self.tracer._record(self)
+        return self.phases
+
+
+class NodeTracer:
+    """
+    Process-wide collector of node phase spans
+
+    Thread-safe; tools may run in worker threads.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_executions: int = 200,
+        max_spans_per_execution: int = 500
+    ):
+        self.enabled = enabled
+        self.max_executions = max_executions
+        self.max_spans_per_execution = max_spans_per_execution
+
+        self._lock = threading.Lock()
+        self._phase_histograms: Dict[str, PhaseHistogram] = {}
+        self._tool_histograms: Dict[Tuple[str, str], PhaseHistogram] = {}
+        self._executions: 'OrderedDict[int, List[Dict[str, Any]]]' = OrderedDict()
+
+    def start_node(self, execution_id: int, node_id: str, tool_id: str) -> NodeTrace:
+        return NodeTrace(self, execution_id, node_id, tool_id)
+
+    def _record(self, trace: NodeTrace) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            for phase, duration_ms in trace.phases.items():
+                self._phase_histograms.setdefault(phase, PhaseHistogram()).observe(duration_ms)
+                self._tool_histograms.setdefault((trace.tool_id, phase), PhaseHistogram()).observe(duration_ms)
+
+            spans = self._executions.get(trace.execution_id)
+            if spans is None:
+                spans = self._executions[trace.execution_id] = []
+                while len(self._executions) > self.max_executions:
+                    self._executions.popitem(last=False)
+
+            if len(spans) < self.max_spans_per_execution:
+                spans.append({
+                    'node_id': trace.node_id,
+                    'tool_id': trace.tool_id,
+                    'status': trace.status,
+                    'phases_ms': {phase: round(ms, 3) for phase, ms in trace.phases.items()},
+                })
+
+    def pop_execution(self, execution_id: int) -> List[Dict[str, Any]]:
+        """Remove and return the node spans of one execution"""
+        with self._lock:
+            return self._executions.pop(execution_id, [])
+
+    def get_histograms(self, by_tool: bool = False) -> Dict[str, Any]:
+        """Snapshot of phase histograms (optionally broken down per tool)"""
+        with self._lock:
+            result: Dict[str, Any] = {
+                'enabled': self.enabled,
+                'phases': {phase: histogram.to_dict() for phase, histogram in sorted(self._phase_histograms.items())},
+                'tracked_executions': len(self._executions),
+            }
+            if by_tool:
+                tools: Dict[str, Dict[str, Any]] = {}
+                for (tool_id, phase), histogram in sorted(self._tool_histograms.items()):
+                    tools.setdefault(tool_id, {})[phase] = histogram.to_dict()
+                result['tools'] = tools
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phase_histograms.clear()
+            self._tool_histograms.clear()
+            self._executions.clear()
+
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-execution summary stored with WorkflowExecution"""
+    totals: Dict[str, float] = {}
+    for span in spans:
+        for phase, duration_ms in span['phases_ms'].items():
+            totals[phase] = totals.get(phase, 0.0) + duration_ms
+    return {
+        'nodes': spans,
+        'phase_totals_ms': {phase: round(ms, 3) for phase, ms in sorted(totals.items())},
+    }
+
+
+# Global tracer instance
+node_tracer = NodeTracer(enabled=settings.node_tracing_enabled)
@@ -9,11 +9,12 @@ Benefits:
 - Better memory usage in Redis
 """
 import redis
-import json
 from typing import Any, Dict, Optional, List
 import logging
 
 from app.configs.config import settings
+from app.core import serialization
+from app.core.metrics import InstrumentedRedis
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +34,8 @@ class RedisHashStateManager:
     200x improvement for single field updates!
     """
     
-    def __init__(self):
-        self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis_client = redis_client or InstrumentedRedis.from_url(settings.redis_url, decode_responses=True)
         self.state_ttl = 7200  # 2 hours
         
         # Fields that should be stored as JSON (complex objects)
@@ -48,7 +49,12 @@ class RedisHashStateManager:
             'workflow_definition',
             'agent_plan',
             'agent_memory',
-            'user_interventions'
+            'user_interventions',
+            'record_store',
+            'enrichment_registry',
+            'results_registry',
+            'data_source',
+            'row_operation_history'
         }
         
         # Simple string fields
@@ -95,7 +101,7 @@ class RedisHashStateManager:
             for field, value in state.items():
                 if field in self.json_fields:
                     # Serialize complex objects
-                    hash_data[field] = json.dumps(value, default=str)
+                    hash_data[field] = serialization.dumps(value)
                 else:
                     # Simple values as strings
                     hash_data[field] = str(value) if value is not None else ''
@@ -137,8 +143,8 @@ class RedisHashStateManager:
                 if field in self.json_fields:
                     # Deserialize JSON fields
                     try:
-                        state[field] = json.loads(value) if value else {}
-                    except json.JSONDecodeError:
+                        state[field] = serialization.loads(value) if value else {}
+                    except serialization.JSONDecodeError:
                         logger.warning(f"Failed to parse JSON field: {field}")
                         state[field] = {}
                 else:
@@ -180,7 +186,7 @@ class RedisHashStateManager:
         try:
             # Serialize value appropriately
             if field in self.json_fields:
-                serialized = json.dumps(value, default=str)
+                serialized = serialization.dumps(value)
             else:
                 serialized = str(value) if value is not None else ''
             
@@ -224,7 +230,7 @@ class RedisHashStateManager:
             
             for field, value in updates.items():
                 if field in self.json_fields:
-                    serialized_updates[field] = json.dumps(value, default=str)
+                    serialized_updates[field] = serialization.dumps(value)
                 else:
                     serialized_updates[field] = str(value) if value is not None else ''
             
@@ -264,7 +270,7 @@ class RedisHashStateManager:
             
             # Deserialize appropriately
             if field in self.json_fields:
-                return json.loads(value) if value else {}
+                return serialization.loads(value) if value else {}
             else:
                 return self._parse_value(field, value)
                 
@@ -293,7 +299,7 @@ class RedisHashStateManager:
             for field, value in zip(fields, values):
                 if value is not None:
                     if field in self.json_fields:
-                        result[field] = json.loads(value) if value else {}
+                        result[field] = serialization.loads(value) if value else {}
                     else:
                         result[field] = self._parse_value(field, value)
             
@@ -13,25 +13,30 @@ from fastapi import HTTPException
 from openai import APIError, APITimeoutError, RateLimitError
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+import asyncio
 import logging
 import traceback
 
 from app.configs.config import settings
+from app.core.shutdown import shutdown_manager
 from app.configs.langsmith_config import create_run_config, should_trace_execution
 
 from app.websocket.manager import WebSocketManager, get_ws_manager
 from .degradation import DegradationConfig, graceful_degradation
+from .node_tracing import node_tracer, summarize_spans
 
 from app.orchestrator.llm.streaming_callbacks import initialize_callback_factory, get_callback_factory
 from .llm.circuit_breaker import CircuitBreakerOpen
 
 from app.models.execution import ExecutionCheckpoint, WorkflowExecution
+from app.models.review_categories import is_review_category, format_review_categories
 
 from .graphs.shared_state import (
     SharedWorkflowState,
     initialize_state,
     get_row_operation_summary,
-    get_data_source_info
+    get_data_source_info,
+    get_results_registry
 )
 
 from .state_manager import HybridStateManager
@@ -347,6 +352,12 @@ class OrchestrationService:
 
             logger.info(f"Execution {execution.id} of Workflow Builder completed successfully")
             
+        except asyncio.CancelledError:
+            # Interrupted (shutdown drain past its deadline): persist state and
+            # a final status instead of leaving a 'running' record behind
+            await self._record_interruption(db, execution, session_id, condition)
+            raise
+            
         except CircuitBreakerOpen as e:
             logger.error(f"Circuit breaker open for execution {execution.id}: {e}")
             execution.status = 'failed'
@@ -426,7 +437,7 @@ class OrchestrationService:
                 current_state = self.state_manager.get_state_from_memory(execution.id)
                 if current_state:
                     from app.database import get_db_context
-                    with get_db_context() as error_db:
+                    with get_db_context('bulk') as error_db:
                         await self.state_manager.checkpoint_to_db(
                             db=error_db,
                             execution_id=execution.id,
@@ -453,10 +464,14 @@ class OrchestrationService:
             # Cleanup Redis state
             self.state_manager.clear_memory_state(execution.id)
             
+            # Release streaming callbacks of this execution
+            if self.ws_manager:
+                get_callback_factory().cleanup_callback(session_id, execution.id)
+            
             # Final checkpoint (separate transaction)
             try:
                 from app.database import get_db_context
-                with get_db_context() as final_db:
+                with get_db_context('bulk') as final_db:
                     await self.state_manager.checkpoint_to_db(
                         db=final_db,
                         execution_id=execution.id,
@@ -469,6 +484,9 @@ class OrchestrationService:
             except Exception as checkpoint_error:
                 logger.error(f"Failed to create final checkpoint: {checkpoint_error}")
             
+            # Node phase timings (separate transaction)
+            self._store_node_timings(execution.id)
+            
             # Unsubscribe from execution channel
             self.ws_manager.unsubscribe(session_id, 'execution')
         
@@ -514,12 +532,12 @@ class OrchestrationService:
             if not category:
                 raise ValueError(
                     "Category must be provided in task_data.input_data.category. "
-                    "Expected 'shoes' or 'wireless'"
+                    f"Expected {format_review_categories()}"
                 )
             
-            if category not in ['shoes', 'wireless']:
+            if not is_review_category(category):
                 raise ValueError(
-                    f"Invalid category '{category}'. Must be 'shoes' or 'wireless'"
+                    f"Invalid category '{category}'. Must be {format_review_categories()}"
                 )
             
             logger.info(
@@ -685,6 +703,12 @@ class OrchestrationService:
             
             logger.info(f"Execution {execution.id} of AI Assistant completed successfully")
             
+        except asyncio.CancelledError:
+            # Interrupted (shutdown drain past its deadline): persist state and
+            # a final status instead of leaving a 'running' record behind
+            await self._record_interruption(db, execution, session_id, condition)
+            raise
+            
         except CircuitBreakerOpen as e:
             logger.error(f"Circuit breaker open for execution {execution.id}: {e}")
             execution.status = 'failed'
@@ -741,7 +765,7 @@ class OrchestrationService:
                 current_state = self.state_manager.get_state_from_memory(execution.id)
                 if current_state:
                     from app.database import get_db_context
-                    with get_db_context() as error_db:
+                    with get_db_context('bulk') as error_db:
                         await self.state_manager.checkpoint_to_db(
                             db=error_db,
                             execution_id=execution.id,
@@ -768,10 +792,14 @@ class OrchestrationService:
             # Cleanup Redis state
             self.state_manager.clear_memory_state(execution.id)
             
+            # Release streaming callbacks of this execution
+            if self.ws_manager:
+                get_callback_factory().cleanup_callback(session_id, execution.id)
+            
             # Final checkpoint (separate transaction)
             try:
                 from app.database import get_db_context
-                with get_db_context() as final_db:
+                with get_db_context('bulk') as final_db:
                     await self.state_manager.checkpoint_to_db(
                         db=final_db,
                         execution_id=execution.id,
@@ -791,6 +819,82 @@ class OrchestrationService:
 
 # Helper Methods for OrchestrationService    
 
+    def _store_node_timings(self, execution_id: int) -> None:
+        """Persist the node phase spans of an execution to execution_metadata['node_timings']"""
+        spans = node_tracer.pop_execution(execution_id)
+        if not spans:
+            return
+        
+        try:
+            from app.database import get_db_context
+            with get_db_context('bulk') as timing_db:
+                execution = timing_db.get(WorkflowExecution, execution_id)
+                if execution is None:
+                    return
+                # Reassign so SQLAlchemy detects the JSON change
+                execution.execution_metadata = {
+                    **(execution.execution_metadata or {}),
+                    'node_timings': summarize_spans(spans)
+                }
+        except Exception as timing_error:
+            logger.error(f"Failed to store node timings: {timing_error}")
+    
+    async def _record_interruption(
+        self,
+        db: Session,
+        execution: WorkflowExecution,
+        session_id: str,
+        condition: Literal['workflow_builder', 'ai_assistant']
+    ) -> None:
+        """Mark a cancelled execution failed, checkpoint its in-memory state and tell the client"""
+        reason = 'Interrupted by server shutdown' if shutdown_manager.draining else 'Execution task cancelled'
+        logger.warning(f"Execution {execution.id} interrupted: {reason}")
+        
+        try:
+            execution.status = 'failed'
+            execution.completed_at = datetime.now(timezone.utc)
+            execution.error_message = reason
+            db.commit()
+        except Exception as commit_error:
+            logger.error(f"Failed to commit interruption status: {commit_error}")
+            db.rollback()
+        
+        # Checkpoint: interrupted (separate transaction)
+        try:
+            current_state = self.state_manager.get_state_from_memory(execution.id)
+            if current_state:
+                from app.database import get_db_context
+                with get_db_context('bulk') as interrupt_db:
+                    await self.state_manager.checkpoint_to_db(
+                        db=interrupt_db,
+                        execution_id=execution.id,
+                        step_number=current_state.get('step_number', 0),
+                        checkpoint_type='interrupted',
+                        state=current_state,
+                        metadata={'reason': reason},
+                        buffered=False  # Direct write, the process is going away
+                    )
+        except Exception as checkpoint_error:
+            logger.error(f"Failed to create interruption checkpoint: {checkpoint_error}")
+        
+        try:
+            await self.ws_manager.send_execution_progress(
+                session_id=session_id,
+                execution_id=execution.id,
+                condition=condition,
+                progress_type='error',
+                status='failed',
+                data={
+                    'error': reason,
+                    'error_type': 'ServerShutdown' if shutdown_manager.draining else 'Cancelled',
+                    'step': execution.steps_completed,
+                    'retryable': True
+                },
+                priority='high'
+            )
+        except Exception as send_error:
+            logger.error(f"Failed to send interruption event: {send_error}")
+    
     def _initialize_state(
         self, 
         execution: WorkflowExecution, 
@@ -851,15 +955,15 @@ class OrchestrationService:
             Final result dictionary for execution record
         """
         # Check results_registry first (new structure)
-        results_registry = state.get('results_registry')
-        if results_registry and results_registry.get('results'):
+        results_registry = get_results_registry(state) if state.get('results_registry') else None
+        if results_registry and results_registry.results:
             # Extract tool results
             tool_results = {}
-            for tool_id, result in results_registry['results'].items():
+            for tool_id, result in results_registry.results.items():
                 tool_results[tool_id] = {
-                    'tool_name': result.get('tool_name'),
-                    'summary': result.get('summary', {}),
-                    'execution_time_ms': result.get('execution_time_ms', 0)
+                    'tool_name': result.tool_name,
+                    'summary': result.summary,
+                    'execution_time_ms': result.execution_time_ms
                 }
             
             return {
@@ -1,6 +1,5 @@
 # backend/app/orchestrator/state_manager.py
 import redis
-import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -9,14 +8,17 @@ import logging
 import asyncio
 
 from app.configs.config import settings
+from app.core import serialization
+from app.core.metrics import InstrumentedRedis
 from app.models.execution import ExecutionCheckpoint, ExecutionLog
 from .checkpoint_buffer import checkpoint_buffer
-from .redis_hash_manager import redis_hash_state 
+from .redis_hash_manager import redis_hash_state
 from .graphs.shared_state import (
     SharedWorkflowState,
     initialize_state,
     get_row_operation_summary,
-    get_data_source_info
+    get_data_source_info,
+    serialize_state
 )
 
 logger = logging.getLogger(__name__)
@@ -55,7 +57,7 @@ class HybridStateManager:
         self.redis_hash_state = redis_hash_state if use_hash else None
         
         # Legacy Redis client (fallback for JSON format)
-        self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        self.redis_client = InstrumentedRedis.from_url(settings.redis_url, decode_responses=True)
         self.state_ttl = 7200  # 2 hours TTL for Redis keys
             
         # Test Redis connection
@@ -92,7 +94,7 @@ class HybridStateManager:
         """Legacy JSON format save (fallback)"""
         key = self._get_state_key(execution_id)
         try:
-            serialized = json.dumps(state, default=str)
+            serialized = serialization.dumps(state)
             self.redis_client.setex(key, self.state_ttl, serialized)
             logger.debug(f"State saved to Redis (JSON): {key}")
         except Exception as e:
@@ -124,7 +126,7 @@ class HybridStateManager:
         try:
             data = self.redis_client.get(key)
             if data:
-                return json.loads(data)
+                return serialization.loads(data)
             return None
         except Exception as e:
             logger.error(f"Failed to retrieve state from Redis: {e}")
@@ -438,7 +440,8 @@ class HybridStateManager:
 
         state['checkpoints_created'] = state.get('checkpoints_created', 0) + 1 
 
-        sanitized_state = state
+        # Snapshot now: typed containers are live objects that keep changing
+        sanitized_state = serialize_state(state)
         sanitized_metadata = metadata if metadata else {}
 
         checkpoint = ExecutionCheckpoint(
@@ -497,7 +500,7 @@ class HybridStateManager:
         """
         from app.database import get_db_context
 
-        with get_db_context() as db:
+        with get_db_context('bulk') as db:
             # Force unbuffered for atomic operations
             checkpoint = asyncio.run(
                 self.checkpoint_to_db(
@@ -8,6 +8,11 @@ from collections import Counter
 import asyncio
 
 from app.orchestrator.tools.base_tool import BaseTool
+from app.orchestrator.graphs.shared_state import RecordStore, RecordStatistics, get_record_statistics
+from app.orchestrator.llm.prompt_budget import PromptBudget, PromptSection
+from app.configs.config import settings
+from app.core.cpu_executor import cpu_executor
+from app.core.cpu_tasks import aggregate_review_themes
 from app.orchestrator.llm.tool_schemas import (
     ReviewSentimentAnalysisInputData,
     GenerateInsightsInputData
@@ -372,7 +377,7 @@ Return JSON with analysis for each review."""
         else:
             return 'negative'
     
-    def _aggregate_themes(
+    async def _aggregate_themes(
         self, 
         analyzed_reviews: List[Dict[str, Any]],
         theme_separation: str,
@@ -385,172 +390,35 @@ Return JSON with analysis for each review."""
         Returns theme analysis with counts/percentages
         Themes are weighted by importance (1-7 scale)
         Weight formula: alpha + (importance / 14)
-        """
-        if theme_separation == 'by_sentiment':
-            # Separate themes by sentiment
-            # Track weighted scores per theme
-            positive_themes = {}  # theme -> total importance score
-            neutral_themes = {}
-            negative_themes = {}
-            positive_review_ids = {}  # theme -> set of review_ids (for count)
-            neutral_review_ids = {}
-            negative_review_ids = {}
-            
-            for review in analyzed_reviews:
-                review_id = review.get('review_id')
-                theme_data = review.get('theme_analysis', {})
-                themes = theme_data.get('themes', [])
-
-                seen_in_review = set()
-                for theme_tuple in themes:
-                    topic_str, importance, sentiment_score = theme_tuple
-                    
-                    # Calculate normalized weight
-                    weight = self.WEIGHT_ALPHA + (importance / self.WEIGHT_SCALING_FACTOR)
-                    
-                    theme_lower = topic_str.lower()
-                    if theme_lower not in seen_in_review:
-                        seen_in_review.add(theme_lower)
-                        
-                        # Classify by sentiment score (1-7 scale) - using lenient positive bias
-                        if sentiment_score >= 5:  # 5-7 = positive
-                            if theme_lower not in positive_themes:
-                                positive_themes[theme_lower] = 0
-                                positive_review_ids[theme_lower] = set()
-                            positive_themes[theme_lower] += weight  # ← Use calculated weight
-                            positive_review_ids[theme_lower].add(review_id)
-                            
-                        elif sentiment_score <= 2:  # 1-2 = negative
-                            if theme_lower not in negative_themes:
-                                negative_themes[theme_lower] = 0
-                                negative_review_ids[theme_lower] = set()
-                            negative_themes[theme_lower] += weight
-                            negative_review_ids[theme_lower].add(review_id)
-                            
-                        else:  # 3-4 = neutral
-                            if theme_lower not in neutral_themes:
-                                neutral_themes[theme_lower] = 0
-                                neutral_review_ids[theme_lower] = set()
-                            neutral_themes[theme_lower] += weight
-                            neutral_review_ids[theme_lower].add(review_id)
-
-            # Sort by weighted importance scores
-            positive_counts = Counter(positive_themes)
-            neutral_counts = Counter(neutral_themes)
-            negative_counts = Counter(negative_themes)
-            
-            # Count reviews per sentiment for percentages
-            total_reviews = len(analyzed_reviews)
-            positive_review_count = sum(
-                1 for r in analyzed_reviews 
-                if any(t[2] >= 5 for t in r.get('theme_analysis', {}).get('themes', []))
-            )
-            neutral_review_count = sum(
-                1 for r in analyzed_reviews 
-                if any(t[2] == 3 or t[2] == 4 for t in r.get('theme_analysis', {}).get('themes', []))
-            )
-            negative_review_count = sum(
-                1 for r in analyzed_reviews 
-                if any(t[2] <= 2 for t in r.get('theme_analysis', {}).get('themes', []))
-            )
-            
-            # Build result structure with weighted scores AND review counts
-            result = {
-                'type': 'by_sentiment',
-                'positive_themes': self._format_themes_weighted(
-                    positive_counts,
-                    positive_review_ids,
-                    max_themes_per_category, 
-                    positive_review_count if positive_review_count > 0 else total_reviews, 
-                    include_percentages
-                ),
-                'neutral_themes': self._format_themes_weighted(
-                    neutral_counts,
-                    neutral_review_ids,
-                    max_themes_per_category, 
-                    neutral_review_count if neutral_review_count > 0 else total_reviews, 
-                    include_percentages
-                ),
-                'negative_themes': self._format_themes_weighted(
-                    negative_counts,
-                    negative_review_ids,
-                    max_themes_per_category, 
-                    negative_review_count if negative_review_count > 0 else total_reviews, 
-                    include_percentages
-                )
-            }
-        else:
-            # Combined themes (all sentiments together)
-            theme_scores = {}  # theme -> total weighted importance score
-            theme_review_ids = {}  # theme -> set of review_ids
-            
-            for review in analyzed_reviews:
-                review_id = review.get('review_id')
-                theme_data = review.get('theme_analysis', {})
-                themes = theme_data.get('themes', [])
-                
-                # Deduplicate within review
-                seen_in_review = set()
-                for theme_tuple in themes:
-                    topic_str, importance, sentiment_score = theme_tuple
-                    theme_lower = topic_str.lower()
-                    
-                    if theme_lower not in seen_in_review:
-                        seen_in_review.add(theme_lower)
-                        
-                        # Calculate normalized weight
-                        weight = self.WEIGHT_ALPHA + (importance / self.WEIGHT_SCALING_FACTOR)
-                        
-                        if theme_lower not in theme_scores:
-                            theme_scores[theme_lower] = 0
-                            theme_review_ids[theme_lower] = set()
-                        theme_scores[theme_lower] += weight  # ← Use weighted score
-                        theme_review_ids[theme_lower].add(review_id)
-            
-            # Sort by weighted scores
-            theme_counts = Counter(theme_scores)
-            total_reviews = len(analyzed_reviews)
-            
-            result = {
-                'type': 'combined',
-                'themes': self._format_themes_weighted(
-                    theme_counts,
-                    theme_review_ids,
-                    max_themes_per_category, 
-                    total_reviews, 
-                    include_percentages
-                )
-            }
         
-        return result
-
-    def _format_themes_weighted(
-        self, 
-        weighted_theme_scores: Counter,
-        review_ids_dict: Dict[str, set],
-        max_count: int, 
-        total_reviews: int,
-        include_percentages: bool
-    ) -> List[Dict[str, Any]]:
-        """Format themes with weighted scores, counts, and optional percentages"""
-        top_themes = weighted_theme_scores.most_common(max_count)
+        Runs app.core.cpu_tasks.aggregate_review_themes on theme columns,
+        in the CPU process pool for large inputs.
+        """
+        review_ids = []
+        theme_rows, theme_topics, theme_importance, theme_sentiment = [], [], [], []
         
-        formatted = []
-        for theme, weighted_score in top_themes:
-            review_count = len(review_ids_dict[theme])
-            
-            theme_data = {
-                'theme': theme,
-                'weighted_score': weighted_score,  # Sum of importance scores
-                'review_count': review_count  # Number of reviews mentioning it
-            }
-            
-            percentage = (review_count / total_reviews * 100) if total_reviews > 0 else 0
-            theme_data['percentage'] = round(percentage, 2)
-            
-            formatted.append(theme_data)
+        for row, review in enumerate(analyzed_reviews):
+            review_ids.append(review.get('review_id'))
+            for topic_str, importance, sentiment_score in review.get('theme_analysis', {}).get('themes', []):
+                theme_rows.append(row)
+                theme_topics.append(topic_str)
+                theme_importance.append(importance)
+                theme_sentiment.append(sentiment_score)
         
-        return formatted
+        return await cpu_executor.run(
+            aggregate_review_themes,
+            columns={
+                'review_ids': review_ids,
+                'theme_rows': theme_rows,
+                'theme_topics': theme_topics,
+                'theme_importance': theme_importance,
+                'theme_sentiment': theme_sentiment,
+            },
+            theme_separation=theme_separation,
+            max_themes_per_category=max_themes_per_category,
+            weight_alpha=self.WEIGHT_ALPHA,
+            weight_scaling=self.WEIGHT_SCALING_FACTOR
+        )
     
     def _format_themes(
         self, 
@@ -676,7 +544,7 @@ Return JSON with analysis for each review."""
 
             # Sample analysis
             try:
-                reviews_sample = self._sample_reviews_multi_strategically(records, int(min(target_count, (MAX_PARALLEL_CALLS * BATCH_SIZE))))
+                reviews_sample = await self._sample_reviews_multi_strategically(records, int(min(target_count, (MAX_PARALLEL_CALLS * BATCH_SIZE))))
                 reviews_sample_size = len(reviews_sample)
                 logger.warning(f"Sampled dataset: {original_count} → {len(reviews_sample)} reviews")
 
@@ -835,7 +703,7 @@ Return JSON with analysis for each review."""
                         logger.warning(f"Failed to send batch complete: {e}")
 
                 # Start analysis of extracted themse
-                theme_analysis = self._aggregate_themes(
+                theme_analysis = await self._aggregate_themes(
                     analyzed_reviews,
                     theme_separation,
                     max_themes_per_category,
@@ -986,7 +854,9 @@ class GenerateInsightsTool(BaseTool):
         theme_analysis: Optional[Dict[str, Any]],
         sample_reviews: List[Dict[str, Any]],
         total_reviews: int,
-        language: Literal['en','de'] = 'en'
+        language: Literal['en','de'] = 'en',
+        record_statistics: Optional[RecordStatistics] = None,
+        product_titles: Optional[Dict[str, str]] = None
     ) -> tuple[str, str]:
         """
         Build optimized system and user prompts
@@ -1116,63 +986,100 @@ Examples:
 Return ONLY the JSON array, nothing else.
 """
 
+        # Data context is ranked and fitted into the model's context budget:
+        # dataset overview > sentiment > negative/positive themes > neutral themes > samples
+        sections: List[PromptSection] = []
+
         # Build statistics summary
-        sentiment_summary = ""
         if sentiment_statistics:
             positive_pct = sentiment_statistics.get('percentages', {}).get('positive', 0)
             neutral_pct = sentiment_statistics.get('percentages', {}).get('neutral', 0)
             negative_pct = sentiment_statistics.get('percentages', {}).get('negative', 0)
-            sentiment_summary = f'- Sentiment Distribution: {positive_pct:.1f}% positive, {neutral_pct:.1f}% neutral, {negative_pct:.1f}% negative'
+            sections.append(PromptSection(
+                name='sentiment',
+                items=[f'- Sentiment Distribution: {positive_pct:.1f}% positive, {neutral_pct:.1f}% neutral, {negative_pct:.1f}% negative'],
+                priority=1
+            ))
+
+        # Build dataset statistics from precomputed aggregates
+        overview = [f"- Total Reviews: {total_reviews}"]
+        if record_statistics and record_statistics.total:
+            stats = record_statistics
+            if stats.rated_count:
+                breakdown = ', '.join(
+                    f"{stars}★ {stats.rating_counts.get(stars, 0) / stats.rated_count * 100:.0f}%"
+                    for stars in [5, 4, 3, 2, 1]
+                )
+                overview.append(f"- Average Rating: {stats.average_rating:.2f}/5 ({breakdown})")
+            overview.append(f"- Verified Purchases: {stats.verified_count / stats.total * 100:.1f}%")
+            
+            if stats.products:
+                overview.append(f"- Products: {len(stats.products)}")
+                for product_id, product in stats.top_products(5):
+                    title = (product_titles or {}).get(product_id, product_id)[:TRUNCATE_PRODUCT]
+                    overview.append(
+                        f"  - {title}: {product.review_count} reviews, "
+                        f"avg {product.average_rating:.2f}★"
+                    )
+        sections.append(PromptSection(
+            name='overview',
+            header='**Dataset Overview:**',
+            items=overview,
+            required=True
+        ))
 
         # Build theme summary if available
-        theme_summary = ""
+        def theme_lines(themes: List[Dict[str, Any]]) -> List[str]:
+            return [f"- {t['theme']}: ({t.get('percentage', 0):.1f}%)" for t in themes]
+
         if theme_analysis:
             if theme_analysis.get('type') == 'by_sentiment':
-                pos_themes = theme_analysis.get('positive_themes', [])
-                neu_themes = theme_analysis.get('neutral_themes', [])
-                neg_themes = theme_analysis.get('negative_themes', [])
-                
-                if pos_themes:
-                    theme_summary += f"\n**Top Positive Themes:**\n"
-                    for t in pos_themes:
-                        theme_summary += f"- {t['theme']}: ({t.get('percentage', 0):.1f}%)\n"
-
-                if neu_themes:
-                    theme_summary += f"\n**Top Neutral Themes:**\n"
-                    for t in neu_themes:
-                        theme_summary += f"- {t['theme']}: ({t.get('percentage', 0):.1f}%)\n"
-                
-                if neg_themes:
-                    theme_summary += f"\n**Top Negative Themes:**\n"
-                    for t in neg_themes:
-                        theme_summary += f"- {t['theme']}: ({t.get('percentage', 0):.1f}%)\n"
+                for key, label, priority in [
+                    ('positive_themes', 'Positive', 2),
+                    ('neutral_themes', 'Neutral', 3),
+                    ('negative_themes', 'Negative', 2)
+                ]:
+                    themes = theme_analysis.get(key, [])
+                    if themes:
+                        sections.append(PromptSection(
+                            name=key,
+                            header=f"**Top {label} Themes:**",
+                            items=theme_lines(themes),
+                            priority=priority
+                        ))
             else:
                 top_themes = theme_analysis.get('themes', [])
                 if top_themes:
-                    theme_summary += f"\n**Top Themes:**\n"
-                    for t in top_themes:
-                        theme_summary += f"- {t['theme']}: ({t.get('percentage', 0):.1f}%)\n"
+                    sections.append(PromptSection(
+                        name='themes',
+                        header="**Top Themes:**",
+                        items=theme_lines(top_themes),
+                        priority=2
+                    ))
         
         # Build sample review context
-        review_context = ""
         if sample_reviews:
-            review_context = f"\n**Sample Reviews for Context:**\n"
+            review_lines = []
             for i, review in enumerate(sample_reviews[:10], 1):  # Max 10 examples
                 rating = review.get('star_rating', 'N/A')
                 body = review.get('review_body', '')[:200]  # Truncate
-                review_context += f"{i}. [{rating}★] {body}...\n"
+                review_lines.append(f"{i}. [{rating}★] {body}...")
+            sections.append(PromptSection(
+                name='sample_reviews',
+                header="**Sample Reviews for Context:**",
+                items=review_lines,
+                priority=5
+            ))
+
+        data_context = PromptBudget.for_model(settings.llm_model).build(sections)
         
         # User prompt
         user_prompt = f"""Analyze the provided data and generate exactly {max_insights} **strategic business insights** per focus area.
 
 **Focus Areas:** 
 {focus_area_labels_list}
-{sentiment_summary}
 
-**Dataset Overview:**
-- Total Reviews: {total_reviews}
-{theme_summary}
-{review_context}
+{data_context}
 
 **Guidelines:**
 1. Be specific and data-driven (reference themes)
@@ -1195,6 +1102,8 @@ Generate insights now."""
         execution_id: int | None = None,
         condition: str | None = None,
         language: Literal['en','de'] = 'en',
+        record_statistics: Optional[RecordStatistics] = None,
+        product_titles: Optional[Dict[str, str]] = None,
         retry_count: int = 0,
         max_retries: int = 3
     ) -> List[Dict[str, Any]]:
@@ -1207,7 +1116,7 @@ Generate insights now."""
         
         # Sample reviews for context
         target_count = math.ceil(len(reviews) * SAMPLE_RATE)
-        sample_reviews = self._sample_reviews_multi_strategically(reviews, int(min(target_count, MAX_REVIEWS)))
+        sample_reviews = await self._sample_reviews_multi_strategically(reviews, int(min(target_count, MAX_REVIEWS)))
 
         # Build prompts
         system_prompt, user_prompt = self._build_llm_prompt(
@@ -1217,7 +1126,9 @@ Generate insights now."""
             theme_analysis=theme_analysis,
             sample_reviews=sample_reviews,
             total_reviews=total_reviews,
-            language=language
+            language=language,
+            record_statistics=record_statistics,
+            product_titles=product_titles
         )
         
         #logger.info(f"system_prompt: {system_prompt}")
@@ -1285,6 +1196,8 @@ Generate insights now."""
                     execution_id=execution_id,
                     condition=condition,
                     language=language,
+                    record_statistics=record_statistics,
+                    product_titles=product_titles,
                     retry_count=retry_count + 1,
                     max_retries=max_retries
                 )
@@ -1391,6 +1304,14 @@ Generate insights now."""
             total_reviews = input_data.get('total', len(records))
             category = input_data.get('category')
             
+            # Precomputed aggregates from the record store
+            record_statistics = get_record_statistics(input_data.get('record_store'), records)
+            record_store = input_data.get('record_store')
+            product_titles = (
+                record_store.product_titles if isinstance(record_store, RecordStore)
+                else (record_store or {}).get('product_titles', {})
+            )
+            
             logger.info(
                 f"Generating insights: {len(focus_areas)} focus areas, "
                 f"{max_insights} insights each, "
@@ -1424,7 +1345,9 @@ Generate insights now."""
                 session_id=session_id,
                 execution_id=execution_id,
                 condition=condition,
-                language=state.get("language")
+                language=state.get("language"),
+                record_statistics=record_statistics,
+                product_titles=product_titles
             )
             
             # Valid only (excluding insufficient data)            
@@ -17,6 +17,9 @@ from html import unescape
 from typing import TYPE_CHECKING, overload, Dict, Any, Optional, List, Union, Literal
 
 from app.websocket.manager import WebSocketManager
+from app.core import serialization
+from app.core.cpu_executor import cpu_executor
+from app.core.cpu_tasks import stratified_sample_indices
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from langchain_core.tools.base import BaseTool as LangChainBaseTool
@@ -259,30 +262,30 @@ class BaseTool(LangChainBaseTool):
                 messages.append(SystemMessage(content=system_prompt))
             messages.append(HumanMessage(content=user_prompt))
 
-        # Create streaming callback
+        from app.configs.config import settings
+
+        # Create streaming callback (released on exit, timeout or cancellation)
         callback_factory = get_callback_factory()
-        callback = callback_factory.create_callback(
+        async with callback_factory.managed_callback(
             session_id=session_id,
             execution_id=execution_id,
             condition=condition,
             tool_name=tool_name,
             step_number=step_number
-        )
-        
-        from app.configs.config import settings
-        # Call LLM with streaming
-        response = await self.llm_client.chat_completion(
-            tool_name=tool_name,
-            messages=messages,
-            callbacks=[callback],
-            stream=settings.langchain_stream,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            verbosity=verbosity,
-            reasoning_effort=reasoning_effort,
-            session_id=session_id,
-            **kwargs
-        )
+        ) as callback:
+            # Call LLM with streaming
+            response = await self.llm_client.chat_completion(
+                tool_name=tool_name,
+                messages=messages,
+                callbacks=[callback],
+                stream=settings.langchain_stream,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                verbosity=verbosity,
+                reasoning_effort=reasoning_effort,
+                session_id=session_id,
+                **kwargs
+            )
 
         if parsed:
            response = self._clean_llm_response(response)
@@ -458,7 +461,6 @@ class BaseTool(LangChainBaseTool):
         Returns:
             Path: Filepath where data was logged
         """
-        import json
         from pathlib import Path
         from datetime import datetime
 
@@ -485,8 +487,7 @@ class BaseTool(LangChainBaseTool):
             }
 
             # Write results to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            serialization.dump_to_file(log_data, filepath)
             
             logger.info(f"Data logged to: {filepath}")
             return filepath
@@ -562,7 +563,7 @@ class BaseTool(LangChainBaseTool):
         
         return sampled[:target_count]
     
-    def _sample_reviews_multi_strategically(
+    async def _sample_reviews_multi_strategically(
         self, 
         reviews: List[Dict[str, Any]], 
         target_count: int
@@ -571,89 +572,19 @@ class BaseTool(LangChainBaseTool):
         Sample reviews maintaining rating and length distributions.
         Stratification: Rating × Length (2 dimensions)
         Prioritizes longer reviews (avoids "Works." type reviews)
-        """
-        import random
-        import math
-        
-        # Calculate length threshold
-        avg_length = sum(len(r.get('review_body', '')) for r in reviews) / len(reviews)
-        
-        # Group by: rating and length (prioritize long reviews)
-        long_groups = {}  # rating -> [long reviews]
-        short_groups = {}  # rating -> [short reviews]
-        
-        for review in reviews:
-            rating = review.get('star_rating', 3)
-            is_long = len(review.get('review_body', '')) >= avg_length
-            
-            if is_long:
-                if rating not in long_groups:
-                    long_groups[rating] = []
-                long_groups[rating].append(review)
-            else:
-                if rating not in short_groups:
-                    short_groups[rating] = []
-                short_groups[rating].append(review)
-        
-        # Calculate allocation per rating
-        all_ratings = set(long_groups.keys()) | set(short_groups.keys())
-        rating_counts = {
-            rating: len(long_groups.get(rating, [])) + len(short_groups.get(rating, []))
-            for rating in all_ratings
-        }
-        
-        allocations = []
-        total_allocated = 0
         
-        for rating in all_ratings:
-            proportion = rating_counts[rating] / len(reviews)
-            ideal_size = target_count * proportion
-            allocated = math.floor(ideal_size)
-            
-            allocations.append({
-                'rating': rating,
-                'long_reviews': long_groups.get(rating, []),
-                'short_reviews': short_groups.get(rating, []),
-                'allocated': allocated,
-                'remainder': ideal_size - allocated
-            })
-            total_allocated += allocated
-        
-        # Distribute remaining slots
-        remaining = target_count - total_allocated
-        allocations.sort(key=lambda x: x['remainder'], reverse=True)
-        
-        for i in range(remaining):
-            if i < len(allocations):
-                total_available = len(allocations[i]['long_reviews']) + len(allocations[i]['short_reviews'])
-                if allocations[i]['allocated'] < total_available:
-                    allocations[i]['allocated'] += 1
-        
-        # Sample from each rating group (prioritize long reviews)
-        sampled = []
-        for allocation in allocations:
-            long_reviews = allocation['long_reviews']
-            short_reviews = allocation['short_reviews']
-            needed = allocation['allocated']
-            
-            if needed == 0:
-                continue
-            
-            # First: sample from long reviews
-            if len(long_reviews) >= needed:
-                sampled.extend(random.sample(long_reviews, needed))
-            else:
-                # Take all long reviews
-                sampled.extend(long_reviews)
-                remaining_needed = needed - len(long_reviews)
-                
-                # Then: fill with short reviews only if necessary
-                if remaining_needed > 0 and short_reviews:
-                    sampled.extend(random.sample(short_reviews, min(remaining_needed, len(short_reviews))))
-        
-        # Final shuffle and exact truncation
-        random.shuffle(sampled)
-        return sampled[:target_count]
+        Large inputs are sampled in the CPU process pool (rating / length
+        columns only, see app.core.cpu_executor).
+        """
+        indices = await cpu_executor.run(
+            stratified_sample_indices,
+            columns={
+                'ratings': [review.get('star_rating', 3) for review in reviews],
+                'body_lengths': [len(review.get('review_body') or '') for review in reviews],
+            },
+            target_count=target_count
+        )
+        return [reviews[index] for index in indices]
     
     def _calculate_batches(self, total_reviews: int, batch_size: int, batch_padding: float = 0.0) -> List[tuple[int, int]]:
         """
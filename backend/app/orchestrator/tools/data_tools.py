@@ -11,7 +11,8 @@ from app.orchestrator.graphs.shared_state import DataSource
 
 from app.database import get_db_context
 from app.models.reviews import get_review_model
-from app.schemas.reviews import to_work_format, ReviewFilterParams
+from app.models.review_categories import is_review_category, format_review_categories
+from app.schemas.reviews import WORK_PROJECTION, ReviewFilterParams
 
 from app.orchestrator.llm.tool_schemas import (
     LoadReviewsInputData,
@@ -116,19 +117,20 @@ class LoadReviewsTool(BaseTool):
                 limit = input_data.get('limit')
                 offset = input_data.get('offset', 0)
             
+            supported_categories = format_review_categories('"')
             if not category:
                 error_output = LoadReviewsOutput(
                     success=False,
-                    error='Missing required parameter: category (must be "shoes" or "wireless")',
+                    error=f'Missing required parameter: category (must be {supported_categories})',
                     error_type='missing_parameter'
                 )
                 return error_output.model_dump(exclude_none=True)
             
             category = category.lower()
-            if category not in ['shoes', 'wireless']:
+            if not is_review_category(category):
                 error_output = LoadReviewsOutput(
                     success=False,
-                    error=f'Invalid category: {category}. Must be "shoes" or "wireless"',
+                    error=f'Invalid category: {category}. Must be {supported_categories}',
                     error_type='invalid_parameter'
                 )
                 return error_output.model_dump(exclude_none=True)
@@ -180,12 +182,9 @@ class LoadReviewsTool(BaseTool):
                 # Get total count before pagination
                 total = query.count()
                 
-                # Apply pagination
-                reviews = query.limit(filters.limit).offset(filters.offset).all()
-                
-                # Convert to study format (reduced fields for participants)
-                study_reviews = [to_work_format(review) for review in reviews]
-                study_reviews_dicts = [r.model_dump() for r in study_reviews]
+                # Apply pagination (work-format columns only, straight to dicts)
+                rows = WORK_PROJECTION.select(query, model).limit(filters.limit).offset(filters.offset).all()
+                study_reviews_dicts = WORK_PROJECTION.to_dicts(rows)
             
             
             filters_applied_dict = {
@@ -200,16 +199,16 @@ class LoadReviewsTool(BaseTool):
                 execution_id=execution_id,
                 condition=condition,
                 progress=80,
-                message=f"Successfully loaded {len(study_reviews)} {category} reviews.",
+                message=f"Successfully loaded {len(study_reviews_dicts)} {category} reviews.",
                 details={
-                    'records_loaded': len(study_reviews),
+                    'records_loaded': len(study_reviews_dicts),
                     'category': category,
                     'total_available': total,
                     'filters_applied': filters_applied_dict
                 }
             )
 
-            logger.info(f"Loaded {len(study_reviews)} {category} reviews (total: {total})")
+            logger.info(f"Loaded {len(study_reviews_dicts)} {category} reviews (total: {total})")
 
             
             # Build proper DataSource with SQL query
@@ -268,7 +267,7 @@ class LoadReviewsTool(BaseTool):
                 'data_source': data_source.model_dump(),  # Use Pydantic model_dump()
                 'execution_time_ms': execution_time,
                 'summary': {                        # For results_registry
-                    'records_loaded': len(reviews),
+                    'records_loaded': len(study_reviews_dicts),
                     'category': category,
                     'total_available': total,
                     'load_time_ms': execution_time
@@ -282,7 +281,7 @@ class LoadReviewsTool(BaseTool):
                 condition=condition,
                 message=f"Completed loading {category} reviews.",
                 details={
-                    'records_loaded': len(reviews),
+                    'records_loaded': len(study_reviews_dicts),
                     'category': category,
                     'total_available': total,
                     'filters_applied': filters_applied_dict,
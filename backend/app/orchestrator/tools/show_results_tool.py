@@ -16,12 +16,17 @@ Each section is conditional based on:
 from typing import Dict, Any, List, Optional, Literal, Union
 import logging
 import time
-from collections import Counter
 
 from app.websocket.manager import WebSocketManager
+from app.core.cpu_executor import cpu_executor
+from app.core.cpu_tasks import merge_theme_list
 
 from app.orchestrator.tools.base_tool import BaseTool
-from app.orchestrator.graphs.shared_state import SharedWorkflowState
+from app.orchestrator.graphs.shared_state import (
+    SharedWorkflowState,
+    RecordStatistics,
+    get_record_statistics
+)
 
 from app.orchestrator.tools.output_schemas.show_results_tool_schema import (
     ExecutiveSummarySection,
@@ -52,6 +57,8 @@ from app.orchestrator.tools.output_schemas.show_results_tool_schema import (
 
 
 from app.orchestrator.llm.tool_schemas import ShowResultsInputData
+from app.orchestrator.llm.prompt_budget import PromptBudget, PromptSection
+from app.configs.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -211,7 +218,7 @@ class ShowResultsTool(BaseTool):
             
             # Aggregate themes if present
             if theme_analysis:
-                theme_analysis = self._aggregate_themes(theme_analysis, total_records)
+                theme_analysis = await self._aggregate_themes(theme_analysis, total_records)
             
             # Aggregate insights if present
             if insights:
@@ -375,11 +382,15 @@ class ShowResultsTool(BaseTool):
     # AGGREGATION METHODS
     # ============================================================
     
-    def _aggregate_themes(self, theme_data: Union[List[Dict], Dict], total_records: int = None) -> Union[List[Dict], Dict]:
+    async def _aggregate_themes(self, theme_data: Union[List[Dict], Dict], total_records: int = None) -> Union[List[Dict], Dict]:
         """
         Aggregate themes by normalizing their names and partial matching.
         Maintains sentiment split structure if present - NEVER aggregates across sentiments.
         
+        Each list is merged by app.core.cpu_tasks.merge_theme_list (quadratic
+        in the number of themes), in the CPU process pool for long lists
+        (cpu_offload_min_themes).
+        
         Args:
             theme_data: Either a list of themes or dict with sentiment keys
             total_records: Total number of records in the full dataset (from data.total)
@@ -387,132 +398,30 @@ class ShowResultsTool(BaseTool):
         Returns:
             Aggregated themes in same structure as input, with projected counts
         """
-        def normalize_theme_name(theme: str) -> str:
-            """Normalize theme name: convert all delimiters to /, remove spaces around /"""
-            # Replace common delimiters with /
-            normalized = theme.replace('|', '/').replace(',', '/').replace(';', '/').replace('\\', '/')
-            # Remove spaces around /
-            normalized = '/'.join(part.strip() for part in normalized.split('/'))
-            return normalized.lower()
-        
-        def get_theme_parts(theme: str) -> frozenset:
-            """Get individual parts of a theme (split by /) as frozenset for order-independent comparison"""
-            return frozenset(part.strip().lower() for part in theme.split('/') if part.strip())
-        
-        def is_partial_match(theme1: str, theme2: str) -> bool:
-            """
-            Check if theme1 and theme2 should be merged.
-            Returns True if one is a subset of the other OR if they have identical parts.
-            """
-            parts1 = get_theme_parts(theme1)
-            parts2 = get_theme_parts(theme2)
-            
-            # Exact match (same parts, different order) OR one is subset of the other
-            return parts1 == parts2 or parts1.issubset(parts2) or parts2.issubset(parts1)
-        
-        def find_matching_key(normalized: str, existing_keys: List[str]) -> Optional[str]:
-            """Find existing key that matches the normalized theme"""
-            for key in existing_keys:
-                if is_partial_match(normalized, key):
-                    return key
-            return None
-        
-        def merge_theme_names(theme1: str, theme2: str) -> str:
-            """Merge two theme names, keeping the more complete one, or alphabetically sorted if equal"""
-            parts1 = get_theme_parts(theme1)
-            parts2 = get_theme_parts(theme2)
-            
-            # If same parts (just different order), return alphabetically sorted version
-            if parts1 == parts2:
-                sorted_parts = sorted(parts1)
-                return '/'.join(sorted_parts)
-            
-            # Keep the one with more parts (more specific)
-            if len(parts1) >= len(parts2):
-                return theme1
-            else:
-                return theme2
-        
-        def aggregate_theme_list(themes: List[Dict], total_records: int = None) -> List[Dict]:
+        async def aggregate_theme_list(themes: List[Dict], total_records: int = None) -> List[Dict]:
             """
             Aggregate a single list of themes.
             ONLY aggregates within this list not cross sentiment boundaries.
-            
-            Args:
-                themes: List of theme dictionaries to aggregate
-                total_records: Total number of records in the full dataset (for projection)
             """
             if not themes:
                 return []
             
-            aggregated = {}
-            
-            for theme in themes:
-                theme_name = theme.get('theme', '')
-                if not theme_name:
-                    continue
-                    
-                normalized = normalize_theme_name(theme_name)
-                
-                # Check if this matches any existing theme
-                matching_key = find_matching_key(normalized, list(aggregated.keys()))
-                
-                if matching_key:
-                    # Merge with existing - keep more complete name
-                    merged_name = merge_theme_names(normalized, matching_key)
-                    
-                    # If merged name is different, we need to update the key
-                    if merged_name != matching_key:
-                        old_data = aggregated.pop(matching_key)
-                        aggregated[merged_name] = {
-                            'theme': merged_name,
-                            'weighted_score': old_data['weighted_score'] + theme.get('weighted_score', 0),
-                            'review_count': old_data['review_count'] + theme.get('review_count', 0),
-                        }
-                    else:
-                        aggregated[matching_key]['weighted_score'] += theme.get('weighted_score', 0)
-                        aggregated[matching_key]['review_count'] += theme.get('review_count', 0)
-                else:
-                    # First occurrence - use normalized name
-                    aggregated[normalized] = {
-                        'theme': normalized,
-                        'weighted_score': theme.get('weighted_score', 0),
-                        'review_count': theme.get('review_count', 0),
-                    }
-            
-            # Convert back to list
-            result = list(aggregated.values())
-            
-            # Calculate percentages based on TOTAL of all aggregated review_counts in this sentiment group
-            if result:
-                # Sum of all review counts in THIS sentiment group (the analyzed sample)
-                total_analyzed_in_group = sum(t['review_count'] for t in result)
-                
-                if total_analyzed_in_group > 0:
-                    for theme in result:
-                        # Percentage within this sentiment group
-                        theme['percentage'] = round((theme['review_count'] / total_analyzed_in_group) * 100, 2)
-                        
-                        # Project to full dataset if total_records provided
-                        if total_records and total_records > 0:
-                            # Estimated count in full dataset
-                            theme['estimated_total_count'] = round((theme['percentage'] / 100) * total_records)
-                else:
-                    for theme in result:
-                        theme['percentage'] = 0.0
-                        if total_records:
-                            theme['estimated_total_count'] = 0
-            
-            # Sort by weighted_score descending
-            result.sort(key=lambda x: x['weighted_score'], reverse=True)
-            
-            return result
+            return await cpu_executor.run(
+                merge_theme_list,
+                columns={
+                    'theme_names': [theme.get('theme', '') for theme in themes],
+                    'weighted_scores': [theme.get('weighted_score', 0) for theme in themes],
+                    'review_counts': [theme.get('review_count', 0) for theme in themes],
+                },
+                offload_from=settings.cpu_offload_min_themes,
+                total_records=total_records
+            )
         
         # Check structure and aggregate accordingly
         if isinstance(theme_data, dict):
             # 1) COMBINED structure: {"type": "combined", "themes": [...]}
             if theme_data.get("type") == "combined" and isinstance(theme_data.get("themes"), list):
-                aggregated_list = aggregate_theme_list(
+                aggregated_list = await aggregate_theme_list(
                     theme_data["themes"],
                     total_records=total_records
                 )
@@ -533,7 +442,7 @@ class ShowResultsTool(BaseTool):
                 result = {}
                 for sentiment_key in ["positive_themes", "neutral_themes", "negative_themes"]:
                     if sentiment_key in theme_data:
-                        result[sentiment_key] = aggregate_theme_list(
+                        result[sentiment_key] = await aggregate_theme_list(
                             theme_data[sentiment_key],
                             total_records=total_records
                         )
@@ -546,7 +455,7 @@ class ShowResultsTool(BaseTool):
 
             # 3) Fallback: dict wrapper with a "themes" list but no sentiment keys
             if isinstance(theme_data.get("themes"), list):
-                return aggregate_theme_list(
+                return await aggregate_theme_list(
                     theme_data["themes"],
                     total_records=total_records
                 )
@@ -554,7 +463,7 @@ class ShowResultsTool(BaseTool):
             # 4) Last resort: treat any list-like value as themes
             for value in theme_data.values():
                 if isinstance(value, list):
-                    return aggregate_theme_list(
+                    return await aggregate_theme_list(
                         value,
                         total_records=total_records
                     )
@@ -563,7 +472,7 @@ class ShowResultsTool(BaseTool):
             return []
 
         # FLAT LIST: aggregate all together
-        return aggregate_theme_list(theme_data, total_records=total_records)
+        return await aggregate_theme_list(theme_data, total_records=total_records)
     
     
     def _aggregate_insights(self, insight_data: Dict[str, Any]) -> Dict[str, List[str]]:
@@ -807,51 +716,69 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
         data: Dict[str, Any],
         availability: Dict[str, bool]
     ) -> str:
-        """Build context string for LLM summary with clear, readable formatting"""
-        context_parts = []
-        records = data.get('records', [])
+        """
+        Build context string for LLM summary with clear, readable formatting
+        
+        Sections are ranked and fitted into the model's context budget
+        (overview > ratings/sentiment > themes > insights).
+        """
+        sections: List[PromptSection] = []
+        stats = get_record_statistics(data.get('record_store'), data.get('records', []))
         
         # === REVIEW COUNT ===
-        context_parts.append(f"Dataset Overview:\n  Total Reviews Analyzed: {len(records)}")
+        sections.append(PromptSection(
+            name='overview',
+            header='Dataset Overview:',
+            items=[f"  Total Reviews Analyzed: {stats.total}"],
+            required=True
+        ))
         
         # === RATING STATISTICS ===
-        ratings = [r.get('star_rating') for r in records if r.get('star_rating')]
-        if ratings:
-            avg_rating = sum(ratings) / len(ratings)
-            rating_dist = Counter(ratings)
-            rating_breakdown = ', '.join(f"{stars}★: {count}" for stars, count in sorted(rating_dist.items(), reverse=True))
-            context_parts.append(
-                f"\nRating Statistics:\n"
-                f"  Average Rating: {avg_rating:.2f}/5.0\n"
-                f"  Distribution: {rating_breakdown}"
+        if stats.rated_count:
+            rating_breakdown = ', '.join(
+                f"{stars}★: {count}"
+                for stars, count in sorted(stats.rating_counts.items(), reverse=True)
+                if count
             )
+            sections.append(PromptSection(
+                name='ratings',
+                header='Rating Statistics:',
+                items=[
+                    f"  Average Rating: {stats.average_rating:.2f}/5.0",
+                    f"  Distribution: {rating_breakdown}"
+                ],
+                priority=1
+            ))
         
         # === SENTIMENT ANALYSIS ===
         if availability['has_sentiment']:
             sentiment_stats = data.get('sentiment_statistics', {})
             if sentiment_stats:
-                context_parts.append(
-                    f"\nSentiment Distribution:\n"
-                    f"  Positive: {sentiment_stats.get('positive', 0)} ({sentiment_stats.get('percentages', {}).get('positive', 0):.1f}%)\n"
-                    f"  Neutral: {sentiment_stats.get('neutral', 0)} ({sentiment_stats.get('percentages', {}).get('neutral', 0):.1f}%)\n"
-                    f"  Negative: {sentiment_stats.get('negative', 0)} ({sentiment_stats.get('percentages', {}).get('negative', 0):.1f}%)\n"
-                    f"  Dominant: {sentiment_stats.get('dominant_sentiment', 'N/A').capitalize()}"
-                )
+                sections.append(PromptSection(
+                    name='sentiment',
+                    header='Sentiment Distribution:',
+                    items=[
+                        f"  Positive: {sentiment_stats.get('positive', 0)} ({sentiment_stats.get('percentages', {}).get('positive', 0):.1f}%)",
+                        f"  Neutral: {sentiment_stats.get('neutral', 0)} ({sentiment_stats.get('percentages', {}).get('neutral', 0):.1f}%)",
+                        f"  Negative: {sentiment_stats.get('negative', 0)} ({sentiment_stats.get('percentages', {}).get('negative', 0):.1f}%)",
+                        f"  Dominant: {sentiment_stats.get('dominant_sentiment', 'N/A').capitalize()}"
+                    ],
+                    priority=1
+                ))
         
         # === THEMES BY SENTIMENT ===
         if availability['has_themes']:
             theme_analysis = data.get('theme_analysis', {})
-            theme_sections = []
             themes_per_category = 3
             
             if isinstance(theme_analysis, dict):
                 sentiment_categories = [
-                    ('positive_themes', 'Positive'),
-                    ('neutral_themes', 'Neutral'),
-                    ('negative_themes', 'Negative')
+                    ('positive_themes', 'Positive', 2),
+                    ('neutral_themes', 'Neutral', 3),
+                    ('negative_themes', 'Negative', 2)
                 ]
                 
-                for sentiment_type, label in sentiment_categories:
+                for sentiment_type, label, priority in sentiment_categories:
                     theme_list = theme_analysis.get(sentiment_type, [])
                     if theme_list:
                         themes_formatted = []
@@ -869,15 +796,16 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
                                 themes_formatted.append(base_info)
                         
                         if themes_formatted:
-                            theme_sections.append(f"  {label}:\n" + "\n".join(themes_formatted))
-            
-            if theme_sections:
-                context_parts.append("\nMain Themes by Sentiment:\n" + "\n".join(theme_sections))
+                            sections.append(PromptSection(
+                                name=f'themes_{label.lower()}',
+                                header=f"Main {label} Themes:",
+                                items=themes_formatted,
+                                priority=priority
+                            ))
         
         # === KEY INSIGHTS ===
         if availability['has_insights']:
             insights_dict = data.get('insights', {})
-            insights_formatted = []
             target_count = 6
             
             if insights_dict:
@@ -887,27 +815,23 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
                 if num_categories <= target_count:
                     # At least one per category, distribute remaining
                     insights_per_category = max(1, target_count // num_categories)
-                    
-                    for category in categories:
-                        category_insights = insights_dict.get(category, [])
-                        if category_insights:
-                            category_label = category.replace('_', ' ').title()
-                            insights_formatted.append(f"  {category_label}:")
-                            for insight in category_insights[:insights_per_category]:
-                                insights_formatted.append(f"    • {insight}")
                 else:
                     # Take top insight from each category
-                    for category in categories[:target_count]:
-                        category_insights = insights_dict.get(category, [])
-                        if category_insights:
-                            category_label = category.replace('_', ' ').title()
-                            insights_formatted.append(f"  {category_label}:")
-                            insights_formatted.append(f"    • {category_insights[0]}")
+                    categories = categories[:target_count]
+                    insights_per_category = 1
                 
-                if insights_formatted:
-                    context_parts.append("\nKey Business Insights:\n" + "\n".join(insights_formatted))
+                for category in categories:
+                    category_insights = insights_dict.get(category, [])
+                    if category_insights:
+                        category_label = category.replace('_', ' ').title()
+                        sections.append(PromptSection(
+                            name=f'insights_{category}',
+                            header=f"Key Business Insights ({category_label}):",
+                            items=[f"    • {insight}" for insight in category_insights[:insights_per_category]],
+                            priority=4
+                        ))
         
-        return "\n".join(context_parts)
+        return PromptBudget.for_model(settings.llm_model).build(sections)
     
     def _generate_themes_section(
         self,
@@ -1120,7 +1044,8 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
                 content=None
             )
         
-        records = data.get('records', [])
+        # Aggregates precomputed with the record store (single pass at load/filter time)
+        stats = get_record_statistics(data.get('record_store'), data.get('records', []))
         statistics = {}
         
         # Calculate requested metrics
@@ -1157,24 +1082,24 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
                 statistics['sentiment_distribution'] = dist.model_dump(exclude_none=True)
             
             elif metric == 'review_summary':
-                statistics['review_summary'] = self._calc_review_summary(records=records).model_dump(exclude_none=True)
+                statistics['review_summary'] = self._calc_review_summary(stats=stats).model_dump(exclude_none=True)
             
             elif metric == 'rating_distribution':
-                statistics['rating_distribution'] = self._calc_rating_distribution(records=records).model_dump(exclude_none=True)
+                statistics['rating_distribution'] = self._calc_rating_distribution(stats=stats).model_dump(exclude_none=True)
             
             elif metric == 'verified_rate':
-                statistics['verified_rate'] = self._calc_verified_rate(records=records).model_dump(exclude_none=True)
+                statistics['verified_rate'] = self._calc_verified_rate(stats=stats).model_dump(exclude_none=True)
             
             elif metric == 'theme_coverage':
                 statistics['theme_coverage'] = self._calc_theme_coverage(
-                    records=records, 
+                    stats=stats, 
                     category=category, 
                     availability=availability
                 ).model_dump(exclude_none=True)
             
             elif metric == 'sentiment_consistency':
                 statistics['sentiment_consistency'] = self._calc_sentiment_consistency(
-                    records=records, 
+                    stats=stats, 
                     availability=availability
                 ).model_dump(exclude_none=True)
         
@@ -1195,45 +1120,44 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
             content=content
         )
     
-    def _calc_review_summary(self, records: List[Dict[str, Any]]) -> ReviewSummary:
+    def _calc_review_summary(self, stats: RecordStatistics) -> ReviewSummary:
         """Calculate general review statistics"""
+        total = stats.total
         return ReviewSummary(
             available=True,
-            total_reviews=len(records),
-            avg_review_body_length=sum(len(r.get('review_body', '')) for r in records) / len(records) if records else 0,
-            avg_review_headline_length=sum(len(r.get('review_headline', '')) for r in records) / len(records) if records else 0,
-            verified_count=sum(1 for r in records if r.get('verified_purchase')),
+            total_reviews=total,
+            avg_review_body_length=stats.body_length_sum / total if total else 0,
+            avg_review_headline_length=stats.headline_length_sum / total if total else 0,
+            verified_count=stats.verified_count,
         )
     
-    def _calc_rating_distribution(self, records: List[Dict[str, Any]]) -> RatingDistribution:
+    def _calc_rating_distribution(self, stats: RecordStatistics) -> RatingDistribution:
         """Calculate rating distribution statistics"""
-        ratings = [r.get('star_rating') for r in records if r.get('star_rating')]
-        
-        if not ratings:
+        if not stats.rated_count:
             return RatingDistribution(
                 available=False,
                 message='No rating data'
             )
         
-        rating_counts = Counter(ratings)
+        rating_counts = stats.rating_counts
         
         return RatingDistribution(
             available=True,
-            total_rated=len(ratings),
-            average_rating=sum(ratings) / len(ratings),
+            total_rated=stats.rated_count,
+            average_rating=stats.average_rating,
             distribution={
                 str(rating): RatingDistributionData(
                     count=rating_counts.get(rating, 0),
-                    percentage=(rating_counts.get(rating, 0) / len(ratings)) * 100
+                    percentage=(rating_counts.get(rating, 0) / stats.rated_count) * 100
                 )
                 for rating in [1, 2, 3, 4, 5]
             }
         )
     
-    def _calc_verified_rate(self, records: List[Dict[str, Any]]) -> VerifiedRate:
+    def _calc_verified_rate(self, stats: RecordStatistics) -> VerifiedRate:
         """Calculate verified purchase rate"""
-        total = len(records)
-        verified = sum(1 for r in records if r.get('verified_purchase'))
+        total = stats.total
+        verified = stats.verified_count
         
         return VerifiedRate(
             available=True,
@@ -1245,7 +1169,7 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
     
     def _calc_theme_coverage(
         self,
-        records: List[Dict[str, Any]],
+        stats: RecordStatistics,
         category: Literal['shoes', 'wireless'],
         availability: Dict[str, bool]
     ) -> ThemeCoverage:
@@ -1262,12 +1186,12 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
             available=True,
             total_themes_identified=0,
             top_themes=[],
-            reviews_with_themes=len(records)
+            reviews_with_themes=stats.total
         )
     
     def _calc_sentiment_consistency(
         self,
-        records: List[Dict[str, Any]],
+        stats: RecordStatistics,
         availability: Dict[str, bool]
     ) -> SentimentConsistency:
         """
@@ -1281,26 +1205,10 @@ Example: ["Key finding 1", "Key finding 2", "Key finding 3"]"""
                 message='No sentiment data'
             )
         
-        # Count alignment between rating and sentiment
-        aligned = 0
-        misaligned = 0
-        
-        for record in records:
-            rating = record.get('star_rating')
-            sentiment = record.get('sentiment')
-            
-            if rating and sentiment:
-                # Expected alignment
-                if rating >= 4 and sentiment == 'positive':
-                    aligned += 1
-                elif rating == 3 and sentiment == 'neutral':
-                    aligned += 1
-                elif rating <= 2 and sentiment == 'negative':
-                    aligned += 1
-                else:
-                    misaligned += 1
-        
-        total = aligned + misaligned
+        # Alignment between rating and sentiment (maintained by apply_enrichment)
+        total = stats.sentiment_compared
+        aligned = stats.sentiment_aligned
+        misaligned = total - aligned
         
         return SentimentConsistency(
             available=True,
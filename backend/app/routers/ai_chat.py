@@ -8,9 +8,9 @@ import time
 from collections import defaultdict
 import json
 import asyncio
-import httpx
 
 from app.database import get_db
+from app.core.http_client import http_client_session
 from app.configs.config import settings
 from app.models.session import Session as SessionModel
 from app.models.ai_chat import ChatMessage, ChatConversation
@@ -45,29 +45,8 @@ if settings.redis_enabled:
         print(f"Redis connection failed: {e}. Continuing without cache.")
         redis_client = None
 
-# Conditional rate limiter setup
-limiter = None
-if settings.rate_limit_enabled:
-    from slowapi import Limiter
-    from slowapi.util import get_remote_address
-    limiter = Limiter(key_func=get_remote_address)
-    print("✅ Rate limiting enabled")
-else:
-    print("⚠️ Rate limiting disabled")
-
-
-def conditional_limit(limit_string: str):
-    """
-    Decorator that applies rate limiting only if enabled in settings
-    """
-    def decorator(func):
-        if settings.rate_limit_enabled and limiter:
-            # Apply the rate limit decorator
-            return limiter.limit(limit_string)(func)
-        else:
-            # Return function unchanged (no rate limiting)
-            return func
-    return decorator
+# Rate limits (chat_rate_limit / save_chat_rate_limit) are applied by
+# RateLimitMiddleware, see app.core.rate_limiter.default_http_rules
 
 def get_session_id_from_request(request: Request) -> str:
     """Extract session ID from request for rate limiting"""
@@ -79,7 +58,6 @@ def get_session_id_from_request(request: Request) -> str:
 
 
 @router.post("/chat")
-@conditional_limit(settings.chat_rate_limit)
 async def chat_stream(
     request: Request,
     chat_request: ChatRequest,
@@ -119,10 +97,7 @@ async def chat_stream(
             # Save user message to database
             if limited_messages and limited_messages[-1].role == "user":
                                 
-                # Calculate message index
-                message_index = db.query(ChatMessage).filter(
-                    ChatMessage.session_id == chat_request.session_id
-                ).count()
+                message_index = ChatConversation.reserve_message_index(db, chat_request.session_id)
                 
                 user_message = ChatMessage(
                     session_id=chat_request.session_id,
@@ -157,7 +132,7 @@ async def chat_stream(
                 # Non-streaming response
                 start_time = time.time()
 
-                async with httpx.AsyncClient() as client:
+                async with http_client_session() as client:
                     response = await client.post(
                         OPENAI_API_URL,
                         headers={
@@ -179,10 +154,7 @@ async def chat_stream(
 
                     response_time_ms = int((time.time() - start_time) * 1000)
                     
-                    # Calculate message index
-                    message_index = db.query(ChatMessage).filter(
-                        ChatMessage.session_id == chat_request.session_id
-                    ).count()
+                    message_index = ChatConversation.reserve_message_index(db, conversation.session_id)
 
                     # Save assistant message
                     db_message = ChatMessage(
@@ -229,7 +201,7 @@ async def chat_stream(
                 finish_reason = None
                 
                 try:
-                    async with httpx.AsyncClient() as client:
+                    async with http_client_session() as client:
                         async with client.stream(
                             "POST",
                             OPENAI_API_URL,
@@ -252,10 +224,7 @@ async def chat_stream(
                                     if data.strip() == '[DONE]':
                                         response_time_ms = int((time.time() - start_time) * 1000)
                                         
-                                        # Calculate message index
-                                        message_index = db.query(ChatMessage).filter(
-                                            ChatMessage.session_id == conversation.session_id
-                                        ).count()
+                                        message_index = ChatConversation.reserve_message_index(db, conversation.session_id)
 
                                         db_message = ChatMessage(
                                             session_id=conversation.session_id,
@@ -326,7 +295,6 @@ async def chat_stream(
 
 
 @router.post("/save-message", response_model=ChatMessageResponse)
-@conditional_limit(settings.save_chat_rate_limit)
 async def save_message(
     request: Request,
     message_data: SaveMessageRequest,
@@ -386,7 +354,8 @@ async def save_message(
                 session_id=effective_session_id,
                 role=message_data.role,
                 content=message_data.content,
-                timestamp=datetime.now(timezone.utc)
+                timestamp=datetime.now(timezone.utc),
+                message_index=ChatConversation.reserve_message_index(db, effective_session_id)
             )
             db.add(db_message)
             
@@ -17,6 +17,18 @@ async def get_circuit_breaker_status():
     """Get circuit breaker status"""
     return llm_client.get_circuit_breaker_state()
 
+@router.get("/callbacks")
+async def get_callback_status():
+    """Get streaming callback registry status (live count, retained bytes)"""
+    from app.orchestrator.llm.streaming_callbacks import get_callback_factory
+    
+    try:
+        factory = get_callback_factory()
+    except RuntimeError:
+        return {'initialized': False, 'live_callbacks': 0, 'retained_bytes': 0}
+    
+    return {'initialized': True, **factory.get_registry_stats()}
+
 @router.get("/health")
 async def health_check():
     """System health check"""
@@ -50,4 +62,58 @@ async def set_degradation_override(level: str):
         graceful_degradation.set_manual_override(deg_level)
         return {"message": f"Degradation set to {level}"}
     except ValueError:
-        raise HTTPException(400, f"Invalid level: {level}")
\ No newline at end of file
+        raise HTTPException(400, f"Invalid level: {level}")
+
+@router.get("/node-timings")
+async def get_node_timings(by_tool: bool = False):
+    """Latency histograms per workflow node phase (optionally per tool)"""
+    from app.orchestrator.node_tracing import node_tracer
+    
+    return node_tracer.get_histograms(by_tool=by_tool)
+
+
+@router.get("/db-pools")
+async def get_db_pool_status():
+    """Connection pool usage per pool and currently long-held connections (with checkout stacks)"""
+    from app.core.db_pool_monitor import pool_monitor
+    
+    return pool_monitor.get_pool_stats()
+
+
+@router.get("/websocket-connections")
+async def get_websocket_connection_stats():
+    """Outbound queue depth and send lag per WebSocket connection (slowest first)"""
+    from app.websocket.manager import get_ws_manager
+    
+    ws_manager = get_ws_manager()
+    return {
+        **ws_manager.get_metrics()['outbound'],
+        'connections': ws_manager.get_connection_stats(),
+    }
+
+
+@router.get("/cpu-pool")
+async def get_cpu_pool_stats():
+    """CPU process pool size, offload threshold and inline / offloaded call counts"""
+    from app.core.cpu_executor import cpu_executor
+    
+    return cpu_executor.get_stats()
+
+
+@router.get("/event-loop")
+async def get_event_loop_stats(limit: int = 20, reset: bool = False):
+    """Event loop lag and blocking call sites ranked by total blocked time (stacks with loop_capture_blocking_stacks / debug)"""
+    from app.core.loop_monitor import loop_monitor
+    
+    stats = loop_monitor.get_stats(limit=limit)
+    if reset:
+        loop_monitor.reset()
+    return stats
+
+
+@router.get("/shutdown")
+async def get_shutdown_status():
+    """Drain state, executions this worker would wait for on shutdown, and the last drain report"""
+    from app.core.shutdown import shutdown_manager
+    
+    return shutdown_manager.get_stats()
@@ -1,9 +1,11 @@
 # backend/app/routers/orchestrator.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import logging
 
+from app.core.serialization import FastJSONResponse
+from app.core.shutdown import shutdown_manager
 from app.database import get_db, get_db_context
 from app.models.session import Session as SessionModel
 from app.models.execution import WorkflowExecution
@@ -16,13 +18,12 @@ from app.schemas.orchestrator import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/orchestrator", tags=["orchestrator"])
+router = APIRouter(prefix="/api/orchestrator", tags=["orchestrator"], default_response_class=FastJSONResponse)
 
 
 @router.post("/execute", response_model=ExecutionResponse)
 async def execute_workflow(
     request: ExecutionRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -33,6 +34,15 @@ async def execute_workflow(
     Note: Real-time progress updates are sent via the main WebSocket endpoint at /ws/{session_id}
     """
     try:
+        # Draining for a restart: no new executions on this worker
+        if shutdown_manager.draining:
+            rejection = shutdown_manager.rejection()
+            raise HTTPException(
+                status_code=503,
+                detail=rejection['error'],
+                headers={'Retry-After': str(max(1, rejection['retry_after_ms'] // 1000))}
+            )
+        
         # Validate session exists
         session = db.query(SessionModel).filter(
             SessionModel.session_id == request.session_id
@@ -115,8 +125,8 @@ async def execute_workflow(
                 except Exception as update_error:
                     logger.error(f"Failed to update execution error status: {update_error}")
         
-        # Add background task
-        background_tasks.add_task(run_execution)
+        # Run in the background (tracked, so a shutdown drains it)
+        shutdown_manager.spawn_execution(run_execution(), execution.id, request.session_id)
         
         return ExecutionResponse(
             execution_id=execution.id,
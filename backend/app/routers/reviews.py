@@ -8,18 +8,24 @@ from sqlalchemy.orm import Session
 from typing import Optional
 import logging
 
+from app.core.serialization import FastJSONResponse
 from app.database import get_db
-from app.models.reviews import ShoesReview, WirelessReview, get_review_model
+from app.models.review_categories import REVIEW_CATEGORIES, ReviewCategorySpec
+from app.models.reviews import get_review_model
+from app.models.product_summary import (
+    aggregate_product_summaries,
+    get_category_overview,
+    get_product_summary
+)
 from app.schemas.reviews import (
-    ShoesReviewStudyListResponse,
-    WirelessReviewStudyListResponse,
+    CATEGORY_SCHEMAS,
+    STUDY_PROJECTION,
     ReviewFilterParams,
-    to_study_format,
-    batch_to_study_format
+    to_study_format
 )
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/reviews", tags=["reviews"])
+router = APIRouter(prefix="/api/reviews", tags=["reviews"], default_response_class=FastJSONResponse)
 
 
 def apply_filters(query, filters: ReviewFilterParams):
@@ -61,19 +67,76 @@ def apply_filters(query, filters: ReviewFilterParams):
     return query
 
 
-@router.get("/shoes", response_model=ShoesReviewStudyListResponse)
-async def get_shoes_reviews(
-    product_id: Optional[str] = Query(None, description="Filter by product ID"),
-    min_rating: Optional[int] = Query(None, ge=1, le=5),
-    max_rating: Optional[int] = Query(None, ge=1, le=5),
-    verified_only: Optional[bool] = Query(None),
-    exclude_malformed: Optional[bool] = Query(True),
-    limit: int = Query(100, ge=1, le=2000),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
-):
-    """
-    Get shoes reviews with optional filters
+def _make_category_endpoint(spec: ReviewCategorySpec):
+    """Build the study list endpoint for one registered category"""
+    model = get_review_model(spec.key)
+    
+    async def get_category_reviews(
+        product_id: Optional[str] = Query(None, description="Filter by product ID"),
+        min_rating: Optional[int] = Query(None, ge=1, le=5),
+        max_rating: Optional[int] = Query(None, ge=1, le=5),
+        verified_only: Optional[bool] = Query(None),
+        exclude_malformed: Optional[bool] = Query(True),
+        limit: int = Query(100, ge=1, le=2000),
+        offset: int = Query(0, ge=0),
+        db: Session = Depends(get_db)
+    ):
+        try:
+            # Build filter params
+            filters = ReviewFilterParams(
+                product_id=product_id,
+                min_rating=min_rating,
+                max_rating=max_rating,
+                verified_only=verified_only,
+                exclude_malformed=exclude_malformed,
+                limit=limit,
+                offset=offset
+            )
+            
+            # Base query
+            query = db.query(model)
+            
+            # Apply filters
+            if filters.product_id:
+                query = query.filter(model.product_id == filters.product_id)
+            if filters.min_rating is not None:
+                query = query.filter(model.star_rating >= filters.min_rating)
+            if filters.max_rating is not None:
+                query = query.filter(model.star_rating <= filters.max_rating)
+            if filters.verified_only:
+                query = query.filter(model.verified_purchase == True)
+            if filters.exclude_malformed:
+                query = query.filter(model.is_malformed == False)
+            
+            # Get total count before pagination
+            total = query.count()
+            
+            # Apply pagination and ordering
+            query = query.order_by(
+                model.helpful_votes.desc(),  # Most helpful first
+                model.review_date.desc()     # Then most recent
+            )
+            rows = STUDY_PROJECTION.select(query, model).limit(filters.limit).offset(filters.offset).all()
+            
+            # Study format (reduced fields) straight from the projected columns
+            study_reviews = STUDY_PROJECTION.to_dicts(rows)
+            
+            logger.info(f"Retrieved {len(study_reviews)} {spec.key} reviews (total: {total})")
+            
+            return {
+                "reviews": study_reviews,
+                "total": total,
+                "limit": filters.limit,
+                "offset": filters.offset
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching {spec.key} reviews: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    get_category_reviews.__name__ = f"get_{spec.key}_reviews"
+    get_category_reviews.__doc__ = f"""
+    Get {spec.key} reviews with optional filters
     
     Returns study-safe format (reduced fields for participants)
     
@@ -82,136 +145,50 @@ async def get_shoes_reviews(
     - min_rating, max_rating: Filter by star rating range
     - verified_only: Only verified purchases
     - exclude_malformed: Exclude spam/malformed reviews (default: true)
-    - limit: Max results (1-1000, default: 100)
+    - limit: Max results (1-2000, default: 100)
     - offset: Pagination offset
     """
-    try:
-        # Build filter params
-        filters = ReviewFilterParams(
-            product_id=product_id,
-            min_rating=min_rating,
-            max_rating=max_rating,
-            verified_only=verified_only,
-            exclude_malformed=exclude_malformed,
-            limit=limit,
-            offset=offset
-        )
-        
-        # Base query
-        query = db.query(ShoesReview)
-        
-        # Apply filters
-        if filters.product_id:
-            query = query.filter(ShoesReview.product_id == filters.product_id)
-        if filters.min_rating is not None:
-            query = query.filter(ShoesReview.star_rating >= filters.min_rating)
-        if filters.max_rating is not None:
-            query = query.filter(ShoesReview.star_rating <= filters.max_rating)
-        if filters.verified_only:
-            query = query.filter(ShoesReview.verified_purchase == True)
-        if filters.exclude_malformed:
-            query = query.filter(ShoesReview.is_malformed == False)
-        
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        reviews = query.order_by(
-            ShoesReview.helpful_votes.desc(),  # Most helpful first
-            ShoesReview.review_date.desc()     # Then most recent
-        ).limit(filters.limit).offset(filters.offset).all()
-        
-        # Convert to study format (reduced fields)
-        study_reviews = batch_to_study_format(reviews)
-        
-        logger.info(f"Retrieved {len(reviews)} shoes reviews (total: {total})")
-        
-        return {
-            "reviews": study_reviews,
-            "total": total,
-            "limit": filters.limit,
-            "offset": filters.offset
-        }
-        
-    except Exception as e:
-        logger.error(f"Error fetching shoes reviews: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return get_category_reviews
+
+
+# One list endpoint per registered category: GET /api/reviews/{key}
+for _spec in REVIEW_CATEGORIES:
+    router.add_api_route(
+        f"/{_spec.key}",
+        _make_category_endpoint(_spec),
+        methods=["GET"],
+        response_model=CATEGORY_SCHEMAS[_spec.key].study_list_response,
+        summary=f"Get {_spec.display_name} Reviews",
+    )
 
 
-@router.get("/wireless", response_model=WirelessReviewStudyListResponse)
-async def get_wireless_reviews(
-    product_id: Optional[str] = Query(None, description="Filter by product ID"),
-    min_rating: Optional[int] = Query(None, ge=1, le=5),
-    max_rating: Optional[int] = Query(None, ge=1, le=5),
-    verified_only: Optional[bool] = Query(None),
-    exclude_malformed: Optional[bool] = Query(True),
-    limit: int = Query(100, ge=1, le=2000),
-    offset: int = Query(0, ge=0),
+@router.get("/{category}/overview")
+async def get_category_overview_endpoint(
+    category: str,
+    top_products: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
     """
-    Get wireless reviews with optional filters
-    
-    Returns study-safe format (reduced fields for participants)
+    Dataset overview for a category (counts, rating distribution, top products)
     
-    Query parameters:
-    - product_id: Filter by specific product
-    - min_rating, max_rating: Filter by star rating range
-    - verified_only: Only verified purchases
-    - exclude_malformed: Exclude spam/malformed reviews (default: true)
-    - limit: Max results (1-1000, default: 100)
-    - offset: Pagination offset
+    Read from the product_summary table, so the cost does not grow with
+    the number of reviews. Returns 503 if summaries have not been built.
     """
     try:
-        # Build filter params
-        filters = ReviewFilterParams(
-            product_id=product_id,
-            min_rating=min_rating,
-            max_rating=max_rating,
-            verified_only=verified_only,
-            exclude_malformed=exclude_malformed,
-            limit=limit,
-            offset=offset
-        )
-        
-        # Base query
-        query = db.query(WirelessReview)
-        
-        # Apply filters
-        if filters.product_id:
-            query = query.filter(WirelessReview.product_id == filters.product_id)
-        if filters.min_rating is not None:
-            query = query.filter(WirelessReview.star_rating >= filters.min_rating)
-        if filters.max_rating is not None:
-            query = query.filter(WirelessReview.star_rating <= filters.max_rating)
-        if filters.verified_only:
-            query = query.filter(WirelessReview.verified_purchase == True)
-        if filters.exclude_malformed:
-            query = query.filter(WirelessReview.is_malformed == False)
-        
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        reviews = query.order_by(
-            WirelessReview.helpful_votes.desc(),  # Most helpful first
-            WirelessReview.review_date.desc()      # Then most recent
-        ).limit(filters.limit).offset(filters.offset).all()
-        
-        # Convert to study format (reduced fields)
-        study_reviews = batch_to_study_format(reviews)
-        
-        logger.info(f"Retrieved {len(reviews)} wireless reviews (total: {total})")
-        
-        return {
-            "reviews": study_reviews,
-            "total": total,
-            "limit": filters.limit,
-            "offset": filters.offset
-        }
+        overview = get_category_overview(db, category, top_products=top_products)
+        if overview is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Product summaries for {category} not built (python -m app.models.product_summary)"
+            )
+        return overview
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching wireless reviews: {e}")
+        logger.error(f"Error fetching {category} overview: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -225,7 +202,7 @@ async def get_review_by_id(
     Get a single review by ID
     
     Args:
-        category: 'shoes' or 'wireless'
+        category: Registered category key (e.g. 'shoes')
         review_id: Review identifier
         
     Returns:
@@ -266,53 +243,35 @@ async def get_product_review_stats(
     Get aggregated statistics for a product's reviews
     
     Args:
-        category: 'shoes' or 'wireless'
+        category: Registered category key (e.g. 'shoes')
         product_id: Product identifier
         
     Returns:
         Statistics: rating distribution, total count, avg rating, etc.
     """
     try:
-        from sqlalchemy import func
+        # Materialized summary; aggregate live if summaries are not built yet
+        summary = get_product_summary(db, category, product_id)
+        if summary is None:
+            summary = next(iter(aggregate_product_summaries(db, category, [product_id])), None)
         
-        # Get appropriate model
-        model = get_review_model(category)
-        
-        # Query statistics
-        stats = db.query(
-            func.count(model.id).label('total_reviews'),
-            func.avg(model.star_rating).label('avg_rating'),
-            func.sum(func.case((model.star_rating == 5, 1), else_=0)).label('five_star'),
-            func.sum(func.case((model.star_rating == 4, 1), else_=0)).label('four_star'),
-            func.sum(func.case((model.star_rating == 3, 1), else_=0)).label('three_star'),
-            func.sum(func.case((model.star_rating == 2, 1), else_=0)).label('two_star'),
-            func.sum(func.case((model.star_rating == 1, 1), else_=0)).label('one_star'),
-            func.sum(func.case((model.verified_purchase == True, 1), else_=0)).label('verified_count'),
-        ).filter(
-            model.product_id == product_id,
-            model.is_malformed == False  # Exclude malformed
-        ).first()
-        
-        if not stats.total_reviews:
+        if summary is None or not summary.review_count:
             raise HTTPException(
                 status_code=404,
                 detail=f"No reviews found for product {product_id}"
             )
         
+        distribution = summary.rating_distribution
         return {
             "product_id": product_id,
             "category": category,
-            "total_reviews": stats.total_reviews,
-            "avg_rating": round(float(stats.avg_rating), 2) if stats.avg_rating else 0,
+            "total_reviews": summary.review_count,
+            "avg_rating": round(summary.average_rating, 2),
             "rating_distribution": {
-                "5_star": stats.five_star or 0,
-                "4_star": stats.four_star or 0,
-                "3_star": stats.three_star or 0,
-                "2_star": stats.two_star or 0,
-                "1_star": stats.one_star or 0,
+                f"{rating}_star": distribution[rating] for rating in (5, 4, 3, 2, 1)
             },
-            "verified_purchase_count": stats.verified_count or 0,
-            "verified_percentage": round((stats.verified_count / stats.total_reviews) * 100, 1) if stats.total_reviews else 0
+            "verified_purchase_count": summary.verified_count,
+            "verified_percentage": round(summary.verified_ratio * 100, 1)
         }
         
     except ValueError as e:
@@ -331,20 +290,14 @@ async def reviews_health_check(db: Session = Depends(get_db)):
     Check if review tables are accessible and have data
     """
     try:
-        shoes_count = db.query(ShoesReview).count()
-        wireless_count = db.query(WirelessReview).count()
-        
         return {
             "status": "healthy",
             "tables": {
-                "shoes_reviews": {
-                    "accessible": True,
-                    "count": shoes_count
-                },
-                "wireless_reviews": {
+                spec.table_name: {
                     "accessible": True,
-                    "count": wireless_count
+                    "count": db.query(get_review_model(spec.key)).count()
                 }
+                for spec in REVIEW_CATEGORIES
             }
         }
     except Exception as e:
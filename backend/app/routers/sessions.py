@@ -7,7 +7,7 @@ import json
 from datetime import datetime, timedelta
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_bulk_db, get_analytics_db
 from app.core.bot_detection import is_bot_request
 from app.models.session import Session as SessionModel, Interaction as InteractionModel
 from app.schemas.session import (
@@ -288,7 +288,7 @@ async def update_session(
 async def sync_session_data(
     session_id: str, 
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_bulk_db)
 ):
     """Sync session data with enhanced metadata"""
     try:
@@ -449,7 +449,7 @@ async def create_interaction(
     session_id: str,
     interaction_data: InteractionCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_bulk_db)
 ):
     """Create a new interaction for a session"""
     try:
@@ -626,7 +626,7 @@ async def list_sessions(
         )
 
 @router.get("/analytics/summary")
-async def get_analytics_summary(db: Session = Depends(get_db)):
+async def get_analytics_summary(db: Session = Depends(get_analytics_db)):
     """Get comprehensive analytics summary"""
     try:
         sessions = db.query(SessionModel).all()
@@ -687,7 +687,7 @@ async def get_analytics_summary(db: Session = Depends(get_db)):
         )
 
 @router.get("/export/csv")
-async def export_sessions_csv(include_interactions: bool = False, db: Session = Depends(get_db)):
+async def export_sessions_csv(include_interactions: bool = False, db: Session = Depends(get_analytics_db)):
     """Export session data as CSV with optional interaction details"""
     try:
         import csv
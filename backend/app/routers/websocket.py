@@ -3,9 +3,9 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
-import json
 import asyncio
 
+from app.core import serialization
 from app.database import get_db
 from app.websocket.manager import get_ws_manager
 
@@ -29,7 +29,8 @@ async def websocket_endpoint(
     try:
         # Connect
         ws_manager = get_ws_manager()
-        await ws_manager.connect(websocket, session_id, connection_id)
+        if not await ws_manager.connect(websocket, session_id, connection_id):
+            return  # server shutting down, client told to reconnect
         
         logger.info(f"WebSocket connected: session={session_id}, connection={connection_id}")
     
@@ -44,7 +45,7 @@ async def websocket_endpoint(
                 
                 # Parse and handle message
                 try:
-                    message = json.loads(data)
+                    message = serialization.loads(data)
                     
                     # Log the message type for debugging
                     logger.debug(f"Received message type: {message.get('type')}, request_id: {message.get('request_id')}")
@@ -52,7 +53,7 @@ async def websocket_endpoint(
                     # Handle message through registered handlers
                     await ws_manager.handle_message(session_id, message, websocket)
 
-                except json.JSONDecodeError as e:
+                except serialization.JSONDecodeError as e:
                     logger.error(f"Invalid JSON received: {e}")
                     # Check connection before sending error
                     if websocket.client_state.value == 1:
@@ -2,10 +2,13 @@
 """
 Pydantic schemas for product reviews
 """
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict, create_model
 from datetime import date
-from typing import Optional, List, Generic, TypeVar, Literal
+from typing import Optional, List, Dict, Generic, TypeVar, Literal
 from enum import Enum
+import re
+
+from app.models.review_categories import REVIEW_CATEGORIES, ReviewCategorySpec, get_review_category
 
 
 # ============================================================
@@ -109,56 +112,6 @@ class ReviewUpdateBase(BaseModel):
     malformed_type: Optional[str] = Field(None, max_length=50)
 
 
-# ============================================================
-# SHOES REVIEW SCHEMAS
-# ============================================================
-
-class ShoesReviewCreate(ReviewFullBase):
-    """Schema for creating shoes review"""
-    product_category: str = Field(default="Shoes", pattern="^Shoes$")
-
-
-class ShoesReviewResponse(ReviewFullBase):
-    """Full shoes review response (backend)"""
-    id: int
-    model_config = ConfigDict(from_attributes=True)
-
-
-class ShoesReviewStudy(ReviewStudyBase):
-    """Shoes review for study participants (reduced fields)"""
-    product_category: str = Field(default="Shoes", pattern="^Shoes$")
-
-
-class ShoesReviewUpdate(ReviewUpdateBase):
-    """Partial update schema for shoes reviews"""
-    pass
-
-
-# ============================================================
-# WIRELESS REVIEW SCHEMAS
-# ============================================================
-
-class WirelessReviewCreate(ReviewFullBase):
-    """Schema for creating wireless review"""
-    product_category: str = Field(default="Wireless", pattern="^Wireless$")
-
-
-class WirelessReviewResponse(ReviewFullBase):
-    """Full wireless review response (backend)"""
-    id: int
-    model_config = ConfigDict(from_attributes=True)
-
-
-class WirelessReviewStudy(ReviewStudyBase):
-    """Wireless review for study participants (reduced fields)"""
-    product_category: str = Field(default="Wireless", pattern="^Wireless$")
-
-
-class WirelessReviewUpdate(ReviewUpdateBase):
-    """Partial update schema for wireless reviews"""
-    pass
-
-
 # ============================================================
 # GENERIC LIST RESPONSES (Uses Type Variable for reusability)
 # ============================================================
@@ -176,11 +129,59 @@ class PaginatedResponse(BaseModel, Generic[T]):
     offset: int
 
 
-# Specific typed aliases for better IDE support
-ShoesReviewListResponse = PaginatedResponse[ShoesReviewResponse]
-ShoesReviewStudyListResponse = PaginatedResponse[ShoesReviewStudy]
-WirelessReviewListResponse = PaginatedResponse[WirelessReviewResponse]
-WirelessReviewStudyListResponse = PaginatedResponse[WirelessReviewStudy]
+# ============================================================
+# GENERATED CATEGORY SCHEMAS (one set per registered category)
+# ============================================================
+
+class CategorySchemas:
+    """
+    Schemas for one review category, generated from its registry entry
+    
+    Attributes:
+        create: Full review for inserts (product_category pinned)
+        response: Full review response (backend)
+        study: Review for study participants (reduced fields)
+        update: Partial update schema
+        list_response / study_list_response: Paginated lists
+    """
+    
+    def __init__(self, spec: ReviewCategorySpec):
+        name = spec.model_name
+        category_field = (
+            str,
+            Field(default=spec.display_name, pattern=f"^{re.escape(spec.display_name)}$")
+        )
+        
+        self.create = create_model(f"{name}Create", __base__=ReviewFullBase, product_category=category_field)
+        self.response = create_model(
+            f"{name}Response",
+            __base__=ReviewFullBase,
+            id=(int, ...),
+        )
+        self.study = create_model(f"{name}Study", __base__=ReviewStudyBase, product_category=category_field)
+        self.update = create_model(f"{name}Update", __base__=ReviewUpdateBase)
+        self.list_response = PaginatedResponse[self.response]
+        self.study_list_response = PaginatedResponse[self.study]
+
+
+CATEGORY_SCHEMAS: Dict[str, CategorySchemas] = {
+    spec.key: CategorySchemas(spec) for spec in REVIEW_CATEGORIES
+}
+
+# Explicit names for existing imports
+ShoesReviewCreate = CATEGORY_SCHEMAS['shoes'].create
+ShoesReviewResponse = CATEGORY_SCHEMAS['shoes'].response
+ShoesReviewStudy = CATEGORY_SCHEMAS['shoes'].study
+ShoesReviewUpdate = CATEGORY_SCHEMAS['shoes'].update
+WirelessReviewCreate = CATEGORY_SCHEMAS['wireless'].create
+WirelessReviewResponse = CATEGORY_SCHEMAS['wireless'].response
+WirelessReviewStudy = CATEGORY_SCHEMAS['wireless'].study
+WirelessReviewUpdate = CATEGORY_SCHEMAS['wireless'].update
+
+ShoesReviewListResponse = CATEGORY_SCHEMAS['shoes'].list_response
+ShoesReviewStudyListResponse = CATEGORY_SCHEMAS['shoes'].study_list_response
+WirelessReviewListResponse = CATEGORY_SCHEMAS['wireless'].list_response
+WirelessReviewStudyListResponse = CATEGORY_SCHEMAS['wireless'].study_list_response
 
 
 # ============================================================
@@ -355,7 +356,7 @@ def get_response_schema(category: str, study_mode: bool = False):
     Factory function to get the correct response schema
     
     Args:
-        category: 'shoes' or 'wireless'
+        category: Registered category key (e.g. 'shoes')
         study_mode: If True, returns study schema (reduced fields)
         
     Returns:
@@ -365,17 +366,55 @@ def get_response_schema(category: str, study_mode: bool = False):
         schema = get_response_schema('shoes', study_mode=True)
         # Returns ShoesReviewStudy
     """
-    category_lower = category.lower()
+    schemas = CATEGORY_SCHEMAS[get_review_category(category).key]
+    return schemas.study if study_mode else schemas.response
+
+# ============================================================
+# ROW PROJECTIONS (trusted DB rows)
+# ============================================================
+
+class ReviewProjection:
+    """
+    Column projection from review tables straight to dicts
+    
+    Selects only the columns of a target schema and builds plain dicts
+    with the same keys and values as schema(...).model_dump(), without
+    constructing ORM or Pydantic objects per row. Rows come from our own
+    tables (already constrained by the DB), so validation is skipped.
+    
+    Usage:
+        rows = WORK_PROJECTION.select(query, model).limit(100).all()
+        records = WORK_PROJECTION.to_dicts(rows)
+    """
+    
+    # Nullable text columns the schemas normalize to ""
+    EMPTY_IF_NULL = ('review_headline', 'review_body')
+    
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self._empty_if_null = tuple(name for name in self.fields if name in self.EMPTY_IF_NULL)
     
-    schema_map = {
-        ('shoes', False): ShoesReviewResponse,
-        ('shoes', True): ShoesReviewStudy,
-        ('wireless', False): WirelessReviewResponse,
-        ('wireless', True): WirelessReviewStudy,
-    }
+    def columns(self, model) -> list:
+        """Labeled model columns in output order"""
+        return [getattr(model, name).label(name) for name in self.fields]
     
-    key = (category_lower, study_mode)
-    if key not in schema_map:
-        raise ValueError(f"Unsupported category: {category}")
+    def select(self, query, model):
+        """Restrict an ORM query on model to the projected columns"""
+        return query.with_entities(*self.columns(model))
     
-    return schema_map[key]
\ No newline at end of file
+    def to_dicts(self, rows) -> List[dict]:
+        """Convert projected result rows to dicts (schema key order)"""
+        fields = self.fields
+        records = []
+        for row in rows:
+            record = dict(zip(fields, row))
+            for name in self._empty_if_null:
+                if record[name] is None:
+                    record[name] = ""
+            records.append(record)
+        return records
+
+
+STUDY_PROJECTION = ReviewProjection(ReviewStudyBase)
+WORK_PROJECTION = ReviewProjection(ReviewWorkBase)
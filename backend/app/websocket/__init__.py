@@ -14,6 +14,7 @@ Features:
 - Message queuing
 - Channel subscriptions
 - Heartbeat monitoring
+- Cross-worker fan-out (Redis pub/sub, see fanout.py)
 """
 
 from .manager import WebSocketManager, ws_manager
@@ -0,0 +1,170 @@
+# backend/app/websocket/batch_executor.py
+"""
+WebSocket batch executor - Concurrent execution of batch sub-requests
+
+Plan:
+- Consecutive read-only sub-requests form one stage and run concurrently
+  (bounded by websocket_batch_max_concurrency)
+- Every write is its own stage (a barrier), so reads after a write in the
+  same batch still see it
+- Stages run in request order
+
+Each item runs isolated: an exception only fails that item. The
+'response' messages its handler sends are captured (see
+manager.batch_response_capture) and released in request order once the
+stage finishes, followed by one ordered 'batch_response'.
+
+Read-only stages can share one DB session (websocket_batch_share_read_session),
+so N reads cost one pool checkout instead of N.
+"""
+import asyncio
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from app.configs import settings
+from app.database import shared_read_session
+from .manager import WebSocketManager, batch_response_capture
+
+logger = logging.getLogger(__name__)
+
+# Sub-requests without side effects (safe to run concurrently / on a shared session)
+READ_ONLY_REQUESTS = frozenset({
+    'session_get',
+    'chat_history',
+    'get_interactions',
+    'get_reviews',
+    'get_review_stats',
+    'get_review_by_id',
+})
+
+# Sub-requests with side effects (executed alone, in order)
+WRITE_REQUESTS = frozenset({
+    'session_update',
+    'track',
+})
+
+BATCHABLE_REQUESTS = READ_ONLY_REQUESTS | WRITE_REQUESTS
+
+
+class BatchItem:
+    """One sub-request of a batch and its outcome"""
+
+    def __init__(self, index: int, request: Dict[str, Any]):
+        self.index = index
+        self.request = request
+        self.type = request.get('type')
+        self.request_id = request.get('request_id')
+        self.read_only = self.type in READ_ONLY_REQUESTS
+        self.responses: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+
+    def to_result(self) -> Dict[str, Any]:
+        """Batch result entry: last response of the handler, or the error"""
+        result: Dict[str, Any] = {'request_id': self.request_id, 'type': self.type}
+        if self.error is not None:
+            result.update({'status': 'error', 'error': self.error})
+        elif self.responses:
+            response = self.responses[-1]
+            result['status'] = response.get('status', 'success')
+            for key in ('data', 'error', 'message'):
+                if key in response:
+                    result[key] = response[key]
+        else:
+            result['status'] = 'success'
+        return result
+
+
+def build_plan(requests: List[Dict[str, Any]]) -> List[List[BatchItem]]:
+    """Split a batch into stages of independent items (see module docstring)"""
+    stages: List[List[BatchItem]] = []
+    read_stage: List[BatchItem] = []
+
+    for index, request in enumerate(requests):
+        item = BatchItem(index, request)
+        if item.read_only:
+            read_stage.append(item)
+            continue
+        if read_stage:
+            stages.append(read_stage)
+            read_stage = []
+        stages.append([item])
+
+    if read_stage:
+        stages.append(read_stage)
+    return stages
+
+
+class BatchExecutor:
+    """
+    Runs batch plans against the registered WebSocket handlers
+
+    Args:
+        max_concurrency: Items of a stage running at the same time
+        share_read_session: Run read-only stages on one shared DB session
+    """
+
+    def __init__(self, max_concurrency: int = 4, share_read_session: bool = True):
+        self.max_concurrency = max(1, max_concurrency)
+        self.share_read_session = share_read_session
+
+    async def execute(
+        self,
+        session_id: str,
+        requests: List[Dict[str, Any]],
+        ws_manager: WebSocketManager
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute all sub-requests; returns one result per request, in request order
+        """
+        items: List[BatchItem] = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        for stage in build_plan(requests):
+            items.extend(stage)
+
+            shared = (
+                self.share_read_session
+                and len(stage) > 1
+                and all(item.read_only for item in stage)
+            )
+            with shared_read_session() if shared else nullcontext():
+                await asyncio.gather(*(
+                    self._run_item(session_id, item, ws_manager.handlers, semaphore)
+                    for item in stage
+                ))
+
+            # Release captured responses in request order
+            for item in stage:
+                for response in item.responses:
+                    await ws_manager.send_to_session(session_id, response)
+
+        return [item.to_result() for item in items]
+
+    async def _run_item(
+        self,
+        session_id: str,
+        item: BatchItem,
+        handlers: Dict[str, Callable],
+        semaphore: asyncio.Semaphore
+    ):
+        handler = handlers.get(item.type) if item.type in BATCHABLE_REQUESTS else None
+        if handler is None:
+            item.error = f'Unknown request type: {item.type}'
+            return
+
+        async with semaphore:
+            # Runs in its own task (gather), so the capture is local to this item
+            batch_response_capture.set(item.responses)
+            try:
+                await handler(session_id, item.request)
+            except Exception as e:
+                logger.error(f"Batch item {item.index} ({item.type}) failed: {e}")
+                item.error = str(e)
+
+
+# Global instance
+batch_executor = BatchExecutor(
+    max_concurrency=settings.websocket_batch_max_concurrency,
+    share_read_session=settings.websocket_batch_share_read_session
+)
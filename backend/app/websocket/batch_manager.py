@@ -9,10 +9,12 @@ Benefits:
 - Better network utilization
 """
 import asyncio
+import time
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
-from collections import defaultdict
+
+from app.core.metrics import WEBSOCKET_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,7 @@ class MessageBatch:
         self.session_id = session_id
         self.messages: List[Dict[str, Any]] = []
         self.created_at = datetime.utcnow()
+        self.created_monotonic = time.monotonic()
         self.priority = 'normal'  # 'high', 'normal', 'low'
     
     def add(self, message: Dict[str, Any], priority: str = 'normal'):
@@ -44,7 +47,7 @@ class MessageBatch:
     
     def age_ms(self) -> int:
         """Get batch age in milliseconds"""
-        return int((datetime.utcnow() - self.created_at).total_seconds() * 1000)
+        return int((time.monotonic() - self.created_monotonic) * 1000)
     
     def to_message(self) -> Dict[str, Any]:
         """Convert batch to WebSocket message"""
@@ -57,27 +60,63 @@ class MessageBatch:
         }
 
 
+class SessionQueue:
+    """
+    Pending batch + delivery state of one session
+    
+    - Enqueue appends to the open batch (no lock; runs on the event loop
+      without awaiting)
+    - send_lock serialises flushes of this session only, so batches leave
+      in enqueue order while other sessions flush concurrently
+    - wake signals the session's flush task (size trigger / new batch)
+    """
+    
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.batch: Optional[MessageBatch] = None
+        self.send_lock = asyncio.Lock()
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+    
+    def add(self, message: Dict[str, Any], priority: str) -> MessageBatch:
+        if self.batch is None:
+            self.batch = MessageBatch(self.session_id)
+        self.batch.add(message, priority)
+        return self.batch
+    
+    def take(self) -> Optional[MessageBatch]:
+        """Detach the open batch (new messages start a new one)"""
+        batch, self.batch = self.batch, None
+        return batch
+    
+    def size(self) -> int:
+        return self.batch.size() if self.batch else 0
+
+
 class WebSocketBatchManager:
     """
     Manages batching of WebSocket messages for performance
     
     Strategy:
-    - Buffer messages for up to max_age_ms (default: 100ms)
-    - Flush when batch reaches max_size (default: 10 messages)
-    - Immediate flush for high-priority messages
-    - Automatic periodic flushing
+    - One SessionQueue per session; no lock shared between sessions
+    - One flush task per active session: flushes when the batch reaches
+      max_batch_size or max_batch_age_ms, sleeps while the session has
+      nothing pending and exits after idle_timeout_s
+    - Immediate flush for high-priority messages (in the caller)
+    - Batches of a session are delivered in enqueue order
     
     Performance gains:
     - Workflow with 50 nodes: 50 WebSocket sends -> 5 batched sends (10x improvement)
     - Reduced message overhead from ~50 bytes/msg to ~5 bytes/msg
     - Lower CPU usage on client side (fewer DOM updates)
+    - A slow send only delays its own session
     """
     
     def __init__(
         self,
         max_batch_size: int = 10,
         max_batch_age_ms: int = 100,
-        flush_interval_ms: int = 50
+        idle_timeout_s: float = 30.0
     ):
         """
         Initialize batch manager
@@ -85,21 +124,18 @@ class WebSocketBatchManager:
         Args:
             max_batch_size: Flush batch when it reaches this size
             max_batch_age_ms: Maximum age before flushing (milliseconds)
-            flush_interval_ms: How often to check for aged batches
+            idle_timeout_s: Stop a session's flush task after this long without messages
         """
         self.max_batch_size = max_batch_size
         self.max_batch_age_ms = max_batch_age_ms
-        self.flush_interval_ms = flush_interval_ms
+        self.idle_timeout_s = idle_timeout_s
         
-        # Batches keyed by session_id
-        self.batches: Dict[str, MessageBatch] = {}
-        self.batch_lock = asyncio.Lock()
+        # Delivery queues keyed by session_id
+        self.queues: Dict[str, SessionQueue] = {}
         
         # Flush callback (set by WebSocketManager)
         self.flush_callback = None
         
-        # Background flush task
-        self.flush_task: Optional[asyncio.Task] = None
         self.running = False
         
         # Metrics
@@ -118,27 +154,42 @@ class WebSocketBatchManager:
         )
     
     def start(self):
-        """Start background flush task"""
+        """Enable per-session flush tasks (started on demand)"""
         if not self.running:
             self.running = True
-            self.flush_task = asyncio.create_task(self._flush_loop())
-            logger.info("Batch manager background flusher started")
+            logger.info("Batch manager started (per-session flush tasks)")
     
     async def stop(self):
-        """Stop background flush task and flush remaining batches"""
+        """Stop all session flush tasks and flush remaining batches"""
         self.running = False
         
-        if self.flush_task:
-            self.flush_task.cancel()
-            try:
-                await self.flush_task
-            except asyncio.CancelledError:
-                pass
+        tasks = [queue.task for queue in self.queues.values() if queue.task and not queue.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         # Flush all remaining batches
         await self.flush_all()
         logger.info("Batch manager stopped")
     
+    def _get_queue(self, session_id: str) -> SessionQueue:
+        queue = self.queues.get(session_id)
+        if queue is None:
+            queue = self.queues[session_id] = SessionQueue(session_id)
+        return queue
+    
+    def _enqueue(self, session_id: str, messages: List[Dict[str, Any]], priority: str) -> SessionQueue:
+        queue = self._get_queue(session_id)
+        for message in messages:
+            queue.add(message, priority)
+        self.metrics['messages_buffered'] += len(messages)
+        
+        if self.running and (queue.task is None or queue.task.done()):
+            queue.task = asyncio.create_task(self._session_flush_loop(queue))
+        queue.wake.set()
+        return queue
+    
     async def add_message(
         self,
         session_id: str,
@@ -155,30 +206,15 @@ class WebSocketBatchManager:
             priority: 'high', 'normal', or 'low'
             immediate: Force immediate flush
         """
-        async with self.batch_lock:
-            # Get or create batch
-            if session_id not in self.batches:
-                self.batches[session_id] = MessageBatch(session_id)
-            
-            batch = self.batches[session_id]
-            batch.add(message, priority)
-            
-            self.metrics['messages_buffered'] += 1
-            
-            # Check if should flush
-            should_flush = (
-                immediate or
-                priority == 'high' or
-                batch.size() >= self.max_batch_size
-            )
-            
-            if should_flush:
-                await self._flush_batch(session_id)
-                
-                if immediate or priority == 'high':
-                    self.metrics['immediate_flushes'] += 1
-                else:
-                    self.metrics['size_flushes'] += 1
+        queue = self._enqueue(session_id, [message], priority)
+        
+        if immediate or priority == 'high':
+            await self._flush_queue(queue)
+            self.metrics['immediate_flushes'] += 1
+        elif not self.running and queue.size() >= self.max_batch_size:
+            # No flush task outside the running loop (e.g. during shutdown)
+            await self._flush_queue(queue)
+            self.metrics['size_flushes'] += 1
     
     async def add_batch(
         self,
@@ -197,21 +233,10 @@ class WebSocketBatchManager:
         if not messages:
             return
         
-        async with self.batch_lock:
-            # Get or create batch
-            if session_id not in self.batches:
-                self.batches[session_id] = MessageBatch(session_id)
-            
-            batch = self.batches[session_id]
-            
-            for msg in messages:
-                batch.add(msg, priority)
-                self.metrics['messages_buffered'] += 1
-            
-            # Flush if batch is full
-            if batch.size() >= self.max_batch_size:
-                await self._flush_batch(session_id)
-                self.metrics['size_flushes'] += 1
+        queue = self._enqueue(session_id, messages, priority)
+        if not self.running and queue.size() >= self.max_batch_size:
+            await self._flush_queue(queue)
+            self.metrics['size_flushes'] += 1
     
     async def flush_session(self, session_id: str) -> int:
         """
@@ -223,98 +248,114 @@ class WebSocketBatchManager:
         Returns:
             Number of messages flushed
         """
-        async with self.batch_lock:
-            return await self._flush_batch(session_id)
+        queue = self.queues.get(session_id)
+        if queue is None:
+            return 0
+        return await self._flush_queue(queue)
     
     async def flush_all(self) -> int:
         """
-        Flush all batched messages for all sessions
+        Flush all batched messages for all sessions (sessions in parallel)
         
         Returns:
             Total number of messages flushed
         """
-        async with self.batch_lock:
-            total_flushed = 0
-            
-            # Flush all batches
-            for session_id in list(self.batches.keys()):
-                count = await self._flush_batch(session_id)
-                total_flushed += count
-            
-            return total_flushed
+        counts = await asyncio.gather(
+            *(self._flush_queue(queue) for queue in list(self.queues.values()))
+        )
+        return sum(counts)
     
-    async def _flush_batch(self, session_id: str) -> int:
+    async def _flush_queue(self, queue: SessionQueue) -> int:
         """
-        Internal: Flush a specific batch
+        Internal: Send the session's open batch
         
-        Must be called with batch_lock held
+        Holds only this session's send_lock; batches taken under the lock
+        are sent in order.
         
         Returns:
             Number of messages flushed
         """
-        if session_id not in self.batches:
-            return 0
-        
-        batch = self.batches[session_id]
-        
-        if batch.is_empty():
-            return 0
-        
-        # Send batch via callback
-        if self.flush_callback:
+        async with queue.send_lock:
+            batch = queue.take()
+            if batch is None or batch.is_empty():
+                return 0
+            
+            # Send batch via callback
+            if not self.flush_callback:
+                return 0
+            
             try:
-                await self.flush_callback(session_id, batch.to_message())
+                await self.flush_callback(queue.session_id, batch.to_message())
                 
                 count = batch.size()
                 self.metrics['messages_sent'] += count
                 self.metrics['batches_sent'] += 1
+                WEBSOCKET_BATCH_SIZE.observe(count)
                 
                 logger.debug(
-                    f"Flushed batch: {session_id} "
+                    f"Flushed batch: {queue.session_id} "
                     f"({count} messages, age: {batch.age_ms()}ms)"
                 )
                 
-                # Remove batch
-                del self.batches[session_id]
-                
                 return count
                 
             except Exception as e:
-                logger.error(f"Failed to flush batch for {session_id}: {e}")
+                logger.error(f"Failed to flush batch for {queue.session_id}: {e}")
                 return 0
-        
-        return 0
     
-    async def _flush_loop(self):
-        """Background task to flush aged batches"""
-        while self.running:
-            try:
-                await asyncio.sleep(self.flush_interval_ms / 1000)
+    async def _session_flush_loop(self, queue: SessionQueue):
+        """Flush task of one session: size/age triggered, sleeps while idle"""
+        max_age_s = self.max_batch_age_ms / 1000
+        
+        try:
+            while self.running:
+                batch = queue.batch
                 
-                async with self.batch_lock:
-                    # Find batches that are too old
-                    aged_sessions = []
-                    
-                    for session_id, batch in self.batches.items():
-                        if batch.age_ms() >= self.max_batch_age_ms:
-                            aged_sessions.append(session_id)
-                    
-                    # Flush aged batches
-                    for session_id in aged_sessions:
-                        await self._flush_batch(session_id)
-                        self.metrics['timed_flushes'] += 1
+                if batch is None:
+                    # Idle: sleep until the next message, exit after idle_timeout_s
+                    queue.wake.clear()
+                    try:
+                        await asyncio.wait_for(queue.wake.wait(), timeout=self.idle_timeout_s)
+                    except asyncio.TimeoutError:
+                        if queue.batch is None:
+                            break
+                    continue
                 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in flush loop: {e}")
+                if batch.size() >= self.max_batch_size:
+                    await self._flush_queue(queue)
+                    self.metrics['size_flushes'] += 1
+                    continue
+                
+                remaining_s = max_age_s - (time.monotonic() - batch.created_monotonic)
+                if remaining_s <= 0:
+                    await self._flush_queue(queue)
+                    self.metrics['timed_flushes'] += 1
+                    continue
+                
+                # Wait for the batch to age out or a size trigger
+                queue.wake.clear()
+                try:
+                    await asyncio.wait_for(queue.wake.wait(), timeout=remaining_s)
+                except asyncio.TimeoutError:
+                    pass
+        
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error in flush loop of {queue.session_id}: {e}")
+        finally:
+            # Drop idle sessions; a later message starts a new task
+            if queue.batch is None and self.queues.get(queue.session_id) is queue and not queue.send_lock.locked():
+                del self.queues[queue.session_id]
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get batch manager metrics"""
+        pending = [queue.size() for queue in self.queues.values()]
         return {
             **self.metrics,
-            'pending_batches': len(self.batches),
-            'pending_messages': sum(b.size() for b in self.batches.values()),
+            'active_sessions': sum(1 for queue in self.queues.values() if queue.task and not queue.task.done()),
+            'pending_batches': sum(1 for size in pending if size),
+            'pending_messages': sum(pending),
             'avg_batch_size': (
                 self.metrics['messages_sent'] / self.metrics['batches_sent']
                 if self.metrics['batches_sent'] > 0 else 0
@@ -325,16 +366,16 @@ class WebSocketBatchManager:
             )
         }
     
-    def get_pending_count(self, session_id: str) -> int:
-        """Get number of pending messages for a session"""
-        if session_id in self.batches:
-            return self.batches[session_id].size()
-        return 0
+    def get_pending_count(self, session_id: Optional[str] = None) -> int:
+        """Get number of pending messages for a session (all sessions if None)"""
+        if session_id is None:
+            return sum(queue.size() for queue in list(self.queues.values()))
+        queue = self.queues.get(session_id)
+        return queue.size() if queue else 0
 
 
 # Global instance
 ws_batch_manager = WebSocketBatchManager(
     max_batch_size=10,
-    max_batch_age_ms=100,
-    flush_interval_ms=50
-)
\ No newline at end of file
+    max_batch_age_ms=100
+)
@@ -0,0 +1,202 @@
+# backend/app/websocket/codec.py
+"""
+WebSocket frame encodings (server -> client)
+
+- json (default): text frames via app.core.serialization, unchanged wire
+  format for existing clients
+- msgpack: binary frames, negotiated per connection with the
+  ``agentic.msgpack.v1`` subprotocol or ``?encoding=msgpack``
+
+Binary frame layout:
+
+    byte 0      header: 0x10 | flags  (high nibble = version 1,
+                bit 0 = body is raw-deflated)
+    byte 1..    MessagePack array [new_keys, payload]
+
+Dictionary keys are replaced by integers from a per-connection key table.
+``new_keys`` lists the keys first assigned in this frame; the client
+appends them to its own table in order (frames arrive in send order over
+one connection). Keys that do not fit the table (table full, or longer
+than MAX_KEY_LENGTH) stay strings, so a decoder maps integer keys through
+the table and leaves string keys as-is.
+
+Bodies of at least ``websocket_compress_threshold_bytes`` (result
+previews, batches) are raw-deflated; small frames skip compression.
+Incoming client frames stay JSON text, and any text frame the server
+sends (e.g. endpoint-level errors) is JSON regardless of the negotiated
+encoding.
+"""
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+import logging
+
+import ormsgpack
+from fastapi import WebSocket
+
+from app.configs import settings
+from app.core import serialization
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_SUBPROTOCOL = 'agentic.msgpack.v1'
+
+FRAME_VERSION = 0x10
+FLAG_DEFLATED = 0x01
+
+MAX_TABLE_KEYS = 512
+MAX_KEY_LENGTH = 64
+
+WEBSOCKET_BYTES_SENT = metrics.counter(
+    'websocket_bytes_sent_total',
+    'WebSocket payload bytes sent (before transport compression)',
+    ['encoding']
+)
+
+class JsonCodec:
+    """Default text encoding (stateless)"""
+
+    name = 'json'
+    binary = False
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes_out = 0
+
+    def encode(self, message: Dict[str, Any]) -> str:
+        frame = serialization.dumps(message)
+        self.frames += 1
+        self.bytes_out += len(frame)
+        WEBSOCKET_BYTES_SENT.labels(self.name).inc(len(frame))
+        return frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'encoding': self.name, 'frames': self.frames, 'bytes_out': self.bytes_out}
+
+
+class MsgpackCodec:
+    """
+    Binary encoding with a per-connection key table
+
+    Stateful: one instance per connection, frames must be sent in the
+    order they were encoded (the connection's writer task guarantees this).
+    """
+
+    name = 'msgpack'
+    binary = True
+
+    def __init__(
+        self,
+        compress_threshold: int = 1024,
+        compress_level: int = 6,
+        max_table_keys: int = MAX_TABLE_KEYS
+    ):
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.max_table_keys = max_table_keys
+
+        self.key_table: Dict[str, int] = {}
+        self.frames = 0
+        self.bytes_out = 0
+        self.deflated_frames = 0
+
+    def _compact(self, value: Any, new_keys: List[str]) -> Any:
+        if isinstance(value, dict):
+            table = self.key_table
+            compacted = {}
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    key = str(key)
+                key_id = table.get(key)
+                if key_id is None and len(table) < self.max_table_keys and len(key) <= MAX_KEY_LENGTH:
+                    key_id = table[key] = len(table)
+                    new_keys.append(key)
+                compacted[key if key_id is None else key_id] = self._compact(item, new_keys)
+            return compacted
+        if isinstance(value, (list, tuple)):
+            return [self._compact(item, new_keys) for item in value]
+        return value
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        new_keys: List[str] = []
+        payload = self._compact(message, new_keys)
+        body = ormsgpack.packb(
+            [new_keys, payload],
+            default=serialization.json_default,
+            option=ormsgpack.OPT_NON_STR_KEYS
+        )
+
+        header = FRAME_VERSION
+        if len(body) >= self.compress_threshold:
+            compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+            deflated = compressor.compress(body) + compressor.flush()
+            if len(deflated) < len(body):
+                body = deflated
+                header |= FLAG_DEFLATED
+                self.deflated_frames += 1
+
+        frame = bytes((header,)) + body
+        self.frames += 1
+        self.bytes_out += len(frame)
+        WEBSOCKET_BYTES_SENT.labels(self.name).inc(len(frame))
+        return frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'encoding': self.name,
+            'frames': self.frames,
+            'bytes_out': self.bytes_out,
+            'deflated_frames': self.deflated_frames,
+            'table_keys': len(self.key_table),
+        }
+
+
+class MsgpackDecoder:
+    """
+    Client-side counterpart of MsgpackCodec (benchmarks / tests / Python clients)
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+
+    def _expand(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            keys = self.keys
+            return {
+                (keys[key] if isinstance(key, int) else key): self._expand(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._expand(item) for item in value]
+        return value
+
+    def decode(self, frame: bytes) -> Dict[str, Any]:
+        header, body = frame[0], frame[1:]
+        if header & 0xF0 != FRAME_VERSION:
+            raise ValueError(f"Unsupported frame version: {header:#x}")
+        if header & FLAG_DEFLATED:
+            body = zlib.decompress(body, -15)
+        new_keys, payload = ormsgpack.unpackb(body, option=ormsgpack.OPT_NON_STR_KEYS)
+        self.keys.extend(new_keys)
+        return self._expand(payload)
+
+
+def negotiate_codec(websocket: WebSocket) -> Tuple[Union[JsonCodec, MsgpackCodec], Optional[str]]:
+    """
+    Pick the encoding for a new connection
+
+    Returns (codec, subprotocol to echo in accept()). JSON unless the client
+    asked for msgpack and settings.websocket_binary_enabled is on.
+    """
+    requested_subprotocols = websocket.scope.get('subprotocols') or []
+    requested_encoding = websocket.query_params.get('encoding', 'json')
+
+    wants_msgpack = MSGPACK_SUBPROTOCOL in requested_subprotocols or requested_encoding == 'msgpack'
+    if wants_msgpack and settings.websocket_binary_enabled:
+        codec = MsgpackCodec(compress_threshold=settings.websocket_compress_threshold_bytes)
+        subprotocol = MSGPACK_SUBPROTOCOL if MSGPACK_SUBPROTOCOL in requested_subprotocols else None
+        return codec, subprotocol
+
+    if wants_msgpack:
+        logger.debug("Client requested msgpack but websocket_binary_enabled is off, using JSON")
+    return JsonCodec(), None
@@ -0,0 +1,438 @@
+# backend/app/websocket/fanout.py
+"""
+WebSocket fan-out across workers
+
+Connections, subscriptions and outbound queues live in the worker that
+accepted the socket. With several uvicorn workers (no sticky sessions) a
+message for a session can originate on any worker: an execution started
+before the client reconnected elsewhere, an HTTP route, a channel
+broadcast. The fan-out layer routes it to the worker(s) holding the socket.
+
+Topics (the broker does the routing, no presence registry):
+- session:<id>   subscribed by a worker while it holds >= 1 connection of
+                 the session; publish returns the number of receiving
+                 workers, 0 = the session is offline everywhere
+- channel:<name> subscribed by a worker while >= 1 of its sessions is
+                 subscribed to the channel
+
+Messages for offline sessions go to a shared offline queue (capped, with
+TTL), drained by whichever worker the session connects to next.
+
+Brokers:
+- MemoryBroker: in-process; several WebSocketManagers can share one
+  instance to simulate workers (tests / benchmarks)
+- RedisBroker:  Redis pub/sub for routing, lists for the offline queue
+
+Envelope (serialization.dumps_bytes):
+    {'o': origin worker, 'k': kind, 't': target, 'p': priority,
+     'i': immediate, 'm': message}
+kinds: 'send' (first connection), 'broadcast' (all connections of the
+session), 'channel' (all local subscribers of the channel)
+"""
+import asyncio
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+import logging
+
+import redis.asyncio as aioredis
+
+from app.configs import settings
+from app.core import serialization
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TopicHandler = Callable[[str, bytes], Awaitable[None]]
+EnvelopeHandler = Callable[[str, str, Dict[str, Any], str, bool], Awaitable[None]]
+
+FANOUT_PUBLISHED = metrics.counter(
+    'websocket_fanout_published_total',
+    'Messages published to other workers',
+    ['kind']
+)
+FANOUT_RECEIVED = metrics.counter(
+    'websocket_fanout_received_total',
+    'Messages received from other workers',
+    ['kind']
+)
+FANOUT_ERRORS = metrics.counter(
+    'websocket_fanout_errors_total',
+    'Fan-out broker operations that failed',
+    ['operation']
+)
+
+
+# ============================================================
+# BROKERS
+# ============================================================
+
+class MemoryBroker:
+    """In-process broker (one process, any number of managers)"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._handlers: Dict[str, List[TopicHandler]] = {}
+        self._offline: Dict[str, Tuple[Deque[bytes], float]] = {}
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def subscribe(self, topic: str, handler: TopicHandler):
+        handlers = self._handlers.setdefault(topic, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    async def unsubscribe(self, topic: str, handler: TopicHandler):
+        handlers = self._handlers.get(topic)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[topic]
+
+    async def publish(self, topic: str, data: bytes) -> int:
+        handlers = list(self._handlers.get(topic, ()))
+        for handler in handlers:
+            await handler(topic, data)
+        return len(handlers)
+
+    async def push_offline(self, session_id: str, data: bytes, max_size: int, ttl_s: int):
+        entry = self._offline.get(session_id)
+        if entry is None or entry[1] < time.monotonic():
+            queue: Deque[bytes] = deque(maxlen=max_size)
+        else:
+            queue = entry[0]
+        queue.append(data)
+        self._offline[session_id] = (queue, time.monotonic() + ttl_s)
+
+    async def pop_offline(self, session_id: str) -> List[bytes]:
+        entry = self._offline.pop(session_id, None)
+        if entry is None or entry[1] < time.monotonic():
+            return []
+        return list(entry[0])
+
+
+class RedisBroker:
+    """
+    Redis pub/sub (routing) + lists (offline queue)
+
+    One pub/sub connection per worker; a listener task dispatches incoming
+    messages in arrival order. After a connection error all registered
+    topics are subscribed again; messages for topics without a handler
+    (a failed unsubscribe) unsubscribe that topic.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str, key_prefix: str = 'ws:'):
+        self.key_prefix = key_prefix
+        self.client = aioredis.Redis.from_url(url, socket_connect_timeout=1.0, health_check_interval=30)
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._handlers: Dict[str, TopicHandler] = {}
+        self._has_topics = asyncio.Event()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def subscribe(self, topic: str, handler: TopicHandler):
+        # Registered first: if the command fails, the reconnect re-subscribes it
+        self._handlers[topic] = handler
+        self._has_topics.set()
+        await self.pubsub.subscribe(self.key_prefix + topic)
+
+    async def unsubscribe(self, topic: str, handler: TopicHandler):
+        if self._handlers.get(topic) is handler:
+            del self._handlers[topic]
+        await self.pubsub.unsubscribe(self.key_prefix + topic)
+
+    async def publish(self, topic: str, data: bytes) -> int:
+        return await self.client.publish(self.key_prefix + topic, data)
+
+    async def push_offline(self, session_id: str, data: bytes, max_size: int, ttl_s: int):
+        key = f"{self.key_prefix}offline:{session_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, data)
+            pipe.ltrim(key, -max_size, -1)
+            pipe.expire(key, ttl_s)
+            await pipe.execute()
+
+    async def pop_offline(self, session_id: str) -> List[bytes]:
+        key = f"{self.key_prefix}offline:{session_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            messages, _ = await pipe.execute()
+        return messages
+
+    async def _listen(self):
+        backoff = 0.5
+        while True:
+            try:
+                if not self._handlers:
+                    # get_message needs at least one subscription
+                    self._has_topics.clear()
+                    await self._has_topics.wait()
+                    continue
+
+                if self.pubsub.connection is None:
+                    # First subscribe still in flight, or it failed: subscribe here
+                    await asyncio.sleep(backoff)
+                    if self.pubsub.connection is None:
+                        await self._resubscribe()
+                    continue
+
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                backoff = 0.5
+                if message is None or message['type'] != 'message':
+                    continue
+
+                topic = message['channel'].decode()[len(self.key_prefix):]
+                handler = self._handlers.get(topic)
+                if handler is not None:
+                    await handler(topic, message['data'])
+                else:
+                    await self.pubsub.unsubscribe(message['channel'])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                FANOUT_ERRORS.labels('listen').inc()
+                logger.warning(f"WebSocket fan-out listener error ({e}), retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+
+    async def _resubscribe(self):
+        if self._handlers:
+            await self.pubsub.subscribe(*(self.key_prefix + topic for topic in self._handlers))
+
+
+# ============================================================
+# FAN-OUT
+# ============================================================
+
+class WebSocketFanout:
+    """
+    Routes WebSocket messages between workers through a broker
+
+    Args:
+        broker: MemoryBroker or RedisBroker
+        offline_max: Offline messages kept per session
+        offline_ttl_s: Seconds an offline queue survives without a reconnect
+        worker_id: Identifies this worker in envelopes (own messages are skipped)
+        retry_after_s: After a broker error, publish / offline operations are
+            skipped (local delivery and queueing only) for this long
+    """
+
+    def __init__(
+        self,
+        broker,
+        offline_max: int = 100,
+        offline_ttl_s: int = 300,
+        worker_id: Optional[str] = None,
+        retry_after_s: float = 5.0
+    ):
+        self.broker = broker
+        self.offline_max = offline_max
+        self.offline_ttl_s = offline_ttl_s
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.retry_after_s = retry_after_s
+        self._down_until = 0.0
+
+        self._handler: Optional[EnvelopeHandler] = None
+        # Topics this worker should / does subscribe to (see _apply)
+        self._wanted: Set[str] = set()
+        self._active: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {'published': 0, 'received': 0, 'offline_pushed': 0, 'errors': 0}
+
+    async def start(self, handler: EnvelopeHandler):
+        """handler(kind, target, message, priority, immediate) delivers locally"""
+        self._handler = handler
+        await self.broker.start()
+        logger.info(f"WebSocket fan-out started (broker: {self.broker.name}, worker: {self.worker_id})")
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await self.broker.close()
+
+    # -------------------- membership --------------------
+
+    async def join_session(self, session_id: str):
+        """Receive messages for a session (awaited before draining its offline queue)"""
+        topic = f"session:{session_id}"
+        self._wanted.add(topic)
+        if self.available():
+            await self._apply(topic)
+        else:
+            # Broker down: do not hold up the connect
+            self._spawn(self._apply(topic))
+
+    def leave_session(self, session_id: str):
+        self._release(f"session:{session_id}")
+
+    def join_channel(self, channel: str):
+        self._wanted.add(f"channel:{channel}")
+        self._spawn(self._apply(f"channel:{channel}"))
+
+    def leave_channel(self, channel: str):
+        self._release(f"channel:{channel}")
+
+    def _release(self, topic: str):
+        self._wanted.discard(topic)
+        self._spawn(self._apply(topic))
+
+    async def _apply(self, topic: str):
+        """Bring the broker subscription in line with _wanted (idempotent, any order)"""
+        async with self._lock:
+            wanted = topic in self._wanted
+            if wanted == (topic in self._active):
+                return
+            # State changes first: brokers register / drop the handler before
+            # sending the command and repair failed commands on reconnect
+            try:
+                if wanted:
+                    self._active.add(topic)
+                    await self.broker.subscribe(topic, self._on_topic_message)
+                else:
+                    self._active.discard(topic)
+                    await self.broker.unsubscribe(topic, self._on_topic_message)
+            except Exception as e:
+                self._error('subscribe' if wanted else 'unsubscribe', e)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # -------------------- publishing --------------------
+
+    async def publish_session(
+        self,
+        session_id: str,
+        message: Dict[str, Any],
+        priority: str = 'normal',
+        immediate: bool = False,
+        broadcast: bool = False
+    ) -> int:
+        """Publish to the worker(s) holding the session; returns receivers (0 on error)"""
+        kind = 'broadcast' if broadcast else 'send'
+        return await self._publish(f"session:{session_id}", kind, session_id, message, priority, immediate)
+
+    async def publish_channel(self, channel: str, message: Dict[str, Any], priority: str = 'normal') -> int:
+        return await self._publish(f"channel:{channel}", 'channel', channel, message, priority, False)
+
+    async def _publish(
+        self,
+        topic: str,
+        kind: str,
+        target: str,
+        message: Dict[str, Any],
+        priority: str,
+        immediate: bool
+    ) -> int:
+        if not self.available():
+            return 0
+        envelope = serialization.dumps_bytes({
+            'o': self.worker_id, 'k': kind, 't': target, 'p': priority, 'i': immediate, 'm': message
+        })
+        try:
+            receivers = await self.broker.publish(topic, envelope)
+        except Exception as e:
+            self._error('publish', e)
+            return 0
+        self.stats['published'] += 1
+        FANOUT_PUBLISHED.labels(kind).inc()
+        return receivers
+
+    async def _on_topic_message(self, topic: str, data: bytes):
+        try:
+            envelope = serialization.loads(data)
+            if envelope['o'] == self.worker_id and envelope['k'] != 'send':
+                return  # broadcasts are delivered locally before publishing
+            self.stats['received'] += 1
+            FANOUT_RECEIVED.labels(envelope['k']).inc()
+            await self._handler(envelope['k'], envelope['t'], envelope['m'], envelope['p'], envelope['i'])
+        except Exception as e:
+            self._error('deliver', e)
+
+    # -------------------- offline queue --------------------
+
+    async def push_offline(self, session_id: str, message: Dict[str, Any]) -> bool:
+        if not self.available():
+            return False
+        try:
+            await self.broker.push_offline(
+                session_id, serialization.dumps_bytes(message), self.offline_max, self.offline_ttl_s
+            )
+        except Exception as e:
+            self._error('push_offline', e)
+            return False
+        self.stats['offline_pushed'] += 1
+        return True
+
+    async def take_offline(self, session_id: str) -> List[Dict[str, Any]]:
+        if not self.available():
+            return []
+        try:
+            return [serialization.loads(data) for data in await self.broker.pop_offline(session_id)]
+        except Exception as e:
+            self._error('pop_offline', e)
+            return []
+
+    # -------------------- health / stats --------------------
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _error(self, operation: str, error: Exception):
+        self.stats['errors'] += 1
+        FANOUT_ERRORS.labels(operation).inc()
+        if operation != 'deliver':
+            self._down_until = time.monotonic() + self.retry_after_s
+        logger.warning(f"WebSocket fan-out {operation} failed: {error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'broker': self.broker.name,
+            'worker_id': self.worker_id,
+            'available': self.available(),
+            'topics': len(self._active),
+            **self.stats
+        }
+
+
+def create_fanout(backend: str = 'redis') -> Optional[WebSocketFanout]:
+    """'redis' (when Redis is enabled), 'memory', or None for 'none'"""
+    if backend == 'redis' and settings.redis_enabled:
+        broker = RedisBroker(settings.redis_url)
+    elif backend in ('redis', 'memory'):
+        broker = MemoryBroker()
+    else:
+        return None
+    return WebSocketFanout(
+        broker,
+        offline_max=settings.websocket_offline_queue_size,
+        offline_ttl_s=settings.websocket_offline_ttl_s
+    )
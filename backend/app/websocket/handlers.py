@@ -10,11 +10,14 @@ import asyncio
 import httpx
 
 from app.database import get_db_context
+from app.core.http_client import http_client_session
+from app.core.shutdown import shutdown_manager
 from app.models.session import Session as SessionModel, Interaction
 from app.models.ai_chat import ChatMessage, ChatConversation
 from app.models.reviews import get_review_model
+from app.models.product_summary import aggregate_product_summaries, get_product_summary
 
-from app.schemas.reviews import batch_to_study_format
+from app.schemas.reviews import STUDY_PROJECTION
 from app.websocket.manager import get_ws_manager, WebSocketManager
 from app.configs import settings
 
@@ -578,7 +581,7 @@ async def handle_chat_message(session_id: str, message: dict):
                 role='user',
                 content=message.get('content', ''),
                 timestamp=datetime.now(timezone.utc),
-                message_index=conversation.message_count,
+                message_index=ChatConversation.reserve_message_index(db, session_id),
                 model_used=str(message.get('model_used', settings.llm_model)),
                 message_metadata={
                     'source': 'websocket',
@@ -645,7 +648,7 @@ async def handle_chat_message(session_id: str, message: dict):
         start_time = time.time()
         response_time_ms = 0
         
-        async with httpx.AsyncClient() as client:
+        async with http_client_session() as client:
             try:
                 # Build payload and set model-specific token key before making the request
                 payload = {
@@ -772,7 +775,7 @@ async def handle_chat_message(session_id: str, message: dict):
                 role='assistant',
                 content=full_content,
                 timestamp=datetime.now(timezone.utc),
-                message_index=conversation.message_count,
+                message_index=ChatConversation.reserve_message_index(db, session_id),
                 token_count= completion_tokens or int(max(1, len(full_content).split() // 0.75)),
                 model_used=model_used or settings.llm_model,
                 response_time_ms=response_time_ms,
@@ -1161,39 +1164,20 @@ async def handle_get_interactions(session_id: str, message: dict):
 # ============================================================
 
 async def handle_batch_request(session_id: str, message: dict):
-    """Handle batched requests for efficiency"""
+    """
+    Handle batched requests for efficiency
+    
+    Independent reads run concurrently (see batch_executor); responses and
+    results keep request order, a failing item only fails itself.
+    """
+    from app.websocket.batch_executor import batch_executor
+    
     batch_id = message.get('batch_id')
-    requests = message.get('requests', [])
+    # Frontend client sends 'items'
+    requests = message.get('requests') or message.get('items', [])
     ws_manager:WebSocketManager = get_ws_manager()
     
-    results = []
-    
-    for req in requests:
-        req_type = req.get('type')
-        req_id = req.get('request_id')
-        
-        try:
-            # Route to appropriate handler
-            if req_type == 'session_update':
-                await handle_session_update(session_id, req)
-            elif req_type == 'session_get':
-                await handle_session_get(session_id, req)
-            elif req_type == 'chat_history':
-                await handle_chat_history_request(session_id, req)
-            elif req_type == 'track':
-                await handle_tracking_event(session_id, req)
-            else:
-                results.append({
-                    'request_id': req_id,
-                    'status': 'error',
-                    'error': f'Unknown request type: {req_type}'
-                })
-        except Exception as e:
-            results.append({
-                'request_id': req_id,
-                'status': 'error',
-                'error': str(e)
-            })
+    results = await batch_executor.execute(session_id, requests, ws_manager)
     
     # Send batch response
     await ws_manager.send_to_session(session_id, {
@@ -1220,6 +1204,15 @@ async def handle_workflow_execute(session_id: str, message: dict):
     
     try:
         ws_manager:WebSocketManager = get_ws_manager()
+        
+        # Draining for a restart: no new executions on this worker
+        if shutdown_manager.draining:
+            await ws_manager.send_to_session(session_id, {
+                'type': 'execution_error',
+                **shutdown_manager.rejection()
+            })
+            return
+        
         # Extract workflow-specific data
         workflow = message.get('workflow')
         input_data = message.get('input_data', {})
@@ -1308,8 +1301,8 @@ async def handle_workflow_execute(session_id: str, message: dict):
                 except Exception as update_error:
                     logger.error(f"Failed to update error status: {update_error}")
         
-        # Launch async task (non-blocking)
-        asyncio.create_task(run_execution())
+        # Launch async task (non-blocking, drained on shutdown)
+        shutdown_manager.spawn_execution(run_execution(), execution_id, session_id)
 
         # ============================================================
         # STEP 3: Send immediate response (like REST does)
@@ -1355,6 +1348,15 @@ async def handle_agent_execute(session_id: str, message: dict):
     
     try:
         ws_manager:WebSocketManager = get_ws_manager()
+        
+        # Draining for a restart: no new executions on this worker
+        if shutdown_manager.draining:
+            await ws_manager.send_to_session(session_id, {
+                'type': 'execution_error',
+                **shutdown_manager.rejection()
+            })
+            return
+        
         # Extract agent-specific data
         task_description = message.get('task_description')
         input_data = message.get('input_data', {})
@@ -1436,8 +1438,8 @@ async def handle_agent_execute(session_id: str, message: dict):
                 except Exception as update_error:
                     logger.error(f"Failed to update error status: {update_error}")
         
-        # Launch async task (non-blocking)
-        asyncio.create_task(run_execution())
+        # Launch async task (non-blocking, drained on shutdown)
+        shutdown_manager.spawn_execution(run_execution(), execution_id, session_id)
         
         # ============================================================
         # STEP 3: Send immediate response (like REST does)
@@ -1601,13 +1603,10 @@ async def handle_get_reviews(session_id: str, message: dict):
             })
             
             # Get paginated results
-            reviews = query.offset(offset).limit(limit).all()
-            
-            # Convert to study format using existing helper (returns Pydantic models)
-            study_reviews_pydantic = batch_to_study_format(reviews)
+            rows = STUDY_PROJECTION.select(query, model).offset(offset).limit(limit).all()
             
-            # Convert Pydantic models to dicts for JSON serialization
-            study_reviews = [review.model_dump() for review in study_reviews_pydantic]
+            # Study-format dicts straight from the projected columns
+            study_reviews = STUDY_PROJECTION.to_dicts(rows)
             
             logger.info(f"Sending {len(study_reviews)}/{total} {category} reviews via WebSocket")
             
@@ -1655,47 +1654,38 @@ async def handle_get_review_stats(session_id: str, message: dict):
         category_normalized = category.capitalize()
         
         with get_db_context() as db:
-            from app.models.source_data import SourceReview
-            
-            # Get all reviews for this product
-            reviews = db.query(SourceReview).filter(
-                SourceReview.product_category == category_normalized,
-                SourceReview.product_id == product_id
-            ).all()
-            
-            if not reviews:
-                await ws_manager.send_to_session(session_id, {
-                    'type': 'response',
-                    'request_id': request_id,
-                    'status': 'error',
-                    'error': f'No reviews found for {category}/{product_id}'
-                })
-                return
-            
-            # Calculate statistics
-            total_reviews = len(reviews)
-            avg_rating = sum(r.star_rating for r in reviews) / total_reviews
-            rating_distribution = {i: 0 for i in range(1, 6)}
-            
-            for review in reviews:
-                rating_distribution[review.star_rating] += 1
-            
-            verified_count = sum(1 for r in reviews if r.verified_purchase)
-            
-            await ws_manager.send_to_session(session_id, {
-                'type': 'response',
-                'request_id': request_id,
-                'status': 'success',
-                'data': {
+            # Materialized summary; aggregate live if summaries are not built yet
+            summary = get_product_summary(db, category, product_id)
+            if summary is None:
+                summary = next(iter(aggregate_product_summaries(db, category, [product_id])), None)
+            
+            stats = None
+            if summary is not None and summary.review_count:
+                stats = {
                     'product_id': product_id,
                     'category': category_normalized,
-                    'total_reviews': total_reviews,
-                    'average_rating': round(avg_rating, 2),
-                    'rating_distribution': rating_distribution,
-                    'verified_purchases': verified_count,
-                    'verified_percentage': round((verified_count / total_reviews) * 100, 1)
+                    'total_reviews': summary.review_count,
+                    'average_rating': round(summary.average_rating, 2),
+                    'rating_distribution': summary.rating_distribution,
+                    'verified_purchases': summary.verified_count,
+                    'verified_percentage': round(summary.verified_ratio * 100, 1)
                 }
+        
+        if stats is None:
+            await ws_manager.send_to_session(session_id, {
+                'type': 'response',
+                'request_id': request_id,
+                'status': 'error',
+                'error': f'No reviews found for {category}/{product_id}'
             })
+            return
+        
+        await ws_manager.send_to_session(session_id, {
+            'type': 'response',
+            'request_id': request_id,
+            'status': 'success',
+            'data': stats
+        })
         
     except Exception as e:
         logger.error(f"Error getting review stats via WebSocket: {e}", exc_info=True)
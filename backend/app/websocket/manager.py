@@ -4,18 +4,28 @@ WebSocket Manager with Batch Support + Connection Pooling
 """
 from fastapi import WebSocket
 from typing import Dict, List, Set, Optional, Any, Callable, Literal
+from contextvars import ContextVar
 import logging
-import json
 import asyncio
 import time
 from datetime import datetime, timezone
 from collections import defaultdict
 
 from app.configs import settings
+from app.core import serialization
+from app.core.metrics import metrics as metrics_registry
+from app.core.rate_limiter import MemoryBackend, Rate, RateLimiter
 from .batch_manager import ws_batch_manager, WebSocketBatchManager
+from .outbound import OutboundQueue, SLOW_CONSUMER_CLOSE_CODE
+from .codec import negotiate_codec
+from .fanout import WebSocketFanout, create_fanout
 
 logger = logging.getLogger(__name__)
 
+# Set by the batch executor: 'response' messages of a batch item are
+# collected here (and sent in request order) instead of being sent directly
+batch_response_capture: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar('batch_response_capture', default=None)
+
 
 class ConnectionPool:
     """
@@ -25,40 +35,81 @@ class ConnectionPool:
     - Multiple connections per session (e.g., multiple browser tabs)
     - Connection health tracking
     - Automatic cleanup of stale connections
+    - O(1) add/remove: per-session insertion-ordered dicts plus a
+      websocket -> session reverse index
+    - Owns each connection's outbound queue (closed on removal)
     """
     
     def __init__(self):
-        # session_id -> List[WebSocket]
-        self.connections: Dict[str, List[WebSocket]] = defaultdict(list)
-        # websocket -> {session_id, connection_id, connected_at}
+        # session_id -> {WebSocket: None} (ordered: first entry = oldest connection)
+        self.connections: Dict[str, Dict[WebSocket, None]] = {}
+        # websocket -> {session_id, connection_id, connected_at, codec}
         self.connection_info: Dict[WebSocket, Dict[str, Any]] = {}
+        # websocket -> outbound queue + writer task
+        self.outbound: Dict[WebSocket, OutboundQueue] = {}
+        # Called with the session_id when its last connection is removed
+        self.on_session_empty: Optional[Callable[[str], None]] = None
 
-    def add_connection(self, session_id: str, websocket: WebSocket, connection_id: str):
+    def add_connection(
+        self,
+        session_id: str,
+        websocket: WebSocket,
+        connection_id: str,
+        outbound: Optional[OutboundQueue] = None,
+        codec: Optional[Any] = None
+    ):
         """Add a connection to the pool"""
-        self.connections[session_id].append(websocket)
+        self.connections.setdefault(session_id, {})[websocket] = None
         self.connection_info[websocket] = {
             'session_id': session_id,
             'connection_id': connection_id,
-            'connected_at': time.time()
+            'connected_at': time.time(),
+            'codec': codec
         }
+        if outbound is not None:
+            self.outbound[websocket] = outbound
     
     def remove_connection(self, session_id: str, websocket: WebSocket):
         """Remove a connection from the pool"""
-        if session_id in self.connections:
-            if websocket in self.connections[session_id]:
-                self.connections[session_id].remove(websocket)
+        session_connections = self.connections.get(session_id)
+        if session_connections is not None:
+            session_connections.pop(websocket, None)
             
             # Clean up empty session
-            if not self.connections[session_id]:
+            if not session_connections:
                 del self.connections[session_id]
+                if self.on_session_empty is not None:
+                    self.on_session_empty(session_id)
         
         # Remove from connection info
-        if websocket in self.connection_info:
-            del self.connection_info[websocket]
+        self.connection_info.pop(websocket, None)
+        
+        outbound = self.outbound.pop(websocket, None)
+        if outbound is not None:
+            outbound.close()
+    
+    def remove_websocket(self, websocket: WebSocket) -> Optional[str]:
+        """Remove a connection by socket only; returns its session_id"""
+        info = self.connection_info.get(websocket)
+        if info is None:
+            return None
+        self.remove_connection(info['session_id'], websocket)
+        return info['session_id']
+    
+    def get_outbound(self, websocket: WebSocket) -> Optional[OutboundQueue]:
+        return self.outbound.get(websocket)
+    
+    def get_codec(self, websocket: WebSocket) -> Optional[Any]:
+        info = self.connection_info.get(websocket)
+        return info['codec'] if info else None
+    
+    def get_session_id(self, websocket: WebSocket) -> Optional[str]:
+        info = self.connection_info.get(websocket)
+        return info['session_id'] if info else None
     
     def get_connections(self, session_id: str) -> List[WebSocket]:
         """Get all connections for a session"""
-        return self.connections.get(session_id, [])
+        return list(self.connections.get(session_id, ()))
     
     def get_all_sessions(self) -> List[str]:
         """Get all active session IDs"""
@@ -66,7 +117,7 @@ class ConnectionPool:
     
     def get_connection_count(self) -> int:
         """Get total number of connections"""
-        return sum(len(conns) for conns in self.connections.values())
+        return len(self.connection_info)
     
     def get_session_connection_count(self, session_id: str) -> int:
         """Get total number of connections"""
@@ -157,19 +208,36 @@ class WebSocketManager:
         self.handlers: Dict[str, Callable] = {}
                 
         # Message queue for offline sessions
+        # (local fallback; with fan-out the queue is shared by all workers)
         self.message_queue: Dict[str, List[dict]] = defaultdict(list)
-        self.max_queue_size = 100
+        self.max_queue_size = settings.websocket_offline_queue_size
+        
+        # Cross-worker delivery (started in start_fanout)
+        self.fanout: Optional[WebSocketFanout] = None
         
 
         # Rate limiting - respect settings
+        # (GCRA, in-process: a connection is pinned to this worker)
         self.rate_limit_enabled = settings.rate_limit_enabled
-        self.rate_limits: Dict[str, dict] = defaultdict(
-            lambda: {'count': 0, 'reset_at': time.time() + 60}
-        )
+        self.rate_limiter = RateLimiter(MemoryBackend())
         self.rate_limit_max = settings.websocket_rate_limit  # messages per minute
+        self.rate_limit = Rate(self.rate_limit_max, 60)
         
-        # Channel subscriptions
+        # Channel subscriptions (session -> channels, channel -> sessions)
         self.subscriptions: Dict[str, Set[str]] = defaultdict(set)
+        self.channel_subscribers: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Upper bound for a single send during fan-out / health checks
+        self.send_timeout = settings.websocket_send_timeout
+        
+        # Per-connection outbound queues (backpressure for slow consumers)
+        self.outbound_queue_size = settings.websocket_outbound_queue_size
+        self.overflow_policy = settings.websocket_overflow_policy
+        
+        # Cleared on shutdown: new connections get shutdown_notice and are closed
+        self.accepting = True
+        self.shutdown_notice: Dict[str, Any] = {'type': 'server_shutdown'}
+        self.shutdown_close_code = 1012
         
         # Batch manager for performance
         self.enable_batching = enable_batching
@@ -188,9 +256,20 @@ class WebSocketManager:
             'messages_received': 0,
             'connections_total': 0,
             'errors_total': 0,
-            'rate_limit_hits': 0
+            'rate_limit_hits': 0,
+            'send_timeouts': 0
         }
         
+        metrics_registry.gauge(
+            'websocket_connections', 'Open WebSocket connections'
+        ).set_function(self.get_connection_count)
+        metrics_registry.gauge(
+            'websocket_queue_depth', 'WebSocket messages waiting to be sent (batched + offline + outbound queues)'
+        ).set_function(self._pending_message_count)
+        metrics_registry.gauge(
+            'websocket_outbound_max_lag_seconds', 'Age of the oldest frame waiting in any outbound queue'
+        ).set_function(lambda: self._max_outbound_lag_ms() / 1000)
+        
         logger.info(
             f"WebSocketManager initialized "
             f"(batching: {enable_batching}, "
@@ -210,32 +289,65 @@ class WebSocketManager:
         Accept and register a WebSocket connection
         
         Supports multiple connections per session (e.g., multiple tabs)
+        and negotiates the frame encoding (JSON unless the client asks for
+        msgpack, see app.websocket.codec)
+        
+        Returns False if the server is shutting down (connection closed
+        after shutdown_notice)
         """
-        await websocket.accept()
+        codec, subprotocol = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        
+        if not self.accepting:
+            # Shutting down: tell the client when to reconnect (to another worker)
+            try:
+                if codec.binary:
+                    await websocket.send_bytes(codec.encode(self.shutdown_notice))
+                else:
+                    await websocket.send_text(codec.encode(self.shutdown_notice))
+                await websocket.close(code=self.shutdown_close_code)
+            except Exception:
+                pass
+            return False
         
         if not connection_id:
             connection_id = f"{session_id}_{int(time.time()*1000)}"
         
-        self.pool.add_connection(session_id, websocket, connection_id)
+        outbound = OutboundQueue(
+            websocket,
+            session_id,
+            send=self._send_direct,
+            on_close=self.pool.remove_websocket,
+            max_size=self.outbound_queue_size,
+            policy=self.overflow_policy
+        )
+        outbound.start()
+        self.pool.add_connection(session_id, websocket, connection_id, outbound, codec)
         self.metrics['connections_total'] += 1
         
         logger.info(
             f"WebSocket connected: session={session_id}, "
             f"connection={connection_id}, "
+            f"encoding={codec.name}, "
             f"total_for_session={len(self.pool.get_connections(session_id))}"
         )
         
-        # Send welcome message directly (bypass batching)
-        await self._send_direct(websocket, {
+        # Send welcome message (bypass batching)
+        await self._send_queued(websocket, {
             'type': 'connected',
             'session_id': session_id,
             'connection_id': connection_id,
             'timestamp': datetime.now(timezone.utc).isoformat(),
-            'batching_enabled': self.enable_batching
+            'batching_enabled': self.enable_batching,
+            'encoding': codec.name
         })
         
-        # Process any queued messages
+        # Receive this session's messages from other workers, then
+        # deliver what was queued while it was offline
+        if self.fanout is not None:
+            await self.fanout.join_session(session_id)
         await self.process_queue(session_id)
+        return True
     
     def disconnect(self, session_id: str, websocket: Optional[WebSocket] = None):
         """
@@ -276,18 +388,21 @@ class WebSocketManager:
                 logger.warning(f"WebSocket not connected (state: {websocket.client_state.name})")
                 return False
             
-            await websocket.send_json(message)
+            codec = self.pool.get_codec(websocket)
+            if codec is None:
+                await websocket.send_text(serialization.dumps(message))
+            elif codec.binary:
+                await websocket.send_bytes(codec.encode(message))
+            else:
+                await websocket.send_text(codec.encode(message))
             self.metrics['messages_sent'] += 1
             return True
         
         except RuntimeError as e:
             if "WebSocket is not connected" in str(e):
                 logger.warning(f"Attempted to send to disconnected WebSocket")
-                # Find and remove this connection
-                for session_id in list(self.pool.connections.keys()):
-                    if websocket in self.pool.connections[session_id]:
-                        self.pool.remove_connection(session_id, websocket)
-                        break
+                # Remove this connection (reverse index lookup)
+                self.pool.remove_websocket(websocket)
             else:
                 logger.error(f"RuntimeError sending to connection: {e}")
             self.metrics['errors_total'] += 1
@@ -298,23 +413,47 @@ class WebSocketManager:
             self.metrics['errors_total'] += 1
             return False
     
+    async def _send_queued(self, websocket: WebSocket, message: Dict[str, Any]) -> bool:
+        """
+        Hand a message to the connection's outbound queue
+        
+        Does not wait for the socket; the connection's writer task sends it.
+        Returns False if the connection is gone or overflowed.
+        """
+        outbound = self.pool.get_outbound(websocket)
+        if outbound is None:
+            return await self._send_direct(websocket, message)
+        return outbound.put(message)
+    
     async def send_to_session(
         self, 
         session_id: str, 
         message: Dict[str, Any],
         priority: str = 'normal',
-        immediate: bool = False
+        immediate: bool = False,
+        local_only: bool = False
     ):
         """
         Send message to first active connection of a session
         
-        With batching support for performance
+        With batching support for performance. Sessions connected to
+        another worker are reached through the fan-out (local_only: message
+        already came from the fan-out, do not publish again).
         """
+        # Batch item responses are collected by the batch executor
+        capture = batch_response_capture.get()
+        if capture is not None and message.get('type') == 'response':
+            capture.append(message)
+            return
+        
         # Early exit: Check connections first (avoid processing if no destination)
         connections = self.pool.get_connections(session_id)
         if not connections:
+            if not local_only and self.fanout is not None:
+                if await self.fanout.publish_session(session_id, message, priority, immediate):
+                    return
             logger.debug(f"No connections for {session_id}, queueing message")
-            self.queue_message(session_id, message)
+            await self._queue_offline(session_id, message)
             return
         
         # Extract once, reuse
@@ -403,12 +542,12 @@ class WebSocketManager:
         Returns True if sent successfully
         """
         # Try first connection
-        if await self._send_direct(connections[0], message):
+        if await self._send_queued(connections[0], message):
             return True
         
         # Fallback to other connections
         for ws in connections[1:]:
-            if await self._send_direct(ws, message):
+            if await self._send_queued(ws, message):
                 return True
         
         logger.warning(f"Failed to send to any connection")
@@ -431,32 +570,36 @@ class WebSocketManager:
         
         # Send to first connection
         websocket = connections[0]
-        success = await self._send_direct(websocket, batch_message)
+        success = await self._send_queued(websocket, batch_message)
         
         # If failed, try other connections
         if not success:
             for ws in connections[1:]:
-                if await self._send_direct(ws, batch_message):
+                if await self._send_queued(ws, batch_message):
                     break
     
-    async def broadcast_to_session(self, session_id: str, message: Dict[str, Any]):
+    async def broadcast_to_session(self, session_id: str, message: Dict[str, Any], local_only: bool = False):
         """
         Broadcast message to ALL connections of a session
         
-        Useful for multi-tab synchronization
+        Useful for multi-tab synchronization (tabs may be connected to
+        different workers)
         """
         connections = self.pool.get_connections(session_id)
         
+        receivers = 0
+        if not local_only and self.fanout is not None:
+            receivers = await self.fanout.publish_session(session_id, message, broadcast=True)
+        
         if not connections:
-            self.queue_message(session_id, message)
+            if not receivers and not local_only:
+                await self._queue_offline(session_id, message)
             return
         
-        # Send to all connections
-        tasks = []
-        for ws in connections:
-            tasks.append(self._send_direct(ws, message))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Send to all connections (each bounded by the send timeout)
+        results = await asyncio.gather(
+            *(self._send_with_timeout(self._send_queued(ws, message), session_id) for ws in connections)
+        )
         
         # Clean up failed connections
         for ws, success in zip(connections, results):
@@ -489,24 +632,10 @@ class WebSocketManager:
         if not self.rate_limit_enabled:
             return True
         
-        # Use provided limit or default
-        limit = max_requests if max_requests is not None else self.rate_limit_max
-        
-        now = time.time()
-        limits = self.rate_limits[session_id]
-        
-        # Reset counter if window expired
-        if now > limits['reset_at']:
-            limits['count'] = 0
-            limits['reset_at'] = now + 60
-
-        # Check if over limit
-        if limits['count'] >= limit:
-            return False
+        # Use provided limit or default (per minute)
+        rate = self.rate_limit if max_requests is None else Rate(max_requests, 60)
         
-        # Increment counter
-        limits['count'] += 1
-        return True
+        return self.rate_limiter.hit(f"ws:{session_id}", rate, scope='websocket').allowed
     
     async def handle_message(
         self, 
@@ -581,14 +710,20 @@ class WebSocketManager:
         else:
             logger.warning(f"Message queue full for session: {session_id}")
     
+    async def _queue_offline(self, session_id: str, message: Dict[str, Any]):
+        """Queue in the shared offline queue (any worker may get the reconnect), else locally"""
+        if self.fanout is not None and await self.fanout.push_offline(session_id, message):
+            return
+        self.queue_message(session_id, message)
+    
     async def process_queue(self, session_id: str):
         """Process queued messages when session reconnects"""
-        if session_id not in self.message_queue:
+        messages = self.message_queue.pop(session_id, [])
+        if self.fanout is not None:
+            messages.extend(await self.fanout.take_offline(session_id))
+        if not messages:
             return
         
-        messages = self.message_queue[session_id]
-        self.message_queue[session_id] = []
-        
         logger.info(f"Processing {len(messages)} queued messages for {session_id}")
         
         for message in messages:
@@ -599,13 +734,49 @@ class WebSocketManager:
     def subscribe(self, session_id: str, channel: str):
         """Subscribe session to a channel"""
         self.subscriptions[session_id].add(channel)
+        if not self.channel_subscribers.get(channel) and self.fanout is not None:
+            self.fanout.join_channel(channel)
+        self.channel_subscribers[channel].add(session_id)
         logger.debug(f"Session {session_id} subscribed to {channel}")
     
     def unsubscribe(self, session_id: str, channel: str):
         """Unsubscribe session from a channel"""
-        if session_id in self.subscriptions:
-            self.subscriptions[session_id].discard(channel)
-            logger.debug(f"Session {session_id} unsubscribed from {channel}")
+        channels = self.subscriptions.get(session_id)
+        if channels is not None:
+            channels.discard(channel)
+            if not channels:
+                del self.subscriptions[session_id]
+        
+        subscribers = self.channel_subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(session_id)
+            if not subscribers:
+                del self.channel_subscribers[channel]
+                if self.fanout is not None:
+                    self.fanout.leave_channel(channel)
+        logger.debug(f"Session {session_id} unsubscribed from {channel}")
+    
+    def get_channel_subscribers(self, channel: str) -> Set[str]:
+        return set(self.channel_subscribers.get(channel, ()))
+    
+    async def _send_with_timeout(self, send, session_id: str) -> bool:
+        """
+        Await a send bounded by websocket_send_timeout
+        
+        A stuck consumer only loses its own message; concurrent sends to
+        other sessions are not delayed.
+        """
+        try:
+            result = await asyncio.wait_for(send, timeout=self.send_timeout)
+            return result is not False
+        except asyncio.TimeoutError:
+            self.metrics['send_timeouts'] += 1
+            logger.warning(f"WebSocket send to {session_id} timed out after {self.send_timeout}s (slow consumer)")
+            return False
+        except Exception as e:
+            self.metrics['errors_total'] += 1
+            logger.error(f"WebSocket send to {session_id} failed: {e}")
+            return False
     
     async def broadcast_to_channel(
         self,
@@ -613,40 +784,101 @@ class WebSocketManager:
         message: Dict[str, Any],
         priority: str = 'normal'
     ):
-        """Broadcast message to all subscribers of a channel"""
-        subscribers = [
-            sid for sid, channels in self.subscriptions.items()
-            if channel in channels
-        ]
+        """Broadcast message to all subscribers of a channel, on every worker (concurrent fan-out)"""
+        if self.fanout is not None:
+            await self.fanout.publish_channel(channel, message, priority)
+        await self._broadcast_local(channel, message, priority)
+    
+    async def _broadcast_local(self, channel: str, message: Dict[str, Any], priority: str = 'normal'):
+        subscribers = self.get_channel_subscribers(channel)
         
         if subscribers:
-            tasks = [
-                self.send_to_session(sid, message, priority)
+            await asyncio.gather(*(
+                self._send_with_timeout(self.send_to_session(sid, message, priority, local_only=True), sid)
                 for sid in subscribers
-            ]
-            await asyncio.gather(*tasks, return_exceptions=True)
+            ))
+    
+    # ==================== CROSS-WORKER FAN-OUT ====================
+    
+    async def start_fanout(self, fanout: Optional[WebSocketFanout] = None):
+        """
+        Enable cross-worker delivery (call once from the running loop)
+        
+        Defaults to settings.websocket_fanout_backend; pass a fanout to share
+        a broker between managers (tests / benchmarks).
+        """
+        if self.fanout is not None:
+            return
+        fanout = fanout or create_fanout(settings.websocket_fanout_backend)
+        if fanout is None:
+            return
+        await fanout.start(self._on_fanout_message)
+        self.fanout = fanout
+        self.pool.on_session_empty = fanout.leave_session
+        
+        # Sessions / channels that were registered before the fan-out started
+        for session_id in self.pool.get_all_sessions():
+            await fanout.join_session(session_id)
+        for channel in list(self.channel_subscribers):
+            fanout.join_channel(channel)
+    
+    async def stop_fanout(self):
+        if self.fanout is None:
+            return
+        fanout, self.fanout = self.fanout, None
+        self.pool.on_session_empty = None
+        await fanout.stop()
+    
+    async def _on_fanout_message(
+        self,
+        kind: str,
+        target: str,
+        message: Dict[str, Any],
+        priority: str,
+        immediate: bool
+    ):
+        """Deliver a message published by another worker to local connections"""
+        if kind == 'send':
+            await self.send_to_session(target, message, priority, immediate, local_only=True)
+        elif kind == 'broadcast':
+            await self.broadcast_to_session(target, message, local_only=True)
+        elif kind == 'channel':
+            await self._broadcast_local(target, message, priority)
     
     # ==================== HEALTH & MONITORING ====================
 
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on all connections"""
-        healthy = 0
-        unhealthy = 0
+        targets = [
+            (session_id, ws)
+            for session_id in self.pool.get_all_sessions()
+            for ws in self.pool.get_connections(session_id)
+        ]
         
-        for session_id in list(self.pool.get_all_sessions()):
-            connections = self.pool.get_connections(session_id)
-            for ws in connections:
-                try:
-                    # Try to send ping
-                    success = await self._send_direct(ws, {'type': 'ping'})
-                    if success:
-                        healthy += 1
-                    else:
-                        unhealthy += 1
-                        self.pool.remove_connection(session_id, ws)
-                except:
-                    unhealthy += 1
-                    self.pool.remove_connection(session_id, ws)
+        # Connections whose oldest queued frame is older than the send
+        # timeout are stuck consumers: close them (client reconnects)
+        lag_limit_ms = self.send_timeout * 1000
+        for session_id, ws in targets:
+            outbound = self.pool.get_outbound(ws)
+            if outbound is not None and outbound.oldest_lag_ms() > lag_limit_ms:
+                logger.warning(
+                    f"Closing stuck WebSocket for {session_id}: "
+                    f"{outbound.depth()} frames pending, oldest {outbound.oldest_lag_ms():.0f}ms"
+                )
+                outbound.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        
+        # Ping all connections concurrently, each bounded by the send timeout
+        results = await asyncio.gather(*(
+            self._send_with_timeout(self._send_queued(ws, {'type': 'ping'}), session_id)
+            for session_id, ws in targets
+        ))
+        
+        for (session_id, ws), success in zip(targets, results):
+            if not success:
+                self.pool.remove_connection(session_id, ws)
+        
+        healthy = sum(1 for success in results if success)
+        unhealthy = len(results) - healthy
         
         return {
             'healthy_connections': healthy,
@@ -777,6 +1009,30 @@ class WebSocketManager:
     
     # ==================== METRICS  ====================
     
+    def _pending_message_count(self) -> int:
+        """Messages waiting in batches and the offline queue"""
+        queued = sum(len(msgs) for msgs in list(self.message_queue.values()))
+        queued += sum(outbound.depth() for outbound in list(self.pool.outbound.values()))
+        if self.enable_batching and self.batch_manager:
+            queued += self.batch_manager.get_pending_count()
+        return queued
+    
+    def _max_outbound_lag_ms(self) -> float:
+        return max((outbound.oldest_lag_ms() for outbound in list(self.pool.outbound.values())), default=0.0)
+    
+    def get_connection_stats(self) -> List[Dict[str, Any]]:
+        """Outbound queue depth and send lag per connection (slowest first)"""
+        stats = []
+        for websocket, outbound in list(self.pool.outbound.items()):
+            info = self.pool.connection_info.get(websocket, {})
+            codec = info.get('codec')
+            stats.append({
+                'connection_id': info.get('connection_id'),
+                **outbound.get_stats(),
+                **(codec.get_stats() if codec else {}),
+            })
+        return sorted(stats, key=lambda entry: -entry['oldest_pending_lag_ms'])
+    
     def get_connection_count(self) -> int:
         """Get number of active connections"""
         return self.pool.get_connection_count()
@@ -796,9 +1052,18 @@ class WebSocketManager:
             'active_connections': self.pool.get_connection_count(),
             'total_subscriptions': sum(len(subs) for subs in self.subscriptions.values()),
             'queued_messages': sum(len(msgs) for msgs in self.message_queue.values()),
+            'outbound': {
+                'policy': self.overflow_policy,
+                'max_size': self.outbound_queue_size,
+                'pending': sum(outbound.depth() for outbound in self.pool.outbound.values()),
+                'max_lag_ms': round(self._max_outbound_lag_ms(), 1),
+            },
             **self.metrics
         }
         
+        if self.fanout is not None:
+            metrics['fanout'] = self.fanout.get_stats()
+        
         # Add batch manager metrics
         if self.enable_batching and self.batch_manager:
             metrics['batching'] = self.batch_manager.get_metrics()
@@ -807,20 +1072,44 @@ class WebSocketManager:
     
     # ==================== SHUTDOWN ====================
     
-    async def shutdown(self):
-        """Cleanup on shutdown"""
+    def stop_accepting(self, notice: Optional[Dict[str, Any]] = None):
+        """Refuse new connections from now on (shutdown drain); they get notice and code 1012"""
+        self.accepting = False
+        if notice is not None:
+            self.shutdown_notice = notice
+    
+    async def shutdown(self, close_code: int = 1000, notice: Optional[Dict[str, Any]] = None):
+        """
+        Cleanup on shutdown
+        
+        Flushes batches and outbound queues; with notice, every connection
+        gets it as its last message before the close (reconnect hint).
+        """
         logger.info("Shutting down WebSocketManager")
+        self.stop_accepting(notice)
         
         # Flush all pending batches
         if self.enable_batching and self.batch_manager:
             await self.batch_manager.stop()
         
+        if notice is not None:
+            for outbound in list(self.pool.outbound.values()):
+                outbound.put(notice)
+        
+        await self.stop_fanout()
+        
+        # Give writers a moment to deliver what is already queued
+        await asyncio.gather(*(
+            outbound.drain(timeout=self.send_timeout)
+            for outbound in list(self.pool.outbound.values())
+        ))
+        
         # Close all connections
         for session_id in list(self.pool.get_all_sessions()):
             connections = self.pool.get_connections(session_id)
             for websocket in connections:
                 try:
-                    await websocket.close()
+                    await websocket.close(code=close_code)
                 except:
                     pass
                 self.pool.remove_connection(session_id, websocket)
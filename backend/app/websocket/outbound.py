@@ -0,0 +1,265 @@
+# backend/app/websocket/outbound.py
+"""
+Per-connection outbound queue - Backpressure for WebSocket sends
+
+Producers (tools, the batch manager, chat streaming) enqueue without
+awaiting the socket; one writer task per connection drains the queue.
+A participant on a slow network therefore only delays their own frames,
+never the coroutine that produced them.
+
+Overflow policies (settings.websocket_overflow_policy):
+- coalesce:    a new progress or stream frame replaces the pending frame it
+               supersedes (same execution / node / tool / status / step)
+               in place
+- drop_stream: only superseded chat stream frames are replaced; progress
+               frames are delivered in full
+- disconnect:  nothing is replaced
+
+Stream frames carry the accumulated ``full_content``, so dropping a
+superseded one loses nothing. A superseded progress frame is lost: the
+client shows only the newer status update of the same step. Frames whose
+content the client accumulates (agent 'decision' reasoning, appended to
+the transcript one by one) are never coalesced. If the queue is still
+full after coalescing, the connection is closed (1013 "try again later");
+the client reconnects and resynchronises instead of silently missing
+non-droppable frames.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Literal, Optional
+import logging
+
+from fastapi import WebSocket
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal['coalesce', 'drop_stream', 'disconnect']
+
+# Close code for slow consumers (RFC 6455: "Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+PROGRESS_TYPES = frozenset({'execution', 'node', 'tool', 'agent'})
+STREAM_FRAME_TYPES = frozenset({'chat_stream'})
+
+# Progress statuses whose frames the client appends (each one is content)
+ACCUMULATED_STATUSES = frozenset({'decision'})
+
+WEBSOCKET_SEND_LAG = metrics.histogram(
+    'websocket_send_lag_seconds',
+    'Time a WebSocket frame waited in the per-connection outbound queue'
+)
+WEBSOCKET_COALESCED = metrics.counter(
+    'websocket_coalesced_messages_total',
+    'Pending WebSocket frames replaced by a newer frame',
+    ['kind']
+)
+WEBSOCKET_SLOW_CONSUMER_DISCONNECTS = metrics.counter(
+    'websocket_slow_consumer_disconnects_total',
+    'Connections closed because their outbound queue overflowed'
+)
+
+
+def supersede_key(message: Dict[str, Any], policy: OverflowPolicy) -> Optional[Hashable]:
+    """
+    Key of the pending frame a message supersedes (None = never replaced)
+    """
+    if policy == 'disconnect':
+        return None
+
+    message_type = message.get('type')
+    if message_type in STREAM_FRAME_TYPES and 'full_content' in message:
+        return (message_type,)
+
+    if (
+        policy == 'coalesce'
+        and message_type in PROGRESS_TYPES
+        and message.get('subtype') == 'progress'
+        and message.get('status') not in ACCUMULATED_STATUSES
+    ):
+        data = message.get('data')
+        node_id = data.get('node_id') if isinstance(data, dict) else None
+        return (
+            message_type,
+            message.get('execution_id'),
+            node_id,
+            message.get('tool_id'),
+            message.get('status'),
+            message.get('step'),
+        )
+
+    return None
+
+
+class _Entry:
+    __slots__ = ('message', 'enqueued_at', 'key')
+
+    def __init__(self, message: Dict[str, Any], key: Optional[Hashable]):
+        self.message = message
+        self.enqueued_at = time.monotonic()
+        self.key = key
+
+
+class OutboundQueue:
+    """
+    Bounded FIFO of frames for one connection plus its writer task
+
+    Args:
+        websocket: Connection the writer sends to
+        session_id: Owning session (logging / stats)
+        send: Coroutine performing the actual send; returns False on failure
+        on_close: Called once when the queue closes (send failure / overflow)
+        max_size: Pending frames before the overflow policy applies
+        policy: Overflow policy (see module docstring)
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        send: Callable[[WebSocket, Dict[str, Any]], Awaitable[bool]],
+        on_close: Optional[Callable[[WebSocket], None]] = None,
+        max_size: int = 256,
+        policy: OverflowPolicy = 'coalesce'
+    ):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.max_size = max_size
+        self.policy = policy
+
+        self._send = send
+        self._on_close = on_close
+        self._entries: Deque[_Entry] = deque()
+        self._pending: Dict[Hashable, _Entry] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        # Stats
+        self.sent = 0
+        self.coalesced = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._writer())
+
+    def put(self, message: Dict[str, Any]) -> bool:
+        """
+        Enqueue a frame without waiting for the socket
+
+        Returns False if the connection is closed or was closed on overflow.
+        """
+        if self.closed:
+            return False
+
+        key = supersede_key(message, self.policy)
+        if key is not None:
+            pending = self._pending.get(key)
+            if pending is not None:
+                # Keep the queue position (and original enqueue time for lag)
+                pending.message = message
+                self.coalesced += 1
+                WEBSOCKET_COALESCED.labels(key[0]).inc()
+                return True
+
+        if len(self._entries) >= self.max_size:
+            logger.warning(
+                f"Outbound queue overflow for session {self.session_id} "
+                f"({len(self._entries)} pending, oldest {self.oldest_lag_ms():.0f}ms), disconnecting slow consumer"
+            )
+            WEBSOCKET_SLOW_CONSUMER_DISCONNECTS.inc()
+            self.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            return False
+
+        entry = _Entry(message, key)
+        self._entries.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        self._wake.set()
+        return True
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                if not self._entries:
+                    self._wake.clear()
+                    await self._wake.wait()
+                    continue
+
+                entry = self._entries.popleft()
+                if entry.key is not None and self._pending.get(entry.key) is entry:
+                    del self._pending[entry.key]
+
+                lag_s = time.monotonic() - entry.enqueued_at
+                WEBSOCKET_SEND_LAG.observe(lag_s)
+                self.last_lag_ms = lag_s * 1000
+                self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+
+                if not await self._send(self.websocket, entry.message):
+                    self.close()
+                    return
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Outbound writer failed for session {self.session_id}: {e}")
+            self.close()
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until all pending frames are written (used on shutdown)"""
+        deadline = time.monotonic() + timeout
+        while self._entries and not self.closed and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        return not self._entries
+
+    def close(self, code: Optional[int] = None):
+        """Stop the writer and drop pending frames; closes the socket if code given"""
+        if self.closed:
+            return
+        self.closed = True
+        self._entries.clear()
+        self._pending.clear()
+
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+        if self._on_close:
+            self._on_close(self.websocket)
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+    # ==================== STATS ====================
+
+    def depth(self) -> int:
+        return len(self._entries)
+
+    def oldest_lag_ms(self) -> float:
+        """How long the oldest pending frame has been waiting"""
+        if not self._entries:
+            return 0.0
+        return (time.monotonic() - self._entries[0].enqueued_at) * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'session_id': self.session_id,
+            'depth': len(self._entries),
+            'max_size': self.max_size,
+            'policy': self.policy,
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'oldest_pending_lag_ms': round(self.oldest_lag_ms(), 1),
+            'last_lag_ms': round(self.last_lag_ms, 1),
+            'max_lag_ms': round(self.max_lag_ms, 1),
+            'closed': self.closed,
+        }
@@ -0,0 +1,152 @@
+# backend/benchmarks/chat_stream_ttft.py
+"""
+Time-to-first-token benchmark for the chat streaming proxy
+
+Starts a local mock of the OpenAI chat completions endpoint (SSE stream)
+and measures time-to-first-token for:
+- per_request: new httpx.AsyncClient per chat request (old behaviour)
+- shared:      application-scoped client from app.core.http_client
+
+Usage (from backend/):
+    python -m benchmarks.chat_stream_ttft --requests 200 --concurrency 10
+    python -m benchmarks.chat_stream_ttft --tls-delay-ms 40   # simulate handshake cost
+
+No network access or API key required.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from app.core.http_client import init_http_client, close_http_client, http_client_session
+
+
+# ============================================================
+# MOCK UPSTREAM
+# ============================================================
+
+async def _handle_upstream(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    first_token_delay: float,
+    chunks: int,
+    connect_delay: float
+):
+    """Minimal HTTP/1.1 keep-alive server emitting an OpenAI-style SSE stream"""
+    # Simulated connection setup cost (TLS handshake) paid once per connection
+    if connect_delay:
+        await asyncio.sleep(connect_delay)
+
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Transfer-Encoding: chunked\r\n"
+                b"Connection: keep-alive\r\n\r\n"
+            )
+            await asyncio.sleep(first_token_delay)
+
+            for i in range(chunks):
+                payload = json.dumps({'choices': [{'delta': {'content': f'tok{i} '}}]})
+                _write_chunk(writer, f"data: {payload}\n\n".encode())
+            _write_chunk(writer, b"data: [DONE]\n\n")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def _write_chunk(writer: asyncio.StreamWriter, data: bytes):
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+# ============================================================
+# CLIENT SIDE
+# ============================================================
+
+async def _stream_once(client: httpx.AsyncClient, url: str) -> float:
+    """Return time to first content line in ms"""
+    start = time.perf_counter()
+    ttft = None
+    async with client.stream("POST", url, json={'stream': True}, timeout=30.0) as response:
+        async for line in response.aiter_lines():
+            if ttft is None and line.startswith('data: '):
+                ttft = (time.perf_counter() - start) * 1000
+    return ttft
+
+
+async def _run_mode(mode: str, url: str, total: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with semaphore:
+            if mode == 'per_request':
+                async with httpx.AsyncClient() as client:
+                    return await _stream_once(client, url)
+            async with http_client_session() as client:
+                return await _stream_once(client, url)
+
+    return await asyncio.gather(*(one() for _ in range(total)))
+
+
+def _report(mode: str, samples: List[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{mode:<12} n={len(samples):<5} "
+        f"mean={statistics.mean(samples):7.2f}ms  "
+        f"p50={statistics.median(samples):7.2f}ms  "
+        f"p95={p95:7.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--first-token-delay-ms', type=float, default=5.0)
+    parser.add_argument('--tls-delay-ms', type=float, default=0.0,
+                        help='Simulated per-connection handshake cost')
+    parser.add_argument('--chunks', type=int, default=20)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(
+        lambda r, w: _handle_upstream(
+            r, w,
+            first_token_delay=args.first_token_delay_ms / 1000,
+            chunks=args.chunks,
+            connect_delay=args.tls_delay_ms / 1000
+        ),
+        host='127.0.0.1',
+        port=0
+    )
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/v1/chat/completions"
+
+    init_http_client()
+    try:
+        async with server:
+            for mode in ('per_request', 'shared'):
+                samples = await _run_mode(mode, url, args.requests, args.concurrency)
+                _report(mode, samples)
+    finally:
+        await close_http_client()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
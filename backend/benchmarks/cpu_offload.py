@@ -0,0 +1,450 @@
+# backend/benchmarks/cpu_offload.py
+"""
+CPU offload: kernel equivalence, event loop lag and offload threshold
+
+Checks (any failure exits non-zero):
+- equivalence: app.core.cpu_tasks kernels vs. the previous in-tool
+               implementations on seeded random input (sampling, review
+               theme aggregation both separations, ShowResults theme merge),
+               inline and through the process pool
+- loop lag:    a 5ms ticker runs while a large sampling / merge executes;
+               max ticker lateness inline vs. offloaded. Offloading must
+               lower it; for the merge (where the kernel is everything) it
+               must stay below --max-lag-ms. Column extraction and encoding
+               stay on the loop, which bounds the gain for linear kernels.
+
+The size sweeps print inline vs. pool time per size, the basis for
+cpu_offload_min_items (sampling, review themes) and cpu_offload_min_themes
+(merge).
+
+Usage (from backend/):
+    python -m benchmarks.cpu_offload --records 200000
+"""
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+
+# ============================================================
+# PREVIOUS IMPLEMENTATIONS (reference)
+# ============================================================
+
+def legacy_sample(reviews: List[Dict[str, Any]], target_count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    avg_length = sum(len(r.get('review_body', '')) for r in reviews) / len(reviews)
+    long_groups, short_groups = {}, {}
+    for review in reviews:
+        rating = review.get('star_rating', 3)
+        groups = long_groups if len(review.get('review_body', '')) >= avg_length else short_groups
+        groups.setdefault(rating, []).append(review)
+
+    all_ratings = set(long_groups.keys()) | set(short_groups.keys())
+    allocations = []
+    total_allocated = 0
+    for rating in all_ratings:
+        count = len(long_groups.get(rating, [])) + len(short_groups.get(rating, []))
+        ideal_size = target_count * (count / len(reviews))
+        allocated = math.floor(ideal_size)
+        allocations.append({
+            'long_reviews': long_groups.get(rating, []),
+            'short_reviews': short_groups.get(rating, []),
+            'allocated': allocated,
+            'remainder': ideal_size - allocated
+        })
+        total_allocated += allocated
+
+    remaining = target_count - total_allocated
+    allocations.sort(key=lambda x: x['remainder'], reverse=True)
+    for i in range(remaining):
+        if i < len(allocations):
+            total_available = len(allocations[i]['long_reviews']) + len(allocations[i]['short_reviews'])
+            if allocations[i]['allocated'] < total_available:
+                allocations[i]['allocated'] += 1
+
+    sampled = []
+    for allocation in allocations:
+        long_reviews, short_reviews, needed = allocation['long_reviews'], allocation['short_reviews'], allocation['allocated']
+        if needed == 0:
+            continue
+        if len(long_reviews) >= needed:
+            sampled.extend(rng.sample(long_reviews, needed))
+        else:
+            sampled.extend(long_reviews)
+            remaining_needed = needed - len(long_reviews)
+            if remaining_needed > 0 and short_reviews:
+                sampled.extend(rng.sample(short_reviews, min(remaining_needed, len(short_reviews))))
+
+    rng.shuffle(sampled)
+    return sampled[:target_count]
+
+
+def _legacy_format(scores: Counter, review_ids: Dict[str, set], max_count: int, total: int) -> List[Dict[str, Any]]:
+    formatted = []
+    for theme, weighted_score in scores.most_common(max_count):
+        review_count = len(review_ids[theme])
+        percentage = (review_count / total * 100) if total > 0 else 0
+        formatted.append({
+            'theme': theme, 'weighted_score': weighted_score,
+            'review_count': review_count, 'percentage': round(percentage, 2)
+        })
+    return formatted
+
+
+def legacy_review_themes(analyzed_reviews, theme_separation, max_count, alpha, scaling) -> Dict[str, Any]:
+    by_sentiment = theme_separation == 'by_sentiment'
+    buckets = ('positive', 'neutral', 'negative') if by_sentiment else ('all',)
+    scores = {bucket: {} for bucket in buckets}
+    ids = {bucket: {} for bucket in buckets}
+    for review in analyzed_reviews:
+        seen_in_review = set()
+        for topic_str, importance, sentiment_score in review.get('theme_analysis', {}).get('themes', []):
+            weight = alpha + (importance / scaling)
+            theme_lower = topic_str.lower()
+            if theme_lower in seen_in_review:
+                continue
+            seen_in_review.add(theme_lower)
+            if not by_sentiment:
+                bucket = 'all'
+            elif sentiment_score >= 5:
+                bucket = 'positive'
+            elif sentiment_score <= 2:
+                bucket = 'negative'
+            else:
+                bucket = 'neutral'
+            if theme_lower not in scores[bucket]:
+                scores[bucket][theme_lower] = 0
+                ids[bucket][theme_lower] = set()
+            scores[bucket][theme_lower] += weight
+            ids[bucket][theme_lower].add(review.get('review_id'))
+
+    total_reviews = len(analyzed_reviews)
+    if not by_sentiment:
+        return {'type': 'combined', 'themes': _legacy_format(Counter(scores['all']), ids['all'], max_count, total_reviews)}
+
+    def reviews_with(predicate) -> int:
+        return sum(
+            1 for r in analyzed_reviews
+            if any(predicate(t[2]) for t in r.get('theme_analysis', {}).get('themes', []))
+        )
+
+    counts = {
+        'positive': reviews_with(lambda s: s >= 5),
+        'neutral': reviews_with(lambda s: s == 3 or s == 4),
+        'negative': reviews_with(lambda s: s <= 2),
+    }
+    result = {'type': 'by_sentiment'}
+    for bucket in buckets:
+        result[f'{bucket}_themes'] = _legacy_format(
+            Counter(scores[bucket]), ids[bucket], max_count, counts[bucket] if counts[bucket] > 0 else total_reviews
+        )
+    return result
+
+
+def legacy_merge(themes: List[Dict[str, Any]], total_records: Optional[int]) -> List[Dict[str, Any]]:
+    def normalize(theme: str) -> str:
+        normalized = theme.replace('|', '/').replace(',', '/').replace(';', '/').replace('\\', '/')
+        return '/'.join(part.strip() for part in normalized.split('/')).lower()
+
+    def parts_of(theme: str) -> frozenset:
+        return frozenset(part.strip().lower() for part in theme.split('/') if part.strip())
+
+    aggregated = {}
+    for theme in themes:
+        name = theme.get('theme', '')
+        if not name:
+            continue
+        normalized = normalize(name)
+        matching_key = None
+        for key in list(aggregated.keys()):
+            p1, p2 = parts_of(normalized), parts_of(key)
+            if p1 == p2 or p1.issubset(p2) or p2.issubset(p1):
+                matching_key = key
+                break
+        if matching_key:
+            p1, p2 = parts_of(normalized), parts_of(matching_key)
+            merged = '/'.join(sorted(p1)) if p1 == p2 else (normalized if len(p1) >= len(p2) else matching_key)
+            if merged != matching_key:
+                old = aggregated.pop(matching_key)
+                aggregated[merged] = {
+                    'theme': merged,
+                    'weighted_score': old['weighted_score'] + theme.get('weighted_score', 0),
+                    'review_count': old['review_count'] + theme.get('review_count', 0),
+                }
+            else:
+                aggregated[matching_key]['weighted_score'] += theme.get('weighted_score', 0)
+                aggregated[matching_key]['review_count'] += theme.get('review_count', 0)
+        else:
+            aggregated[normalized] = {
+                'theme': normalized,
+                'weighted_score': theme.get('weighted_score', 0),
+                'review_count': theme.get('review_count', 0),
+            }
+
+    result = list(aggregated.values())
+    if result:
+        total_in_group = sum(t['review_count'] for t in result)
+        for theme in result:
+            if total_in_group > 0:
+                theme['percentage'] = round((theme['review_count'] / total_in_group) * 100, 2)
+                if total_records and total_records > 0:
+                    theme['estimated_total_count'] = round((theme['percentage'] / 100) * total_records)
+            else:
+                theme['percentage'] = 0.0
+                if total_records:
+                    theme['estimated_total_count'] = 0
+    result.sort(key=lambda x: x['weighted_score'], reverse=True)
+    return result
+
+
+# ============================================================
+# DATA
+# ============================================================
+
+TOPICS = ['battery', 'screen', 'price', 'delivery', 'sound', 'build quality', 'support', 'size', 'weight', 'noise']
+
+
+def make_reviews(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            'review_id': f'R{index}',
+            'star_rating': rng.choice([1, 2, 3, 4, 5, 5, 5, 4]),
+            'review_body': 'x' * int(rng.expovariate(1 / 200)),
+        }
+        for index in range(count)
+    ]
+
+
+def make_analyzed(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            'review_id': f'R{index}',
+            'theme_analysis': {'themes': [
+                (rng.choice(TOPICS).title() if rng.random() < 0.3 else rng.choice(TOPICS),
+                 rng.randint(1, 7), rng.randint(1, 7))
+                for _ in range(rng.randint(0, 5))
+            ]},
+        }
+        for index in range(count)
+    ]
+
+
+def make_theme_list(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    separators = ['/', ' / ', ', ', ' | ', ';']
+    themes = []
+    for _ in range(count):
+        parts = rng.sample(TOPICS, rng.randint(1, 3)) + [f'aspect {rng.randint(0, count)}']
+        themes.append({
+            'theme': rng.choice(separators).join(parts),
+            'weighted_score': round(rng.uniform(0.5, 20), 3),
+            'review_count': rng.randint(1, 50),
+        })
+    return themes
+
+
+# ============================================================
+# CHECKS
+# ============================================================
+
+async def check_equivalence(records: int, seed: int) -> bool:
+    from app.core.cpu_executor import CpuExecutor
+    from app.core.cpu_tasks import aggregate_review_themes, merge_theme_list, stratified_sample_indices
+
+    rng = random.Random(seed)
+    reviews = make_reviews(records, rng)
+    analyzed = make_analyzed(2000, rng)
+    theme_list = make_theme_list(600, rng)
+    alpha, scaling = 0.5, 14
+
+    inline = CpuExecutor(max_workers=0, min_items=0)
+    pooled = CpuExecutor(max_workers=2, min_items=0)
+    results = {}
+
+    for target in (1, 100, 1000):
+        expected = legacy_sample(reviews, target, random.Random(seed))
+        for name, executor in (('inline', inline), ('pool', pooled)):
+            indices = await executor.run(
+                stratified_sample_indices,
+                columns={
+                    'ratings': [r.get('star_rating', 3) for r in reviews],
+                    'body_lengths': [len(r.get('review_body') or '') for r in reviews],
+                },
+                target_count=target,
+                seed=seed
+            )
+            results[f'sample[{target}] {name}'] = [reviews[i] for i in indices] == expected
+
+    columns = {'review_ids': [], 'theme_rows': [], 'theme_topics': [], 'theme_importance': [], 'theme_sentiment': []}
+    for row, review in enumerate(analyzed):
+        columns['review_ids'].append(review['review_id'])
+        for topic, importance, sentiment in review['theme_analysis']['themes']:
+            columns['theme_rows'].append(row)
+            columns['theme_topics'].append(topic)
+            columns['theme_importance'].append(importance)
+            columns['theme_sentiment'].append(sentiment)
+    for separation in ('combined', 'by_sentiment'):
+        expected = legacy_review_themes(analyzed, separation, 20, alpha, scaling)
+        for name, executor in (('inline', inline), ('pool', pooled)):
+            got = await executor.run(
+                aggregate_review_themes, columns=columns,
+                theme_separation=separation, max_themes_per_category=20,
+                weight_alpha=alpha, weight_scaling=scaling
+            )
+            results[f'themes[{separation}] {name}'] = got == expected
+
+    for total_records in (None, 12345):
+        expected = legacy_merge(theme_list, total_records)
+        for name, executor in (('inline', inline), ('pool', pooled)):
+            got = await executor.run(
+                merge_theme_list,
+                columns={
+                    'theme_names': [t['theme'] for t in theme_list],
+                    'weighted_scores': [t['weighted_score'] for t in theme_list],
+                    'review_counts': [t['review_count'] for t in theme_list],
+                },
+                total_records=total_records
+            )
+            results[f'merge[{total_records}] {name}'] = got == expected
+
+    pooled.shutdown()
+    for name, ok in results.items():
+        print(f"  {name:<28}{'ok' if ok else 'MISMATCH'}")
+    return all(results.values())
+
+
+async def _max_lag(coro_factory, interval: float = 0.005) -> tuple:
+    """Run the coroutine while a ticker measures how late it wakes up"""
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    await coro_factory()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    return elapsed * 1000, max(lags) * 1000
+
+
+async def check_loop_lag(records: int, themes: int, max_lag_ms: float) -> bool:
+    from app.core.cpu_executor import CpuExecutor
+    from app.core.cpu_tasks import merge_theme_list, stratified_sample_indices
+
+    rng = random.Random(1)
+    reviews = make_reviews(records, rng)
+    theme_list = make_theme_list(themes, rng)
+    inline = CpuExecutor(max_workers=0, min_items=0)
+    pooled = CpuExecutor(max_workers=2, min_items=0)
+    await pooled.run(merge_theme_list, columns={'theme_names': ['warm'], 'weighted_scores': [1.0], 'review_counts': [1]})
+
+    def sample(executor):
+        return lambda: executor.run(
+            stratified_sample_indices,
+            columns={
+                'ratings': [r['star_rating'] for r in reviews],
+                'body_lengths': [len(r['review_body']) for r in reviews],
+            },
+            target_count=100
+        )
+
+    def merge(executor):
+        return lambda: executor.run(
+            merge_theme_list,
+            columns={
+                'theme_names': [t['theme'] for t in theme_list],
+                'weighted_scores': [t['weighted_score'] for t in theme_list],
+                'review_counts': [t['review_count'] for t in theme_list],
+            }
+        )
+
+    ok = True
+    cases = (
+        (f'sample {records} records', sample, None),
+        (f'merge {themes} themes', merge, max_lag_ms),
+    )
+    for label, factory, lag_limit in cases:
+        inline_ms, inline_lag = await _max_lag(factory(inline))
+        pool_ms, pool_lag = await _max_lag(factory(pooled))
+        print(
+            f"  {label:<28}inline {inline_ms:7.1f}ms (max loop lag {inline_lag:6.1f}ms) | "
+            f"pool {pool_ms:7.1f}ms (max loop lag {pool_lag:5.1f}ms)"
+        )
+        ok = ok and pool_lag < inline_lag and (lag_limit is None or pool_lag <= lag_limit)
+
+    pooled.shutdown()
+    return ok
+
+
+async def sweep_threshold(sample_sizes: List[int], merge_sizes: List[int]):
+    from app.core.cpu_executor import CpuExecutor
+    from app.core.cpu_tasks import merge_theme_list, stratified_sample_indices
+
+    inline = CpuExecutor(max_workers=0, min_items=0)
+    pooled = CpuExecutor(max_workers=2, min_items=0)
+    await pooled.run(stratified_sample_indices, columns={'ratings': [5], 'body_lengths': [1]}, target_count=1)
+
+    async def timed(executor, fn, columns, **params) -> float:
+        start = time.perf_counter()
+        for _ in range(5):
+            await executor.run(fn, columns=columns, **params)
+        return (time.perf_counter() - start) / 5 * 1000
+
+    rng = random.Random(2)
+    for size in sample_sizes:
+        columns = {
+            'ratings': [rng.randint(1, 5) for _ in range(size)],
+            'body_lengths': [rng.randint(0, 1000) for _ in range(size)],
+        }
+        inline_ms = await timed(inline, stratified_sample_indices, columns, target_count=100)
+        pool_ms = await timed(pooled, stratified_sample_indices, columns, target_count=100)
+        print(f"  sample {size:>8} rows     inline {inline_ms:8.2f}ms   pool {pool_ms:8.2f}ms")
+
+    for size in merge_sizes:
+        theme_list = make_theme_list(size, rng)
+        columns = {
+            'theme_names': [t['theme'] for t in theme_list],
+            'weighted_scores': [t['weighted_score'] for t in theme_list],
+            'review_counts': [t['review_count'] for t in theme_list],
+        }
+        inline_ms = await timed(inline, merge_theme_list, columns)
+        pool_ms = await timed(pooled, merge_theme_list, columns)
+        print(f"  merge  {size:>8} themes   inline {inline_ms:8.2f}ms   pool {pool_ms:8.2f}ms")
+
+    pooled.shutdown()
+
+
+async def run(args) -> bool:
+    print("equivalence")
+    ok = await check_equivalence(args.records // 10, args.seed)
+    print("loop lag")
+    ok = await check_loop_lag(args.records, args.themes, args.max_lag_ms) and ok
+    print("threshold sweep")
+    await sweep_threshold([1000, 5000, 10000, 20000, 50000, 100000], [100, 200, 300, 500, 1000])
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--themes', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-lag-ms', type=float, default=50.0)
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args)):
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
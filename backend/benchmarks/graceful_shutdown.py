@@ -0,0 +1,210 @@
+# backend/benchmarks/graceful_shutdown.py
+"""
+Graceful shutdown: SIGTERM against a running uvicorn worker
+
+Starts a uvicorn process with the real ShutdownManager and
+WebSocketManager (executions are stand-ins that sleep and record how
+they ended), connects a WebSocket client, starts a short and a long
+execution, then sends SIGTERM. Checks (any failure exits non-zero):
+- admissions:  while draining, /health answers 503 and new executions /
+               WebSocket connections are refused with a retry hint
+- drained:     the short execution (< drain deadline) completes
+- interrupted: the long one is cancelled and records its interruption
+               (the orchestrator's checkpoint path)
+- notice:      the connected client gets 'server_shutdown' with
+               reconnect_after_ms, then close code 1012
+- exit:        the process exits by itself within the deadline
+
+--compare also runs the worker without the SIGTERM handler (previous
+behaviour): executions are destroyed with the loop and record nothing.
+
+Usage (from backend/):
+    python -m benchmarks.graceful_shutdown --compare
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+
+def serve(port: int, results_path: str, install_handler: bool):
+    """Worker process: WebSocket endpoint plus stand-in executions"""
+    from contextlib import asynccontextmanager
+    import uvicorn
+    from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+    from fastapi.responses import JSONResponse
+    from app.core.shutdown import shutdown_manager
+    from app.websocket.manager import get_ws_manager
+
+    def record(execution_id: int, outcome: str):
+        with open(results_path, 'a') as f:
+            f.write(json.dumps({'execution_id': execution_id, 'outcome': outcome}) + '\n')
+
+    async def execution(execution_id: int, seconds: float):
+        try:
+            await asyncio.sleep(seconds)
+            record(execution_id, 'completed')
+        except asyncio.CancelledError:
+            record(execution_id, 'interrupted' if shutdown_manager.draining else 'cancelled')
+            raise
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if install_handler:
+            shutdown_manager.install_signal_handler()
+        yield
+        if install_handler:
+            await shutdown_manager.drain()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get('/health')
+    async def health():
+        if shutdown_manager.draining:
+            return JSONResponse(status_code=503, content={'status': 'draining'})
+        return {'status': 'healthy'}
+
+    @app.post('/start/{execution_id}')
+    async def start(execution_id: int, seconds: float):
+        if shutdown_manager.draining:
+            raise HTTPException(status_code=503, detail=shutdown_manager.rejection()['error'])
+        shutdown_manager.spawn_execution(execution(execution_id, seconds), execution_id, 'bench')
+        return {'ok': True}
+
+    @app.websocket('/ws/{session_id}')
+    async def websocket_endpoint(websocket: WebSocket, session_id: str):
+        manager = get_ws_manager()
+        if not await manager.connect(websocket, session_id):
+            return
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            manager.disconnect(session_id, websocket)
+
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def _read_results(path: str) -> Dict[int, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {entry['execution_id']: entry['outcome'] for entry in map(json.loads, f)}
+
+
+async def run(port: int, drain_s: float, install_handler: bool) -> Dict[str, Any]:
+    import httpx
+    import websockets
+
+    results_path = tempfile.mktemp(suffix='.jsonl')
+    env = {
+        **os.environ,
+        'SHUTDOWN_DRAIN_TIMEOUT_SECONDS': str(drain_s),
+        'SHUTDOWN_INTERRUPT_TIMEOUT_SECONDS': '2',
+    }
+    worker = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.graceful_shutdown', '--serve', str(port),
+         '--results', results_path] + ([] if install_handler else ['--no-handler']),
+        env=env
+    )
+    base, ws_url = f'http://127.0.0.1:{port}', f'ws://127.0.0.1:{port}'
+    checks: Dict[str, Any] = {}
+
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            for _ in range(100):
+                try:
+                    await client.get(f'{base}/health')
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+
+            async with websockets.connect(f'{ws_url}/ws/s1') as connection:
+                await connection.recv()  # welcome
+                await client.post(f'{base}/start/1', params={'seconds': drain_s / 2})
+                await client.post(f'{base}/start/2', params={'seconds': 60})
+
+                signalled = time.monotonic()
+                worker.send_signal(signal.SIGTERM)
+                await asyncio.sleep(0.2)
+
+                if install_handler:
+                    health = await client.get(f'{base}/health')
+                    start = await client.post(f'{base}/start/3', params={'seconds': 1})
+                    async with websockets.connect(f'{ws_url}/ws/s2') as late:
+                        late_notice = json.loads(await asyncio.wait_for(late.recv(), 5))
+                        await asyncio.wait_for(late.wait_closed(), 5)
+                    checks['admissions'] = (
+                        health.status_code == 503 and start.status_code == 503
+                        and late_notice.get('type') == 'server_shutdown' and late.close_code == 1012
+                    )
+
+                notice = None
+                try:
+                    while True:
+                        message = json.loads(await asyncio.wait_for(connection.recv(), drain_s + 10))
+                        if message.get('type') == 'server_shutdown':
+                            notice = message
+                except (websockets.ConnectionClosed, asyncio.TimeoutError):
+                    pass
+                await connection.wait_closed()
+                checks['notice'] = (
+                    notice is not None and 'reconnect_after_ms' in notice and connection.close_code == 1012
+                )
+
+        try:
+            exit_code = worker.wait(timeout=drain_s + 15)
+        except subprocess.TimeoutExpired:
+            exit_code = None
+        elapsed = time.monotonic() - signalled
+        outcomes = _read_results(results_path)
+        checks['drained'] = outcomes.get(1) == 'completed'
+        checks['interrupted'] = outcomes.get(2) == 'interrupted'
+        checks['exit'] = exit_code is not None and elapsed < drain_s + 10
+        print(
+            f"{'with' if install_handler else 'without'} drain: exit after {elapsed:.1f}s (code {exit_code}), "
+            f"execution outcomes {outcomes or '{} (nothing recorded)'}"
+        )
+    finally:
+        if worker.poll() is None:
+            worker.kill()
+        if os.path.exists(results_path):
+            os.unlink(results_path)
+
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8795)
+    parser.add_argument('--drain-seconds', type=float, default=3.0)
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--serve', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--results', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--no-handler', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.results, install_handler=not args.no_handler)
+        return
+
+    checks = asyncio.run(run(args.port, args.drain_seconds, install_handler=True))
+    for name, ok in checks.items():
+        print(f"  {name:<12}{'ok' if ok else 'FAILED'}")
+
+    if args.compare:
+        asyncio.run(run(args.port + 1, args.drain_seconds, install_handler=False))
+
+    if not all(checks.values()):
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
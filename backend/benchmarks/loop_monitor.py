@@ -0,0 +1,154 @@
+# backend/benchmarks/loop_monitor.py
+"""
+Event loop monitor: blocking detection, attribution and overhead
+
+Runs a loop with well-behaved async traffic plus known blocking calls
+(time.sleep standing in for sync DB / Redis calls, a busy loop for CPU
+work). Checks (any failure exits non-zero):
+- detection:   every blocking call longer than the threshold counts as
+               exactly one block, short ones not at all
+- attribution: offenders are ranked by total blocked time and name the
+               blocking function and task
+- idle lag:    heartbeat lag without blockers stays below 10ms (p99)
+- overhead:    throughput of a yield-heavy workload with the monitor
+               (and watchdog) running vs. without
+
+Usage (from backend/):
+    python -m benchmarks.loop_monitor
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+
+def blocking_query(seconds: float):
+    time.sleep(seconds)
+
+
+def busy_aggregation(seconds: float):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+async def handle_request(seconds: float):
+    await asyncio.sleep(0.01)
+    blocking_query(seconds)
+
+
+async def build_report(seconds: float):
+    await asyncio.sleep(0.01)
+    busy_aggregation(seconds)
+
+
+async def chatter(stop: asyncio.Event):
+    while not stop.is_set():
+        await asyncio.sleep(0.002)
+
+
+async def check_detection(threshold_s: float) -> bool:
+    from app.core.loop_monitor import LoopMonitor
+
+    monitor = LoopMonitor(interval_s=0.02, threshold_s=threshold_s, capture_stacks=True)
+    monitor.start()
+    stop = asyncio.Event()
+    background = asyncio.create_task(chatter(stop))
+
+    expected_blocks = 0
+    for seconds in (0.3, 0.3, 0.3):
+        await asyncio.create_task(handle_request(seconds), name='request')
+        expected_blocks += 1
+        await asyncio.sleep(0.05)
+    await asyncio.create_task(build_report(0.2), name='report')
+    expected_blocks += 1
+    await asyncio.sleep(0.05)
+    for _ in range(5):
+        # below the threshold: not a block
+        await asyncio.create_task(handle_request(threshold_s / 4), name='fast-request')
+        await asyncio.sleep(0.05)
+
+    stop.set()
+    await background
+    await monitor.stop()
+
+    stats = monitor.get_stats()
+    offenders = stats['offenders']
+    top = offenders[0] if offenders else {}
+    results = {
+        'detection': stats['blocks'] == expected_blocks,
+        'ranking': len(offenders) == 2 and 'blocking_query' in top['site'] and 'busy_aggregation' in offenders[1]['site'],
+        'task': top.get('task') == 'request' and top.get('coroutine') == 'handle_request',
+        'stack': 'handle_request' in (top.get('stack') or ''),
+    }
+    print(f"detection    {stats['blocks']} blocks (expected {expected_blocks}), blocked {stats['blocked_s']}s")
+    for offender in offenders:
+        print(
+            f"  {offender['site']:<60} {offender['count']}x total {offender['total_blocked_s'] * 1000:.0f}ms "
+            f"max {offender['max_blocked_s'] * 1000:.0f}ms task={offender['task']}"
+        )
+    for name, ok in results.items():
+        print(f"  {name:<12}{'ok' if ok else 'FAILED'}")
+    return all(results.values())
+
+
+async def check_idle_lag(seconds: float) -> bool:
+    from app.core.loop_monitor import LoopMonitor
+
+    monitor = LoopMonitor(interval_s=0.01, threshold_s=0.1, capture_stacks=True)
+    monitor.start()
+    stop = asyncio.Event()
+    background = asyncio.create_task(chatter(stop))
+    await asyncio.sleep(seconds)
+    stop.set()
+    await background
+    await monitor.stop()
+
+    lag = monitor.get_stats()['lag_ms']
+    print(f"idle lag     p50 {lag['p50']}ms p99 {lag['p99']}ms max {lag['max_recent']}ms")
+    return lag['p99'] < 10.0
+
+
+async def _yield_throughput(seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(0)
+        count += 1
+    return count / seconds
+
+
+async def check_overhead(seconds: float) -> bool:
+    from app.core.loop_monitor import LoopMonitor
+
+    baseline = await _yield_throughput(seconds)
+    monitor = LoopMonitor(interval_s=0.1, threshold_s=0.1, capture_stacks=True)
+    monitor.start()
+    monitored = await _yield_throughput(seconds)
+    await monitor.stop()
+
+    overhead = (1 - monitored / baseline) * 100
+    print(f"overhead     {baseline:,.0f} -> {monitored:,.0f} loop iterations/s ({overhead:+.1f}%)")
+    return overhead < 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threshold-ms', type=float, default=100)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    results = [
+        asyncio.run(check_detection(args.threshold_ms / 1000)),
+        asyncio.run(check_idle_lag(args.seconds)),
+        asyncio.run(check_overhead(args.seconds)),
+    ]
+    if not all(results):
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+# backend/benchmarks/rate_limiter.py
+"""
+Rate limiter load simulation and bot detection benchmark
+
+Checks (any failure exits non-zero):
+- accuracy:    clients sending above their limit on a simulated clock get
+               exactly burst + elapsed / interval requests through
+- concurrency: threads hitting one key at the same instant admit exactly
+               `limit` requests (no lost updates)
+- middleware:  concurrent HTTP requests from several clients through
+               RateLimitMiddleware; 429s only for clients over their rate
+- keys:        participants behind the proxy get their own budget (trusted
+               X-Forwarded-For); rotating client-supplied session ids
+               (query, header, body) or X-Forwarded-For from an untrusted
+               peer do not add budget
+- redis:       (with --redis-url) the same accuracy check against the
+               shared Lua backend from several limiter instances ("workers")
+- bot detection: precompiled pattern vs. the previous per-pattern scan,
+               identical decisions on a user agent corpus
+
+Usage (from backend/):
+    python -m benchmarks.rate_limiter --clients 200 --seconds 60
+    python -m benchmarks.rate_limiter --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from typing import List, Optional
+
+
+class _SimClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def check_accuracy(clients: int, seconds: int, limit: int, overload: float) -> bool:
+    from app.core.rate_limiter import MemoryBackend, Rate, RateLimiter
+
+    clock = _SimClock()
+    limiter = RateLimiter(MemoryBackend(clock=clock))
+    rate = Rate(limit, 60)
+    send_interval = rate.interval_s / overload
+
+    admitted = [0] * clients
+    steps = int(seconds / send_interval)
+    start = time.perf_counter()
+    for _ in range(steps):
+        for client in range(clients):
+            if limiter.hit(f'client:{client}', rate).allowed:
+                admitted[client] += 1
+        clock.now += send_interval
+    elapsed = time.perf_counter() - start
+
+    elapsed_sim = steps * send_interval
+    expected = limit + int(elapsed_sim / rate.interval_s)
+    worst = max(abs(count - expected) for count in admitted)
+    hits = steps * clients
+    print(
+        f"accuracy       {clients} clients x {steps} requests ({overload:g}x over {rate}): "
+        f"expected {expected}/client, max deviation {worst} | {hits / elapsed:,.0f} hits/s"
+    )
+    return worst <= 1
+
+
+def check_concurrency(threads: int, hits_per_thread: int, limit: int) -> bool:
+    from app.core.rate_limiter import MemoryBackend, Rate, RateLimiter
+
+    limiter = RateLimiter(MemoryBackend(clock=_SimClock()))
+    rate = Rate(limit, 60)
+    admitted = [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        local = sum(1 for _ in range(hits_per_thread) if limiter.hit('shared', rate).allowed)
+        with lock:
+            admitted[0] += local
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    print(f"concurrency    {threads} threads x {hits_per_thread} hits on one key: admitted {admitted[0]} (limit {limit})")
+    return admitted[0] == limit
+
+
+async def check_middleware(clients: int, requests_per_client: int, limit: int) -> bool:
+    import httpx
+    from fastapi import FastAPI
+    from app.core.rate_limiter import MemoryBackend, RateLimiter, RateLimitMiddleware
+
+    app = FastAPI()
+
+    @app.get('/api/ping')
+    async def ping():
+        return {'ok': True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RateLimiter(MemoryBackend()),
+        rules=[(None, '/api/', f'{limit}/minute')]
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        async def burst(client_id: int) -> List[int]:
+            return [
+                response.status_code for response in await asyncio.gather(*(
+                    client.get('/api/ping', headers={'X-Forwarded-For': f'198.51.100.{client_id}'})
+                    for _ in range(requests_per_client)
+                ))
+            ]
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(burst(client_id) for client_id in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    ok = all(codes.count(200) == min(limit, requests_per_client) for codes in statuses)
+    rejected = sum(codes.count(429) for codes in statuses)
+    total = clients * requests_per_client
+    print(
+        f"middleware     {clients} clients x {requests_per_client} concurrent requests (limit {limit}/min): "
+        f"{rejected} rejected | {total / elapsed:,.0f} req/s"
+    )
+    return ok
+
+
+async def check_keys(participants: int, limit: int) -> bool:
+    import httpx
+    from fastapi import FastAPI
+    from app.core.rate_limiter import MemoryBackend, RateLimiter, RateLimitMiddleware
+
+    app = FastAPI()
+
+    @app.post('/api/ai-chat/chat')
+    async def chat_endpoint():
+        return {'ok': True}
+
+    @app.get('/api/ping')
+    async def ping():
+        return {'ok': True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RateLimiter(MemoryBackend()),
+        rules=[
+            ('POST', '/api/ai-chat/chat', f'{limit}/minute'),
+            (None, '/api/', f'{limit}/minute'),
+        ],
+        trusted_proxies=['127.0.0.1/32', '172.16.0.0/12']
+    )
+
+    async def admitted(client_addr, requests) -> List[int]:
+        transport = httpx.ASGITransport(app=app, client=client_addr)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            counts = []
+            for make in requests:
+                responses = [await make(client, attempt) for attempt in range(limit + 5)]
+                counts.append(sum(response.status_code == 200 for response in responses))
+            return counts
+
+    proxy = ('172.18.0.5', 40000)
+    forwarded = await admitted(proxy, [
+        (lambda client, attempt, n=n: client.get('/api/ping', headers={'X-Forwarded-For': f'198.51.100.{n}'}))
+        for n in range(participants)
+    ])
+    # One client inventing a new session id on every request
+    rotating = await admitted(proxy, [
+        lambda client, attempt: client.post(
+            '/api/ai-chat/chat', json={'session_id': f'b{attempt}'},
+            headers={'X-Forwarded-For': '198.51.100.200', 'X-Session-ID': f'h{attempt}'}
+        ),
+        lambda client, attempt: client.get(
+            '/api/ping', params={'session_id': f'q{attempt}'},
+            headers={'X-Forwarded-For': '198.51.100.201', 'X-Session-ID': f'h{attempt}'}
+        ),
+    ])
+    spoofed = await admitted(('203.0.113.7', 40000), [
+        (lambda client, attempt, n=n: client.get('/api/ping', headers={'X-Forwarded-For': f'198.51.100.{100 + n}'}))
+        for n in range(participants)
+    ])
+
+    results = {
+        'forwarded ip': forwarded == [limit] * participants,
+        'rotating ids': rotating == [limit, limit],
+        'untrusted xff': sum(spoofed) == limit,
+    }
+    print(f"keys           {participants} participants behind one proxy address, {limit + 5} requests each (limit {limit}):")
+    for name, ok in results.items():
+        print(f"  {name:<15}{'ok' if ok else 'FAILED'}")
+    return all(results.values())
+
+
+async def check_redis(redis_url: str, workers: int, limit: int, seconds: float) -> bool:
+    import redis.asyncio as aioredis
+    from app.core.rate_limiter import Rate, RateLimiter, RedisBackend
+
+    client = aioredis.Redis.from_url(redis_url, decode_responses=True)
+    prefix = f'ratelimit-bench:{time.time_ns()}:'
+    limiters = [RateLimiter(RedisBackend(client, key_prefix=prefix)) for _ in range(workers)]
+    rate = Rate(limit, 1)
+
+    admitted = 0
+    hits = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for limiter in limiters:
+            hits += 1
+            admitted += (await limiter.hit_async('shared', rate)).allowed
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    expected = limit + int(elapsed / rate.interval_s)
+    print(
+        f"redis          {workers} workers, {hits} hits over {elapsed:.1f}s ({rate}): "
+        f"admitted {admitted}, expected ~{expected} | {hits / elapsed:,.0f} hits/s"
+    )
+    return abs(admitted - expected) <= max(2, expected * 0.02)
+
+
+def check_bot_detection(iterations: int) -> bool:
+    from app.core.bot_detection import BOT_USER_AGENT_PATTERNS, SUSPICIOUS_RESOLUTIONS, is_bot_request, _match_bot_pattern
+
+    def legacy(user_agent: Optional[str], screen_resolution: Optional[str]):
+        if not user_agent:
+            return True, "Missing user agent"
+        user_agent_lower = user_agent.lower()
+        for pattern in BOT_USER_AGENT_PATTERNS:
+            if pattern in user_agent_lower:
+                return True, f"Bot pattern detected: {pattern}"
+        if screen_resolution and screen_resolution in SUSPICIOUS_RESOLUTIONS:
+            return True, f"Suspicious resolution: {screen_resolution}"
+        return False, None
+
+    corpus = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15',
+        'Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0',
+        'Mozilla/5.0 (iPhone; CPU iPhone OS 17_6 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+        'Mozilla/5.0 HeadlessChrome/120.0 Safari/537.36',
+        'Googlebot/2.1 (+http://www.google.com/bot.html)',
+        'curl/8.5.0',
+        'python-requests/2.32.3',
+        None,
+    ]
+    resolutions = ['1920x1080', '800x600', None]
+    cases = [(ua, res) for ua in corpus for res in resolutions]
+
+    mismatches = [
+        case for case in cases
+        if is_bot_request(*case)[0] != legacy(*case)[0]
+    ]
+
+    def timed(function) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for case in cases:
+                function(*case)
+        return (time.perf_counter() - start) / (iterations * len(cases)) * 1e6
+
+    legacy_us = timed(legacy)
+    _match_bot_pattern.cache_clear()
+    current_us = timed(is_bot_request)
+    print(
+        f"bot detection  {len(cases)} cases: legacy {legacy_us:.2f}us/check, "
+        f"precompiled+cached {current_us:.2f}us/check, decision mismatches {len(mismatches)}"
+    )
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--seconds', type=int, default=60, help="Simulated seconds (accuracy check)")
+    parser.add_argument('--limit', type=int, default=100, help="Requests per minute per client")
+    parser.add_argument('--overload', type=float, default=3.0, help="Client send rate as a multiple of the limit")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--redis-url', default=None)
+    args = parser.parse_args()
+
+    results = [
+        check_accuracy(args.clients, args.seconds, args.limit, args.overload),
+        check_concurrency(args.threads, args.limit, args.limit),
+        asyncio.run(check_middleware(min(args.clients, 50), 30, 20)),
+        asyncio.run(check_keys(5, 10)),
+        check_bot_detection(2000),
+    ]
+    if args.redis_url:
+        results.append(asyncio.run(check_redis(args.redis_url, workers=4, limit=50, seconds=3.0)))
+
+    if not all(results):
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
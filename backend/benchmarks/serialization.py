@@ -0,0 +1,339 @@
+# backend/benchmarks/serialization.py
+"""
+JSON serialization benchmark and round-trip equivalence check
+
+Encodes/decodes the payloads of the converted hot paths with every
+installed backend of app.core.serialization:
+- state_field:  record_store as stored in a Redis hash field
+- checkpoint:   full state snapshot (checkpoint_to_db / JSON columns)
+- ws_frame:     chat_stream WebSocket message
+- review_list:  /api/reviews response body
+
+Each backend's decoded output is compared against the stdlib reference
+(json.dumps + json_default); any mismatch fails the run.
+
+Path checks then run every converted call site with each backend active
+and assert its output equals the stdlib output (the payloads include
+datetime, Decimal and UUID values):
+- save_state/get_state:  RedisHashStateManager round trip (stored fields
+                         must also parse with stdlib json)
+- checkpoint_to_db:      state_snapshot written through the engine's JSON
+                         serializer and read back
+- _log_to_file:          BaseTool and state_utils debug dumps
+- _send_direct:          WebSocket text frame
+- responses:             the reviews / orchestrator routers' response class
+                         vs. FastAPI's JSONResponse
+
+Usage (from backend/):
+    python -m benchmarks.serialization --records 2000 --runs 20
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+from uuid import uuid4
+
+
+def _make_payloads(count: int) -> Dict[str, Any]:
+    from app.orchestrator.graphs.shared_state import initialize_state, initialize_records, apply_enrichment
+    from app.schemas.reviews import ReviewStudyBase
+
+    records = [
+        {
+            'review_id': f'R{i:07d}',
+            'product_id': f'P{i % 40:04d}',
+            'product_title': f'Laufschuh {i % 40} – leicht & atmungsaktiv',
+            'product_category': 'shoes',
+            'star_rating': (i % 5) + 1,
+            'verified_purchase': i % 3 != 0,
+            'review_headline': f'Headline {i}',
+            'review_body': 'Comfortable fit, runs a bit small, good value overall. ' * 4,
+            'helpful_votes': i % 7,
+            'total_votes': i % 7 + i % 5,
+            'customer_id': i + 1,
+        }
+        for i in range(count)
+    ]
+
+    state = initialize_state(1, 'bench', 'workflow_builder', 'shoes', 'en')
+    initialize_records(state, records)
+    apply_enrichment(
+        state, 'Review Sentiment Analysis', 'review-sentiment-analysis',
+        {r['review_id']: {'sentiment': 'positive', 'sentiment_confidence': 0.9} for r in records},
+        ['sentiment', 'sentiment_confidence']
+    )
+    state['started_at'] = datetime.now(timezone.utc)
+    state['trace_id'] = uuid4()
+    state['cost_usd'] = Decimal('0.0125')
+
+    return {
+        'state_field': state['record_store'],
+        'checkpoint': state,
+        'ws_frame': {
+            'type': 'chat_stream',
+            'content': 'Die Passform ist gut',
+            'full_content': 'Die Passform ist gut ' * 40,
+            'timestamp': datetime.now(timezone.utc),
+        },
+        'review_list': {
+            'reviews': [ReviewStudyBase(**r) for r in records],
+            'total': count,
+            'limit': count,
+            'offset': 0,
+        },
+    }
+
+
+def _stdlib(value: Any) -> Any:
+    from app.core.serialization import json_default
+    return json.loads(json.dumps(value, default=json_default))
+
+
+def _typed_values() -> Dict[str, Any]:
+    return {
+        'started_at': datetime.now(timezone.utc),
+        'midnight': datetime(2026, 1, 1),
+        'cost_usd': Decimal('0.0125'),
+        'tokens': Decimal('1200'),
+        'trace_id': uuid4(),
+        'nested': [{'at': datetime(2026, 3, 1, 12, 30, 15, 250000, tzinfo=timezone.utc), 'id': uuid4()}],
+    }
+
+
+class _HashStore:
+    """In-process stand-in for the Redis hash commands RedisHashStateManager uses"""
+
+    def __init__(self):
+        self.hashes: Dict[str, Dict[str, str]] = {}
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+    def ping(self):
+        return True
+
+
+class _CapturingSocket:
+    def __init__(self):
+        from starlette.websockets import WebSocketState
+        self.client_state = WebSocketState.CONNECTED
+        self.sent: List[str] = []
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+
+def check_state_hash(state: Dict[str, Any]) -> List[str]:
+    from app.orchestrator.graphs.shared_state import serialize_state
+    from app.orchestrator.redis_hash_manager import RedisHashStateManager
+
+    manager = RedisHashStateManager(redis_client=_HashStore())
+    snapshot = serialize_state(state)
+    manager.save_state(1, snapshot)
+    stored = manager.redis_client.hgetall(manager._get_state_key(1))
+    loaded = manager.get_state(1)
+
+    errors = []
+    for field, value in snapshot.items():
+        if field in manager.json_fields:
+            reference = _stdlib(value)
+            if json.loads(stored[field]) != reference:
+                errors.append(f"save_state: field {field} does not parse to the stdlib value")
+            if loaded.get(field) != reference:
+                errors.append(f"get_state: field {field} differs from stdlib")
+    return errors
+
+
+async def check_checkpoint(state: Dict[str, Any]) -> List[str]:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core import serialization
+    from app.models import ai_chat, demographics, session, survey  # noqa: F401 (mapper relationships)
+    from app.models.execution import ExecutionCheckpoint
+    from app.orchestrator.graphs.shared_state import serialize_state
+    from app.orchestrator.state_manager import state_manager
+
+    # Same JSON column configuration as app.database
+    engine = create_engine(
+        'sqlite://',
+        json_serializer=serialization.dumps,
+        json_deserializer=serialization.loads
+    )
+    ExecutionCheckpoint.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    metadata = _typed_values()
+    with Session() as db:
+        await state_manager.checkpoint_to_db(
+            db, execution_id=1, step_number=1, checkpoint_type='node_end',
+            state=state, metadata=metadata, buffered=False
+        )
+    # checkpoint_to_db bumps checkpoints_created before the snapshot
+    reference_state = _stdlib(serialize_state(state))
+    with Session() as db:
+        row = db.query(ExecutionCheckpoint).one()
+        stored_snapshot, stored_metadata = row.state_snapshot, row.checkpoint_metadata
+    engine.dispose()
+
+    errors = []
+    if stored_snapshot != reference_state:
+        errors.append("checkpoint_to_db: state_snapshot differs from stdlib")
+    if stored_metadata != _stdlib(metadata):
+        errors.append("checkpoint_to_db: checkpoint_metadata differs from stdlib")
+    return errors
+
+
+def check_log_files(payload: Dict[str, Any]) -> List[str]:
+    from app.orchestrator.graphs import state_utils
+    from app.orchestrator.tools.base_tool import BaseTool
+
+    errors = []
+    reference = _stdlib(payload)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            path = BaseTool._log_to_file(None, payload, 'bench_tool')
+            with open(path, encoding='utf-8') as f:
+                logged = json.load(f)
+            if logged.get('data') != reference:
+                errors.append("BaseTool._log_to_file differs from stdlib")
+
+            path = state_utils._log_to_file(payload, 'bench_state')
+            with open(path, encoding='utf-8') as f:
+                if json.load(f) != reference:
+                    errors.append("state_utils._log_to_file differs from stdlib")
+        finally:
+            os.chdir(cwd)
+    return errors
+
+
+async def check_send_direct(message: Dict[str, Any]) -> List[str]:
+    from app.websocket.manager import get_ws_manager
+
+    websocket = _CapturingSocket()
+    ok = await get_ws_manager()._send_direct(websocket, message)
+    if not ok or len(websocket.sent) != 1:
+        return ["_send_direct: frame not sent"]
+    if json.loads(websocket.sent[0]) != _stdlib(message):
+        return ["_send_direct: frame differs from stdlib"]
+    return []
+
+
+async def check_responses(body: Dict[str, Any]) -> List[str]:
+    import httpx
+    from fastapi import APIRouter, FastAPI
+    from fastapi.responses import JSONResponse
+    from app.routers import orchestrator, reviews
+
+    errors = []
+    for name, router in (('reviews', reviews.router), ('orchestrator', orchestrator.router)):
+        app = FastAPI()
+        for response_class, path in ((router.default_response_class, '/converted'), (JSONResponse, '/stdlib')):
+            endpoint_router = APIRouter(default_response_class=response_class)
+            endpoint_router.add_api_route(path, lambda: body, methods=['GET'])
+            app.include_router(endpoint_router)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            converted = (await client.get('/converted')).json()
+            reference = (await client.get('/stdlib')).json()
+        if converted != reference:
+            errors.append(f"{name} responses differ from JSONResponse")
+    return errors
+
+
+async def check_paths(backends, records: int) -> int:
+    from app.core import serialization
+
+    payloads = _make_payloads(records)
+    state = payloads['checkpoint']
+    state['metadata'] = _typed_values()
+    message = {**payloads['ws_frame'], **_typed_values()}
+    response_body = {**payloads['review_list'], 'meta': _typed_values()}
+
+    active = serialization._backend
+    failures = 0
+    try:
+        for backend in backends:
+            serialization._backend = backend
+            errors = (
+                check_state_hash(state)
+                + await check_checkpoint(state)
+                + check_log_files({'records': payloads['review_list']['reviews'][:50], **_typed_values()})
+                + await check_send_direct(message)
+                + await check_responses(response_body)
+            )
+            for error in errors:
+                print(f"MISMATCH {backend.name}: {error}")
+            print(f"paths        {backend.name:<8} {'ok' if not errors else f'{len(errors)} mismatch(es)'}")
+            failures += len(errors)
+    finally:
+        serialization._backend = active
+    return failures
+
+
+def _time(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    # App modules start background tasks on import; import inside the running loop
+    from app.core.serialization import get_backend, json_default
+
+    payloads = _make_payloads(args.records)
+    backends = [
+        get_backend(name) for name in ('json', 'orjson')
+        if name == 'json' or importlib.util.find_spec(name) is not None
+    ]
+
+    failures = 0
+    for label, payload in payloads.items():
+        reference = json.loads(json.dumps(payload, default=json_default))
+        for backend in backends:
+            encoded = backend.dumps(payload)
+            if backend.loads(encoded) != reference:
+                print(f"MISMATCH {label}: {backend.name} round-trip differs from stdlib")
+                failures += 1
+                continue
+
+            dump_ms = _time(lambda: backend.dumps(payload), args.runs)
+            load_ms = _time(lambda: backend.loads(encoded), args.runs)
+            print(
+                f"{label:<12} {backend.name:<8} "
+                f"dumps={dump_ms:8.2f}ms  loads={load_ms:8.2f}ms  "
+                f"size={len(encoded) / 1024:8.0f}KiB"
+            )
+
+    failures += await check_paths(backends, min(args.records, 200))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+# backend/benchmarks/ws_batching.py
+"""
+WebSocket batch manager load benchmark
+
+Drives N sessions x M messages/sec through WebSocketBatchManager with a
+simulated socket send (fixed delay per batch, optionally one slow session)
+and reports:
+- delivered messages/sec and average batch size
+- enqueue -> send latency (p50 / p99 / max)
+- producer time spent inside add_message (p99)
+- per-session ordering violations (must be 0)
+
+Usage (from backend/):
+    python -m benchmarks.ws_batching --sessions 50 --rate 200 --seconds 5
+    python -m benchmarks.ws_batching --sessions 50 --rate 200 --slow-session-ms 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--rate', type=int, default=200, help="Messages per second per session")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--send-ms', type=float, default=1.0, help="Simulated send time per batch")
+    parser.add_argument('--slow-session-ms', type=float, default=0.0, help="Send time of session 0 (slow consumer)")
+    args = parser.parse_args()
+
+    from app.websocket.batch_manager import WebSocketBatchManager
+
+    manager = WebSocketBatchManager(max_batch_size=10, max_batch_age_ms=100)
+    latencies: List[float] = []
+    last_seq: Dict[str, int] = {}
+    violations = 0
+    delivered = 0
+
+    async def send(session_id: str, batch: dict):
+        nonlocal violations, delivered
+        delay = args.slow_session_ms if session_id == 's0' and args.slow_session_ms else args.send_ms
+        await asyncio.sleep(delay / 1000)
+        now = time.perf_counter()
+        for message in batch['messages']:
+            if message['seq'] <= last_seq.get(session_id, -1):
+                violations += 1
+            last_seq[session_id] = message['seq']
+            latencies.append((now - message['t']) * 1000)
+        delivered += len(batch['messages'])
+
+    manager.flush_callback = send
+    manager.start()
+
+    enqueue_ms: List[float] = []
+
+    async def producer(session_id: str):
+        interval = 1.0 / args.rate
+        deadline = time.perf_counter() + args.seconds
+        seq = 0
+        next_at = time.perf_counter()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await manager.add_message(session_id, {'type': 'chat_stream', 'seq': seq, 't': start})
+            enqueue_ms.append((time.perf_counter() - start) * 1000)
+            seq += 1
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(producer(f's{i}') for i in range(args.sessions)))
+    await manager.stop()
+    elapsed = time.perf_counter() - started
+
+    metrics = manager.get_metrics()
+    print(
+        f"sessions={args.sessions} rate={args.rate}/s send={args.send_ms}ms "
+        f"slow_session={args.slow_session_ms or '-'}ms"
+    )
+    print(f"delivered        {delivered} messages ({delivered / elapsed:,.0f}/s)")
+    print(f"batches          {metrics['batches_sent']} (avg size {metrics['avg_batch_size']:.1f})")
+    print(
+        f"delivery latency p50={_percentile(latencies, 0.5):.1f}ms "
+        f"p99={_percentile(latencies, 0.99):.1f}ms max={max(latencies, default=0):.1f}ms"
+    )
+    print(f"add_message      p99={_percentile(enqueue_ms, 0.99):.3f}ms mean={statistics.fmean(enqueue_ms):.3f}ms")
+    print(f"ordering violations {violations}")
+
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
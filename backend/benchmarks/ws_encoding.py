@@ -0,0 +1,174 @@
+# backend/benchmarks/ws_encoding.py
+"""
+WebSocket frame encoding benchmark: bytes on the wire and encode CPU
+
+Encodes a stream of representative server -> client frames on one
+simulated connection with:
+- json:          default text frames (app.core.serialization)
+- json+pmd:      json with permessage-deflate as the transport applies it
+                 (context takeover, sync flush per message)
+- msgpack:       app.websocket.codec.MsgpackCodec (key table + deflate
+                 above the threshold)
+- msgpack+pmd:   msgpack frames additionally compressed by the transport
+
+Frame kinds:
+- node_progress:  workflow node progress event
+- llm_token:      streaming callback token (_send_unified_message)
+- chat_stream:    chat token with accumulated full_content
+- tool_result:    tool end event with a result preview of N reviews
+- batch_update:   batch manager frame of 10 progress events
+
+Every msgpack frame is decoded with MsgpackDecoder and compared to the
+JSON round trip; any mismatch fails the run.
+
+Usage (from backend/):
+    python -m benchmarks.ws_encoding --frames 2000 --preview-reviews 20
+"""
+import argparse
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+def _make_frames(count: int, preview_reviews: int) -> Dict[str, List[Dict[str, Any]]]:
+    now = datetime.now(timezone.utc).isoformat()
+
+    def node_progress(i):
+        return {
+            'type': 'node', 'subtype': 'progress', 'execution_id': 42,
+            'condition': 'workflow_builder', 'status': 'running', 'timestamp': now,
+            'data': {'node_id': f'node-{i % 6}', 'tool_id': 'review-sentiment-analysis', 'step_number': i % 6,
+                     'progress': (i * 7) % 100},
+        }
+
+    def llm_token(i):
+        return {
+            'type': 'llm', 'subtype': 'token', 'execution_id': 42,
+            'condition': 'ai_assistant', 'timestamp': now,
+            'data': {'tool_name': 'decision_maker', 'chunk': f'token{i} '},
+        }
+
+    def chat_stream(i):
+        return {'type': 'chat_stream', 'content': 'gut ', 'full_content': 'Die Passform ist gut ' * (i % 80 + 1)}
+
+    def tool_result(i):
+        return {
+            'type': 'tool', 'subtype': 'end', 'execution_id': 42, 'condition': 'workflow_builder',
+            'status': 'completed', 'tool_name': 'Filter Reviews', 'tool_id': 'filter-reviews', 'timestamp': now,
+            'data': {
+                'records_before': 500, 'records_after': preview_reviews,
+                'preview': [
+                    {
+                        'review_id': f'R{i * preview_reviews + j:07d}', 'product_id': f'P{j % 40:04d}',
+                        'star_rating': j % 5 + 1, 'verified_purchase': j % 3 != 0,
+                        'review_headline': f'Headline {j}',
+                        'review_body': 'Comfortable fit, runs a bit small, good value overall. ' * 3,
+                        'sentiment': 'positive', 'sentiment_confidence': 0.91,
+                    }
+                    for j in range(preview_reviews)
+                ],
+            },
+        }
+
+    def batch_update(i):
+        return {
+            'type': 'batch_update', 'timestamp': now, 'message_count': 10, 'priority': 'normal',
+            'messages': [node_progress(i * 10 + j) for j in range(10)],
+        }
+
+    builders = {
+        'node_progress': node_progress,
+        'llm_token': llm_token,
+        'chat_stream': chat_stream,
+        'tool_result': tool_result,
+        'batch_update': batch_update,
+    }
+    return {name: [build(i) for i in range(count)] for name, build in builders.items()}
+
+
+class _PerMessageDeflate:
+    """permessage-deflate as negotiated by default (context takeover)"""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+
+    def __call__(self, data: bytes) -> bytes:
+        compressed = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return compressed[:-4]  # RFC 7692: strip the trailing 00 00 ff ff
+
+
+def _encoders(compress_threshold: int) -> Dict[str, Callable[[], Callable[[Dict[str, Any]], bytes]]]:
+    from app.websocket.codec import JsonCodec, MsgpackCodec
+
+    def json_plain():
+        codec = JsonCodec()
+        return lambda message: codec.encode(message).encode('utf-8')
+
+    def json_pmd():
+        codec, deflate = JsonCodec(), _PerMessageDeflate()
+        return lambda message: deflate(codec.encode(message).encode('utf-8'))
+
+    def msgpack_plain():
+        return MsgpackCodec(compress_threshold=compress_threshold).encode
+
+    def msgpack_pmd():
+        codec, deflate = MsgpackCodec(compress_threshold=compress_threshold), _PerMessageDeflate()
+        return lambda message: deflate(codec.encode(message))
+
+    return {'json': json_plain, 'json+pmd': json_pmd, 'msgpack': msgpack_plain, 'msgpack+pmd': msgpack_pmd}
+
+
+def _verify(frames: List[Dict[str, Any]], compress_threshold: int) -> int:
+    from app.core import serialization
+    from app.websocket.codec import MsgpackCodec, MsgpackDecoder
+
+    codec, decoder = MsgpackCodec(compress_threshold=compress_threshold), MsgpackDecoder()
+    mismatches = 0
+    for message in frames:
+        if decoder.decode(codec.encode(message)) != serialization.loads(serialization.dumps(message)):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=2000, help="Frames per kind")
+    parser.add_argument('--preview-reviews', type=int, default=20)
+    parser.add_argument('--compress-threshold', type=int, default=1024)
+    args = parser.parse_args()
+
+    frames_by_kind = _make_frames(args.frames, args.preview_reviews)
+    encoders = _encoders(args.compress_threshold)
+
+    print(f"frames/kind={args.frames} preview_reviews={args.preview_reviews} "
+          f"compress_threshold={args.compress_threshold}B")
+    print(f"{'kind':<14}{'encoding':<13}{'bytes/frame':>12}{'vs json':>9}{'encode us/frame':>17}")
+
+    failed = False
+    for kind, frames in frames_by_kind.items():
+        baseline = None
+        for name, make_encoder in encoders.items():
+            encode = make_encoder()
+            total_bytes = 0
+            start = time.process_time()
+            for message in frames:
+                total_bytes += len(encode(message))
+            cpu_us = (time.process_time() - start) / len(frames) * 1e6
+
+            per_frame = total_bytes / len(frames)
+            baseline = baseline or per_frame
+            print(f"{kind:<14}{name:<13}{per_frame:>12.1f}{per_frame / baseline:>8.0%}{cpu_us:>17.1f}")
+
+        mismatches = _verify(frames, args.compress_threshold)
+        if mismatches:
+            print(f"{kind}: {mismatches} msgpack frames did not round-trip")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+# backend/benchmarks/ws_fanout.py
+"""
+Cross-worker WebSocket fan-out: routing checks and delivery latency
+
+In-process (always): two WebSocketManagers ("workers") share one
+MemoryBroker. Checks, any failure exits non-zero:
+- send:      worker A sends to a session connected to worker B
+- order:     N messages A -> B arrive complete and in order
+- offline:   a message for a session connected nowhere is queued and
+             delivered when the session connects to the other worker
+- broadcast: tabs of one session on both workers each get one copy
+- channel:   subscribers on both workers each get one copy
+- leave:     after the last disconnect the worker stops receiving
+
+Two processes (--redis-url): starts two uvicorn workers on separate ports
+with the Redis broker (no sticky sessions, no shared memory), connects
+a client to worker A, publishes via HTTP on worker B, and repeats the
+send / order / offline / channel checks over real sockets, reporting
+cross-worker delivery latency.
+
+Usage (from backend/):
+    python -m benchmarks.ws_fanout --messages 1000
+    python -m benchmarks.ws_fanout --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+
+# ============================================================
+# IN-PROCESS (MemoryBroker)
+# ============================================================
+
+class _FakeWebSocket:
+    def __init__(self):
+        from starlette.websockets import WebSocketState
+        self.client_state = WebSocketState.CONNECTED
+        self.scope: Dict[str, Any] = {}
+        self.query_params: Dict[str, str] = {}
+        self.received: List[Dict[str, Any]] = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        from app.core import serialization
+        message = serialization.loads(data)
+        if message.get('type') not in ('connected', 'ping'):
+            self.received.append(message)
+
+    async def close(self, code: int = 1000):
+        from starlette.websockets import WebSocketState
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+async def run_in_process(messages: int) -> bool:
+    from app.websocket.manager import WebSocketManager
+    from app.websocket.fanout import MemoryBroker, WebSocketFanout
+
+    broker = MemoryBroker()
+    worker_a = WebSocketManager(enable_batching=False)
+    worker_b = WebSocketManager(enable_batching=False)
+    await worker_a.start_fanout(WebSocketFanout(broker, worker_id='A'))
+    await worker_b.start_fanout(WebSocketFanout(broker, worker_id='B'))
+
+    results = {}
+
+    # send + order
+    ws_b = _FakeWebSocket()
+    await worker_b.connect(ws_b, 's1')
+    start = time.perf_counter()
+    for seq in range(messages):
+        await worker_a.send_to_session('s1', {'type': 'response', 'seq': seq}, immediate=True)
+        await asyncio.sleep(0)  # producers yield between sends; lets B's writer run
+    await _settle()
+    elapsed = time.perf_counter() - start
+    results['send'] = bool(ws_b.received)
+    results['order'] = [m['seq'] for m in ws_b.received] == list(range(messages))
+
+    # leave
+    worker_b.disconnect('s1', ws_b)
+    await _settle()
+    receivers = await worker_a.fanout.publish_session('s1', {'type': 'response'})
+    results['leave'] = receivers == 0
+
+    # offline
+    await worker_a.send_to_session('s2', {'type': 'response', 'seq': 'queued'}, immediate=True)
+    ws_b2 = _FakeWebSocket()
+    await worker_b.connect(ws_b2, 's2')
+    await _settle()
+    results['offline'] = [m.get('seq') for m in ws_b2.received] == ['queued']
+
+    # broadcast (one tab per worker)
+    tab_a, tab_b = _FakeWebSocket(), _FakeWebSocket()
+    await worker_a.connect(tab_a, 's3')
+    await worker_b.connect(tab_b, 's3')
+    await worker_a.broadcast_to_session('s3', {'type': 'session_sync'})
+    await _settle()
+    results['broadcast'] = len(tab_a.received) == 1 and len(tab_b.received) == 1
+
+    # channel
+    sub_a, sub_b = _FakeWebSocket(), _FakeWebSocket()
+    await worker_a.connect(sub_a, 's4')
+    await worker_b.connect(sub_b, 's5')
+    worker_a.subscribe('s4', 'news')
+    worker_b.subscribe('s5', 'news')
+    await _settle()
+    await worker_b.broadcast_to_channel('news', {'type': 'announcement'})
+    await _settle()
+    results['channel'] = len(sub_a.received) == 1 and len(sub_b.received) == 1
+
+    await worker_a.shutdown()
+    await worker_b.shutdown()
+
+    print(f"in-process: {messages} cross-worker messages in {elapsed * 1000:.1f}ms "
+          f"({messages / elapsed:,.0f} msg/s)")
+    for name, ok in results.items():
+        print(f"  {name:<10}{'ok' if ok else 'FAILED'}")
+    return all(results.values())
+
+
+# ============================================================
+# TWO PROCESSES (RedisBroker)
+# ============================================================
+
+def serve(port: int, redis_url: str, key_prefix: str):
+    """One worker process: manager + Redis fan-out, WS endpoint and HTTP publish endpoints"""
+    from contextlib import asynccontextmanager
+    import uvicorn
+    from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+    from app.websocket.manager import WebSocketManager
+    from app.websocket.fanout import RedisBroker, WebSocketFanout
+
+    manager = WebSocketManager(enable_batching=False)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await manager.start_fanout(
+            WebSocketFanout(RedisBroker(redis_url, key_prefix=key_prefix), worker_id=f'worker-{port}')
+        )
+        yield
+        await manager.shutdown()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get('/health')
+    async def health():
+        return {'worker': port}
+
+    @app.websocket('/ws/{session_id}')
+    async def websocket_endpoint(websocket: WebSocket, session_id: str):
+        await manager.connect(websocket, session_id)
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            manager.disconnect(session_id, websocket)
+
+    @app.post('/send/{session_id}')
+    async def send(session_id: str, request: Request):
+        await manager.send_to_session(session_id, await request.json(), immediate=True)
+        return {'ok': True}
+
+    @app.post('/subscribe/{session_id}/{channel}')
+    async def subscribe(session_id: str, channel: str):
+        manager.subscribe(session_id, channel)
+        await asyncio.sleep(0.05)  # let the broker subscription land
+        return {'ok': True}
+
+    @app.post('/channel/{channel}')
+    async def channel_broadcast(channel: str, request: Request):
+        await manager.broadcast_to_channel(channel, await request.json())
+        return {'ok': True}
+
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning')
+
+
+async def _receive_json(connection, timeout: float = 5.0) -> Dict[str, Any]:
+    from app.core import serialization
+    while True:
+        message = serialization.loads(await asyncio.wait_for(connection.recv(), timeout))
+        if message.get('type') != 'ping':
+            return message
+
+
+async def run_two_processes(redis_url: str, messages: int, base_port: int) -> bool:
+    import httpx
+    import websockets
+
+    key_prefix = f'ws-bench-{os.getpid()}:'
+    ports = (base_port, base_port + 1)
+    workers = [
+        subprocess.Popen([
+            sys.executable, '-m', 'benchmarks.ws_fanout',
+            '--serve', str(port), '--redis-url', redis_url, '--key-prefix', key_prefix
+        ])
+        for port in ports
+    ]
+    http_a, http_b = (f'http://127.0.0.1:{port}' for port in ports)
+    ws_a, ws_b = (f'ws://127.0.0.1:{port}' for port in ports)
+    results = {}
+    latencies: List[float] = []
+
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            for url in (http_a, http_b):
+                for _ in range(100):
+                    try:
+                        await client.get(f'{url}/health')
+                        break
+                    except httpx.TransportError:
+                        await asyncio.sleep(0.1)
+
+            # send + order + latency: client on A, publisher on B
+            async with websockets.connect(f'{ws_a}/ws/p1') as connection:
+                await _receive_json(connection)  # welcome
+
+                for seq in range(min(messages, 200)):
+                    start = time.perf_counter()
+                    await client.post(f'{http_b}/send/p1', json={'type': 'response', 'seq': seq})
+                    await _receive_json(connection)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                results['send'] = True
+
+                await asyncio.gather(*(
+                    client.post(f'{http_b}/send/p1', json={'type': 'response', 'seq': seq})
+                    for seq in range(messages)
+                ))
+                received = [(await _receive_json(connection))['seq'] for _ in range(messages)]
+                # concurrent HTTP posts may reach the server in any order; none may be lost
+                results['order'] = sorted(received) == list(range(messages))
+
+            # offline: nobody connected, publish on A, reconnect on B
+            await asyncio.sleep(0.2)
+            await client.post(f'{http_a}/send/p2', json={'type': 'response', 'seq': 'queued'})
+            async with websockets.connect(f'{ws_b}/ws/p2') as connection:
+                await _receive_json(connection)  # welcome
+                results['offline'] = (await _receive_json(connection)).get('seq') == 'queued'
+
+            # channel: one subscriber per worker
+            async with websockets.connect(f'{ws_a}/ws/p3') as sub_a, websockets.connect(f'{ws_b}/ws/p4') as sub_b:
+                await _receive_json(sub_a)
+                await _receive_json(sub_b)
+                await client.post(f'{http_a}/subscribe/p3/news')
+                await client.post(f'{http_b}/subscribe/p4/news')
+                await client.post(f'{http_a}/channel/news', json={'type': 'announcement'})
+                got = await asyncio.gather(_receive_json(sub_a), _receive_json(sub_b))
+                results['channel'] = all(message.get('type') == 'announcement' for message in got)
+
+    except Exception as e:
+        print(f"two-process run failed: {e!r}")
+        results.setdefault('run', False)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait(timeout=10)
+
+    if latencies:
+        print(f"two processes (redis): cross-worker latency p50 {statistics.median(latencies):.2f}ms "
+              f"p99 {sorted(latencies)[int(len(latencies) * 0.99) - 1]:.2f}ms (HTTP publish -> WS receive)")
+    for name, ok in results.items():
+        print(f"  {name:<10}{'ok' if ok else 'FAILED'}")
+    return bool(results) and all(results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=1000)
+    parser.add_argument('--redis-url', default=None)
+    parser.add_argument('--base-port', type=int, default=8791)
+    parser.add_argument('--serve', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--key-prefix', default='ws:', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.redis_url, args.key_prefix)
+        return
+
+    ok = asyncio.run(run_in_process(args.messages))
+    if args.redis_url:
+        ok = asyncio.run(run_two_processes(args.redis_url, args.messages, args.base_port)) and ok
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()